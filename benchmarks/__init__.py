@@ -0,0 +1,3 @@
+"""
+Offline benchmark suite for pipeline hot paths (see benchmarks/README.md).
+"""
@@ -0,0 +1,371 @@
+"""
+Benchmark cases.
+
+Each case has a `setup(ctx)` that prepares inputs under `ctx.root` (not timed) and returns the
+timed callable. The callable returns the number of work units it processed, so results can be
+reported as throughput (e.g. audio seconds per wall second, segments per second).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from benchmarks.stubs import StubASR, StubMT, StubTTS, speech_spans
+from benchmarks.synth import ffmpeg_bin, make_audio, make_video
+
+
+@dataclass(slots=True)
+class BenchContext:
+    root: Path
+    scale: float = 1.0
+
+    def size(self, n: int, *, minimum: int = 1) -> int:
+        return max(int(minimum), int(round(float(n) * float(self.scale))))
+
+    @property
+    def audio_seconds(self) -> float:
+        return float(self.size(120, minimum=12))
+
+    def audio(self) -> Path:
+        p = self.root / "media" / f"speech_{int(self.audio_seconds)}s.wav"
+        if not p.exists():
+            make_audio(p, seconds=self.audio_seconds)
+        return p
+
+    def lines(self, n: int) -> list[dict]:
+        spans = speech_spans(float(n) * 4.0 / 0.85 + 4.0)[:n]
+        return StubMT().translate(StubASR().transcribe(spans))
+
+
+@dataclass(frozen=True, slots=True)
+class BenchCase:
+    name: str
+    unit: str
+    setup: Callable[[BenchContext], Callable[[], float]]
+    needs_ffmpeg: bool = False
+    needs_redis: bool = False
+
+
+def _vad(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.utils.vad import detect_speech_segments
+
+    wav = ctx.audio()
+
+    def run() -> float:
+        detect_speech_segments(wav)
+        return ctx.audio_seconds
+
+    return run
+
+
+def _music_detect(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.audio.music_detect import analyze_audio_for_music_regions, detect_op_ed
+
+    wav = ctx.audio()
+
+    def run() -> float:
+        regs = analyze_audio_for_music_regions(wav, mode="heuristic")
+        detect_op_ed(wav, music_regions=regs, seconds=int(ctx.audio_seconds * 0.2))
+        return ctx.audio_seconds
+
+    return run
+
+
+def _chunk_split(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.streaming.chunker import split_audio_to_chunks
+
+    wav = ctx.audio()
+    out = ctx.root / "chunks"
+
+    def run() -> float:
+        split_audio_to_chunks(source_wav=wav, out_dir=out, chunk_seconds=10.0, overlap_seconds=1.0)
+        return ctx.audio_seconds
+
+    return run
+
+
+def _render_aligned_track(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.stages.tts_impl import render_aligned_track
+
+    lines = ctx.lines(ctx.size(400, minimum=10))
+    clips = StubTTS().synthesize(lines, ctx.root / "tts_clips")
+    out = ctx.root / "aligned.wav"
+
+    def run() -> float:
+        render_aligned_track(lines, clips, out)
+        return float(len(lines))
+
+    return run
+
+
+def _qa_scoring(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.qa.scoring_impl import score_job
+
+    lines = ctx.lines(ctx.size(300, minimum=10))
+    job_dir = ctx.root / "qa_job"
+    clips = StubTTS().synthesize(lines, job_dir / "tts_clips")
+    (job_dir / "analysis").mkdir(parents=True, exist_ok=True)
+    (job_dir / "translated.json").write_text(json.dumps({"segments": lines}), encoding="utf-8")
+    (job_dir / "analysis" / "tts_manifest.json").write_text(
+        json.dumps({"clips": [str(c) for c in clips]}), encoding="utf-8"
+    )
+
+    def run() -> float:
+        score_job(job_dir, write_outputs=True)
+        return float(len(lines))
+
+    return run
+
+
+def _subtitle_format(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.subs.formatting import (
+        SubtitleFormatRules,
+        format_subtitle_blocks_with_stats,
+    )
+
+    blocks = []
+    for ln in ctx.lines(ctx.size(3000, minimum=20)):
+        # Longer text so wrapping/truncation paths are exercised.
+        text = f"{ln['text']} {ln['src_text']}"
+        blocks.append({"start": ln["start"], "end": ln["end"], "text": text})
+    rules = SubtitleFormatRules()
+
+    def run() -> float:
+        format_subtitle_blocks_with_stats(blocks, rules)
+        return float(len(blocks))
+
+    return run
+
+
+def _jobs(n: int) -> list:
+    from dubbing_pipeline.jobs.models import Job, JobState
+
+    now = "2026-01-01T00:00:00+00:00"
+    return [
+        Job(
+            id=f"bench{i:05d}",
+            owner_id="bench",
+            video_path=f"/bench/{i}.mp4",
+            duration_s=600.0,
+            mode="medium",
+            device="cpu",
+            src_lang="ja",
+            tgt_lang="en",
+            created_at=now,
+            updated_at=now,
+            state=JobState.RUNNING,
+            progress=0.0,
+            message="Running",
+            output_mkv="",
+            output_srt="",
+            work_dir="",
+            log_path="",
+        )
+        for i in range(n)
+    ]
+
+
+def _jobstore(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.jobs.store import JobStore
+
+    store = JobStore(ctx.root / "jobstore" / "jobs.db")
+    jobs = _jobs(ctx.size(200, minimum=10))
+    for j in jobs:
+        store.put(j)
+    n_updates = ctx.size(200, minimum=10)
+    n_lists = ctx.size(20, minimum=2)
+    tick = [0]
+
+    def run() -> float:
+        tick[0] += 1
+        for i in range(n_updates):
+            j = jobs[i % len(jobs)]
+            store.update(j.id, progress=(tick[0] % 100) / 100.0, message=f"tick {tick[0]}")
+        for _ in range(n_lists):
+            store.list(limit=200)
+        return float(n_updates + n_lists)
+
+    return run
+
+
+def _cache(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.cache.store import cache_get, cache_put, make_key
+
+    wav = ctx.audio()
+    n = ctx.size(100, minimum=5)
+    keys = [make_key("bench", {"i": i}) for i in range(n)]
+
+    def run() -> float:
+        for k in keys:
+            cache_put(k, {"wav": wav}, meta={"bench": True})
+        for k in keys:
+            cache_get(k)
+        return float(2 * n)
+
+    return run
+
+
+def _sse_fanout(ctx: BenchContext) -> Callable[[], float]:
+    """
+    One poll tick of /api/jobs/events (web.routes.jobs_events.job_events_tick) for N
+    subscribers, with ~10% of jobs changing per tick.
+    """
+    from dubbing_pipeline.api.deps import Identity
+    from dubbing_pipeline.api.models import Role, User
+    from dubbing_pipeline.jobs.store import JobStore
+    from dubbing_pipeline.web.routes.jobs_events import job_events_tick
+
+    store = JobStore(ctx.root / "sse" / "jobs.db")
+    jobs = _jobs(ctx.size(200, minimum=10))
+    for j in jobs:
+        store.put(j)
+    user = User(
+        id="bench",
+        username="bench",
+        password_hash="",
+        role=Role.viewer,
+        totp_secret=None,
+        totp_enabled=False,
+        created_at=0,
+    )
+    ident = Identity(kind="user", user=user, scopes=["read:job"])
+    subscribers: list[dict[str, str]] = [{} for _ in range(ctx.size(50, minimum=2))]
+    tick = [0]
+
+    def run() -> float:
+        tick[0] += 1
+        for j in jobs[tick[0] % 10 :: 10]:
+            store.update(j.id, progress=(tick[0] % 100) / 100.0, message=f"tick {tick[0]}")
+        sent = sum(len(job_events_tick(store, ident, last)) for last in subscribers)
+        return float(max(1, sent))
+
+    return run
+
+
+def _export(ctx: BenchContext) -> Callable[[], float]:
+    from dubbing_pipeline.stages.export import export_audio_preview, export_mobile_mp4
+
+    seconds = float(ctx.size(20, minimum=3))
+    video = ctx.root / "media" / f"video_{int(seconds)}s.mp4"
+    if not video.exists():
+        make_video(video, seconds=seconds)
+    wav = ctx.audio()
+    out = ctx.root / "export"
+
+    def run() -> float:
+        export_audio_preview(wav, out / "preview.m4a")
+        export_mobile_mp4(video_in=video, audio_wav=wav, out_path=out / "mobile.mp4")
+        return seconds
+
+    return run
+
+
+_FAKE_REDIS_SERVER = None
+
+
+def _redis_client():
+    """
+    Async client for REDIS_URL when set, else an in-process fakeredis server (needs `lupa` for
+    Lua). Created per event loop: redis.asyncio connections are bound to the loop.
+    """
+    url = os.environ.get("REDIS_URL", "")
+    if url:
+        import redis.asyncio as aioredis  # type: ignore
+
+        return aioredis.Redis.from_url(url, decode_responses=True)
+    import fakeredis  # type: ignore
+
+    global _FAKE_REDIS_SERVER
+    if _FAKE_REDIS_SERVER is None:
+        _FAKE_REDIS_SERVER = fakeredis.FakeServer()
+    return fakeredis.FakeAsyncRedis(server=_FAKE_REDIS_SERVER, decode_responses=True)
+
+
+def _redis_dispatch(ctx: BenchContext) -> Callable[[], float]:
+    """
+    Submit N jobs then claim/finish them one by one through RedisQueue (one EVALSHA per claim).
+    """
+    from dataclasses import replace
+
+    from dubbing_pipeline.queue.redis_queue_impl import RedisQueue
+
+    n = ctx.size(200, minimum=10)
+
+    async def _round() -> None:
+        rq = RedisQueue(redis_url="redis://bench", enqueue_job_id_cb=lambda _j: None)
+        rq._client = _redis_client()
+        rq._cfg = replace(rq._cfg, prefix=f"bench{uuid.uuid4().hex[:8]}")
+        await rq._prepare_scripts()
+        r = rq._client
+        try:
+            for i in range(n):
+                await rq.submit_job(
+                    job_id=f"j{i:05d}",
+                    user_id="bench",
+                    mode="medium",
+                    device="cpu",
+                    meta={"user_role": "admin"},
+                )
+            claimed = 0
+            while claimed < n:
+                got = await rq._dispatch_one()
+                if got is None:
+                    raise RuntimeError(f"dispatch stalled after {claimed}/{n}")
+                assert await rq.before_job_run(job_id=got[0], user_id=got[1])
+                await rq.after_job_run(job_id=got[0], user_id=got[1], final_state="DONE", ok=True)
+                claimed += 1
+        finally:
+            await rq.stop()
+            keys = [k async for k in r.scan_iter(match=f"{rq._cfg.prefix}:*")]
+            if keys:
+                await r.delete(*keys)
+            await r.aclose()
+
+    def run() -> float:
+        asyncio.run(_round())
+        return float(n)
+
+    return run
+
+
+CASES: dict[str, BenchCase] = {
+    c.name: c
+    for c in (
+        BenchCase("vad", "audio_s", _vad),
+        BenchCase("music_detect", "audio_s", _music_detect),
+        BenchCase("chunk_split", "audio_s", _chunk_split, needs_ffmpeg=True),
+        BenchCase("render_aligned_track", "lines", _render_aligned_track),
+        BenchCase("qa_scoring", "segments", _qa_scoring),
+        BenchCase("subtitle_format", "blocks", _subtitle_format),
+        BenchCase("jobstore_update_list", "ops", _jobstore),
+        BenchCase("cache_get_put", "ops", _cache),
+        BenchCase("sse_fanout", "events", _sse_fanout),
+        BenchCase("export", "video_s", _export, needs_ffmpeg=True),
+        BenchCase("redis_dispatch", "jobs", _redis_dispatch, needs_redis=True),
+    )
+}
+
+
+def have_ffmpeg() -> bool:
+    return ffmpeg_bin() is not None
+
+
+def have_redis() -> bool:
+    url = os.environ.get("REDIS_URL", "")
+    try:
+        if url:
+            import redis  # type: ignore
+
+            return bool(redis.Redis.from_url(url).ping())
+        import fakeredis  # type: ignore  # noqa: F401
+        import lupa  # type: ignore  # noqa: F401
+
+        return True
+    except Exception:
+        return False
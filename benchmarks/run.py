@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Run the offline benchmark suite and compare against a stored baseline.
+
+  python benchmarks/run.py                          # all cases, compare to benchmarks/baseline.json
+  python benchmarks/run.py --only vad,qa_scoring --repeat 10
+  python benchmarks/run.py --quick                  # tiny inputs, 1 iteration (smoke)
+  python benchmarks/run.py --update-baseline        # store this node's numbers as the baseline
+
+Exit code 1 when any case fails or its median regresses more than --threshold vs the baseline.
+Cases that cannot run on this node (no ffmpeg/redis) are skipped, not failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baseline.json"
+DEFAULT_OUT = REPO_ROOT / "benchmarks" / "results" / "latest.json"
+
+
+def _percentile(xs: list[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    ys = sorted(xs)
+    k = min(len(ys) - 1, max(0, int(round(q * (len(ys) - 1)))))
+    return float(ys[k])
+
+
+def _isolate_env(root: Path) -> dict[str, str | None]:
+    """
+    Point every writable path at the scratch dir. Returns the previous values for `_restore_env`.
+    """
+    env = {
+        "STRICT_SECRETS": os.environ.get("STRICT_SECRETS", "0"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        "DUBBING_OUTPUT_DIR": str(root / "Output"),
+        "DUBBING_STATE_DIR": str(root / "Output" / "_state"),
+        "DUBBING_CACHE_DIR": str(root / "Output" / "cache"),
+        "DUBBING_LOG_DIR": str(root / "logs"),
+    }
+    prev = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    return prev
+
+
+def _restore_env(prev: dict[str, str | None]) -> None:
+    for k, v in prev.items():
+        if v is None:
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = v
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+
+
+def host_info() -> dict[str, Any]:
+    info: dict[str, Any] = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import numpy as np
+
+        info["numpy"] = np.__version__
+    except Exception:
+        info["numpy"] = None
+    return info
+
+
+def _measure(fn, *, repeat: int, warmup: int) -> tuple[list[float], float]:
+    for _ in range(max(0, int(warmup))):
+        fn()
+    times: list[float] = []
+    units = 0.0
+    for _ in range(max(1, int(repeat))):
+        gc.collect()
+        t0 = time.perf_counter()
+        units = float(fn())
+        times.append(time.perf_counter() - t0)
+    return times, units
+
+
+def run_cases(
+    names: list[str] | None = None,
+    *,
+    scale: float = 1.0,
+    repeat: int = 5,
+    warmup: int = 1,
+) -> dict[str, Any]:
+    from benchmarks.cases import CASES, BenchContext, have_ffmpeg, have_redis
+
+    selected = list(names or CASES)
+    unknown = [n for n in selected if n not in CASES]
+    if unknown:
+        raise SystemExit(f"unknown benchmark case(s): {', '.join(unknown)}")
+
+    cases: dict[str, Any] = {}
+    skipped: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    with tempfile.TemporaryDirectory(prefix="dp_bench_") as td:
+        prev_env = _isolate_env(Path(td))
+        try:
+            ctx = BenchContext(root=Path(td), scale=float(scale))
+            ff = have_ffmpeg()
+            rd = have_redis()
+            for name in selected:
+                case = CASES[name]
+                if case.needs_ffmpeg and not ff:
+                    skipped[name] = "ffmpeg not available"
+                    continue
+                if case.needs_redis and not rd:
+                    skipped[name] = "redis not available (set REDIS_URL or install fakeredis)"
+                    continue
+                try:
+                    times, units = _measure(case.setup(ctx), repeat=repeat, warmup=warmup)
+                except Exception as ex:
+                    errors[name] = f"{type(ex).__name__}: {ex}"
+                    continue
+                med = statistics.median(times)
+                cases[name] = {
+                    "unit": case.unit,
+                    "units": units,
+                    "iterations": len(times),
+                    "median_s": med,
+                    "min_s": min(times),
+                    "p95_s": _percentile(times, 0.95),
+                    "throughput": (units / med) if med > 0 else 0.0,
+                }
+                print(
+                    f"{name:24s} median={med * 1000:9.2f}ms  "
+                    f"{cases[name]['throughput']:12.1f} {case.unit}/s",
+                    flush=True,
+                )
+        finally:
+            _restore_env(prev_env)
+    for name, why in skipped.items():
+        print(f"{name:24s} skipped ({why})", flush=True)
+    for name, why in errors.items():
+        print(f"{name:24s} FAILED ({why})", file=sys.stderr, flush=True)
+
+    return {
+        "version": 1,
+        "created_at": time.time(),
+        "host": host_info(),
+        "params": {"scale": float(scale), "repeat": int(repeat), "warmup": int(warmup)},
+        "ffmpeg": ff,
+        "cases": cases,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], *, threshold: float = 0.25
+) -> list[dict[str, Any]]:
+    """
+    Cases whose median is more than `threshold` (fraction) slower than the baseline median.
+    Cases missing from either side, or measured at a different scale, are not compared.
+    """
+    regressions: list[dict[str, Any]] = []
+    if (results.get("params") or {}).get("scale") != (baseline.get("params") or {}).get("scale"):
+        return regressions
+    base_cases = baseline.get("cases") or {}
+    for name, cur in (results.get("cases") or {}).items():
+        ref = base_cases.get(name)
+        if not isinstance(ref, dict):
+            continue
+        ref_s = float(ref.get("median_s") or 0.0)
+        cur_s = float(cur.get("median_s") or 0.0)
+        if ref_s <= 0:
+            continue
+        ratio = cur_s / ref_s
+        if ratio > 1.0 + float(threshold):
+            regressions.append(
+                {"case": name, "baseline_s": ref_s, "current_s": cur_s, "ratio": ratio}
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Offline pipeline benchmarks (CPU-only)")
+    ap.add_argument("--only", default="", help="comma-separated case names")
+    ap.add_argument("--list", action="store_true", help="list cases and exit")
+    ap.add_argument("--scale", type=float, default=1.0, help="input size multiplier")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--quick", action="store_true", help="scale=0.1, repeat=1, warmup=0")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown fraction")
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        from benchmarks.cases import CASES
+
+        for name, case in CASES.items():
+            extra = " (needs ffmpeg)" if case.needs_ffmpeg else ""
+            extra += " (needs redis)" if case.needs_redis else ""
+            print(f"{name}\t{case.unit}{extra}")
+        return 0
+
+    if args.quick:
+        args.scale, args.repeat, args.warmup = 0.1, 1, 0
+    names = [n.strip() for n in str(args.only or "").split(",") if n.strip()] or None
+    results = run_cases(names, scale=args.scale, repeat=args.repeat, warmup=args.warmup)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+    print(f"results: {args.out}")
+
+    if results["errors"]:
+        print(f"{len(results['errors'])} case(s) failed", file=sys.stderr)
+        return 1
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline} (run with --update-baseline to create one)")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regs = compare(results, baseline, threshold=args.threshold)
+    for r in regs:
+        print(
+            f"REGRESSION {r['case']}: {r['baseline_s'] * 1000:.2f}ms -> "
+            f"{r['current_s'] * 1000:.2f}ms (x{r['ratio']:.2f})",
+            file=sys.stderr,
+        )
+    if regs:
+        return 1
+    print(f"no regressions (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""
+Deterministic stand-ins for the ASR / MT / TTS engines.
+
+They produce artifacts with the same shapes the real stages write (segments with
+start/end/text, translated text, 16kHz mono clips) without loading any model, so downstream hot
+paths can be timed on CPU-only nodes.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synth import SR, write_wav
+
+_WORDS = (
+    "we have to reach the tower before night falls and nobody can know about the plan "
+    "listen carefully this is the last time I will say it"
+).split()
+
+
+class StubASR:
+    """
+    Turns VAD speech spans into transcript segments (fixed-rate pseudo text).
+    """
+
+    words_per_second = 2.5
+
+    def transcribe(self, spans: list[tuple[float, float]]) -> list[dict]:
+        out: list[dict] = []
+        k = 0
+        for i, (s, e) in enumerate(spans, 1):
+            n = max(1, int((float(e) - float(s)) * self.words_per_second))
+            words = [_WORDS[(k + j) % len(_WORDS)] for j in range(n)]
+            k += n
+            out.append(
+                {"segment_id": i, "start": float(s), "end": float(e), "text": " ".join(words)}
+            )
+        return out
+
+
+class StubMT:
+    """
+    Length-preserving "translation" (reversed word order, capitalised).
+    """
+
+    def translate(self, segments: list[dict]) -> list[dict]:
+        out = []
+        for s in segments:
+            ss = dict(s)
+            ss["src_text"] = str(s.get("text") or "")
+            ss["text"] = " ".join(reversed(ss["src_text"].split())).capitalize()
+            out.append(ss)
+        return out
+
+
+class StubTTS:
+    """
+    Writes one tone clip per line, sized to the line's time slot (+/- a little drift).
+    """
+
+    def synthesize(self, lines: list[dict], out_dir: Path) -> list[Path]:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        clips: list[Path] = []
+        for i, line in enumerate(lines, 1):
+            dur = max(0.1, float(line["end"]) - float(line["start"])) * (0.9 + 0.05 * (i % 5))
+            t = np.arange(int(dur * SR), dtype=np.float64) / float(SR)
+            wav = 0.3 * np.sin(2.0 * np.pi * (160.0 + 10.0 * (i % 7)) * t)
+            clips.append(write_wav(out_dir / f"{i:04d}.wav", wav))
+        return clips
+
+
+def speech_spans(seconds: float, *, every_s: float = 4.0, on_s: float = 2.0) -> list[tuple]:
+    """
+    Speech spans matching benchmarks.synth audio (used where VAD output is not the subject).
+    """
+    op = 0.15 * float(seconds)
+    spans = []
+    t = 0.0
+    while t < float(seconds):
+        s, e = t, min(float(seconds), t + on_s)
+        if s >= op:
+            spans.append((round(s, 3), round(e, 3)))
+        t += every_s
+    return spans
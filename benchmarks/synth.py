@@ -0,0 +1,141 @@
+"""
+Synthetic, deterministic benchmark media.
+
+Audio is one lavfi `aevalsrc` expression: a chord "OP" for the first 15% of the clip followed by
+speech-like bursts (AM-modulated harmonic tone, 2s on / 2s off). When ffmpeg is missing the same
+expression is evaluated with NumPy so CPU-only nodes without ffmpeg can still run the
+pure-Python cases.
+"""
+
+from __future__ import annotations
+
+import shutil
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SR = 16000
+
+
+def _op_end(seconds: float) -> float:
+    return round(0.15 * float(seconds), 3)
+
+
+def audio_expr(seconds: float) -> str:
+    op = _op_end(seconds)
+    music = f"lt(t,{op})*0.25*(sin(2*PI*440*t)+sin(2*PI*554.37*t)+sin(2*PI*659.25*t))"
+    speech = (
+        f"gte(t,{op})*gt(sin(2*PI*0.25*t),0)"
+        "*0.5*(0.6*sin(2*PI*180*t)+0.3*sin(2*PI*360*t)+0.1*sin(2*PI*540*t))"
+        "*(0.55+0.45*sin(2*PI*4*t))"
+    )
+    return f"{music}+{speech}"
+
+
+def _audio_numpy(seconds: float, sr: int) -> np.ndarray:
+    t = np.arange(int(float(seconds) * sr), dtype=np.float64) / float(sr)
+    op = _op_end(seconds)
+    two_pi = 2.0 * np.pi
+    music = (
+        (t < op)
+        * 0.25
+        * (np.sin(two_pi * 440 * t) + np.sin(two_pi * 554.37 * t) + np.sin(two_pi * 659.25 * t))
+    )
+    gate = (t >= op) & (np.sin(two_pi * 0.25 * t) > 0)
+    voice = 0.6 * np.sin(two_pi * 180 * t) + 0.3 * np.sin(two_pi * 360 * t)
+    voice += 0.1 * np.sin(two_pi * 540 * t)
+    speech = gate * 0.5 * voice * (0.55 + 0.45 * np.sin(two_pi * 4 * t))
+    return np.clip(music + speech, -1.0, 1.0)
+
+
+def write_wav(path: Path, samples: np.ndarray, *, sr: int = SR) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(int(sr))
+        wf.writeframes(pcm.tobytes())
+    return path
+
+
+def ffmpeg_bin() -> str | None:
+    from dubbing_pipeline.config import get_settings
+
+    b = str(getattr(get_settings(), "ffmpeg_bin", "ffmpeg") or "ffmpeg")
+    return b if shutil.which(b) else None
+
+
+def make_audio(path: Path, *, seconds: float, sr: int = SR) -> Path:
+    """
+    16kHz mono PCM16 WAV (ffmpeg lavfi when available, NumPy otherwise).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ff = ffmpeg_bin()
+    if ff is not None:
+        from dubbing_pipeline.utils.ffmpeg_safe import run_ffmpeg
+
+        run_ffmpeg(
+            [
+                ff,
+                "-y",
+                "-f",
+                "lavfi",
+                "-i",
+                f"aevalsrc=exprs='{audio_expr(seconds)}':s={int(sr)}:d={float(seconds)}",
+                "-ac",
+                "1",
+                "-ar",
+                str(int(sr)),
+                "-c:a",
+                "pcm_s16le",
+                str(path),
+            ],
+            timeout_s=120,
+            capture=True,
+        )
+        return path
+    return write_wav(path, _audio_numpy(seconds, sr), sr=sr)
+
+
+def make_video(path: Path, *, seconds: float) -> Path:
+    """
+    Small H.264/AAC test video (requires ffmpeg).
+    """
+    ff = ffmpeg_bin()
+    if ff is None:
+        raise RuntimeError("ffmpeg not available")
+    from dubbing_pipeline.utils.ffmpeg_safe import run_ffmpeg
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    run_ffmpeg(
+        [
+            ff,
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            "testsrc=size=320x180:rate=10",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=220:sample_rate=44100",
+            "-t",
+            str(float(seconds)),
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-shortest",
+            str(path),
+        ],
+        timeout_s=120,
+        capture=True,
+    )
+    return path
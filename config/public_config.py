@@ -52,6 +52,11 @@ class PublicConfig(BaseSettings):
     auth_db_name: str = Field(default="auth.db", alias="DUBBING_AUTH_DB_NAME")
     jobs_db_name: str = Field(default="jobs.db", alias="DUBBING_JOBS_DB_NAME")
     cache_dir: Path | None = Field(default=None, alias="DUBBING_CACHE_DIR")
+    # Per-segment ASR/MT results shared across jobs (<cache dir>/segments.db).
+    segment_cache: bool = Field(default=True, alias="SEGMENT_CACHE")
+    # Pruned by the periodic workdir prune: TTL since last hit, then LRU (0 disables either).
+    segment_cache_max_entries: int = Field(default=200_000, alias="SEGMENT_CACHE_MAX_ENTRIES")
+    segment_cache_ttl_days: int = Field(default=90, alias="SEGMENT_CACHE_TTL_DAYS")
     models_dir: Path = Field(default=Path("/models"), alias="MODELS_DIR")
 
     # Web/API input layout (uploads)
@@ -87,6 +92,13 @@ class PublicConfig(BaseSettings):
 
     # --- alignment / metadata ---
     whisper_word_timestamps: bool = Field(default=False, alias="WHISPER_WORD_TIMESTAMPS")
+    # Streaming ASR: VAD-aligned windows, journaled as they finish (resumable, tailable).
+    # Progress only: MT lines are diarization utterances, so translation needs the final transcript.
+    asr_streaming: bool = Field(default=False, alias="ASR_STREAMING")
+    asr_window_s: float = Field(default=30.0, alias="ASR_WINDOW_S")
+    asr_shard_workers: int = Field(default=0, alias="ASR_SHARD_WORKERS")  # 0/1 = off
+    asr_shard_min_s: float = Field(default=120.0, alias="ASR_SHARD_MIN_S")
+    asr_shard_context_s: float = Field(default=5.0, alias="ASR_SHARD_CONTEXT_S")
 
     # --- expressive speech controls (optional) ---
     emotion_mode: str = Field(default="off", alias="EMOTION_MODE")  # off|auto|tags
@@ -106,6 +118,8 @@ class PublicConfig(BaseSettings):
     stream_context_seconds: float = Field(default=15.0, alias="STREAM_CONTEXT_SECONDS")
     stream_output: str = Field(default="segments", alias="STREAM_OUTPUT")  # segments|final
     stream_concurrency: int = Field(default=1, alias="STREAM_CONCURRENCY")
+    # Snap chunk cuts back into the nearest VAD silence (up to 3s) instead of mid-utterance.
+    stream_speech_boundaries: bool = Field(default=False, alias="STREAM_SPEECH_BOUNDARIES")
 
     # Tier-Next A/B: music/singing preservation (opt-in; default off)
     music_detect: bool = Field(default=False, alias="MUSIC_DETECT")
@@ -113,6 +127,9 @@ class PublicConfig(BaseSettings):
     music_threshold: float = Field(default=0.70, alias="MUSIC_THRESHOLD")
     op_ed_detect: bool = Field(default=False, alias="OP_ED_DETECT")
     op_ed_seconds: int = Field(default=90, alias="OP_ED_SECONDS")
+    # Cross-episode OP/ED fingerprint index per series (JobStore); matches reuse stored decisions.
+    op_ed_fingerprint: bool = Field(default=False, alias="OP_ED_FINGERPRINT")
+    op_ed_fingerprint_min_score: float = Field(default=0.10, alias="OP_ED_FINGERPRINT_MIN_SCORE")
 
     # Tier-Next F: speaker smoothing / audio scene detection (opt-in; default off)
     speaker_smoothing: bool = Field(default=False, alias="SPEAKER_SMOOTHING")
@@ -366,6 +383,11 @@ class PublicConfig(BaseSettings):
 
     # Provider selection (F9)
     tts_provider: str = Field(default="auto", alias="TTS_PROVIDER")  # auto|xtts|basic|espeak
+    # Review regen: keep a resident per-job synthesis session (engine, speaker latents, voice maps,
+    # delivery profiles, pronunciations) instead of running the full TTS stage per segment.
+    review_synth_warm: bool = Field(default=True, alias="REVIEW_SYNTH_WARM")
+    review_synth_sessions: int = Field(default=4, alias="REVIEW_SYNTH_SESSIONS")
+    review_synth_idle_sec: float = Field(default=900.0, alias="REVIEW_SYNTH_IDLE_SEC")
 
     # --- Tier-3 A: lip-sync plugin (optional; default off) ---
     lipsync: str = Field(default="off", alias="LIPSYNC")  # off|wav2lip
@@ -383,6 +405,13 @@ class PublicConfig(BaseSettings):
     lipsync_min_range_s: float = Field(default=2.0, alias="LIPSYNC_MIN_RANGE_S")
     lipsync_merge_gap_s: float = Field(default=0.6, alias="LIPSYNC_MERGE_GAP_S")
     lipsync_max_frames: int = Field(default=600, alias="LIPSYNC_MAX_FRAMES")
+    # Scene-limited ranges run as concurrent Wav2Lip processes (GPU runs capped separately);
+    # pass-through gaps are stream-copied between keyframes instead of re-encoded.
+    lipsync_workers: int = Field(default=2, alias="LIPSYNC_WORKERS")
+    lipsync_gpu_workers: int = Field(default=1, alias="LIPSYNC_GPU_WORKERS")
+    lipsync_range_retries: int = Field(default=1, alias="LIPSYNC_RANGE_RETRIES")
+    lipsync_range_face_box: bool = Field(default=True, alias="LIPSYNC_RANGE_FACE_BOX")
+    lipsync_passthrough_copy: bool = Field(default=False, alias="LIPSYNC_PASSTHROUGH_COPY")
 
     # --- ops: retention/cleanup ---
     # latency budgets (seconds): mark jobs "degraded" when exceeded
@@ -415,6 +444,30 @@ class PublicConfig(BaseSettings):
     max_concurrency_transcribe: int = Field(default=1, alias="MAX_CONCURRENCY_TRANSCRIBE")
     max_concurrency_tts: int = Field(default=1, alias="MAX_CONCURRENCY_TTS")
     backpressure_q_max: int = Field(default=6, alias="BACKPRESSURE_Q_MAX")
+    # Max concurrently running independent stages within one job (diarize || transcribe and the
+    # export stage graph; 1 => serial)
+    stage_graph_workers: int = Field(default=2, alias="STAGE_GRAPH_WORKERS")
+    # Resource-aware admission: a phase starts when its estimated CPU/RAM/VRAM (learned per
+    # stage/mode/model) fits the host budget, under the MAX_CONCURRENCY_* ceilings.
+    # 0 => only the fixed MAX_CONCURRENCY_* phase semaphores.
+    sched_resource_aware: bool = Field(default=True, alias="SCHED_RESOURCE_AWARE")
+    # Budget overrides (0 => auto: all cores, 85% of RAM, 90% of GPU memory)
+    sched_cpu_cores: float = Field(default=0.0, alias="SCHED_CPU_CORES")
+    sched_ram_mb: int = Field(default=0, alias="SCHED_RAM_MB")
+    sched_vram_mb: int = Field(default=0, alias="SCHED_VRAM_MB")
+
+    # Split deployment: the web process serves API/UI only and `dubbing-worker` processes
+    # (any number, on any box sharing the state dir / Redis) execute jobs.
+    web_run_jobs: bool = Field(default=True, alias="WEB_RUN_JOBS")
+    # uvicorn worker processes for dubbing-web (only honored with WEB_RUN_JOBS=0)
+    web_workers: int = Field(default=1, alias="WEB_WORKERS")
+    worker_id: str = Field(default="", alias="WORKER_ID")  # default <hostname>:<pid>
+    worker_concurrency: int = Field(default=0, alias="WORKER_CONCURRENCY")  # 0 => JOBS_CONCURRENCY
+    worker_heartbeat_sec: float = Field(default=5.0, alias="WORKER_HEARTBEAT_SEC")
+    # Workers silent for longer than this are dead; their RUNNING jobs are requeued.
+    worker_stale_sec: float = Field(default=30.0, alias="WORKER_STALE_SEC")
+    # `run --batch --jobs N`: restart a batch worker after this many inputs (0 => never)
+    batch_worker_max_inputs: int = Field(default=0, alias="BATCH_WORKER_MAX_INPUTS")
 
     # Optional per-mode caps (0 => fall back to MAX_CONCURRENCY_GLOBAL)
     max_jobs_high: int = Field(default=1, alias="MAX_JOBS_HIGH")
@@ -454,6 +507,8 @@ class PublicConfig(BaseSettings):
     redis_queue_max_attempts: int = Field(default=8, alias="REDIS_QUEUE_MAX_ATTEMPTS")
     redis_queue_backoff_ms: int = Field(default=750, alias="REDIS_QUEUE_BACKOFF_MS")
     redis_queue_backoff_cap_ms: int = Field(default=30_000, alias="REDIS_QUEUE_BACKOFF_CAP_MS")
+    # Idle consumers block on the wake list this long before re-checking (no sleep-polling)
+    redis_queue_block_sec: float = Field(default=2.0, alias="REDIS_QUEUE_BLOCK_SEC")
     # Cancel flag TTL (ms): how long to keep cancel markers (helps late consumers)
     redis_cancel_ttl_ms: int = Field(default=24 * 3600_000, alias="REDIS_CANCEL_TTL_MS")
     # Active set TTL (ms): keep per-user active job sets bounded
@@ -511,6 +566,12 @@ class PublicConfig(BaseSettings):
     )
     otel_service_name: str = Field(default="dubbing_pipeline", alias="OTEL_SERVICE_NAME")
 
+    # --- sampling profiler (opt-in; armed per job/window via /api/runtime/profiler) ---
+    profiling_enabled: bool = Field(default=False, alias="PROFILING_ENABLED")
+    profiling_hz: int = Field(default=50, alias="PROFILING_HZ")
+    # Profile every job without arming (debug/staging only).
+    profiling_all_jobs: bool = Field(default=False, alias="PROFILING_ALL_JOBS")
+
     # --- WebRTC defaults (TURN creds live in secrets) ---
     webrtc_stun: str = Field(default="stun:stun.l.google.com:19302", alias="WEBRTC_STUN")
     webrtc_idle_timeout_s: int = Field(default=300, alias="WEBRTC_IDLE_TIMEOUT_S")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+
+from dubbing_pipeline.ops.importtime import (
+    STARTUP_BUDGETS,
+    StartupBudget,
+    check_budget,
+    measure_imports,
+    total_ms,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure entry-point import time (-X importtime) against startup budgets."
+    )
+    parser.add_argument(
+        "--module", action="append", default=[], help="Module to measure (repeatable)"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list per module")
+    args = parser.parse_args()
+
+    budgets = {b.module: b for b in STARTUP_BUDGETS}
+    targets = [budgets.get(m) or StartupBudget(m, float("inf"), ()) for m in args.module]
+    failed = 0
+    for budget in targets or list(STARTUP_BUDGETS):
+        try:
+            records = measure_imports(budget.module)
+        except Exception as ex:
+            failed += 1
+            print(f"{budget.module}\tfailed: {ex}")
+            continue
+        print(f"{budget.module}\ttotal={total_ms(records, budget.module):.1f}ms")
+        for r in sorted(records, key=lambda r: r.self_us, reverse=True)[: max(0, args.top)]:
+            self_ms, cum_ms = r.self_us / 1000.0, r.cumulative_us / 1000.0
+            print(f"  {self_ms:8.1f}ms self {cum_ms:8.1f}ms cum  {r.name}")
+        problems = check_budget(budget, records)
+        failed += 1 if problems else 0
+        for p in problems:
+            print(f"  BUDGET: {p}")
+    print(f"modules={len(targets or STARTUP_BUDGETS)} failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs.artifacts import index_job_artifacts
+from dubbing_pipeline.jobs.store import JobStore
+from dubbing_pipeline.library.paths import get_job_output_root
+
+
+def _resolve_store(*, state_dir: Path | None = None) -> JobStore:
+    s = get_settings()
+    state_root = Path(
+        state_dir
+        if state_dir is not None
+        else (getattr(s, "state_dir", None) or (Path(s.output_dir) / "_state"))
+    ).resolve()
+    state_root.mkdir(parents=True, exist_ok=True)
+    jobs_db = state_root / str(getattr(s, "jobs_db_name", "jobs.db") or "jobs.db")
+    return JobStore(jobs_db)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the per-job artifact index from disk.")
+    parser.add_argument("--state-dir", default=None, help="Override state dir (jobs.db)")
+    parser.add_argument("--job", action="append", default=[], help="Job id (repeatable)")
+    parser.add_argument(
+        "--shallow", action="store_true", help="Skip the recursive HLS manifest search"
+    )
+    args = parser.parse_args()
+
+    store = _resolve_store(state_dir=Path(args.state_dir).resolve() if args.state_dir else None)
+    if args.job:
+        jobs = [j for j in (store.get(str(i)) for i in args.job) if j is not None]
+    else:
+        jobs = store.list_all()
+
+    failed = 0
+    for job in jobs:
+        try:
+            rows = index_job_artifacts(
+                store, job.id, get_job_output_root(job), deep=not bool(args.shallow)
+            )
+            meta, _ = store.list_job_artifacts(job.id)
+            rev = int((meta or {}).get("revision") or 0)
+            print(f"{job.id}\tartifacts={len(rows)}\trevision={rev}")
+        except Exception as ex:
+            failed += 1
+            print(f"{job.id}\tfailed: {ex}")
+    print(f"jobs={len(jobs)} failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
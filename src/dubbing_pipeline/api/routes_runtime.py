@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from dubbing_pipeline.api.deps import Identity, require_role
 from dubbing_pipeline.api.models import Role
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.ops import profiler
 from dubbing_pipeline.ops.storage import ensure_free_space
 from dubbing_pipeline.security import policy
 from dubbing_pipeline.runtime.model_manager import ModelManager
@@ -51,6 +52,26 @@ async def runtime_queue_status(request: Request, _: Identity = Depends(require_r
     }
 
 
+@router.get("/workers")
+async def runtime_workers(_: Identity = Depends(require_role(Role.operator))):
+    """
+    dubbing-worker processes: heartbeat age, capabilities (device/VRAM/RAM/resident models)
+    and the jobs each one currently holds.
+    """
+    from dubbing_pipeline.worker.registry import WorkerRegistry, default_registry_path
+
+    s = get_settings()
+    path = default_registry_path()
+    if not path.exists():
+        return {"ok": True, "web_run_jobs": bool(s.web_run_jobs), "workers": []}
+    stale = float(getattr(s, "worker_stale_sec", 30.0) or 30.0)
+    return {
+        "ok": True,
+        "web_run_jobs": bool(s.web_run_jobs),
+        "workers": WorkerRegistry(path).workers(stale_after_s=stale),
+    }
+
+
 @router.get("/models")
 async def runtime_models(_: Identity = Depends(policy.require_admin)):
     s = get_settings()
@@ -150,3 +171,45 @@ async def runtime_models_prewarm(
     th = threading.Thread(target=_run, name=f"model_prewarm:{task_id}", daemon=True)
     th.start()
     return {"ok": True, "task_id": task_id, "preset": preset, "whisper": whisper, "tts": tts}
+
+
+def _require_profiling() -> None:
+    if not profiler.profiling_enabled():
+        raise HTTPException(status_code=400, detail="Profiling disabled (PROFILING_ENABLED=0)")
+
+
+@router.get("/profiler")
+async def runtime_profiler_state(_: Identity = Depends(policy.require_admin)):
+    s = get_settings()
+    return {
+        "ok": True,
+        "enabled": profiler.profiling_enabled(),
+        "hz": int(getattr(s, "profiling_hz", 50) or 50),
+        "all_jobs": bool(getattr(s, "profiling_all_jobs", False)),
+        "control": profiler.read_control(),
+        "active_jobs": profiler.active_jobs(),
+    }
+
+
+@router.post("/profiler/arm")
+async def runtime_profiler_arm(
+    job_id: str = "", seconds: int = 0, _: Identity = Depends(policy.require_admin)
+):
+    """
+    Arm the sampling profiler for one job (optionally bounded by `seconds`) or, without
+    `job_id`, for every job running in the next `seconds`.
+    """
+    _require_profiling()
+    job_id = str(job_id or "").strip()
+    if job_id:
+        ctl = profiler.arm_job(job_id, seconds=seconds)
+    else:
+        if int(seconds) <= 0:
+            raise HTTPException(status_code=400, detail="job_id or seconds > 0 required")
+        ctl = profiler.arm_window(seconds)
+    return {"ok": True, "control": ctl}
+
+
+@router.post("/profiler/disarm")
+async def runtime_profiler_disarm(job_id: str = "", _: Identity = Depends(policy.require_admin)):
+    return {"ok": True, "control": profiler.disarm(str(job_id or "").strip() or None)}
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import importlib.util
-import os
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +8,12 @@ from fastapi import APIRouter, Depends
 from dubbing_pipeline.api.deps import Identity
 from dubbing_pipeline.api.remote_access import resolve_access_posture
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.doctor.probes import (
+    _can_import,
+    _secret_configured,
+    _whisper_cache_dirs,
+    _whisper_model_cached,
+)
 from dubbing_pipeline.modes import HardwareCaps, resolve_effective_settings
 from dubbing_pipeline.security import policy
 from dubbing_pipeline.security.runtime_db import UnsafeRuntimeDbPath, assert_safe_runtime_db_path
@@ -24,49 +28,6 @@ router = APIRouter(
 )
 
 
-def _can_import(module: str) -> bool:
-    try:
-        return importlib.util.find_spec(module) is not None
-    except Exception:
-        return False
-
-
-def _secret_configured(secret: object | None) -> bool:
-    if secret is None:
-        return False
-    try:
-        # SecretStr
-        val = secret.get_secret_value()  # type: ignore[attr-defined]
-        return bool(str(val or "").strip())
-    except Exception:
-        return bool(str(secret).strip())
-
-
-def _whisper_cache_dirs() -> list[Path]:
-    dirs: list[Path] = []
-    try:
-        env = os.environ.get("WHISPER_CACHE_DIR", "")
-        if env:
-            dirs.append(Path(env).expanduser().resolve())
-    except Exception:
-        pass
-    try:
-        dirs.append((Path.home() / ".cache" / "whisper").resolve())
-    except Exception:
-        pass
-    return dirs
-
-
-def _whisper_model_cached(model_name: str) -> bool:
-    for root in _whisper_cache_dirs():
-        try:
-            if (root / f"{model_name}.pt").exists():
-                return True
-        except Exception:
-            continue
-    return False
-
-
 def _hf_cache_root(s) -> Path:
     try:
         if getattr(s, "transformers_cache", None):
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import json
 import math
+import time
 import wave
-from contextlib import suppress
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
@@ -13,6 +13,7 @@ from dubbing_pipeline.utils.ffmpeg_safe import run_ffmpeg
 from dubbing_pipeline.utils.io import atomic_write_text
 from dubbing_pipeline.utils.log import logger
 from dubbing_pipeline.utils.vad import VADConfig, detect_speech_segments
+from dubbing_pipeline.utils.vad import pcm16_view as _pcm16_view
 
 
 @dataclass(frozen=True, slots=True)
@@ -37,78 +38,212 @@ def _wav_duration_s(path: Path) -> float:
         return 0.0
 
 
-def _read_pcm16_mono(path: Path) -> tuple[list[float], int] | tuple[None, int]:
+def _window_features(x: Any, sr: int) -> dict[str, Any]:
     """
-    Read mono int16 wav into float samples [-1..1]. Returns (samples, sr).
+    RMS + spectral stats for a (windows, samples) int16 block with one batched rFFT.
+    Spectral stats are NaN when windows are shorter than 256 samples.
     """
+    import numpy as np  # type: ignore
+
+    xf = x.astype(np.float64) / 32768.0
+    rms = np.sqrt(np.mean(xf * xf, axis=1)) if xf.shape[1] else np.zeros(xf.shape[0])
+    nan = np.full(xf.shape[0], np.nan)
+    if xf.shape[1] < 256 or sr <= 0:
+        return {"rms": rms, "centroid": nan, "flat": nan, "roll": nan.copy()}
+    mag = np.abs(np.fft.rfft(xf * np.hanning(xf.shape[1]), axis=1)) + 1e-9
+    freqs = np.fft.rfftfreq(xf.shape[1], 1.0 / float(sr))
+    tot = mag.sum(axis=1)
+    centroid = (mag @ freqs) / tot
+    flat = np.exp(np.mean(np.log(mag), axis=1)) / np.mean(mag, axis=1)
+    cdf = np.cumsum(mag, axis=1)
+    # searchsorted(cdf, 0.85 * total) per row == count of bins still below the threshold.
+    idx = np.minimum((cdf < (0.85 * cdf[:, -1])[:, None]).sum(axis=1), freqs.size - 1)
+    return {"rms": rms, "centroid": centroid, "flat": flat, "roll": freqs[idx]}
+
+
+def _coverage_ratios(intervals: list[tuple[float, float]], starts: Any, ends: Any) -> Any:
+    """
+    Fraction of each [start, end) covered by `intervals` (overlaps summed, clipped to 0..1).
+
+    Covered length up to t is C(t) = sum(t - s | s < t) - sum(t - e | e < t); with sorted
+    starts/ends and their prefix sums every window is two binary searches.
+    """
+    import numpy as np  # type: ignore
+
+    iv = [(float(s), float(e)) for s, e in intervals if float(e) > float(s)]
+    span = ends - starts
+    if not iv:
+        return np.zeros_like(span)
+    ss = np.sort(np.array([s for s, _ in iv], dtype=np.float64))
+    es = np.sort(np.array([e for _, e in iv], dtype=np.float64))
+    ps = np.concatenate([[0.0], np.cumsum(ss)])
+    pe = np.concatenate([[0.0], np.cumsum(es)])
+
+    def _covered(t: Any) -> Any:
+        ks = np.searchsorted(ss, t, side="left")
+        ke = np.searchsorted(es, t, side="left")
+        return (ks * t - ps[ks]) - (ke * t - pe[ke])
+
+    cov = _covered(ends) - _covered(starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(span > 0, cov / np.where(span > 0, span, 1.0), 0.0)
+    return np.clip(ratio, 0.0, 1.0)
+
+
+@dataclass(slots=True)
+class MusicFeatures:
+    """
+    Per-window feature matrix for one WAV; columns are parallel arrays indexed by window.
+    `speech_ratio` is None when webrtcvad is unavailable.
+    """
+
+    path: str
+    sr: int
+    duration_s: float
+    window_s: float
+    hop_s: float
+    start: Any
+    end: Any
+    rms: Any
+    centroid: Any
+    flat: Any
+    roll: Any
+    speech_ratio: Any | None
+    vad_segments: int = 0
+
+    def __len__(self) -> int:
+        return int(self.start.shape[0])
+
+    def scores(self) -> Any:
+        """Heuristic music score per window (0..1)."""
+        import numpy as np  # type: ignore
+
+        def _unit(v: Any, scale: float) -> Any:
+            return np.nan_to_num(np.clip(v / scale, 0.0, 1.0), nan=0.0)
+
+        loud = np.where(self.rms >= 0.03, np.minimum(1.0, (self.rms - 0.03) / 0.12), 0.0)
+        flat = np.nan_to_num(np.clip(self.flat, 0.0, 1.0), nan=0.0)
+        if self.speech_ratio is not None:
+            # webrtcvad available: speech ratio dominates.
+            score = (1.0 - self.speech_ratio) * 0.70 + loud * 0.15 + flat * 0.08
+            score = score + _unit(self.centroid, 2500.0) * 0.07
+        else:
+            # Otherwise rely on spectral stats more heavily (offline, no heavy deps).
+            score = loud * 0.25 + flat * 0.25 + _unit(self.centroid, 2500.0) * 0.25
+            score = score + _unit(self.roll, 6000.0) * 0.25
+        return np.clip(score, 0.0, 1.0)
+
+
+_FEATURE_CACHE: dict[tuple, MusicFeatures] = {}
+_FEATURE_CACHE_MAX = 4
+_BLOCK_WINDOWS = 256
+
+
+def _speech_segments(audio_path: Path, cfg: VADConfig) -> tuple[list[tuple[float, float]], bool]:
+    # Prefer webrtcvad-based speech detection when available; energy-only fallback is not
+    # reliable for music detection (it flags any loud audio as "speech").
     try:
-        with wave.open(str(path), "rb") as wf:
-            sr = int(wf.getframerate())
-            ch = int(wf.getnchannels())
-            sw = int(wf.getsampwidth())
-            if ch != 1 or sw != 2:
-                return None, sr
-            frames = wf.readframes(wf.getnframes())
-        n = len(frames) // 2
-        samples = []
-        for i in range(0, n * 2, 2):
-            v = int.from_bytes(frames[i : i + 2], "little", signed=True)
-            samples.append(float(v) / 32768.0)
-        return samples, sr
+        import webrtcvad  # type: ignore  # noqa: F401
     except Exception:
-        return None, 0
+        return [], False
+    try:
+        return detect_speech_segments(audio_path, cfg), True
+    except Exception:
+        return [], True
 
 
-def _rms(samples: list[float]) -> float:
-    if not samples:
-        return 0.0
-    s2 = 0.0
-    for x in samples:
-        s2 += float(x * x)
-    return math.sqrt(s2 / float(len(samples)))
+def _cached_features(audio_path: Path) -> MusicFeatures | None:
+    """Most recent cached features for this exact file (any window/hop), if any."""
+    try:
+        st = Path(audio_path).stat()
+        path = str(Path(audio_path).resolve())
+    except Exception:
+        return None
+    for key in reversed(list(_FEATURE_CACHE)):
+        if key[:3] == (path, int(st.st_size), int(st.st_mtime_ns)):
+            return _FEATURE_CACHE[key]
+    return None
 
 
-def _spectral_features_numpy(
-    samples: list[float], sr: int
-) -> tuple[float | None, float | None, float | None]:
+def compute_music_features(
+    audio_path: Path,
+    *,
+    window_s: float = 1.0,
+    hop_s: float = 0.5,
+    vad_cfg: VADConfig | None = None,
+) -> MusicFeatures | None:
     """
-    Returns (centroid_hz, flatness, rolloff_hz) using numpy if available.
+    Sliding-window features over a memory-mapped mono PCM16 WAV.
+
+    Windows start every hop_s and span window_s (the last ones are truncated at the end of
+    the file). Full-length windows are strided views of the mapped samples and go through
+    one batched rFFT per block, so samples are never copied per window or decoded twice.
+    Results are cached per file (size/mtime) and window/hop, so `detect_op_ed` reuses them.
     """
+    import numpy as np  # type: ignore
+
+    audio_path = Path(audio_path)
+    w = max(0.5, float(window_s))
+    h = max(0.2, float(hop_s))
     try:
-        import numpy as np  # type: ignore
-    except Exception:
-        return None, None, None
-    try:
-        x = np.asarray(samples, dtype=np.float32)
-        if x.size < 256 or sr <= 0:
-            return None, None, None
-        # Hann window FFT
-        w = np.hanning(x.size)
-        X = np.fft.rfft(x * w)
-        mag = np.abs(X) + 1e-9
-        freqs = np.fft.rfftfreq(x.size, 1.0 / float(sr))
-        # centroid
-        centroid = float((freqs * mag).sum() / mag.sum())
-        # flatness
-        flat = float(np.exp(np.mean(np.log(mag))) / (np.mean(mag)))
-        # rolloff (85%)
-        cdf = np.cumsum(mag)
-        thr = 0.85 * float(cdf[-1])
-        idx = int(np.searchsorted(cdf, thr))
-        roll = float(freqs[min(idx, freqs.size - 1)])
-        return centroid, flat, roll
+        st = audio_path.stat()
     except Exception:
-        return None, None, None
-
+        return None
+    key = (str(audio_path.resolve()), int(st.st_size), int(st.st_mtime_ns), w, h, vad_cfg)
+    hit = _FEATURE_CACHE.get(key)
+    if hit is not None:
+        return hit
 
-def _coverage_ratio(intervals: list[tuple[float, float]], *, start: float, end: float) -> float:
-    if end <= start:
-        return 0.0
-    tot = 0.0
-    for s, e in intervals:
-        ov = max(0.0, min(end, float(e)) - max(start, float(s)))
-        tot += ov
-    return max(0.0, min(1.0, tot / (end - start)))
+    dur = _wav_duration_s(audio_path)
+    x, sr = _pcm16_view(audio_path)
+    if dur <= 0 or x is None or sr <= 0 or x.shape[0] == 0:
+        if sr > 0 and x is None:
+            logger.warning("music_detect_expected_pcm16_mono16k", sr=sr)
+        return None
+
+    nwin = int(max(1, math.ceil(dur / h)))
+    starts = np.arange(nwin, dtype=np.float64) * h
+    ends = np.minimum(dur, starts + w)
+    # Windows stop at the first one shorter than 0.25s (they only shrink from there).
+    first_short = np.flatnonzero(ends - starts < 0.25)
+    keep = int(first_short[0]) if first_short.size else nwin
+    starts, ends = starts[:keep], ends[:keep]
+    i0 = np.maximum(0, (starts * sr).astype(np.int64))
+    i1 = np.maximum(i0 + 1, (ends * sr).astype(np.int64))
+    i1 = np.minimum(i1, x.shape[0])
+    i0 = np.minimum(i0, max(0, x.shape[0] - 1))
+    lens = i1 - i0
+
+    cols = {k: np.full(keep, np.nan) for k in ("rms", "centroid", "flat", "roll")}
+    # Nearly all windows share one length (only the tail is truncated); batch per length.
+    for n in np.unique(lens):
+        sel = np.flatnonzero(lens == n)
+        frames = np.lib.stride_tricks.sliding_window_view(x, int(n))
+        for b in range(0, sel.size, _BLOCK_WINDOWS):
+            idx = sel[b : b + _BLOCK_WINDOWS]
+            for k, v in _window_features(frames[i0[idx]], sr).items():
+                cols[k][idx] = v
+
+    speech, use_webrtc = _speech_segments(audio_path, vad_cfg or VADConfig())
+    feats = MusicFeatures(
+        path=str(audio_path),
+        sr=int(sr),
+        duration_s=float(dur),
+        window_s=w,
+        hop_s=h,
+        start=starts,
+        end=ends,
+        rms=cols["rms"],
+        centroid=cols["centroid"],
+        flat=cols["flat"],
+        roll=cols["roll"],
+        speech_ratio=_coverage_ratios(speech, starts, ends) if use_webrtc else None,
+        vad_segments=len(speech),
+    )
+    if len(_FEATURE_CACHE) >= _FEATURE_CACHE_MAX:
+        _FEATURE_CACHE.pop(next(iter(_FEATURE_CACHE)))
+    _FEATURE_CACHE[key] = feats
+    return feats
 
 
 def _merge_regions(regs: list[Region], *, gap_s: float = 0.5) -> list[Region]:
@@ -133,6 +268,39 @@ def _merge_regions(regs: list[Region], *, gap_s: float = 0.5) -> list[Region]:
     return out
 
 
+def regions_from_features(feats: MusicFeatures, *, threshold: float = 0.70) -> list[Region]:
+    """
+    Windows scoring >= threshold as merged "music" regions.
+    """
+    import numpy as np  # type: ignore
+
+    score = feats.scores()
+    regs: list[Region] = []
+    for k in np.flatnonzero(score >= float(threshold)):
+        sc = float(score[k])
+        rms = float(feats.rms[k])
+        ratio = feats.speech_ratio[k] if feats.speech_ratio is not None else None
+        sr_s = f"{float(ratio):.2f}" if ratio is not None else "na"
+        reason = f"heuristic score={sc:.3f} speech_ratio={sr_s} rms={rms:.3f}"
+        flat, centroid, roll = feats.flat[k], feats.centroid[k], feats.roll[k]
+        if not np.isnan(flat):
+            reason += f" flat={float(flat):.3f}"
+        if not np.isnan(centroid):
+            reason += f" centroid={float(centroid):.0f}"
+        if not np.isnan(roll):
+            reason += f" rolloff={float(roll):.0f}"
+        regs.append(
+            Region(
+                start=float(feats.start[k]),
+                end=float(feats.end[k]),
+                kind="music",
+                confidence=sc,
+                reason=reason,
+            )
+        )
+    return _merge_regions(regs, gap_s=max(0.2, feats.hop_s))
+
+
 def analyze_audio_for_music_regions(
     audio_path: Path,
     *,
@@ -164,24 +332,10 @@ def analyze_audio_for_music_regions(
     if m == "classifier":
         used = "heuristic"
 
-    cfg = vad_cfg or VADConfig()
-    # Prefer webrtcvad-based speech detection when available; energy-only fallback is not
-    # reliable for music detection (it flags any loud audio as "speech").
-    use_webrtc = False
-    try:
-        import webrtcvad  # type: ignore  # noqa: F401
-
-        use_webrtc = True
-    except Exception:
-        use_webrtc = False
-
-    speech: list[tuple[float, float]] = []
-    if use_webrtc:
-        try:
-            speech = detect_speech_segments(audio_path, cfg)
-        except Exception:
-            speech = []
-
+    t0 = time.perf_counter()
+    feats = compute_music_features(audio_path, window_s=window_s, hop_s=hop_s, vad_cfg=vad_cfg)
+    if feats is None:
+        return []
     logger.info(
         "music_detect_start",
         audio=str(audio_path),
@@ -191,110 +345,44 @@ def analyze_audio_for_music_regions(
         window_s=float(window_s),
         hop_s=float(hop_s),
         threshold=float(threshold),
-        vad_segments=len(speech),
-        webrtcvad=bool(use_webrtc),
+        vad_segments=int(feats.vad_segments),
+        webrtcvad=feats.speech_ratio is not None,
+        windows=len(feats),
     )
 
-    regs: list[Region] = []
-    w = max(0.5, float(window_s))
-    h = max(0.2, float(hop_s))
-
-    # Read windows via wave to avoid loading entire file.
-    try:
-        wf = wave.open(str(audio_path), "rb")
-    except Exception:
-        return []
-    sr = int(wf.getframerate())
-    ch = int(wf.getnchannels())
-    sw = int(wf.getsampwidth())
-    if ch != 1 or sw != 2 or sr <= 0:
-        logger.warning("music_detect_expected_pcm16_mono16k", sr=sr, ch=ch, sw=sw)
-    try:
-        for k in range(int(max(1, math.ceil(dur / h)))):
-            start = float(k) * h
-            end = min(dur, start + w)
-            if end - start < 0.25:
-                break
-
-            i0 = max(0, int(start * sr))
-            i1 = max(i0 + 1, int(end * sr))
-            wf.setpos(min(i0, max(0, wf.getnframes() - 1)))
-            buf = wf.readframes(max(1, i1 - i0))
-            n = len(buf) // 2
-            win = []
-            for i in range(0, n * 2, 2):
-                v = int.from_bytes(buf[i : i + 2], "little", signed=True)
-                win.append(float(v) / 32768.0)
-
-            rms = _rms(win)
-            speech_ratio = _coverage_ratio(speech, start=start, end=end) if use_webrtc else None
-            centroid, flat, roll = _spectral_features_numpy(win, sr)
-
-            # Simple scoring. If webrtcvad is available we can use speech_ratio strongly.
-            # Otherwise rely on spectral stats more heavily (offline, no heavy deps).
-            score = 0.0
-            if speech_ratio is not None:
-                score += (1.0 - float(speech_ratio)) * 0.70
-                if rms >= 0.03:
-                    score += min(1.0, (rms - 0.03) / 0.12) * 0.15
-                if flat is not None:
-                    score += max(0.0, min(1.0, float(flat))) * 0.08
-                if centroid is not None:
-                    score += max(0.0, min(1.0, float(centroid) / 2500.0)) * 0.07
-            else:
-                if rms >= 0.03:
-                    score += min(1.0, (rms - 0.03) / 0.12) * 0.25
-                if flat is not None:
-                    score += max(0.0, min(1.0, float(flat))) * 0.25
-                if centroid is not None:
-                    score += max(0.0, min(1.0, float(centroid) / 2500.0)) * 0.25
-                if roll is not None:
-                    score += max(0.0, min(1.0, float(roll) / 6000.0)) * 0.25
-
-            score = max(0.0, min(1.0, score))
-            if score >= float(threshold):
-                kind = "music"
-                sr_s = f"{float(speech_ratio):.2f}" if speech_ratio is not None else "na"
-                reason = f"heuristic score={score:.3f} speech_ratio={sr_s} rms={rms:.3f}"
-                if flat is not None:
-                    reason += f" flat={float(flat):.3f}"
-                if centroid is not None:
-                    reason += f" centroid={float(centroid):.0f}"
-                if roll is not None:
-                    reason += f" rolloff={float(roll):.0f}"
-                regs.append(
-                    Region(
-                        start=float(start),
-                        end=float(end),
-                        kind=kind,
-                        confidence=float(score),
-                        reason=reason,
-                    )
-                )
-    finally:
-        with suppress(Exception):
-            wf.close()
-
-    merged = _merge_regions(regs, gap_s=max(0.2, h))
-    logger.info("music_detect_done", regions=len(merged))
+    merged = regions_from_features(feats, threshold=float(threshold))
+    logger.info(
+        "music_detect_done",
+        regions=len(merged),
+        elapsed_s=round(time.perf_counter() - t0, 3),
+    )
     return merged
 
 
 def detect_op_ed(
     audio_path: Path,
     *,
-    music_regions: list[Region],
+    music_regions: list[Region] | None = None,
     seconds: int = 90,
     threshold: float = 0.70,
+    features: MusicFeatures | None = None,
 ) -> dict[str, Region | None]:
     """
     Best-effort OP/ED specialization:
     - Candidate OP: [0..N]
     - Candidate ED: [dur-N..dur]
     - Confirm if a music region overlaps sufficiently and meets threshold.
+
+    Uses the feature matrix from `analyze_audio_for_music_regions` (passed in or cached) so
+    the WAV is not scanned again; without `music_regions`, regions come from those features.
     """
     audio_path = Path(audio_path)
-    dur = _wav_duration_s(audio_path)
+    feats = features or _cached_features(audio_path)
+    if music_regions is None:
+        if feats is None:
+            feats = compute_music_features(audio_path)
+        music_regions = regions_from_features(feats, threshold=threshold) if feats else []
+    dur = float(feats.duration_s) if feats is not None else _wav_duration_s(audio_path)
     n = max(10.0, float(seconds))
     out: dict[str, Region | None] = {"op": None, "ed": None}
     if dur <= 0:
@@ -0,0 +1,406 @@
+"""
+Cross-episode OP/ED fingerprint index.
+
+Episodes of a series share their opening/ending songs. Once an OP/ED has been detected in one
+episode, its audio is stored as compact spectral-peak hashes per `series_slug` (JobStore table
+`series_audio_fingerprints`). Later episodes are fingerprinted once and matched against every
+stored OP/ED by offset voting; a match becomes an "op"/"ed" music region (so
+`should_suppress_segment` skips TTS there) and brings back the music decisions cached with the
+reference episode instead of the heuristic's per-episode guess.
+
+Fingerprints are landmark pairs: the 3 strongest local spectral peaks of each frame (128 ms
+window, 32 ms hop), each paired with the strongest peak a few frames later; hash = (f1, f2, lag).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.audio.music_detect import Region
+from dubbing_pipeline.utils.log import logger
+from dubbing_pipeline.utils.vad import pcm16_view
+
+SR = 16000
+NFFT = 2048
+HOP = 512
+F_LO, F_HI = 12, 780  # ~90 Hz .. ~6.1 kHz
+PEAKS_PER_FRAME = 3
+NEIGHBOURHOOD_T = 6  # frames
+NEIGHBOURHOOD_F = 16  # bins
+LAGS = (1, 2, 3, 5, 8, 12, 18, 27)
+PARAMS = f"v1:sr{SR}:n{NFFT}:h{HOP}:k{PEAKS_PER_FRAME}"
+_BLOCK_FRAMES = 2048
+# Query hashes seen more often than this are too generic to vote.
+_MAX_HASH_REPEAT = 16
+_MIN_LEARN_S = 30.0
+_MAX_ENTRIES_PER_KIND = 8
+
+
+@dataclass(slots=True)
+class Fingerprint:
+    hashes: Any  # uint32
+    times: Any  # int32 anchor frame index
+    n_frames: int
+
+    @property
+    def hop_s(self) -> float:
+        return HOP / float(SR)
+
+    def pack(self) -> bytes:
+        return self.hashes.astype("<u4").tobytes() + self.times.astype("<i4").tobytes()
+
+    @classmethod
+    def unpack(cls, blob: bytes, n: int) -> Fingerprint:
+        import numpy as np  # type: ignore
+
+        h = np.frombuffer(blob, dtype="<u4", count=int(n))
+        t = np.frombuffer(blob, dtype="<i4", count=int(n), offset=4 * int(n))
+        return cls(hashes=h, times=t, n_frames=int(t.max()) + 1 if n else 0)
+
+
+@dataclass(frozen=True, slots=True)
+class OpEdMatch:
+    entry_id: str
+    kind: str
+    start_s: float
+    end_s: float
+    score: float
+    votes: int
+    source_job_id: str = ""
+    decisions: dict[str, Any] = field(default_factory=dict)
+
+
+def _max_filter(a: Any, r: int, axis: int) -> Any:
+    import numpy as np  # type: ignore
+
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (r, r)
+    p = np.pad(a, pad, mode="constant", constant_values=-np.inf)
+    return np.lib.stride_tricks.sliding_window_view(p, 2 * r + 1, axis=axis).max(axis=-1)
+
+
+def _frame_peaks(x: Any) -> Any:
+    """
+    (n_frames, PEAKS_PER_FRAME) peak bins (strongest first, -1 = none) for int16 samples.
+    """
+    import numpy as np  # type: ignore
+
+    n_frames = 1 + (x.shape[0] - NFFT) // HOP if x.shape[0] >= NFFT else 0
+    out = np.full((n_frames, PEAKS_PER_FRAME), -1, dtype=np.int16)
+    if n_frames <= 0:
+        return out
+    frames = np.lib.stride_tricks.sliding_window_view(x, NFFT)[::HOP]
+    win = np.hanning(NFFT).astype(np.float32)
+    for b in range(0, n_frames, _BLOCK_FRAMES):
+        lo = max(0, b - NEIGHBOURHOOD_T)
+        hi = min(n_frames, b + _BLOCK_FRAMES + NEIGHBOURHOOD_T)
+        spec = np.abs(np.fft.rfft(frames[lo:hi].astype(np.float32) * win, axis=1))
+        mag = np.log(spec[:, F_LO:F_HI] + 1e-3)
+        mx = _max_filter(_max_filter(mag, NEIGHBOURHOOD_F, 1), NEIGHBOURHOOD_T, 0)
+        cand = (mag == mx) & (mag > mag.mean(axis=1, keepdims=True) + 1.0)
+        core = slice(b - lo, b - lo + min(_BLOCK_FRAMES, n_frames - b))
+        masked = np.where(cand, mag, -np.inf)[core]
+        top = np.argpartition(-masked, PEAKS_PER_FRAME - 1, axis=1)[:, :PEAKS_PER_FRAME]
+        vals = np.take_along_axis(masked, top, axis=1)
+        rank = np.argsort(-vals, axis=1)
+        top = np.take_along_axis(top, rank, axis=1)
+        ok = np.take_along_axis(vals, rank, axis=1) > -np.inf
+        out[b : b + masked.shape[0]] = np.where(ok, top + F_LO, -1)
+    return out
+
+
+def _landmarks(peaks: Any) -> Fingerprint:
+    import numpy as np  # type: ignore
+
+    n = int(peaks.shape[0])
+    hs: list[Any] = []
+    ts: list[Any] = []
+    strongest = peaks[:, 0].astype(np.int64)
+    for li, lag in enumerate(LAGS):
+        if lag >= n:
+            break
+        f2 = strongest[lag:]
+        for k in range(PEAKS_PER_FRAME):
+            f1 = peaks[: n - lag, k].astype(np.int64)
+            t = np.flatnonzero((f1 >= 0) & (f2 >= 0))
+            hs.append(((f1[t] << 13) | (f2[t] << 3) | li).astype(np.uint32))
+            ts.append(t.astype(np.int32))
+    if not hs:
+        return Fingerprint(np.zeros(0, np.uint32), np.zeros(0, np.int32), n)
+    h = np.concatenate(hs)
+    t = np.concatenate(ts)
+    order = np.argsort(t, kind="stable")
+    return Fingerprint(hashes=h[order], times=t[order], n_frames=n)
+
+
+def episode_fingerprint(wav: Path) -> Fingerprint | None:
+    """
+    Fingerprint a 16 kHz mono PCM16 WAV in one pass over a memory-mapped sample array.
+    """
+    x, sr = pcm16_view(Path(wav))
+    if x is None or int(sr) != SR:
+        return None
+    return _landmarks(_frame_peaks(x))
+
+
+def _best_offset(q_sorted: tuple[Any, Any], e: Fingerprint) -> tuple[int, int, Any] | None:
+    """
+    Offset voting of entry hashes against the (hash-sorted) query.
+    Returns (votes, offset_frames, matched query anchor frames) or None.
+    """
+    import numpy as np  # type: ignore
+
+    qh, qt = q_sorted
+    lo = np.searchsorted(qh, e.hashes, side="left")
+    cnt = np.searchsorted(qh, e.hashes, side="right") - lo
+    cnt = np.where(cnt > _MAX_HASH_REPEAT, 0, cnt)
+    total = int(cnt.sum())
+    if total == 0:
+        return None
+    rep = np.repeat(np.arange(e.hashes.size), cnt)
+    starts = np.cumsum(cnt) - cnt
+    qi = lo[rep] + (np.arange(total) - starts[rep])
+    q_times = qt[qi]
+    off = q_times.astype(np.int64) - e.times[rep].astype(np.int64)
+    base = int(off.min())
+    hist = np.bincount(off - base)
+    # Frame grids of two episodes rarely line up; votes split across adjacent offsets.
+    sm = hist.copy()
+    sm[1:] += hist[:-1]
+    sm[:-1] += hist[1:]
+    best = int(np.argmax(sm))
+    offset = best + base
+    sel = np.abs(off - offset) <= 1
+    return int(sm[best]), int(offset), q_times[sel]
+
+
+def match_entries(
+    fp: Fingerprint,
+    entries: list[dict[str, Any]],
+    *,
+    min_score: float = 0.10,
+    min_votes: int = 40,
+) -> list[OpEdMatch]:
+    """
+    Match every stored entry against one episode fingerprint (a single sort of the episode).
+    """
+    import numpy as np  # type: ignore
+
+    if fp.hashes.size == 0 or not entries:
+        return []
+    order = np.argsort(fp.hashes, kind="stable")
+    q_sorted = (fp.hashes[order], fp.times[order])
+    hop_s = fp.hop_s
+    dur_s = fp.n_frames * hop_s + NFFT / float(SR)
+    out: list[OpEdMatch] = []
+    for ent in entries:
+        try:
+            e = Fingerprint.unpack(ent["hashes"], int(ent["n_hashes"]))
+        except Exception:
+            continue
+        if e.hashes.size == 0:
+            continue
+        res = _best_offset(q_sorted, e)
+        if res is None:
+            continue
+        votes, offset, q_times = res
+        score = votes / float(e.hashes.size)
+        if votes < int(min_votes) or score < float(min_score):
+            continue
+        off_s = offset * hop_s
+        ent_dur = float(ent.get("duration_s") or 0.0)
+        start = max(0.0, float(q_times.min()) * hop_s)
+        end = min(off_s + ent_dur, float(q_times.max()) * hop_s + NFFT / float(SR))
+        # Snap to the stored span when the match reaches (almost) its edges.
+        if start - off_s < 1.0:
+            start = max(0.0, off_s)
+        if off_s + ent_dur - end < 1.0:
+            end = off_s + ent_dur
+        end = min(end, dur_s)
+        if end - start < 1.0:
+            continue
+        out.append(
+            OpEdMatch(
+                entry_id=str(ent.get("id") or ""),
+                kind=str(ent.get("kind") or "op"),
+                start_s=float(start),
+                end_s=float(end),
+                score=float(score),
+                votes=int(votes),
+                source_job_id=str(ent.get("source_job_id") or ""),
+                decisions=dict(ent.get("decisions") or {}),
+            )
+        )
+    # One match per kind/span: keep the strongest when stored variants overlap.
+    out.sort(key=lambda m: -m.score)
+    kept: list[OpEdMatch] = []
+    for m in out:
+        if any(m.start_s < k.end_s and k.start_s < m.end_s for k in kept):
+            continue
+        kept.append(m)
+    return sorted(kept, key=lambda m: m.start_s)
+
+
+def _overlaps(r: Region, m: OpEdMatch) -> bool:
+    return float(r.start) < m.end_s and m.start_s < float(r.end)
+
+
+class SeriesOpEdIndex:
+    """
+    Per-episode view of a series' OP/ED index: fingerprint once, match, then apply/learn.
+    """
+
+    def __init__(self, *, store: Any, series_slug: str, fp: Fingerprint, matches: list[OpEdMatch]):
+        self.store = store
+        self.series_slug = str(series_slug)
+        self.fp = fp
+        self.matches = list(matches)
+
+    @classmethod
+    def for_episode(
+        cls, *, store: Any, series_slug: str, wav: Path, min_score: float = 0.10
+    ) -> SeriesOpEdIndex | None:
+        series_slug = str(series_slug or "").strip()
+        if not series_slug:
+            return None
+        fp = episode_fingerprint(wav)
+        if fp is None:
+            logger.info("oped_index_skip_format", wav=str(wav))
+            return None
+        entries = store.list_series_fingerprints(series_slug, params=PARAMS)
+        matches = match_entries(fp, entries, min_score=min_score)
+        for m in matches:
+            store.record_series_fingerprint_hit(m.entry_id)
+        logger.info(
+            "oped_index_matched",
+            series=series_slug,
+            entries=len(entries),
+            hashes=int(fp.hashes.size),
+            matches=[
+                {
+                    "kind": m.kind,
+                    "start": round(m.start_s, 2),
+                    "end": round(m.end_s, 2),
+                    "score": round(m.score, 3),
+                }
+                for m in matches
+            ],
+        )
+        return cls(store=store, series_slug=series_slug, fp=fp, matches=matches)
+
+    def _region(self, m: OpEdMatch) -> Region:
+        conf = float(m.decisions.get("confidence") or 1.0)
+        return Region(
+            start=m.start_s,
+            end=m.end_s,
+            kind=m.kind,
+            confidence=conf,
+            reason=(
+                f"fingerprint_match entry={m.entry_id} score={m.score:.3f} "
+                f"source_job={m.source_job_id}"
+            ),
+        )
+
+    def music_regions(self, regions: list[Region]) -> list[Region]:
+        """
+        Replace detected regions inside matched spans with the matched OP/ED region plus the
+        music regions cached from the reference episode (shifted into this episode).
+        """
+        out = [r for r in regions if not any(_overlaps(r, m) for m in self.matches)]
+        for m in self.matches:
+            out.append(self._region(m))
+            for c in m.decisions.get("regions") or []:
+                try:
+                    a = m.start_s + float(c["start"])
+                    b = min(m.end_s, m.start_s + float(c["end"]))
+                except Exception:
+                    continue
+                if b > a:
+                    out.append(
+                        Region(
+                            start=a,
+                            end=b,
+                            kind=str(c.get("kind") or "music"),
+                            confidence=float(c.get("confidence") or 0.0),
+                            reason=f"fingerprint_cached entry={m.entry_id}",
+                        )
+                    )
+        return sorted(out, key=lambda r: (float(r.start), float(r.end)))
+
+    def op_ed(self, oped: dict[str, Region | None]) -> dict[str, Region | None]:
+        out = dict(oped)
+        for m in self.matches:
+            if m.kind in {"op", "ed"}:
+                out[m.kind] = self._region(m)
+        return out
+
+    def learn(
+        self, oped: dict[str, Region | None], regions: list[Region], *, job_id: str = ""
+    ) -> list[str]:
+        """
+        Store newly detected OP/ED spans (not explained by a match) for later episodes.
+        Hashes are sliced out of the episode fingerprint; the audio is not read again.
+        """
+        import numpy as np  # type: ignore
+
+        learned: list[str] = []
+        existing = self.store.list_series_fingerprints(self.series_slug, params=PARAMS)
+        lags = np.asarray(LAGS, dtype=np.int64)
+        hop_s = self.fp.hop_s
+        for kind in ("op", "ed"):
+            r = oped.get(kind)
+            if r is None or str(r.reason).startswith("fingerprint_"):
+                continue
+            if float(r.end) - float(r.start) < _MIN_LEARN_S:
+                continue
+            if any(float(r.start) < m.end_s and m.start_s < float(r.end) for m in self.matches):
+                continue
+            if sum(1 for e in existing if e.get("kind") == kind) >= _MAX_ENTRIES_PER_KIND:
+                continue
+            s_f = int(np.ceil(float(r.start) / hop_s))
+            e_f = int(float(r.end) / hop_s)
+            t = self.fp.times.astype(np.int64)
+            lag = lags[(self.fp.hashes & 7).astype(np.int64)]
+            sel = (t >= s_f) & (t + lag < e_f)
+            if int(sel.sum()) < 100:
+                continue
+            sub = Fingerprint(
+                hashes=self.fp.hashes[sel],
+                times=(t[sel] - s_f).astype(np.int32),
+                n_frames=e_f - s_f,
+            )
+            blob = sub.pack()
+            eid = f"{kind}_{hashlib.sha256(blob).hexdigest()[:16]}"
+            span_s = s_f * hop_s
+            cached = [
+                {
+                    "start": max(0.0, float(x.start) - span_s),
+                    "end": float(x.end) - span_s,
+                    "kind": str(x.kind),
+                    "confidence": float(x.confidence),
+                }
+                for x in regions
+                if float(x.start) < float(r.end) and float(r.start) < float(x.end)
+            ]
+            self.store.upsert_series_fingerprint(
+                entry_id=eid,
+                series_slug=self.series_slug,
+                kind=kind,
+                params=PARAMS,
+                duration_s=(e_f - s_f) * hop_s,
+                n_hashes=int(sub.hashes.size),
+                hashes=blob,
+                decisions={
+                    "confidence": float(r.confidence),
+                    "reason": str(r.reason),
+                    "regions": cached,
+                },
+                source_job_id=str(job_id or ""),
+            )
+            learned.append(eid)
+        if learned:
+            logger.info("oped_index_learned", series=self.series_slug, entries=learned)
+        return learned
@@ -0,0 +1,251 @@
+"""
+Long-lived worker processes for `dubbing-pipeline run --batch ... --jobs N`.
+
+Each worker imports the CLI once and runs one input after another, so models stay warm in its
+ModelManager (Whisper, XTTS) instead of being reloaded for every episode. The parent holds the
+queue of pending inputs and hands the next one to whichever worker is idle, which means it always
+knows what a worker was doing when it died.
+
+Per-input isolation inside a worker:
+  - settings are re-read from the environment and env changes made by an input are rolled back
+  - each input runs in an empty contextvars context (log/span correlation does not leak)
+  - a failed input ends its worker; the parent starts a fresh one for the remaining inputs
+  - BATCH_WORKER_MAX_INPUTS recycles workers after N inputs (0 = keep them for the whole batch)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import multiprocessing
+import os
+import queue
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.utils.log import logger
+
+# spawn: a worker must not inherit the parent's half-initialized ML/thread state.
+_MP_CONTEXT = "spawn"
+
+
+@dataclass(frozen=True, slots=True)
+class BatchInput:
+    idx: int  # 1-based position in the batch (for progress lines)
+    path: Path
+    args: list[str]  # full `run` CLI args for this input
+
+
+def _reset_settings() -> None:
+    with suppress(Exception):
+        from dubbing_pipeline.config import get_settings
+
+        get_settings.cache_clear()
+
+
+def _run_input(args: list[str]) -> str | None:
+    """
+    Run one `run` invocation in this process. Returns an error string, or None on success.
+    """
+    from dubbing_pipeline.cli import cli
+
+    env = dict(os.environ)
+    _reset_settings()
+    try:
+        contextvars.Context().run(cli.main, args=list(args), standalone_mode=False)
+        return None
+    except SystemExit as ex:
+        return None if ex.code in (None, 0) else f"exit={ex.code}"
+    except Exception as ex:
+        return f"{type(ex).__name__}: {ex}"
+    finally:
+        os.environ.clear()
+        os.environ.update(env)
+        _reset_settings()
+
+
+def _worker_main(wid: int, tasks: Any, results: Any, max_inputs: int) -> None:
+    done = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        idx, args = int(task[0]), list(task[1])
+        results.put(("start", wid, idx, None))
+        t0 = time.perf_counter()
+        error = _run_input(args)
+        results.put(("done", wid, idx, {"error": error, "wall_s": time.perf_counter() - t0}))
+        done += 1
+        if error is not None:
+            # Whatever broke may have left state behind: the next input gets a fresh process.
+            raise SystemExit(1)
+        if max_inputs > 0 and done >= max_inputs:
+            return
+
+
+class _Worker:
+    def __init__(self, ctx: Any, wid: int, results: Any, max_inputs: int) -> None:
+        self.wid = wid
+        self.max_inputs = int(max_inputs)
+        self.tasks = ctx.Queue()
+        self.proc = ctx.Process(
+            target=_worker_main,
+            args=(wid, self.tasks, results, int(max_inputs)),
+            name=f"dp-batch-{wid}",
+            # Not daemonic: inputs may start their own pools (ASR shards, ffmpeg helpers).
+            daemon=False,
+        )
+        self.proc.start()
+        self.current: BatchInput | None = None
+        self.inputs = 0
+        self.exit_seen = False
+        self.retired = False  # failed an input: exits instead of taking another
+
+    def idle(self) -> bool:
+        if self.current is not None or self.retired or not self.proc.is_alive():
+            return False
+        return self.max_inputs <= 0 or self.inputs < self.max_inputs
+
+    def assign(self, item: BatchInput) -> None:
+        self.current = item
+        self.inputs += 1
+        self.tasks.put((item.idx, item.args))
+
+    def stop(self, *, timeout_s: float = 5.0) -> None:
+        with suppress(Exception):
+            if self.proc.is_alive():
+                self.tasks.put(None)
+                self.proc.join(timeout_s)
+        with suppress(Exception):
+            if self.proc.is_alive():
+                self.proc.terminate()
+                self.proc.join(timeout_s)
+
+
+def run_batch_pool(
+    inputs: list[BatchInput],
+    *,
+    workers: int,
+    fail_fast: bool = False,
+    max_inputs_per_worker: int = 0,
+    total: int | None = None,
+) -> dict[str, Any]:
+    """
+    Run `inputs` on `workers` persistent processes and return a combined report:
+    {"workers", "ok", "failed", "skipped", "worker_starts", "wall_s", "inputs": [...]}
+    (one row per input with status, wall time and the worker pid that ran it).
+    """
+    t0 = time.perf_counter()
+    total = int(total or len(inputs))
+    pending = list(inputs)
+    rows: dict[int, dict[str, Any]] = {}
+    ctx = multiprocessing.get_context(_MP_CONTEXT)
+    results = ctx.Queue()
+    n = max(1, min(int(workers), len(inputs)))
+    pool: dict[int, _Worker] = {}
+    starts = 0
+    stop = False
+
+    def _spawn() -> None:
+        nonlocal starts
+        starts += 1
+        pool[starts] = _Worker(ctx, starts, results, max_inputs_per_worker)
+
+    def _finish(w: _Worker, error: str | None, wall_s: float | None, pid: int | None) -> None:
+        nonlocal stop
+        item = w.current
+        w.current = None
+        if item is None:
+            return
+        row = {
+            "idx": item.idx,
+            "path": str(item.path),
+            "status": "ok" if error is None else "failed",
+            "error": error,
+            "wall_s": round(float(wall_s), 3) if wall_s is not None else None,
+            "worker": w.wid,
+            "pid": pid,
+            "worker_input": w.inputs,  # 1 = cold worker, >1 = models already warm
+        }
+        rows[item.idx] = row
+        n_done = len(rows)
+        if error is None:
+            logger.info(
+                "[batch %s/%s] ok: %s (%.1fs, worker %s, %s/%s done)",
+                item.idx,
+                total,
+                item.path,
+                float(wall_s or 0.0),
+                w.wid,
+                n_done,
+                len(inputs),
+            )
+        else:
+            w.retired = True
+            logger.warning("[batch %s/%s] failed: %s (%s)", item.idx, total, item.path, error)
+            if fail_fast:
+                stop = True
+
+    try:
+        for _ in range(n):
+            _spawn()
+        while pool:
+            for w in list(pool.values()):
+                if pending and not stop and w.idle():
+                    w.assign(pending.pop(0))
+            try:
+                kind, wid, idx, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                kind = None
+            w = pool.get(wid) if kind is not None else None
+            if kind == "start" and w is not None:
+                logger.info("[batch %s/%s] start: %s (worker %s)", idx, total, w.current.path, wid)
+            elif kind == "done" and w is not None:
+                _finish(w, payload.get("error"), payload.get("wall_s"), w.proc.pid)
+            if kind is not None:
+                continue
+            # Nothing arrived: reap exited workers (finished, recycled or crashed).
+            for wid, w in list(pool.items()):
+                if w.proc.is_alive():
+                    # Busy workers finish their input even after a fail-fast stop.
+                    if w.current is None and not w.retired and (stop or not pending):
+                        w.stop()
+                        pool.pop(wid, None)
+                    continue
+                if w.current is not None and not w.exit_seen:
+                    # Its last message may still be in flight: look again on the next tick.
+                    w.exit_seen = True
+                    continue
+                if w.current is not None:
+                    _finish(w, f"worker crashed (exit={w.proc.exitcode})", None, w.proc.pid)
+                pool.pop(wid, None)
+                if pending and not stop:
+                    _spawn()
+    finally:
+        for w in pool.values():
+            w.stop(timeout_s=1.0)
+
+    skipped = [
+        {"idx": it.idx, "path": str(it.path), "status": "skipped", "error": "fail-fast"}
+        for it in pending
+    ]
+    out_rows = [rows[k] for k in sorted(rows)] + skipped
+    return {
+        "workers": n,
+        "ok": sum(1 for r in out_rows if r["status"] == "ok"),
+        "failed": sum(1 for r in out_rows if r["status"] == "failed"),
+        "skipped": len(skipped),
+        "worker_starts": starts,
+        "wall_s": round(time.perf_counter() - t0, 3),
+        "inputs": out_rows,
+    }
+
+
+def write_batch_report(report: dict[str, Any], out_dir: Path) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"batch_{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}.json"
+    path.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return path
@@ -0,0 +1,262 @@
+"""
+Segment-level result cache (cross-job).
+
+The whole-file transcribe cache (`cache.store`) misses as soon as anything about the audio
+changes. This store keeps results per unit of work instead, so reruns, re-uploads and
+recap-heavy episodes reuse every window or line they have seen before:
+
+  - asr: one VAD-aligned ASR window, keyed by the sha256 of its 16 kHz PCM plus decode options
+  - mt:  one text-engine translation, keyed by engine, languages and the exact MT input
+         (after glossary injection; style rules are applied after the lookup)
+
+Rows live in SQLite under the cache dir (`segments.db`), shared by all jobs and processes.
+The periodic workdir prune also prunes this store: rows unused for SEGMENT_CACHE_TTL_DAYS go
+first, then the least recently used ones beyond SEGMENT_CACHE_MAX_ENTRIES. Per-kind row counts
+are kept by triggers so the metrics gauge never counts the table.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.cache.store import _cache_root, count_lookup, make_key
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.utils.log import logger
+
+# Bump to invalidate every cached segment (e.g. when result shapes change).
+SEGMENT_CACHE_VERSION = 1
+
+
+class SegmentCache:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        con = self._conn()
+        try:
+            con.execute("PRAGMA journal_mode=WAL;")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS segment_cache (
+                  kind TEXT NOT NULL,
+                  key TEXT NOT NULL,
+                  value TEXT NOT NULL,
+                  created_at REAL NOT NULL,
+                  last_hit_at REAL,
+                  hits INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (kind, key)
+                );
+                """
+            )
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS segment_cache_recency "
+                "ON segment_cache(COALESCE(last_hit_at, created_at));"
+            )
+            con.commit()
+            if not self._has_counts(con):
+                # One process creates the counts table and backfills it (older databases).
+                con.execute("BEGIN IMMEDIATE")
+            if con.in_transaction and not self._has_counts(con):
+                con.execute(
+                    "CREATE TABLE segment_cache_counts "
+                    "(kind TEXT PRIMARY KEY, entries INTEGER NOT NULL)"
+                )
+                con.execute(
+                    "INSERT INTO segment_cache_counts(kind, entries) "
+                    "SELECT kind, COUNT(*) FROM segment_cache GROUP BY kind"
+                )
+                con.execute(
+                    """
+                    CREATE TRIGGER segment_cache_counts_ins AFTER INSERT ON segment_cache BEGIN
+                      INSERT INTO segment_cache_counts(kind, entries) VALUES (NEW.kind, 1)
+                      ON CONFLICT(kind) DO UPDATE SET entries = entries + 1;
+                    END;
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TRIGGER segment_cache_counts_del AFTER DELETE ON segment_cache BEGIN
+                      UPDATE segment_cache_counts SET entries = entries - 1 WHERE kind = OLD.kind;
+                    END;
+                    """
+                )
+            con.commit()
+        finally:
+            con.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    @staticmethod
+    def _has_counts(con: sqlite3.Connection) -> bool:
+        return bool(
+            con.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='segment_cache_counts'"
+            ).fetchone()
+        )
+
+    def get(self, kind: str, key: str) -> Any | None:
+        con = self._conn()
+        try:
+            row = con.execute(
+                "SELECT value FROM segment_cache WHERE kind=? AND key=?", (kind, key)
+            ).fetchone()
+            count_lookup(f"segment_{kind}", row is not None)
+            if row is None:
+                return None
+            with suppress(sqlite3.Error):
+                con.execute(
+                    "UPDATE segment_cache SET hits=hits+1, last_hit_at=? WHERE kind=? AND key=?",
+                    (time.time(), kind, key),
+                )
+                con.commit()
+            return json.loads(row[0])
+        finally:
+            con.close()
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        blob = json.dumps(value, sort_keys=True, ensure_ascii=False)
+        con = self._conn()
+        try:
+            con.execute(
+                """
+                INSERT INTO segment_cache(kind, key, value, created_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET value=excluded.value
+                """,
+                (kind, key, blob, time.time()),
+            )
+            con.commit()
+        finally:
+            con.close()
+
+    def counts(self) -> dict[str, int]:
+        con = self._conn()
+        try:
+            rows = con.execute("SELECT kind, entries FROM segment_cache_counts").fetchall()
+            return {str(k): int(n) for k, n in rows}
+        finally:
+            con.close()
+
+    def prune(self, *, max_entries: int, ttl_s: float = 0.0, now: float | None = None) -> int:
+        """
+        Drop rows unused for `ttl_s` (0 => no TTL), then the least recently used rows beyond
+        `max_entries` (0 => unbounded). Returns the number of rows removed.
+        """
+        now = time.time() if now is None else float(now)
+        con = self._conn()
+        try:
+            removed = 0
+            if ttl_s > 0:
+                removed += con.execute(
+                    "DELETE FROM segment_cache WHERE COALESCE(last_hit_at, created_at) < ?",
+                    (now - float(ttl_s),),
+                ).rowcount
+            if max_entries > 0:
+                total = con.execute(
+                    "SELECT COALESCE(SUM(entries), 0) FROM segment_cache_counts"
+                ).fetchone()[0]
+                excess = int(total) - int(max_entries)
+                if excess > 0:
+                    removed += con.execute(
+                        """
+                        DELETE FROM segment_cache WHERE rowid IN (
+                          SELECT rowid FROM segment_cache
+                          ORDER BY COALESCE(last_hit_at, created_at) ASC LIMIT ?
+                        )
+                        """,
+                        (excess,),
+                    ).rowcount
+            con.commit()
+            return removed
+        finally:
+            con.close()
+
+
+def segment_cache() -> SegmentCache | None:
+    """
+    The shared store, or None when disabled (SEGMENT_CACHE=0) or unusable.
+    """
+    if not bool(getattr(get_settings(), "segment_cache", True)):
+        return None
+    try:
+        return SegmentCache(_cache_root() / "segments.db")
+    except Exception as ex:
+        logger.warning("segment_cache_unavailable", error=str(ex))
+        return None
+
+
+def prune_segment_cache() -> int:
+    """
+    Apply SEGMENT_CACHE_TTL_DAYS / SEGMENT_CACHE_MAX_ENTRIES (periodic prune tick).
+    """
+    s = get_settings()
+    sc = segment_cache()
+    if sc is None:
+        return 0
+    removed = sc.prune(
+        max_entries=int(getattr(s, "segment_cache_max_entries", 0) or 0),
+        ttl_s=float(getattr(s, "segment_cache_ttl_days", 0) or 0) * 86400.0,
+    )
+    if removed:
+        logger.info("segment_cache_pruned", removed=removed)
+    return removed
+
+
+def pcm_fingerprint(pcm: Any) -> str:
+    """
+    sha256 of raw PCM samples (a numpy slice of the extracted 16 kHz audio).
+    """
+    import numpy as np  # type: ignore
+
+    return hashlib.sha256(np.ascontiguousarray(pcm).tobytes()).hexdigest()
+
+
+def asr_window_key(fingerprint: str, **opts: Any) -> str:
+    return make_key("asr_window", {"v": SEGMENT_CACHE_VERSION, "pcm": fingerprint, **opts})
+
+
+def mt_key(text: str, *, engine: str, src_lang: str, tgt_lang: str) -> str:
+    parts = {
+        "v": SEGMENT_CACHE_VERSION,
+        "engine": str(engine),
+        "src": str(src_lang).lower(),
+        "tgt": str(tgt_lang).lower(),
+        "text": str(text),
+    }
+    return make_key("mt", parts)
+
+
+@dataclass(slots=True)
+class CacheCounter:
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        n = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookups": n,
+            "hit_ratio": round(self.hits / n, 4) if n else None,
+        }
+
+
+def read_cache_stats(path: Path | str | None, *, field: str | None = None) -> dict | None:
+    """
+    Hit/miss counters a stage wrote to `path` (optionally under `field` of a larger JSON doc).
+    """
+    if not path:
+        return None
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if field is not None:
+        data = data.get(field) if isinstance(data, dict) else None
+    return data if isinstance(data, dict) else None
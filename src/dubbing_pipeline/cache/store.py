@@ -4,6 +4,7 @@ import hashlib
 import json
 import threading
 import time
+from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
@@ -52,7 +53,21 @@ def make_key(namespace: str, parts: dict[str, Any]) -> str:
     return f"{namespace}:{hashlib.sha256(blob).hexdigest()}"
 
 
+def count_lookup(cache: str, hit: bool) -> None:
+    # Imported here: ops.metrics pulls in prometheus_client, which the CLI does not need.
+    with suppress(Exception):
+        from dubbing_pipeline.ops.metrics import cache_request
+
+        cache_request(cache, "hit" if hit else "miss").inc()
+
+
 def cache_get(key: str) -> dict[str, Any] | None:
+    item = _cache_get(key)
+    count_lookup(key.split(":", 1)[0], item is not None)
+    return item
+
+
+def _cache_get(key: str) -> dict[str, Any] | None:
     with _lock:
         idx = _read_index()
         item = idx.get("items", {}).get(key)
@@ -71,6 +86,19 @@ def cache_get(key: str) -> dict[str, Any] | None:
         return item
 
 
+def cache_counts() -> dict[str, int]:
+    """
+    Index entries per key namespace (e.g. {"whisper": 12, "tts": 40}).
+    """
+    with _lock:
+        items = _read_index().get("items", {})
+    out: dict[str, int] = {}
+    for key in items:
+        ns = str(key).split(":", 1)[0]
+        out[ns] = out.get(ns, 0) + 1
+    return out
+
+
 def cache_put(
     key: str, paths: dict[str, str | Path], *, meta: dict[str, Any] | None = None
 ) -> None:
@@ -1,17 +1,44 @@
 from __future__ import annotations
 
+from typing import Any
+
 from .args_common import DefaultGroup
-from .commands_admin import doctor, lipsync
-from .commands_jobs import overrides, qa, review
-from .commands_library import character, voice
-from .commands_run import run
-from . import commands_admin, commands_jobs, commands_library
-
-cli = DefaultGroup(name="dubbing-pipeline", help="dubbing-pipeline CLI (run + review)")  # type: ignore[assignment]
-cli.add_command(run)
-commands_jobs.add_commands(cli)
-commands_library.add_commands(cli)
-commands_admin.add_commands(cli)
+
+# Subcommands load on first use ("module:attr", short help for the group listing), so a short
+# command does not import the run pipeline, or FastAPI through `doctor`, before it starts.
+LAZY_COMMANDS: dict[str, tuple[str, str]] = {
+    "run": ("dubbing_pipeline.cli.commands_run:run", "Run pipeline on VIDEO."),
+    "review": ("dubbing_pipeline.review.cli:review", "Tier-2B review loop commands."),
+    "qa": ("dubbing_pipeline.qa.cli:qa", "Quality checks and scoring."),
+    "overrides": (
+        "dubbing_pipeline.overrides.cli:overrides",
+        "Per-job override controls (music regions, speakers, smoothing).",
+    ),
+    "voice": (
+        "dubbing_pipeline.voice_memory.cli:voice",
+        "Character Voice Memory tools (list/merge/undo/audition).",
+    ),
+    "character": (
+        "dubbing_pipeline.character.cli:character",
+        "Character utilities (voice memory + delivery profiles).",
+    ),
+    "lipsync": ("dubbing_pipeline.plugins.lipsync.cli:lipsync", "Lip-sync tools (optional)."),
+    "doctor": ("dubbing_pipeline.doctor.cli:doctor", "Setup wizard / doctor."),
+}
+
+cli = DefaultGroup(  # type: ignore[assignment]
+    name="dubbing-pipeline",
+    help="dubbing-pipeline CLI (run + review)",
+    lazy_commands=LAZY_COMMANDS,
+)
+
+
+def __getattr__(name: str) -> Any:
+    # `from dubbing_pipeline.cli import run` keeps working; it loads that command only.
+    if name in LAZY_COMMANDS:
+        return cli.get_command(None, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "DefaultGroup",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
 
 import click
@@ -13,16 +14,55 @@ class DefaultGroup(click.Group):
       dubbing-pipeline Input/Test.mp4 ...
     while enabling subcommands:
       dubbing-pipeline review ...
+
+    `lazy_commands` maps a command name to ("module:attr", short help). The module is imported
+    the first time the command is resolved, so startup only pays for the command that runs.
     """
 
-    def __init__(self, *args, default_cmd: str = "run", **kwargs) -> None:
+    def __init__(
+        self,
+        *args,
+        default_cmd: str = "run",
+        lazy_commands: dict[str, tuple[str, str]] | None = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.default_cmd = str(default_cmd)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*self.commands, *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context | None, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            target, _help = self.lazy_commands[cmd_name]
+            mod_name, _, attr = target.partition(":")
+            cmd = getattr(importlib.import_module(mod_name), attr)
+            self.add_command(cmd, cmd_name)
+        return self.commands.get(cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        # Listing the group must not import every subcommand: unloaded ones use their stub help.
+        names = [
+            n for n in self.list_commands(ctx) if not getattr(self.commands.get(n), "hidden", False)
+        ]
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(n) for n in names)
+        rows = []
+        for name in names:
+            cmd = self.commands.get(name)
+            if cmd is None:
+                cmd = click.Command(name, short_help=self.lazy_commands[name][1])
+            rows.append((name, cmd.get_short_help_str(limit)))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
 
     def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
         if args:
             first = args[0]
-            if first not in self.commands:
+            if first not in self.commands and first not in self.lazy_commands:
                 args.insert(0, self.default_cmd)
         return super().parse_args(ctx, args)
 
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import shutil
-import subprocess
 import time
 import os
 from contextlib import suppress
@@ -12,6 +11,7 @@ from click.exceptions import UsageError
 
 from .args_common import _assign_speakers, _parse_srt_to_cues, _select_device
 from .output_format import _write_srt_from_lines, _write_vtt_from_lines
+from dubbing_pipeline.cache.segments import read_cache_stats
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.stages import audio_extractor, mkv_export, tts
 from dubbing_pipeline.stages.align import AlignConfig, realign_srt
@@ -19,8 +19,12 @@ from dubbing_pipeline.audio.routing import resolve_diarization_input
 from dubbing_pipeline.stages.diarization import DiarizeConfig
 from dubbing_pipeline.stages.diarization import diarize as diarize_v2
 from dubbing_pipeline.stages.mixing import MixConfig, mix
-from dubbing_pipeline.stages.transcription import transcribe
-from dubbing_pipeline.stages.translation import TranslationConfig, translate_segments
+from dubbing_pipeline.stages.transcription import transcribe, whisper_translate_sidecar
+from dubbing_pipeline.stages.translation import (
+    TranslationConfig,
+    translate_segments,
+    wants_whisper_translate,
+)
 from dubbing_pipeline.utils.embeds import ecapa_embedding
 from dubbing_pipeline.utils.io import read_json
 from dubbing_pipeline.utils.log import logger
@@ -46,7 +50,7 @@ from dubbing_pipeline.utils.subtitles import write_vtt
     type=int,
     default=1,
     show_default=True,
-    help="Batch worker count (currently best-effort; batch runs sequentially by default)",
+    help="Batch worker processes (each keeps its models loaded across inputs)",
 )
 @click.option("--resume/--no-resume", default=True, show_default=True)
 @click.option("--fail-fast/--no-fail-fast", default=False, show_default=True)
@@ -887,10 +891,6 @@ def run(
 
     if batch_spec:
         import glob
-        import json
-        import sys
-        import tempfile
-        from concurrent.futures import ThreadPoolExecutor, as_completed
 
         spec = str(batch_spec)
         p = Path(spec)
@@ -1100,69 +1100,60 @@ def run(
                 )
             return
 
-        # jobs>1: execute isolated workers via subprocess for robustness.
-        with tempfile.TemporaryDirectory(prefix="dubbing_pipeline_batch_") as td:
-            td_p = Path(td)
-
-            specs: list[tuple[int, Path, Path]] = []
-            for idx, vp in enumerate(paths, 1):
-                if not vp.exists():
-                    msg = f"[batch {idx}/{len(paths)}] missing file: {vp}"
-                    if fail_fast:
-                        raise click.ClickException(msg)
-                    logger.warning(msg)
-                    continue
-                out_dir_b = output_dir_for(vp)
-                dub_mkv_b = out_dir_b / "dub.mkv"
-                if resume and dub_mkv_b.exists():
-                    logger.info("[batch %s/%s] skip (resume hit): %s", idx, len(paths), vp)
-                    continue
+        # jobs>1: persistent worker processes pull inputs one after another (models stay warm).
+        from dubbing_pipeline.batch_pool import BatchInput, run_batch_pool, write_batch_report
 
-                spec_path = td_p / f"{idx:05d}.json"
-                spec_path.write_text(
-                    json.dumps({"args": [str(vp), *base_args]}, indent=2, sort_keys=True),
-                    encoding="utf-8",
-                )
-                specs.append((idx, vp, spec_path))
-
-            if not specs:
-                logger.info("[dp] batch: nothing to do")
-                return
-
-            def _run_one(spec_path: Path) -> int:
-                cmd = [sys.executable, "-m", "dubbing_pipeline.batch_worker", str(spec_path)]
-                p = subprocess.run(cmd)
-                return int(p.returncode)
-
-            failures: list[str] = []
-            with ThreadPoolExecutor(max_workers=jobs_n) as ex:
-                futs = {ex.submit(_run_one, spec_path): (idx, vp) for idx, vp, spec_path in specs}
-                for fut in as_completed(futs):
-                    idx, vp = futs[fut]
-                    rc = 1
-                    try:
-                        rc = int(fut.result())
-                    except Exception as ex2:
-                        rc = 1
-                        logger.warning(
-                            "[batch %s/%s] worker exception: %s (%s)", idx, len(paths), vp, ex2
-                        )
-                    if rc != 0:
-                        failures.append(f"{vp} (exit={rc})")
-                        logger.warning(
-                            "[batch %s/%s] failed: %s (exit=%s)", idx, len(paths), vp, rc
-                        )
-                        if fail_fast:
-                            break
-                    else:
-                        logger.info("[batch %s/%s] ok: %s", idx, len(paths), vp)
+        items: list[BatchInput] = []
+        for idx, vp in enumerate(paths, 1):
+            if not vp.exists():
+                msg = f"[batch {idx}/{len(paths)}] missing file: {vp}"
+                if fail_fast:
+                    raise click.ClickException(msg)
+                logger.warning(msg)
+                continue
+            out_dir_b = output_dir_for(vp)
+            dub_mkv_b = out_dir_b / "dub.mkv"
+            if resume and dub_mkv_b.exists():
+                logger.info("[batch %s/%s] skip (resume hit): %s", idx, len(paths), vp)
+                continue
+            items.append(BatchInput(idx=idx, path=vp, args=[str(vp), *base_args]))
 
-            if failures and fail_fast:
-                raise click.ClickException("Batch failed (fail-fast):\n" + "\n".join(failures))
-            if failures:
-                logger.warning("Batch completed with failures:\n%s", "\n".join(failures))
+        if not items:
+            logger.info("[dp] batch: nothing to do")
             return
 
+        report = run_batch_pool(
+            items,
+            workers=jobs_n,
+            fail_fast=bool(fail_fast),
+            max_inputs_per_worker=int(get_settings().batch_worker_max_inputs or 0),
+            total=len(paths),
+        )
+        report["spec"] = str(batch_spec)
+        try:
+            rp = write_batch_report(report, Path(get_settings().output_dir) / "_batch")
+        except Exception as ex:
+            rp = None
+            logger.warning("[dp] batch report not written: %s", ex)
+        logger.info(
+            "[dp] batch done: ok=%s failed=%s skipped=%s workers=%s starts=%s (%.1fs) -> %s",
+            report["ok"],
+            report["failed"],
+            report["skipped"],
+            report["workers"],
+            report["worker_starts"],
+            float(report["wall_s"]),
+            rp,
+        )
+        failures = [
+            f"{r['path']} ({r['error']})" for r in report["inputs"] if r["status"] == "failed"
+        ]
+        if failures and fail_fast:
+            raise click.ClickException("Batch failed (fail-fast):\n" + "\n".join(failures))
+        if failures:
+            logger.warning("Batch completed with failures:\n%s", "\n".join(failures))
+        return
+
     assert video is not None
     if not video.exists():
         raise click.ClickException(f"Video not found: {video}")
@@ -1442,6 +1433,7 @@ def run(
 
     wav_path = (work_priv / "audio.wav") if priv.no_store_source_audio else (out_dir / "audio.wav")
     srt_out = (work_priv / f"{stem}.srt") if priv.no_store_transcript else (out_dir / f"{stem}.srt")
+    mt_cache_stats = out_dir / "analysis" / "mt_segment_cache.json"
     vtt_out = (work_priv / f"{stem}.vtt") if priv.no_store_transcript else (out_dir / f"{stem}.vtt")
     translated_srt = (
         (work_priv / f"{stem}.translated.srt")
@@ -1961,8 +1953,6 @@ def run(
                 pass
 
         if vm_store is not None and episode_key:
-            from contextlib import suppress
-
             with suppress(Exception):
                 vm_store.write_episode_mapping(
                     episode_key,
@@ -2053,6 +2043,9 @@ def run(
                 src_lang=src_lang,
                 tgt_lang=tgt_lang,
                 word_timestamps=want_words,
+                also_translate=(not no_translate)
+                and wants_whisper_translate(mt_engine, src_lang, tgt_lang),
+                use_segment_cache=not priv.no_store_transcript,
             )
             if write_stage_manifest is not None and file_fingerprint is not None:
                 with suppress(Exception):
@@ -2348,6 +2341,9 @@ def run(
                 whisper_model=chosen_model,
                 audio_path=str(extracted),
                 device=chosen_device,
+                whisper_translate_path=str(whisper_translate_sidecar(srt_out)),
+                use_segment_cache=not priv.no_store_transcript,
+                cache_stats_path=str(mt_cache_stats),
             )
             translated_segments = translate_segments(
                 segments_for_mt, src_lang=src_lang, tgt_lang=tgt_lang, cfg=cfg
@@ -2626,8 +2622,6 @@ def run(
             )
         except Exception as ex:
             logger.exception("[dp] translate failed (continuing with original text): %s", ex)
-            from contextlib import suppress
-
             with suppress(Exception):
                 write_json(
                     translated_json,
@@ -2966,6 +2960,12 @@ def run(
                     "out_dir": str(out_dir),
                     "wall_time_s": float(time.perf_counter() - t0),
                     "stage_durations_s": stage_durations,
+                    "segment_cache": {
+                        "transcribe": read_cache_stats(
+                            srt_out.with_suffix(".json"), field="segment_cache"
+                        ),
+                        "translate": read_cache_stats(mt_cache_stats),
+                    },
                 }
             )
         with suppress(Exception):
@@ -8,14 +8,13 @@ from typing import Any, Callable
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.modes import HardwareCaps, resolve_effective_settings
 from dubbing_pipeline.plugins.lipsync.wav2lip_plugin import Wav2LipPlugin
-from dubbing_pipeline.utils.doctor_types import CheckResult
-
-from dubbing_pipeline.api.routes_system import (  # noqa: E402
+from dubbing_pipeline.doctor.probes import (
     _can_import,
     _secret_configured,
     _whisper_cache_dirs,
     _whisper_model_cached,
 )
+from dubbing_pipeline.utils.doctor_types import CheckResult
 
 
 @dataclass(frozen=True, slots=True)
@@ -0,0 +1,49 @@
+"""
+Cheap install/cache probes shared by the doctor checks and the system API (no web imports).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from contextlib import suppress
+from pathlib import Path
+
+
+def _can_import(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except Exception:
+        return False
+
+
+def _secret_configured(secret: object | None) -> bool:
+    if secret is None:
+        return False
+    try:
+        # SecretStr
+        val = secret.get_secret_value()  # type: ignore[attr-defined]
+        return bool(str(val or "").strip())
+    except Exception:
+        return bool(str(secret).strip())
+
+
+def _whisper_cache_dirs() -> list[Path]:
+    dirs: list[Path] = []
+    with suppress(Exception):
+        env = os.environ.get("WHISPER_CACHE_DIR", "")
+        if env:
+            dirs.append(Path(env).expanduser().resolve())
+    with suppress(Exception):
+        dirs.append((Path.home() / ".cache" / "whisper").resolve())
+    return dirs
+
+
+def _whisper_model_cached(model_name: str) -> bool:
+    for root in _whisper_cache_dirs():
+        try:
+            if (root / f"{model_name}.pt").exists():
+                return True
+        except Exception:
+            continue
+    return False
@@ -6,7 +6,6 @@ from dataclasses import replace
 from pathlib import Path
 from typing import Any, Callable
 
-from dubbing_pipeline.api.remote_access import resolve_access_posture
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.doctor.container import (
     check_ffmpeg,
@@ -294,6 +293,9 @@ def check_security_secrets() -> CheckResult:
 
 
 def check_remote_access_posture() -> CheckResult:
+    # api.remote_access pulls in FastAPI; only this check needs it.
+    from dubbing_pipeline.api.remote_access import resolve_access_posture
+
     posture = resolve_access_posture()
     warnings = list(posture.get("warnings") or [])
     mode = str(posture.get("mode") or "off")
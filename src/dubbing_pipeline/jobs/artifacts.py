@@ -0,0 +1,317 @@
+"""
+Per-job artifact index.
+
+Stages register the outputs they write (kind, path, size, mtime, media info) in the job store as
+they finish; `/api/jobs/{id}/files`, `/outputs` and the preview endpoints answer from that index
+instead of probing candidate paths and walking the job tree on every poll.
+
+`index_job_artifacts()` rebuilds a job's index from disk. It runs when a job finishes (done,
+failed or canceled), lazily for jobs that were never indexed, and from
+`scripts/reindex_artifacts.py` (repair). Listings prune rows whose file has since disappeared.
+"""
+
+from __future__ import annotations
+
+import wave
+from collections.abc import Iterable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.utils.log import logger
+
+# Kinds listed in the `files` array of the files endpoint, in display order.
+FILE_KINDS = (
+    "mobile_hls_manifest",
+    "mobile_mp4",
+    "mobile_original_mp4",
+    "hls_manifest",
+    "lipsync_mp4",
+    "mp4",
+    "mkv",
+    "retention_report",
+    "audio_track",
+    "subs",
+)
+# Indexed but only exposed through dedicated keys/endpoints.
+OTHER_KINDS = ("audio_preview", "lowres_preview", "qa_summary", "qa_top_issues")
+
+AUDIO_TRACK_NAMES = (
+    "original_full.wav",
+    "dubbed_full.wav",
+    "background_only.wav",
+    "dialogue_only.wav",
+    "original_full.m4a",
+    "dubbed_full.m4a",
+    "background_only.m4a",
+    "dialogue_only.m4a",
+)
+
+_CONTENT_TYPES = {
+    ".mp4": "video/mp4",
+    ".mkv": "video/x-matroska",
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".srt": "application/x-subrip",
+    ".vtt": "text/vtt",
+    ".json": "application/json",
+    ".md": "text/markdown",
+}
+
+
+def classify_artifact(base_dir: Path, path: Path) -> str | None:
+    """
+    Map a file under Output/<job>/ to its artifact kind (None: not an indexed artifact).
+    """
+    try:
+        rel = Path(path).resolve().relative_to(Path(base_dir).resolve())
+    except Exception:
+        return None
+    parts = rel.parts
+    name = rel.name
+    if len(parts) == 1:
+        if name.endswith(".dub.mp4") or name == "dub.mp4":
+            return "mp4"
+        if name.endswith(".dub.mkv") or name == "dub.mkv":
+            return "mkv"
+        if name.endswith(".mp4") and "lipsync" in name:
+            return "lipsync_mp4"
+        return None
+    if parts[:2] == ("mobile", "hls") and len(parts) == 3 and name in ("index.m3u8", "master.m3u8"):
+        return "mobile_hls_manifest"
+    if name == "master.m3u8":
+        return "hls_manifest"
+    if len(parts) == 2:
+        folder = parts[0]
+        if folder == "mobile" and name == "mobile.mp4":
+            return "mobile_mp4"
+        if folder == "mobile" and name == "original.mp4":
+            return "mobile_original_mp4"
+        if folder == "preview" and name in ("audio_preview.m4a", "audio_preview.mp3"):
+            return "audio_preview"
+        if folder == "preview" and name == "preview_lowres.mp4":
+            return "lowres_preview"
+        if folder == "qa" and name == "summary.json":
+            return "qa_summary"
+        if folder == "qa" and name == "top_issues.md":
+            return "qa_top_issues"
+        if folder == "analysis" and name == "retention_report.json":
+            return "retention_report"
+        if folder == "subs" and rel.suffix in (".srt", ".vtt"):
+            return "subs"
+    if parts[:2] == ("audio", "tracks") and len(parts) == 3 and name in AUDIO_TRACK_NAMES:
+        return "audio_track"
+    return None
+
+
+def media_info(path: Path) -> dict[str, Any]:
+    """
+    Cheap media facts: content type, plus duration for WAV (header only).
+    """
+    info: dict[str, Any] = {"content_type": _CONTENT_TYPES.get(path.suffix.lower(), "")}
+    if path.suffix.lower() == ".wav":
+        with suppress(Exception), wave.open(str(path), "rb") as wf:
+            sr = wf.getframerate()
+            info["duration_s"] = float(wf.getnframes()) / float(sr) if sr else 0.0
+    return info
+
+
+def artifact_row(
+    base_dir: Path, path: Path, *, kind: str | None = None, media: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    p = Path(path).resolve()
+    kind = kind or classify_artifact(base_dir, p)
+    if not kind:
+        return None
+    try:
+        st = p.stat()
+    except Exception:
+        return None
+    if not p.is_file():
+        return None
+    info = media_info(p)
+    info.update(media or {})
+    return {
+        "kind": kind,
+        "path": str(p),
+        "size_bytes": int(st.st_size),
+        "mtime": float(st.st_mtime),
+        "media": info,
+    }
+
+
+def _candidates(base_dir: Path, *, deep: bool) -> Iterable[Path]:
+    for pat in ("*.mp4", "*.mkv"):
+        yield from base_dir.glob(pat)
+    for sub, names in (
+        ("mobile", ("mobile.mp4", "original.mp4")),
+        ("mobile/hls", ("index.m3u8", "master.m3u8")),
+        ("preview", ("audio_preview.m4a", "audio_preview.mp3", "preview_lowres.mp4")),
+        ("qa", ("summary.json", "top_issues.md")),
+        ("analysis", ("retention_report.json",)),
+        ("audio/tracks", AUDIO_TRACK_NAMES),
+    ):
+        for n in names:
+            yield base_dir / sub / n
+    subs_dir = base_dir / "subs"
+    if subs_dir.is_dir():
+        yield from subs_dir.glob("*.srt")
+        yield from subs_dir.glob("*.vtt")
+    if deep:
+        # HLS trees can hold thousands of segments; only the repair path walks them.
+        yield from base_dir.rglob("master.m3u8")
+
+
+def scan_job_artifacts(base_dir: Path, *, deep: bool = True) -> list[dict[str, Any]]:
+    """
+    Probe Output/<job>/ for known artifacts. `deep=False` skips the recursive HLS search.
+    """
+    base_dir = Path(base_dir)
+    rows: dict[str, dict[str, Any]] = {}
+    for p in _candidates(base_dir, deep=deep):
+        with suppress(Exception):
+            if not p.exists():
+                continue
+            row = artifact_row(base_dir, p)
+            if row is not None:
+                rows.setdefault(row["path"], row)
+    return list(rows.values())
+
+
+def register_artifacts(
+    store: Any,
+    job_id: str,
+    base_dir: Path,
+    paths: Iterable[Path | str],
+    *,
+    media: dict[str, Any] | None = None,
+) -> int:
+    """
+    Add/refresh index rows for files a stage just wrote (unknown kinds are ignored).
+    Returns the index revision. Best-effort: never raises.
+    """
+    try:
+        rows = []
+        for p in paths:
+            row = artifact_row(base_dir, Path(p), media=media)
+            if row is not None:
+                rows.append(row)
+        return int(store.upsert_job_artifacts(str(job_id), rows))
+    except Exception as ex:
+        logger.warning("artifact_register_failed", job_id=str(job_id), error=str(ex))
+        return 0
+
+
+def index_job_artifacts(
+    store: Any, job_id: str, base_dir: Path, *, deep: bool = True
+) -> list[dict[str, Any]]:
+    """
+    Rebuild the index of one job from disk (drops rows for files that are gone).
+    """
+    rows = scan_job_artifacts(base_dir, deep=deep)
+    if not deep:
+        # Keep HLS manifests registered by stages when skipping the tree walk.
+        _meta, old = store.list_job_artifacts(str(job_id))
+        seen = {r["path"] for r in rows}
+        for r in old:
+            if r["kind"] == "hls_manifest" and r["path"] not in seen:
+                row = artifact_row(base_dir, Path(r["path"]), kind="hls_manifest")
+                if row is not None:
+                    rows.append(row)
+    store.upsert_job_artifacts(str(job_id), rows, replace=True)
+    logger.info("artifact_index_rebuilt", job_id=str(job_id), artifacts=len(rows), deep=deep)
+    return rows
+
+
+def prune_missing_artifacts(store: Any, job_id: str, rows: list[dict[str, Any]]) -> bool:
+    """
+    Drop index rows whose file is gone (retention, manual cleanup). The revision moves, so
+    cached listings revalidate. Returns True when rows were dropped.
+    """
+    present = [r for r in rows if Path(r["path"]).is_file()]
+    if len(present) == len(rows):
+        return False
+    store.upsert_job_artifacts(str(job_id), present, replace=True)
+    logger.info("artifact_index_pruned", job_id=str(job_id), dropped=len(rows) - len(present))
+    return True
+
+
+def _preference(kind: str, name: str, stem: str) -> tuple[int, str]:
+    """
+    Order several files of one kind like the old candidate lists did.
+    """
+    preferred = {
+        "mp4": (f"{stem}.dub.mp4", "dub.mp4"),
+        "mkv": (f"{stem}.dub.mkv", "dub.mkv"),
+        "lipsync_mp4": ("final_lipsynced.mp4", f"{stem}.final_lipsynced.mp4"),
+        "mobile_hls_manifest": ("index.m3u8", "master.m3u8"),
+        "audio_preview": ("audio_preview.m4a", "audio_preview.mp3"),
+        "audio_track": AUDIO_TRACK_NAMES,
+    }.get(kind, ())
+    if name in preferred:
+        return (preferred.index(name), name)
+    if kind == "subs":
+        return (0 if name.endswith(".srt") else 1, name)
+    return (len(preferred), name)
+
+
+def pick(rows: list[dict[str, Any]], kind: str, *, stem: str = "") -> dict[str, Any] | None:
+    cands = [r for r in rows if r.get("kind") == kind]
+    if not cands:
+        return None
+    return min(cands, key=lambda r: _preference(kind, Path(r["path"]).name, stem))
+
+
+def files_payload(rows: list[dict[str, Any]], *, stem: str, out_root: Path) -> dict[str, Any]:
+    """
+    Response body of `/api/jobs/{id}/files` built from index rows.
+    """
+
+    def rel_url(p: str) -> str:
+        rel = str(Path(p).resolve().relative_to(out_root)).replace("\\", "/")
+        return f"/files/{rel}"
+
+    def ref(row: dict[str, Any] | None) -> dict[str, str] | None:
+        return {"url": rel_url(row["path"]), "path": row["path"]} if row else None
+
+    files: list[dict[str, Any]] = []
+    for kind in FILE_KINDS:
+        if kind in ("audio_track", "subs"):
+            chosen = sorted(
+                (r for r in rows if r.get("kind") == kind),
+                key=lambda r, k=kind: _preference(k, Path(r["path"]).name, stem),
+            )
+        else:
+            one = pick(rows, kind, stem=stem)
+            chosen = [one] if one is not None else []
+        for r in chosen:
+            with suppress(Exception):
+                files.append(
+                    {
+                        "kind": kind,
+                        "name": Path(r["path"]).name,
+                        "path": r["path"],
+                        "url": rel_url(r["path"]),
+                        "size_bytes": int(r["size_bytes"]),
+                        "mtime": float(r["mtime"]),
+                    }
+                )
+
+    mobile_hls = pick(rows, "mobile_hls_manifest", stem=stem)
+    mobile_mp4 = pick(rows, "mobile_mp4", stem=stem)
+    data: dict[str, Any] = {
+        "files": files,
+        # Prefer mobile playback sources for the built-in player keys.
+        "hls_manifest": ref(mobile_hls or pick(rows, "hls_manifest", stem=stem)),
+        "lipsync_mp4": ref(pick(rows, "lipsync_mp4", stem=stem)),
+        "mp4": ref(mobile_mp4 or pick(rows, "mp4", stem=stem)),
+        "mkv": ref(pick(rows, "mkv", stem=stem)),
+        "mobile_mp4": ref(mobile_mp4),
+        "mobile_original_mp4": ref(pick(rows, "mobile_original_mp4", stem=stem)),
+        "mobile_hls_manifest": ref(mobile_hls),
+        "qa_summary": ref(pick(rows, "qa_summary", stem=stem)),
+        "qa_top_issues": ref(pick(rows, "qa_top_issues", stem=stem)),
+    }
+    return data
@@ -110,6 +110,20 @@ def _resolve_limits_for_user(*, user_role: Role, user_quota: dict[str, int] | No
     return max_active, max_queued
 
 
+def dispatch_limits() -> dict[str, int]:
+    """
+    The settings-derived inputs of `evaluate_dispatch`, for backends that apply the same rules
+    server-side (RedisQueue's dispatch script).
+    """
+    s = get_settings()
+    max_active, _ = _resolve_limits_for_user(user_role=Role.operator, user_quota=None)
+    return {
+        "default_max_running": int(max_active),
+        "high_admin_only": int(bool(getattr(s, "high_mode_admin_only", True))),
+        "max_high_running_global": max(0, int(getattr(s, "max_high_running_global", 1))),
+    }
+
+
 def evaluate_dispatch(
     *,
     user_id: str,
@@ -128,6 +142,8 @@ def evaluate_dispatch(
     Dispatch-time safety net.
 
     Enforced even if submission-time checks were skipped/stale.
+    Keep in sync with `queue.redis_queue_impl._DISPATCH_LUA`, which applies the same checks
+    atomically in Redis (inputs from `dispatch_limits()`).
     """
     s = get_settings()
     mode = str(requested_mode or "medium").strip().lower()
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import os
 import re
 import shutil
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import Future
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
+from dubbing_pipeline.cache.segments import read_cache_stats
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs.artifacts import index_job_artifacts, register_artifacts
 from dubbing_pipeline.jobs.checkpoint import (
     read_ckpt,
     record_stage_skipped,
@@ -33,15 +39,31 @@ from dubbing_pipeline.ops.metrics import (
     tts_seconds,
     whisper_seconds,
 )
+from dubbing_pipeline.ops.spans import (
+    TRACE_FILENAME,
+    SpanRecorder,
+    install_recorder,
+    reset_recorder,
+    start_span,
+)
 from dubbing_pipeline.runtime.scheduler import Scheduler
 from dubbing_pipeline.security.crypto import CryptoConfigError, decrypt_file, is_encrypted_path
 from dubbing_pipeline.stages import audio_extractor, mkv_export, tts
-from dubbing_pipeline.ops import audit
+from dubbing_pipeline.ops import audit, profiler
 from dubbing_pipeline.stages.diarization import DiarizeConfig
 from dubbing_pipeline.stages.diarization import diarize as diarize_v2
 from dubbing_pipeline.stages.mixing import MixConfig, mix
-from dubbing_pipeline.stages.transcription import transcribe
-from dubbing_pipeline.stages.translation import TranslationConfig, translate_segments
+from dubbing_pipeline.stages.transcription import (
+    asr_journal_path,
+    follow_asr_journal,
+    transcribe,
+    whisper_translate_sidecar,
+)
+from dubbing_pipeline.stages.translation import (
+    TranslationConfig,
+    translate_segments,
+    wants_whisper_translate,
+)
 from dubbing_pipeline.utils.circuit import Circuit
 from dubbing_pipeline.utils.ffmpeg_safe import extract_audio_mono_16k
 from dubbing_pipeline.utils.hashio import hash_audio_from_video
@@ -132,6 +154,10 @@ class JobQueue:
         qb = getattr(self, "queue_backend", None)
         for j in self.store.list(limit=1000):
             if j.state in {JobState.QUEUED, JobState.RUNNING}:
+                # Worker pool: a job another live worker is running is not ours to recover.
+                with suppress(Exception):
+                    if qb is not None and await qb.is_claimed_elsewhere(str(j.id)):
+                        continue
                 self.store.update(j.id, state=JobState.QUEUED, message="Recovered after restart")
                 if qb is not None:
                     try:
@@ -331,13 +357,26 @@ class JobQueue:
             with suppress(Exception):
                 self.store.append_log(job_id, msg)
 
+        open_spans: dict[str, Any] = {}
+        trace_path: Path | None = None
+
         def _stage_start(stage: str) -> float:
             _log_stage_event(stage, "start")
+            with suppress(Exception):
+                open_spans[str(stage)] = start_span(str(stage), kind="stage")
             return time.perf_counter()
 
         def _stage_end(stage: str, t0: float, *, outcome: str, error: str | None = None) -> None:
             dt = max(0.0, time.perf_counter() - float(t0 or 0.0)) if t0 else 0.0
             _log_stage_event(stage, "end", outcome=outcome, duration_s=dt, error=error)
+            sp = open_spans.pop(str(stage), None)
+            if sp is None:
+                return
+            with suppress(Exception):
+                sp.finish(outcome=str(outcome), error=error)
+            with suppress(Exception):
+                if trace_path is not None:
+                    span_rec.write(trace_path)
 
         limits = get_limits()
         sched = Scheduler.instance_optional()
@@ -419,6 +458,7 @@ class JobQueue:
         work_dir.mkdir(parents=True, exist_ok=True)
         log_path = base_dir / "job.log"
         ckpt_path = base_dir / ".checkpoint.json"
+        trace_path = base_dir / "logs" / TRACE_FILENAME
         ckpt = read_ckpt(job_id, ckpt_path=ckpt_path) or {}
         # runtime report fields persisted on the job
         runtime.setdefault("attempts", {})
@@ -433,6 +473,14 @@ class JobQueue:
             runtime=runtime,
         )
 
+        # Per-job span recorder (stages + sub-steps) -> Prometheus + <job>/logs/trace.json
+        span_rec = SpanRecorder(
+            str(job_id), mode=str(job.mode or ""), device=_select_device(str(job.device or ""))
+        )
+        span_token = install_recorder(span_rec)
+        # Opt-in sampling profiler (PROFILING_ENABLED=1; armed via /api/runtime/profiler).
+        with suppress(Exception):
+            profiler.register_job(str(job_id), base_dir / "logs")
         t0 = time.perf_counter()
         settings = get_settings()
         # Two-pass voice cloning orchestration (pass1: no-clone; pass2: rerun TTS+mix using extracted refs).
@@ -541,6 +589,8 @@ class JobQueue:
                 raise RuntimeError(f"forbidden_stage:{stage}")
 
         decrypted_video: Path | None = None
+        # Set when the job ends: stops an ASR run started alongside diarization if unused.
+        asr_abandon = threading.Event()
         try:
             await self._check_canceled(job_id)
 
@@ -662,7 +712,7 @@ class JobQueue:
                             cancel_exc=JobCanceled(),
                         )
                     else:
-                        with sched.phase("audio"):
+                        with sched.phase("audio", job_id=job_id):
                             wav = run_with_timeout(
                                 "audio_extract",
                                 timeout_s=limits.timeout_audio_s,
@@ -773,7 +823,35 @@ class JobQueue:
                         music_regions_path_work = raw
                     _note_pass2_skip("music_detect", "reuse_existing")
                     raise _Pass2Skip()
-                if bool(getattr(settings, "music_detect", False)):
+                oped_index = None
+                if bool(getattr(settings, "op_ed_fingerprint", False)):
+                    try:
+                        from dubbing_pipeline.audio.oped_index import SeriesOpEdIndex
+
+                        oped_index = SeriesOpEdIndex.for_episode(
+                            store=self.store,
+                            series_slug=str(getattr(job, "series_slug", "") or ""),
+                            wav=Path(str(wav)),
+                            min_score=float(getattr(settings, "op_ed_fingerprint_min_score", 0.10)),
+                        )
+                    except Exception as ex:
+                        self.store.append_log(job_id, f"[{now_utc()}] oped_index failed: {ex}")
+                        oped_index = None
+                    if oped_index is not None:
+                        self.store.append_log(
+                            job_id,
+                            f"[{now_utc()}] oped_index matches="
+                            + ",".join(
+                                f"{m.kind}@{m.start_s:.1f}-{m.end_s:.1f}:{m.score:.2f}"
+                                for m in oped_index.matches
+                            ),
+                        )
+                # Detection follows MUSIC_DETECT / OP_ED_DETECT; the index only adds its matches
+                # (and learns from OP/ED spans when detection ran).
+                music_on = bool(getattr(settings, "music_detect", False))
+                oped_on = bool(getattr(settings, "op_ed_detect", False))
+                oped_matched = oped_index is not None and bool(oped_index.matches)
+                if music_on or oped_matched:
                     from dubbing_pipeline.audio.music_detect import (
                         analyze_audio_for_music_regions,
                         detect_op_ed,
@@ -782,11 +860,15 @@ class JobQueue:
                     )
                     from dubbing_pipeline.utils.io import atomic_copy
 
-                    regs = analyze_audio_for_music_regions(
-                        Path(str(wav)),
-                        mode=str(getattr(settings, "music_mode", "auto") or "auto"),
-                        threshold=float(getattr(settings, "music_threshold", 0.70)),
-                    )
+                    regs = []
+                    if music_on:
+                        regs = analyze_audio_for_music_regions(
+                            Path(str(wav)),
+                            mode=str(getattr(settings, "music_mode", "auto") or "auto"),
+                            threshold=float(getattr(settings, "music_threshold", 0.70)),
+                        )
+                    if oped_index is not None:
+                        regs = oped_index.music_regions(regs)
                     music_regions_path_work = analysis_dir / "music_regions.json"
                     write_regions_json(regs, music_regions_path_work)
                     with suppress(Exception):
@@ -797,13 +879,20 @@ class JobQueue:
                         job_id,
                         f"[{now_utc()}] music_detect regions={len(regs)} threshold={float(getattr(settings, 'music_threshold', 0.70)):.2f}",
                     )
-                    if bool(getattr(settings, "op_ed_detect", False)):
-                        oped = detect_op_ed(
-                            Path(str(wav)),
-                            music_regions=regs,
-                            seconds=int(getattr(settings, "op_ed_seconds", 90)),
-                            threshold=float(getattr(settings, "music_threshold", 0.70)),
-                        )
+                    if oped_on or oped_matched:
+                        oped: dict = {"op": None, "ed": None}
+                        if oped_on:
+                            oped = detect_op_ed(
+                                Path(str(wav)),
+                                music_regions=regs,
+                                seconds=int(getattr(settings, "op_ed_seconds", 90)),
+                                threshold=float(getattr(settings, "music_threshold", 0.70)),
+                            )
+                        if oped_index is not None:
+                            oped = oped_index.op_ed(oped)
+                            if oped_on:
+                                with suppress(Exception):
+                                    oped_index.learn(oped, regs, job_id=job_id)
                         oped_path = analysis_dir / "op_ed.json"
                         write_oped_json(oped, oped_path)
                         with suppress(Exception):
@@ -923,6 +1012,157 @@ class JobQueue:
                 else:
                     background_wav = Path(str(wav))
 
+            srt_out = work_dir / f"{stem}.srt"
+            srt_meta = srt_out.with_suffix(".json")
+
+            def _effective_mode_settings() -> Any:
+                from dubbing_pipeline.modes import resolve_effective_settings
+
+                curj = self.store.get(job_id)
+                rt_mode = dict((curj.runtime or {}) if curj else runtime)
+                base = {
+                    "diarizer": str(getattr(settings, "diarizer", "auto")),
+                    "speaker_smoothing": bool(getattr(settings, "speaker_smoothing", False)),
+                    "voice_memory": bool(getattr(settings, "voice_memory", False)),
+                    "voice_mode": str(getattr(settings, "voice_mode", "clone")),
+                    "voice_clone_two_pass": bool(getattr(settings, "voice_clone_two_pass", False)),
+                    "music_detect": bool(getattr(settings, "music_detect", False)),
+                    "separation": str(getattr(settings, "separation", "off")),
+                    "mix_mode": str(getattr(settings, "mix_mode", "legacy")),
+                    "timing_fit": bool(getattr(settings, "timing_fit", False)),
+                    "pacing": bool(getattr(settings, "pacing", False)),
+                    "qa": bool(rt_mode.get("qa") or False),
+                    "director": bool(getattr(settings, "director", False)),
+                    "multitrack": bool(getattr(settings, "multitrack", False)),
+                    "stream_context_seconds": float(
+                        getattr(settings, "stream_context_seconds", 15.0) or 15.0
+                    ),
+                }
+                # No job-level ASR model override yet: the mode picks the model.
+                return resolve_effective_settings(
+                    mode=(job.mode or "medium").lower(), base=base, overrides={}
+                )
+
+            def _imported_transcript() -> tuple[str, str]:
+                """(src_srt_path, transcript_json_path) supplied at submit time, if any."""
+                try:
+                    curj = self.store.get(job_id)
+                    rt_imp = dict((curj.runtime or {}) if curj else runtime)
+                    imp = rt_imp.get("imports") if isinstance(rt_imp.get("imports"), dict) else {}
+                    return (
+                        str((imp or {}).get("src_srt_path") or "").strip(),
+                        str((imp or {}).get("transcript_json_path") or "").strip(),
+                    )
+                except Exception:
+                    return "", ""
+
+            def _run_asr(model_name: str, device: str, cancel_check: Callable[[], bool]) -> None:
+                kwargs = {
+                    "audio_path": wav,
+                    "srt_out": srt_out,
+                    "device": device,
+                    "model_name": model_name,
+                    "task": "transcribe",
+                    "src_lang": job.src_lang,
+                    "tgt_lang": job.tgt_lang,
+                    "job_id": job_id,
+                    "audio_hash": audio_hash,
+                    "use_segment_cache": not bool(runtime.get("no_store_transcript") or False),
+                    "word_timestamps": bool(get_settings().whisper_word_timestamps),
+                    "also_translate": wants_whisper_translate(
+                        str(get_settings().mt_engine), job.src_lang, job.tgt_lang
+                    ),
+                }
+                # The combined pass also does the translate phase's Whisper decode (MT then reads
+                # its sidecar), so the phase gets that budget on top of its own.
+                timeout_s = int(limits.timeout_whisper_s) + (
+                    int(limits.timeout_translate_s) if kwargs["also_translate"] else 0
+                )
+                # The shard pool (stages.asr_shards) starts processes: not from a daemonic child.
+                sharded = (
+                    int(getattr(settings, "asr_shard_workers", 0) or 0) > 1 and device == "cpu"
+                )
+                stop_asr_feed = (
+                    self._start_asr_feed(
+                        job_id=job_id, srt_out=srt_out, duration_s=float(job.duration_s or 0.0)
+                    )
+                    if bool(getattr(settings, "asr_streaming", False))
+                    else None
+                )
+                try:
+                    if sched is None:
+                        run_with_timeout(
+                            "transcribe",
+                            timeout_s=timeout_s,
+                            fn=transcribe,
+                            kwargs=kwargs,
+                            cancel_check=cancel_check,
+                            cancel_exc=JobCanceled(),
+                            daemon=not sharded,
+                        )
+                    else:
+                        with sched.phase(
+                            "transcribe", job_id=job_id, model=model_name, device=device
+                        ):
+                            run_with_timeout(
+                                "transcribe",
+                                timeout_s=timeout_s,
+                                fn=transcribe,
+                                kwargs=kwargs,
+                                cancel_check=cancel_check,
+                                cancel_exc=JobCanceled(),
+                                daemon=not sharded,
+                            )
+                finally:
+                    if stop_asr_feed is not None:
+                        stop_asr_feed()
+
+            # Diarization and ASR both read only the extracted audio: with STAGE_GRAPH_WORKERS > 1
+            # whisper starts now, in its own watchdog process, and the transcribe step waits for it.
+            asr_prefetch: Future | None = None
+            asr_prefetch_model = ""
+            if (
+                not is_pass2_outer
+                and int(getattr(settings, "stage_graph_workers", 2) or 1) > 1
+                and not (
+                    srt_out.exists() and srt_meta.exists() and stage_is_done(ckpt, "transcribe")
+                )
+                and not any(_imported_transcript())
+            ):
+                try:
+                    _fail_if_forbidden_stage("transcribe")
+                    asr_prefetch_model = str(_effective_mode_settings().asr_model)
+                except Exception:
+                    asr_prefetch_model = ""
+            if asr_prefetch_model:
+                asr_prefetch = Future()
+
+                def _prefetch_asr(
+                    fut: Future = asr_prefetch, model_name: str = asr_prefetch_model
+                ) -> None:
+                    try:
+                        _run_asr(
+                            model_name,
+                            _select_device(job.device),
+                            lambda: asr_abandon.is_set() or _cancel_check_sync(),
+                        )
+                    except BaseException as ex:
+                        fut.set_exception(ex)
+                        return
+                    fut.set_result(None)
+
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(_prefetch_asr,),
+                    name=f"asr-{job_id}",
+                    daemon=True,
+                ).start()
+                self.store.append_log(
+                    job_id,
+                    f"[{now_utc()}] transcribe started alongside diarize "
+                    f"model={asr_prefetch_model}",
+                )
+
             # b) diarize.identify (~0.25) (optional)
             diar_json_work = work_dir / "diarization.work.json"
             diar_json_public = base_dir / "diarization.json"
@@ -1599,33 +1839,8 @@ class JobQueue:
             await self._check_canceled(job_id)
 
             # c) transcription.transcribe (~0.60)
-            mode = (job.mode or "medium").lower()
             try:
-                from dubbing_pipeline.modes import resolve_effective_settings
-
-                base = {
-                    "diarizer": str(getattr(settings, "diarizer", "auto")),
-                    "speaker_smoothing": bool(getattr(settings, "speaker_smoothing", False)),
-                    "voice_memory": bool(getattr(settings, "voice_memory", False)),
-                    "voice_mode": str(getattr(settings, "voice_mode", "clone")),
-                    "voice_clone_two_pass": bool(
-                        getattr(settings, "voice_clone_two_pass", False)
-                    ),
-                    "music_detect": bool(getattr(settings, "music_detect", False)),
-                    "separation": str(getattr(settings, "separation", "off")),
-                    "mix_mode": str(getattr(settings, "mix_mode", "legacy")),
-                    "timing_fit": bool(getattr(settings, "timing_fit", False)),
-                    "pacing": bool(getattr(settings, "pacing", False)),
-                    "qa": bool(rt2.get("qa") or False) if isinstance(rt2, dict) else False,
-                    "director": bool(getattr(settings, "director", False)),
-                    "multitrack": bool(getattr(settings, "multitrack", False)),
-                    "stream_context_seconds": float(
-                        getattr(settings, "stream_context_seconds", 15.0) or 15.0
-                    ),
-                }
-                overrides: dict[str, Any] = {}
-                # job-level override for ASR model isn't currently a first-class field; keep mode-based selection.
-                eff = resolve_effective_settings(mode=mode, base=base, overrides=overrides)
+                eff = _effective_mode_settings()
                 model_name = str(eff.asr_model)
                 # Apply mode-driven diarizer (not persisted; only affects this run)
                 eff_diar = str(eff.diarizer)
@@ -1636,7 +1851,6 @@ class JobQueue:
             except Exception:
                 model_name = "medium"
             device = _select_device(job.device)
-            srt_out = work_dir / f"{stem}.srt"
             # Persist a stable copy in Output/<stem>/ for inspection / playback.
             srt_public = base_dir / f"{stem}.srt"
             transcribe_t0 = _stage_start("transcribe")
@@ -1649,7 +1863,6 @@ class JobQueue:
             try:
                 with time_hist(pipeline_transcribe_seconds) as elapsed:
                     t_wh0 = time.perf_counter()
-                    srt_meta = srt_out.with_suffix(".json")
                     if is_pass2_outer and not (
                         srt_out.exists() and srt_meta.exists() and stage_is_done(ckpt, "transcribe")
                     ):
@@ -1682,19 +1895,7 @@ class JobQueue:
                         transcribe_outcome = "skipped"
                     else:
                         # Import path: if a source SRT/transcript was provided at submit time, skip ASR.
-                        try:
-                            curj = self.store.get(job_id)
-                            rt_imp = dict((curj.runtime or {}) if curj else runtime)
-                            imp = (
-                                rt_imp.get("imports")
-                                if isinstance(rt_imp.get("imports"), dict)
-                                else {}
-                            )
-                            src_p = str((imp or {}).get("src_srt_path") or "").strip()
-                            js_p = str((imp or {}).get("transcript_json_path") or "").strip()
-                        except Exception:
-                            src_p = ""
-                            js_p = ""
+                        src_p, js_p = _imported_transcript()
                         if src_p or js_p:
                             from dubbing_pipeline.utils.io import atomic_copy, read_json, write_json
 
@@ -1771,51 +1972,18 @@ class JobQueue:
                             _fail_if_forbidden_stage("transcribe")
                             with suppress(Exception):
                                 record_stage_started(job_id, "transcribe", ckpt_path=ckpt_path)
-                            if sched is None:
-                                run_with_timeout(
-                                    "transcribe",
-                                    timeout_s=limits.timeout_whisper_s,
-                                    fn=transcribe,
-                                    kwargs={
-                                        "audio_path": wav,
-                                        "srt_out": srt_out,
-                                        "device": device,
-                                        "model_name": model_name,
-                                        "task": "transcribe",
-                                        "src_lang": job.src_lang,
-                                        "tgt_lang": job.tgt_lang,
-                                        "job_id": job_id,
-                                        "audio_hash": audio_hash,
-                                        "word_timestamps": bool(
-                                            get_settings().whisper_word_timestamps
-                                        ),
-                                    },
-                                    cancel_check=_cancel_check_sync,
-                                    cancel_exc=JobCanceled(),
-                                )
+                            if asr_prefetch is not None and asr_prefetch_model == model_name:
+                                asr_prefetch.result()
                             else:
-                                with sched.phase("transcribe"):
-                                    run_with_timeout(
-                                        "transcribe",
-                                        timeout_s=limits.timeout_whisper_s,
-                                        fn=transcribe,
-                                        kwargs={
-                                            "audio_path": wav,
-                                            "srt_out": srt_out,
-                                            "device": device,
-                                            "model_name": model_name,
-                                            "task": "transcribe",
-                                            "src_lang": job.src_lang,
-                                            "tgt_lang": job.tgt_lang,
-                                            "job_id": job_id,
-                                            "audio_hash": audio_hash,
-                                            "word_timestamps": bool(
-                                                get_settings().whisper_word_timestamps
-                                            ),
-                                        },
-                                        cancel_check=_cancel_check_sync,
-                                        cancel_exc=JobCanceled(),
-                                    )
+                                if asr_prefetch is not None:
+                                    # Mode resolved differently since: drop the early run first.
+                                    asr_abandon.set()
+                                    with suppress(BaseException):
+                                        asr_prefetch.result()
+                                _run_asr(model_name, device, _cancel_check_sync)
+                        self._record_segment_cache(
+                            job_id, "transcribe", read_cache_stats(srt_meta, field="segment_cache")
+                        )
                         # reflect circuit state into job (only when we actually ran transcribe)
                         try:
                             curj = self.store.get(job_id)
@@ -2480,6 +2648,8 @@ class JobQueue:
                 try:
                     from dubbing_pipeline.utils.io import write_json
 
+                    mt_cache_stats = work_dir / "analysis" / "mt_segment_cache.json"
+                    mt_cache_stats.unlink(missing_ok=True)
                     cfg = TranslationConfig(
                         mt_engine=str(settings.mt_engine),
                         mt_lowconf_thresh=float(settings.mt_lowconf_thresh),
@@ -2489,6 +2659,9 @@ class JobQueue:
                         whisper_model=model_name,
                         audio_path=str(wav),
                         device=device,
+                        whisper_translate_path=str(whisper_translate_sidecar(srt_out)),
+                        use_segment_cache=not bool(runtime.get("no_store_transcript") or False),
+                        cache_stats_path=str(mt_cache_stats),
                     )
                     _fail_if_forbidden_stage("translate")
                     translated_segments = run_with_timeout(
@@ -2500,6 +2673,9 @@ class JobQueue:
                         cancel_check=_cancel_check_sync,
                         cancel_exc=JobCanceled(),
                     )
+                    self._record_segment_cache(
+                        job_id, "translate", read_cache_stats(mt_cache_stats)
+                    )
                     # Tier-Next E: optional project style guide (best-effort; OFF by default).
                     try:
                         curj = self.store.get(job_id)
@@ -2963,6 +3139,8 @@ class JobQueue:
                             )
                         except Exception:
                             pass
+                        from dubbing_pipeline.review.state import has_review_state
+
                         review_state = base_dir / "review" / "state.json"
                         # Pronunciation dictionary + per-segment overrides (best-effort).
                         pron_dict = []
@@ -3033,7 +3211,9 @@ class JobQueue:
                             translated_json=translated_json if translated_json.exists() else None,
                             diarization_json=diar_json_work if diar_json_work.exists() else None,
                             wav_out=tts_wav,
-                            review_state_path=review_state if review_state.exists() else None,
+                            review_state_path=(
+                                review_state if has_review_state(base_dir) else None
+                            ),
                             voice_map_json_path=voice_map_json,
                             tts_lang=tts_lang,
                             tts_speaker=tts_speaker,
@@ -3126,7 +3306,7 @@ class JobQueue:
                                 cancel_exc=JobCanceled(),
                             )
                         else:
-                            with sched.phase("tts"):
+                            with sched.phase("tts", job_id=job_id):
                                 run_with_timeout(
                                     "tts",
                                     timeout_s=limits.timeout_tts_s,
@@ -3503,7 +3683,7 @@ class JobQueue:
                                     cancel_exc=JobCanceled(),
                                 )
                             else:
-                                with sched.phase("mux"):
+                                with sched.phase("mux", job_id=job_id):
                                     outs = run_with_timeout(
                                         "mix",
                                         timeout_s=limits.timeout_mix_s,
@@ -3528,7 +3708,7 @@ class JobQueue:
                                     cancel_exc=JobCanceled(),
                                 )
                             else:
-                                with sched.phase("mux"):
+                                with sched.phase("mux", job_id=job_id):
                                     outs = run_with_timeout(
                                         "mix",
                                         timeout_s=limits.timeout_mix_s,
@@ -3684,7 +3864,7 @@ class JobQueue:
                             used_mux_fallback = True
                         mux_t0 = _stage_start("mux")
                         try:
-                            with sched.phase("mux"):
+                            with sched.phase("mux", job_id=job_id):
                                 run_with_timeout(
                                     "mux",
                                     timeout_s=limits.timeout_mux_s,
@@ -3791,122 +3971,162 @@ class JobQueue:
                         await self.enqueue_id(job_id)
                 return
 
-            # Mobile-friendly playback outputs (H.264/AAC MP4 + optional HLS).
-            try:
-                if is_pass2_outer:
-                    _note_pass2_skip("mobile_outputs", "pass2_skip")
-                    raise _Pass2Skip()
-                if bool(getattr(settings, "mobile_outputs", True)):
-                    from dubbing_pipeline.stages.export import export_mobile_hls, export_mobile_mp4
+            # Post-mux exports (mobile MP4/HLS + preview variants) have no data dependency on
+            # each other, so they run as a stage graph: independent nodes execute concurrently
+            # (bounded by STAGE_GRAPH_WORKERS and Scheduler mux caps) and reuse per-node
+            # checkpoints.
+            from dubbing_pipeline.jobs.stage_graph import (
+                StageGraph,
+                StageNode,
+                run_stage_graph,
+                write_stage_timeline,
+            )
 
-                    mobile_dir = (base_dir / "mobile").resolve()
-                    mobile_dir.mkdir(parents=True, exist_ok=True)
+            export_graph = StageGraph()
+            # Prefer enhanced final mix when present, else TTS track.
+            dubbed_wav = (
+                (base_dir / "audio" / "final_mix.wav")
+                if (base_dir / "audio" / "final_mix.wav").exists()
+                else tts_wav
+            )
 
-                    # Prefer enhanced final mix when present, else TTS track.
-                    dubbed_wav = (
-                        (base_dir / "audio" / "final_mix.wav")
-                        if (base_dir / "audio" / "final_mix.wav").exists()
-                        else tts_wav
-                    )
-                    # Dubbed mobile MP4 (default)
-                    run_with_timeout(
-                        "export_mobile_mp4_dubbed",
+            def _export_node(name: str, fn, kwargs: dict[str, Any]):
+                def _call():
+                    return run_with_timeout(
+                        name,
                         timeout_s=limits.timeout_export_s,
-                        fn=export_mobile_mp4,
-                        kwargs={
-                            "video_in": video_in,
-                            "audio_wav": dubbed_wav if dubbed_wav.exists() else None,
-                            "out_path": mobile_dir / "mobile.mp4",
-                        },
+                        fn=fn,
+                        kwargs=kwargs,
                         cancel_check=_cancel_check_sync,
                         cancel_exc=JobCanceled(),
                     )
+
+                return _call
+
+            if is_pass2_outer:
+                _note_pass2_skip("mobile_outputs", "pass2_skip")
+            elif bool(getattr(settings, "mobile_outputs", True)):
+                # A node that cannot be built is skipped like a failed one.
+                try:
+                    from dubbing_pipeline.stages.export import export_mobile_hls, export_mobile_mp4
+
+                    mobile_dir = (base_dir / "mobile").resolve()
+                    mobile_dir.mkdir(parents=True, exist_ok=True)
+                    dub_in = dubbed_wav if dubbed_wav.exists() else None
+                    # Dubbed mobile MP4 (default)
+                    export_graph.add(
+                        StageNode(
+                            name="export_mobile_mp4_dubbed",
+                            fn=_export_node(
+                                "export_mobile_mp4_dubbed",
+                                export_mobile_mp4,
+                                {
+                                    "video_in": video_in,
+                                    "audio_wav": dub_in,
+                                    "out_path": mobile_dir / "mobile.mp4",
+                                },
+                            ),
+                            inputs=tuple(p for p in (Path(video_in), dub_in) if p is not None),
+                            outputs={"mp4": mobile_dir / "mobile.mp4"},
+                            phase="mux",
+                            ckpt_stage="export_mobile_mp4",
+                            kind="export",
+                        )
+                    )
                     # Original mobile MP4 (user-selectable in UI)
-                    run_with_timeout(
-                        "export_mobile_mp4_original",
-                        timeout_s=limits.timeout_export_s,
-                        fn=export_mobile_mp4,
-                        kwargs={
-                            "video_in": video_in,
-                            "audio_wav": None,
-                            "out_path": mobile_dir / "original.mp4",
-                        },
-                        cancel_check=_cancel_check_sync,
-                        cancel_exc=JobCanceled(),
+                    export_graph.add(
+                        StageNode(
+                            name="export_mobile_mp4_original",
+                            fn=_export_node(
+                                "export_mobile_mp4_original",
+                                export_mobile_mp4,
+                                {
+                                    "video_in": video_in,
+                                    "audio_wav": None,
+                                    "out_path": mobile_dir / "original.mp4",
+                                },
+                            ),
+                            inputs=(Path(video_in),),
+                            outputs={"mp4": mobile_dir / "original.mp4"},
+                            phase="mux",
+                            ckpt_stage="export_mobile_original",
+                            kind="export",
+                        )
                     )
-
                     if bool(getattr(settings, "mobile_hls", False)) and dubbed_wav.exists():
-                        run_with_timeout(
-                            "export_mobile_hls",
-                            timeout_s=limits.timeout_export_s,
-                            fn=export_mobile_hls,
-                            kwargs={
-                                "video_in": video_in,
-                                "dub_wav": dubbed_wav,
-                                "out_dir": mobile_dir / "hls",
-                            },
-                            cancel_check=_cancel_check_sync,
-                            cancel_exc=JobCanceled(),
+                        export_graph.add(
+                            StageNode(
+                                name="export_mobile_hls",
+                                fn=_export_node(
+                                    "export_mobile_hls",
+                                    export_mobile_hls,
+                                    {
+                                        "video_in": video_in,
+                                        "dub_wav": dubbed_wav,
+                                        "out_dir": mobile_dir / "hls",
+                                    },
+                                ),
+                                inputs=(Path(video_in), dubbed_wav),
+                                outputs={"master": mobile_dir / "hls" / "master.m3u8"},
+                                phase="mux",
+                                ckpt_stage="export_mobile_hls",
+                                kind="export",
+                            )
                         )
-            except _Pass2Skip:
-                pass
-            except Exception as ex:
-                self.store.append_log(job_id, f"[{now_utc()}] mobile outputs skipped: {ex}")
+                except Exception as ex:
+                    self.store.append_log(job_id, f"[{now_utc()}] mobile outputs skipped: {ex}")
 
             # Preview variants (optional; off by default).
-            try:
-                if is_pass2_outer:
-                    _note_pass2_skip("previews", "pass2_skip")
-                    raise _Pass2Skip()
-                enable_audio = bool(getattr(settings, "enable_audio_preview", False))
-                enable_lowres = bool(getattr(settings, "enable_lowres_preview", False))
-                if not enable_audio and not enable_lowres:
-                    self.store.append_log(
-                        job_id, f"[{now_utc()}] preview_generation_skipped: disabled"
+            enable_audio = bool(getattr(settings, "enable_audio_preview", False))
+            enable_lowres = bool(getattr(settings, "enable_lowres_preview", False))
+            if is_pass2_outer:
+                _note_pass2_skip("previews", "pass2_skip")
+            elif not enable_audio and not enable_lowres:
+                self.store.append_log(job_id, f"[{now_utc()}] preview_generation_skipped: disabled")
+            else:
+                try:
+                    from dubbing_pipeline.stages.export import (
+                        export_audio_preview,
+                        export_lowres_mp4,
                     )
-                else:
-                    from dubbing_pipeline.stages.export import export_audio_preview, export_lowres_mp4
 
                     preview_dir = (base_dir / "preview").resolve()
                     preview_dir.mkdir(parents=True, exist_ok=True)
 
-                    # Prefer enhanced final mix when present, else TTS track.
-                    audio_src = (
-                        (base_dir / "audio" / "final_mix.wav")
-                        if (base_dir / "audio" / "final_mix.wav").exists()
-                        else tts_wav
-                    )
-
-                    if enable_audio:
-                        if audio_src and audio_src.exists():
-                            self.store.append_log(
-                                job_id, f"[{now_utc()}] preview_generation_started: audio"
-                            )
-                            run_with_timeout(
-                                "export_audio_preview",
-                                timeout_s=limits.timeout_export_s,
-                                fn=export_audio_preview,
-                                kwargs={
-                                    "audio_in": audio_src,
-                                    "out_path": preview_dir / "audio_preview.m4a",
-                                    "bitrate": "96k",
-                                },
-                                cancel_check=_cancel_check_sync,
-                                cancel_exc=JobCanceled(),
-                            )
-                            self.store.append_log(
-                                job_id, f"[{now_utc()}] preview_generation_finished: audio"
-                            )
-                        else:
-                            self.store.append_log(
-                                job_id, f"[{now_utc()}] preview_generation_skipped: audio_missing"
+                    if not enable_audio:
+                        self.store.append_log(
+                            job_id, f"[{now_utc()}] preview_generation_skipped: audio_disabled"
+                        )
+                    elif dubbed_wav and dubbed_wav.exists():
+                        export_graph.add(
+                            StageNode(
+                                name="export_audio_preview",
+                                fn=_export_node(
+                                    "export_audio_preview",
+                                    export_audio_preview,
+                                    {
+                                        "audio_in": dubbed_wav,
+                                        "out_path": preview_dir / "audio_preview.m4a",
+                                        "bitrate": "96k",
+                                    },
+                                ),
+                                inputs=(dubbed_wav,),
+                                outputs={"m4a": preview_dir / "audio_preview.m4a"},
+                                phase="mux",
+                                ckpt_stage="export_audio_preview",
+                                kind="export",
                             )
+                        )
                     else:
                         self.store.append_log(
-                            job_id, f"[{now_utc()}] preview_generation_skipped: audio_disabled"
+                            job_id, f"[{now_utc()}] preview_generation_skipped: audio_missing"
                         )
 
-                    if enable_lowres:
+                    if not enable_lowres:
+                        self.store.append_log(
+                            job_id, f"[{now_utc()}] preview_generation_skipped: lowres_disabled"
+                        )
+                    else:
                         preset = str(getattr(settings, "lowres_preview_preset", "480p") or "480p")
                         source_video = None
                         for cand in [
@@ -3924,34 +4144,74 @@ class JobQueue:
                                 f"[{now_utc()}] preview_generation_skipped: lowres_missing_source",
                             )
                         else:
-                            self.store.append_log(
-                                job_id,
-                                f"[{now_utc()}] preview_generation_started: lowres preset={preset}",
-                            )
-                            run_with_timeout(
-                                "export_lowres_preview",
-                                timeout_s=limits.timeout_export_s,
-                                fn=export_lowres_mp4,
-                                kwargs={
-                                    "video_in": source_video,
-                                    "audio_wav": None,
-                                    "out_path": preview_dir / "preview_lowres.mp4",
-                                    "preset": preset,
-                                },
-                                cancel_check=_cancel_check_sync,
-                                cancel_exc=JobCanceled(),
-                            )
-                            self.store.append_log(
-                                job_id, f"[{now_utc()}] preview_generation_finished: lowres"
+                            export_graph.add(
+                                StageNode(
+                                    name="export_lowres_preview",
+                                    fn=_export_node(
+                                        "export_lowres_preview",
+                                        export_lowres_mp4,
+                                        {
+                                            "video_in": source_video,
+                                            "audio_wav": None,
+                                            "out_path": preview_dir / "preview_lowres.mp4",
+                                            "preset": preset,
+                                        },
+                                    ),
+                                    inputs=(source_video,),
+                                    outputs={"mp4": preview_dir / "preview_lowres.mp4"},
+                                    phase="mux",
+                                    ckpt_stage="export_lowres_preview",
+                                    kind="export",
+                                )
                             )
-                    else:
-                        self.store.append_log(
-                            job_id, f"[{now_utc()}] preview_generation_skipped: lowres_disabled"
-                        )
-            except _Pass2Skip:
-                pass
-            except Exception as ex:
-                self.store.append_log(job_id, f"[{now_utc()}] preview_generation_skipped: {ex}")
+                except Exception as ex:
+                    self.store.append_log(job_id, f"[{now_utc()}] preview_generation_skipped: {ex}")
+
+            _export_labels = {
+                "export_audio_preview": "audio",
+                "export_lowres_preview": "lowres",
+            }
+
+            def _on_export_event(name: str, event: str, info: dict[str, Any]) -> None:
+                label = _export_labels.get(name)
+                outcome = str(info.get("outcome") or "")
+                node = export_graph.nodes.get(name)
+                if node is not None and event == "end" and outcome in ("ok", "checkpoint"):
+                    register_artifacts(self.store, job_id, base_dir, node.outputs.values())
+                if label and event == "start":
+                    self.store.append_log(
+                        job_id, f"[{now_utc()}] preview_generation_started: {label}"
+                    )
+                elif label and event == "end" and outcome == "ok":
+                    self.store.append_log(
+                        job_id, f"[{now_utc()}] preview_generation_finished: {label}"
+                    )
+                elif event == "end" and outcome == "failed":
+                    what = "preview_generation_skipped" if label else "mobile outputs skipped"
+                    self.store.append_log(
+                        job_id, f"[{now_utc()}] {what}: {name}: {info.get('error')}"
+                    )
+                elif event == "end" and outcome == "checkpoint":
+                    self.store.append_log(job_id, f"[{now_utc()}] {name} (checkpoint hit)")
+
+            if export_graph.nodes:
+                export_res = run_stage_graph(
+                    export_graph,
+                    job_id=str(job_id),
+                    max_workers=int(getattr(settings, "stage_graph_workers", 2) or 1),
+                    scheduler=sched,
+                    ckpt_path=ckpt_path,
+                    cancel_check=_cancel_check_sync,
+                    cancel_exc=JobCanceled(),
+                    on_event=_on_export_event,
+                )
+                with suppress(Exception):
+                    write_stage_timeline(
+                        base_dir / "logs" / "stage_timeline.json",
+                        job_id=str(job_id),
+                        group="export",
+                        timeline=export_res.timeline,
+                    )
 
             # Tier-3A: optional lip-sync plugin (default off).
             try:
@@ -4019,6 +4279,7 @@ class JobQueue:
                         )
                         plugin.run(req)
                         self.store.append_log(job_id, f"[{now_utc()}] lipsync ok → {out_lip}")
+                        register_artifacts(self.store, job_id, base_dir, [out_lip])
             except Exception as ex:
                 if bool(getattr(settings, "strict_plugins", False)):
                     raise
@@ -4041,6 +4302,12 @@ class JobQueue:
                     from dubbing_pipeline.qa.scoring import score_job
 
                     score_job(base_dir, enabled=True, write_outputs=True)
+                    register_artifacts(
+                        self.store,
+                        job_id,
+                        base_dir,
+                        [base_dir / "qa" / "summary.json", base_dir / "qa" / "top_issues.md"],
+                    )
                     self.store.append_log(job_id, f"[{now_utc()}] qa: ok")
             except Exception:
                 self.store.append_log(job_id, f"[{now_utc()}] qa failed; continuing")
@@ -4091,6 +4358,9 @@ class JobQueue:
             except Exception as ex:
                 self.store.append_log(job_id, f"[{now_utc()}] retention failed; continuing: {ex}")
 
+            # Final artifact index (after retention), so file listings never probe the tree.
+            self._reindex_artifacts(job_id, base_dir)
+
             self.store.update(
                 job_id,
                 state=JobState.DONE,
@@ -4154,6 +4424,8 @@ class JobQueue:
                 shutil.rmtree(work_dir, ignore_errors=True)
         except JobCanceled:
             self.store.append_log(job_id, f"[{now_utc()}] canceled")
+            # Partial outputs were registered as stages went; drop the ones cleanup removed.
+            self._reindex_artifacts(job_id, base_dir)
             self.store.update(job_id, state=JobState.CANCELED, message="Canceled", error=None)
             with suppress(Exception):
                 _update_storage_accounting()
@@ -4168,6 +4440,7 @@ class JobQueue:
             # optional cleanup of in-progress outputs: leave as-is (ignored by state)
         except Exception as ex:
             self.store.append_log(job_id, f"[{now_utc()}] failed: {ex}")
+            self._reindex_artifacts(job_id, base_dir)
             self.store.update(job_id, state=JobState.FAILED, message="Failed", error=str(ex))
             # Best-effort library mirror + manifest on failure as well.
             with suppress(Exception):
@@ -4187,6 +4460,7 @@ class JobQueue:
                     meta={"state": "FAILED", "error": str(ex)},
                 )
         finally:
+            asr_abandon.set()
             dt = time.perf_counter() - t0
             logger.info(
                 "job %s finished state=%s in %.2fs",
@@ -4197,11 +4471,75 @@ class JobQueue:
             with suppress(Exception):
                 if sched is not None:
                     sched.on_job_done(job_id)
+            with suppress(Exception):
+                for sp in list(open_spans.values()):
+                    sp.finish(outcome="aborted")
+                open_spans.clear()
+                span_rec.write(trace_path)
+            reset_recorder(span_token)
+            with suppress(Exception):
+                profiler.unregister_job(str(job_id))
             # Best-effort cleanup of decrypted input (if any).
             with suppress(Exception):
                 if decrypted_video is not None:
                     decrypted_video.unlink(missing_ok=True)
 
+    def _start_asr_feed(
+        self, *, job_id: str, srt_out: Path, duration_s: float
+    ) -> Callable[[], None]:
+        """
+        Tail the streaming ASR journal written by the transcribe child process and publish
+        per-window progress on the job. Returns a stop function (drains what is left).
+        """
+        stop = threading.Event()
+
+        def _feed() -> None:
+            n = 0
+            with suppress(Exception):
+                for rec in follow_asr_journal(
+                    asr_journal_path(srt_out), stop=stop.is_set, until_done=False
+                ):
+                    if rec.get("type") == "header":
+                        n = 0
+                    if rec.get("type") != "window":
+                        continue
+                    n += len(rec.get("segments") or [])
+                    frac = float(rec.get("end") or 0.0) / max(1.0, float(duration_s or 0.0))
+                    self.store.update(
+                        job_id,
+                        progress=0.30 + 0.29 * max(0.0, min(1.0, frac)),
+                        message=f"Transcribing ({n} segments so far)",
+                    )
+
+        t = threading.Thread(target=_feed, name=f"asr-feed-{job_id}", daemon=True)
+        t.start()
+
+        def _stop() -> None:
+            stop.set()
+            t.join(timeout=5.0)
+
+        return _stop
+
+    def _reindex_artifacts(self, job_id: str, base_dir: Path) -> None:
+        try:
+            index_job_artifacts(self.store, job_id, base_dir, deep=False)
+        except Exception as ex:
+            self.store.append_log(job_id, f"[{now_utc()}] artifact index failed: {ex}")
+
+    def _record_segment_cache(self, job_id: str, stage: str, stats: dict | None) -> None:
+        """
+        Store a stage's segment-cache hit/miss counters on the job runtime (best-effort).
+        """
+        if not stats:
+            return
+        with suppress(Exception):
+            curj = self.store.get(job_id)
+            rt = dict((curj.runtime or {}) if curj else {})
+            per_stage = dict(rt.get("segment_cache") or {})
+            per_stage[str(stage)] = dict(stats)
+            rt["segment_cache"] = per_stage
+            self.store.update(job_id, runtime=rt)
+
     def _write_library_artifacts_best_effort(self, *, job_id: str, base_dir: Path) -> None:
         """
         Best-effort creation of the grouped Library/ mirror and its manifest.json.
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.jobs.checkpoint import (
+    read_ckpt,
+    record_stage_started,
+    stage_is_done,
+    write_ckpt,
+)
+from dubbing_pipeline.ops.spans import span
+from dubbing_pipeline.utils.io import write_json
+from dubbing_pipeline.utils.log import logger
+
+
+class StageGraphError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True)
+class StageNode:
+    """
+    One unit of work in a job's stage DAG.
+
+    - `deps` names nodes that must finish (ok or skipped) before this node starts
+    - `outputs` are the artifacts the node promises; they are checkpointed on success
+    - `phase` (optional) is a Scheduler.phase() name used to respect per-phase caps
+    - `required` nodes abort the graph on failure; optional nodes only record the error
+    - `kind` is the span kind recorded for the node (ops.spans)
+    """
+
+    name: str
+    fn: Callable[[], Any]
+    deps: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    outputs: dict[str, Path] = field(default_factory=dict)
+    phase: str | None = None
+    ckpt_stage: str | None = None
+    required: bool = False
+    kind: str = "node"
+
+
+@dataclass(slots=True)
+class StageGraphResult:
+    results: dict[str, Any]
+    errors: dict[str, str]
+    timeline: list[dict[str, Any]]
+
+    def ok(self, name: str) -> bool:
+        return name in self.results and name not in self.errors
+
+
+class StageGraph:
+    def __init__(self) -> None:
+        self._nodes: dict[str, StageNode] = {}
+
+    def add(self, node: StageNode) -> StageNode:
+        if node.name in self._nodes:
+            raise StageGraphError(f"duplicate stage node: {node.name}")
+        self._nodes[node.name] = node
+        return node
+
+    @property
+    def nodes(self) -> dict[str, StageNode]:
+        return dict(self._nodes)
+
+    def order(self) -> list[str]:
+        """
+        Deterministic topological order (insertion order among ready nodes).
+        Raises StageGraphError for unknown deps or cycles.
+        """
+        for n in self._nodes.values():
+            for d in n.deps:
+                if d not in self._nodes:
+                    raise StageGraphError(f"stage {n.name!r} depends on unknown stage {d!r}")
+        done: list[str] = []
+        seen: set[str] = set()
+        remaining = list(self._nodes)
+        while remaining:
+            progressed = False
+            for name in list(remaining):
+                if all(d in seen for d in self._nodes[name].deps):
+                    done.append(name)
+                    seen.add(name)
+                    remaining.remove(name)
+                    progressed = True
+            if not progressed:
+                raise StageGraphError(f"stage graph has a cycle: {sorted(remaining)}")
+        return done
+
+
+def _outputs_exist(node: StageNode) -> bool:
+    if not node.outputs:
+        return False
+    return all(Path(p).exists() for p in node.outputs.values())
+
+
+def _inputs_fingerprint(node: StageNode) -> dict[str, list[int]]:
+    """
+    Cheap (size, mtime_ns) fingerprint of declared inputs; used to invalidate node checkpoints
+    when upstream artifacts were regenerated (e.g. resynth/pass2).
+    """
+    out: dict[str, list[int]] = {}
+    for p in node.inputs:
+        try:
+            st = Path(p).stat()
+            out[str(Path(p))] = [int(st.st_size), int(st.st_mtime_ns)]
+        except Exception:
+            out[str(Path(p))] = [-1, -1]
+    return out
+
+
+def _ckpt_reusable(ckpt: dict[str, Any] | None, node: StageNode) -> bool:
+    key = node.ckpt_stage
+    if not key or not stage_is_done(ckpt, key) or not _outputs_exist(node):
+        return False
+    try:
+        meta = ckpt["stages"][key].get("meta") or {}
+    except Exception:
+        return False
+    return meta.get("inputs") == _inputs_fingerprint(node)
+
+
+def run_stage_graph(
+    graph: StageGraph,
+    *,
+    job_id: str,
+    max_workers: int = 2,
+    scheduler: Any | None = None,
+    ckpt_path: Path | None = None,
+    cancel_check: Callable[[], bool] | None = None,
+    cancel_exc: BaseException | None = None,
+    on_event: Callable[[str, str, dict[str, Any]], None] | None = None,
+) -> StageGraphResult:
+    """
+    Execute a StageGraph, running independent nodes concurrently.
+
+    Checkpoint reuse: a node with `ckpt_stage` set is skipped when the checkpoint marks it done,
+    all declared outputs still exist and its declared inputs are unchanged since that run.
+    Checkpoint writes are serialized (read-modify-write).
+
+    Returns per-node results/errors and a timeline (offsets relative to graph start).
+    Raises the first error of a `required` node (or `cancel_exc`, if any node was canceled)
+    after in-flight nodes finish.
+    """
+    order = graph.order()
+    nodes = graph.nodes
+    workers = max(1, int(max_workers or 1))
+    ckpt_lock = threading.Lock()
+    ckpt = read_ckpt(job_id, ckpt_path=ckpt_path) if ckpt_path is not None else None
+
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    timeline: list[dict[str, Any]] = []
+    finished: set[str] = set()
+    t_graph = time.perf_counter()
+    wall0 = time.time()
+    required_exc: BaseException | None = None
+
+    def _emit(name: str, event: str, info: dict[str, Any]) -> None:
+        if on_event is None:
+            return
+        with suppress(Exception):
+            on_event(name, event, info)
+
+    def _record(node: StageNode, t0: float, t1: float, outcome: str, error: str | None) -> None:
+        entry = {
+            "stage": node.name,
+            "phase": node.phase or "",
+            "deps": list(node.deps),
+            "start_s": round(t0 - t_graph, 6),
+            "end_s": round(t1 - t_graph, 6),
+            "duration_s": round(max(0.0, t1 - t0), 6),
+            "started_at": wall0 + (t0 - t_graph),
+            "outcome": outcome,
+            "error": (error or "")[:200] or None,
+            "thread": threading.current_thread().name,
+        }
+        timeline.append(entry)
+        _emit(node.name, "end", entry)
+
+    def _run(node: StageNode) -> Any:
+        key = node.ckpt_stage
+        t0 = time.perf_counter()
+        if _ckpt_reusable(ckpt, node):
+            _record(node, t0, time.perf_counter(), "checkpoint", None)
+            return None
+        if cancel_check is not None and cancel_check():
+            _record(node, t0, time.perf_counter(), "canceled", None)
+            raise cancel_exc if cancel_exc is not None else StageGraphError("canceled")
+        _emit(node.name, "start", {"phase": node.phase or ""})
+        if key and ckpt_path is not None:
+            with ckpt_lock, suppress(Exception):
+                record_stage_started(job_id, key, ckpt_path=ckpt_path)
+        gate = (
+            scheduler.phase(node.phase, job_id=job_id)
+            if (scheduler is not None and node.phase)
+            else nullcontext()
+        )
+        try:
+            with gate, span(node.name, kind=node.kind, phase=node.phase):
+                value = node.fn()
+        except BaseException as ex:
+            _record(node, t0, time.perf_counter(), "failed", str(ex))
+            raise
+        if key and ckpt_path is not None:
+            arts = {k: Path(p) for k, p in node.outputs.items() if Path(p).exists()}
+            if arts:
+                with ckpt_lock, suppress(Exception):
+                    write_ckpt(
+                        job_id,
+                        key,
+                        arts,
+                        {"stage_graph": True, "inputs": _inputs_fingerprint(node)},
+                        ckpt_path=ckpt_path,
+                    )
+        _record(node, t0, time.perf_counter(), "ok", None)
+        return value
+
+    def _ready(name: str) -> bool:
+        return all(d in finished for d in nodes[name].deps)
+
+    pending = list(order)
+    running: dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stage-{job_id[:8]}") as ex:
+        while pending or running:
+            if required_exc is None:
+                for name in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if not _ready(name):
+                        continue
+                    pending.remove(name)
+                    failed_deps = [d for d in nodes[name].deps if d in errors]
+                    if failed_deps:
+                        errors[name] = f"dependency_failed:{','.join(failed_deps)}"
+                        now = time.perf_counter()
+                        _record(nodes[name], now, now, "skipped", errors[name])
+                        finished.add(name)
+                        continue
+                    # Copy context so span recorder / stage labels follow the node into the pool.
+                    ctx = contextvars.copy_context()
+                    running[ex.submit(ctx.run, _run, nodes[name])] = name
+            else:
+                pending.clear()
+            if not running:
+                if pending:
+                    # Unreachable for a validated DAG; guard against spinning.
+                    raise StageGraphError(f"stage graph stalled: {pending}")
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                finished.add(name)
+                try:
+                    results[name] = fut.result()
+                except BaseException as err:
+                    errors[name] = str(err)
+                    is_cancel = cancel_exc is not None and isinstance(err, type(cancel_exc))
+                    if (nodes[name].required or is_cancel) and required_exc is None:
+                        required_exc = err
+                    logger.warning(
+                        "stage_graph_node_failed", job_id=str(job_id), stage=name, error=str(err)
+                    )
+
+    timeline.sort(key=lambda e: (float(e["start_s"]), str(e["stage"])))
+    if required_exc is not None:
+        raise required_exc
+    return StageGraphResult(results=results, errors=errors, timeline=timeline)
+
+
+def write_stage_timeline(path: Path, *, job_id: str, group: str, timeline: list[dict]) -> Path:
+    """
+    Merge a graph run's timeline into `<job>/logs/stage_timeline.json` (keyed by group).
+    """
+    from dubbing_pipeline.utils.io import read_json
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cur = read_json(path, default={}) if path.exists() else {}
+    if not isinstance(cur, dict):
+        cur = {}
+    groups = cur.get("groups") if isinstance(cur.get("groups"), dict) else {}
+    wall = 0.0
+    serial = 0.0
+    for e in timeline:
+        serial += float(e.get("duration_s") or 0.0)
+        wall = max(wall, float(e.get("end_s") or 0.0))
+    groups[str(group)] = {
+        "stages": list(timeline),
+        "wall_s": round(wall, 6),
+        "serial_s": round(serial, 6),
+    }
+    cur.update({"version": 1, "job_id": str(job_id), "groups": groups, "updated_at": time.time()})
+    write_json(path, cur)
+    return path
@@ -54,6 +54,12 @@ class JobStore:
         # Schema for pronunciation dictionary (per-language).
         with suppress(Exception):
             self._init_pronunciation_schema()
+        # Schema for per-series OP/ED audio fingerprints.
+        with suppress(Exception):
+            self._init_audio_fingerprint_schema()
+        # Schema for the per-job artifact index (files/outputs endpoints).
+        with suppress(Exception):
+            self._init_artifact_schema()
 
     def _jobs(self) -> SqliteDict:
         # Open/close per operation (safe + avoids cross-thread SQLite handle issues)
@@ -692,6 +698,73 @@ class JobStore:
             finally:
                 con.close()
 
+    def _init_audio_fingerprint_schema(self) -> None:
+        """
+        Create table for per-series OP/ED audio fingerprints (packed spectral-peak hashes).
+        """
+        with self._write_lock():
+            con = self._conn()
+            try:
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS series_audio_fingerprints (
+                      id TEXT PRIMARY KEY,
+                      series_slug TEXT NOT NULL,
+                      kind TEXT NOT NULL,
+                      params TEXT NOT NULL,
+                      duration_s REAL NOT NULL,
+                      n_hashes INTEGER NOT NULL,
+                      hashes BLOB NOT NULL,
+                      decisions_json TEXT,
+                      source_job_id TEXT,
+                      hits INTEGER DEFAULT 0,
+                      created_at REAL,
+                      updated_at REAL
+                    );
+                    """
+                )
+                con.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_series_audio_fp_series ON series_audio_fingerprints(series_slug, params);"
+                )
+                con.commit()
+            finally:
+                con.close()
+
+    def _init_artifact_schema(self) -> None:
+        """
+        Create tables for the per-job artifact index (rows + per-job revision for ETags).
+        """
+        with self._write_lock():
+            con = self._conn()
+            try:
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS job_artifacts (
+                      job_id TEXT NOT NULL,
+                      path TEXT NOT NULL,
+                      kind TEXT NOT NULL,
+                      size_bytes INTEGER NOT NULL DEFAULT 0,
+                      mtime REAL NOT NULL DEFAULT 0,
+                      media_json TEXT,
+                      updated_at REAL,
+                      PRIMARY KEY (job_id, path)
+                    );
+                    """
+                )
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS job_artifact_index (
+                      job_id TEXT PRIMARY KEY,
+                      revision INTEGER NOT NULL DEFAULT 0,
+                      indexed_at REAL,
+                      updated_at REAL
+                    );
+                    """
+                )
+                con.commit()
+            finally:
+                con.close()
+
     def record_view(
         self,
         *,
@@ -1962,6 +2035,253 @@ class JobStore:
             finally:
                 con.close()
 
+    # --- series OP/ED fingerprints ---
+    def list_series_fingerprints(
+        self, series_slug: str, *, params: str | None = None
+    ) -> list[dict[str, Any]]:
+        series_slug = str(series_slug or "").strip()
+        if not series_slug:
+            return []
+        con = self._conn()
+        try:
+            where = "series_slug = ?"
+            args: list[Any] = [series_slug]
+            if params:
+                where += " AND params = ?"
+                args.append(str(params))
+            rows = con.execute(
+                f"""
+                SELECT id, series_slug, kind, params, duration_s, n_hashes, hashes, decisions_json,
+                       source_job_id, hits, created_at, updated_at
+                FROM series_audio_fingerprints
+                WHERE {where}
+                ORDER BY created_at ASC, id ASC;
+                """,
+                tuple(args),
+            ).fetchall()
+            out: list[dict[str, Any]] = []
+            for r in rows:
+                d = dict(r)
+                d["hashes"] = bytes(d.get("hashes") or b"")
+                raw = d.pop("decisions_json", None)
+                d["decisions"] = {}
+                if isinstance(raw, str) and raw:
+                    with suppress(Exception):
+                        d["decisions"] = json.loads(raw)
+                out.append(d)
+            return out
+        finally:
+            con.close()
+
+    def upsert_series_fingerprint(
+        self,
+        *,
+        entry_id: str,
+        series_slug: str,
+        kind: str,
+        params: str,
+        duration_s: float,
+        n_hashes: int,
+        hashes: bytes,
+        decisions: dict[str, Any] | None = None,
+        source_job_id: str = "",
+    ) -> dict[str, Any]:
+        eid = str(entry_id or "").strip()
+        series_slug = str(series_slug or "").strip()
+        if not eid or not series_slug:
+            raise ValueError("entry_id and series_slug are required")
+        now = float(time.time())
+        with self._write_lock():
+            con = self._conn()
+            try:
+                con.execute(
+                    """
+                    INSERT INTO series_audio_fingerprints (
+                      id, series_slug, kind, params, duration_s, n_hashes, hashes,
+                      decisions_json, source_job_id, hits, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                      kind=excluded.kind,
+                      params=excluded.params,
+                      duration_s=excluded.duration_s,
+                      n_hashes=excluded.n_hashes,
+                      hashes=excluded.hashes,
+                      decisions_json=excluded.decisions_json,
+                      source_job_id=excluded.source_job_id,
+                      updated_at=excluded.updated_at;
+                    """,
+                    (
+                        eid,
+                        series_slug,
+                        str(kind or ""),
+                        str(params or ""),
+                        float(duration_s),
+                        int(n_hashes),
+                        sqlite3.Binary(bytes(hashes)),
+                        json.dumps(decisions or {}, sort_keys=True),
+                        str(source_job_id or ""),
+                        now,
+                        now,
+                    ),
+                )
+                con.commit()
+            finally:
+                con.close()
+        return {
+            "id": eid,
+            "series_slug": series_slug,
+            "kind": str(kind or ""),
+            "params": str(params or ""),
+            "duration_s": float(duration_s),
+            "n_hashes": int(n_hashes),
+            "source_job_id": str(source_job_id or ""),
+            "created_at": now,
+        }
+
+    def record_series_fingerprint_hit(self, entry_id: str) -> None:
+        eid = str(entry_id or "").strip()
+        if not eid:
+            return
+        with self._write_lock():
+            con = self._conn()
+            try:
+                con.execute(
+                    "UPDATE series_audio_fingerprints SET hits = COALESCE(hits, 0) + 1, updated_at = ? WHERE id = ?;",
+                    (float(time.time()), eid),
+                )
+                con.commit()
+            finally:
+                con.close()
+
+    def delete_series_fingerprint(self, entry_id: str) -> bool:
+        eid = str(entry_id or "").strip()
+        if not eid:
+            return False
+        with self._write_lock():
+            con = self._conn()
+            try:
+                cur = con.execute("DELETE FROM series_audio_fingerprints WHERE id = ?;", (eid,))
+                con.commit()
+                return bool(cur.rowcount)
+            finally:
+                con.close()
+
+    # --- artifact index ---
+    def list_job_artifacts(
+        self, job_id: str
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        """
+        Returns (index meta or None if the job has no index yet, artifact rows).
+        """
+        job_id = str(job_id or "").strip()
+        con = self._conn()
+        try:
+            meta = con.execute(
+                "SELECT revision, indexed_at, updated_at FROM job_artifact_index WHERE job_id = ?;",
+                (job_id,),
+            ).fetchone()
+            if meta is None:
+                return None, []
+            rows = con.execute(
+                """
+                SELECT kind, path, size_bytes, mtime, media_json
+                FROM job_artifacts WHERE job_id = ? ORDER BY kind ASC, path ASC;
+                """,
+                (job_id,),
+            ).fetchall()
+        finally:
+            con.close()
+        out: list[dict[str, Any]] = []
+        for r in rows:
+            d = dict(r)
+            raw = d.pop("media_json", None)
+            d["media"] = {}
+            if isinstance(raw, str) and raw:
+                with suppress(Exception):
+                    d["media"] = json.loads(raw)
+            out.append(d)
+        return dict(meta), out
+
+    def upsert_job_artifacts(
+        self, job_id: str, rows: list[dict[str, Any]], *, replace: bool = False
+    ) -> int:
+        """
+        Insert/refresh artifact rows; `replace=True` makes `rows` the complete index.
+        The job's revision only moves when something actually changed. Returns the revision.
+        """
+        job_id = str(job_id or "").strip()
+        if not job_id:
+            raise ValueError("job_id is required")
+        now = float(time.time())
+        with self._write_lock():
+            con = self._conn()
+            try:
+                before = con.total_changes
+                if replace:
+                    keep = [str(r["path"]) for r in rows]
+                    marks = ",".join("?" for _ in keep)
+                    con.execute(
+                        f"DELETE FROM job_artifacts WHERE job_id = ? AND path NOT IN ({marks});",
+                        (job_id, *keep),
+                    )
+                for r in rows:
+                    con.execute(
+                        """
+                        INSERT INTO job_artifacts (
+                          job_id, path, kind, size_bytes, mtime, media_json, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(job_id, path) DO UPDATE SET
+                          kind=excluded.kind,
+                          size_bytes=excluded.size_bytes,
+                          mtime=excluded.mtime,
+                          media_json=excluded.media_json,
+                          updated_at=excluded.updated_at
+                        WHERE job_artifacts.kind IS NOT excluded.kind
+                           OR job_artifacts.size_bytes IS NOT excluded.size_bytes
+                           OR job_artifacts.mtime IS NOT excluded.mtime
+                           OR job_artifacts.media_json IS NOT excluded.media_json;
+                        """,
+                        (
+                            job_id,
+                            str(r["path"]),
+                            str(r["kind"]),
+                            int(r.get("size_bytes") or 0),
+                            float(r.get("mtime") or 0.0),
+                            json.dumps(r.get("media") or {}, sort_keys=True),
+                            now,
+                        ),
+                    )
+                bump = 1 if con.total_changes != before else 0
+                con.execute(
+                    """
+                    INSERT INTO job_artifact_index (job_id, revision, indexed_at, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(job_id) DO UPDATE SET
+                      revision=job_artifact_index.revision + excluded.revision,
+                      indexed_at=COALESCE(excluded.indexed_at, job_artifact_index.indexed_at),
+                      updated_at=excluded.updated_at;
+                    """,
+                    (job_id, bump, now if replace else None, now),
+                )
+                rev = con.execute(
+                    "SELECT revision FROM job_artifact_index WHERE job_id = ?;", (job_id,)
+                ).fetchone()
+                con.commit()
+                return int(rev["revision"]) if rev is not None else 0
+            finally:
+                con.close()
+
+    def delete_job_artifacts(self, job_id: str) -> None:
+        job_id = str(job_id or "").strip()
+        with self._write_lock():
+            con = self._conn()
+            try:
+                con.execute("DELETE FROM job_artifacts WHERE job_id = ?;", (job_id,))
+                con.execute("DELETE FROM job_artifact_index WHERE job_id = ?;", (job_id,))
+                con.commit()
+            finally:
+                con.close()
+
     # --- voice profiles ---
     def _parse_embedding_vector(self, raw: object) -> list[float] | None:
         if raw is None:
@@ -2546,6 +2866,8 @@ class JobStore:
                         con.close()
         with suppress(Exception):
             self.delete_job_storage(str(id))
+        with suppress(Exception):
+            self.delete_job_artifacts(str(id))
         with suppress(Exception):
             from dubbing_pipeline.library.registry import remove_manifest_entry
 
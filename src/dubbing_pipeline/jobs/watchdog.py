@@ -19,10 +19,86 @@ class PhaseResult:
     ok: bool
     value: Any = None
     error: str | None = None
+    spans: list[dict[str, Any]] | None = None
+    profile: dict[str, int] | None = None
+    usage: dict[str, float] | None = None  # runtime.capacity.PhaseMeter(process=True)
 
 
-def _child_main(q: mp.Queue, fn: Callable, args: tuple, kwargs: dict) -> None:
+def _child_spans(rec: Any) -> list[dict[str, Any]] | None:
+    if rec is None:
+        return None
     try:
+        return rec.events()
+    except Exception:
+        return None
+
+
+def _child_profile(sampler: Any, trace_ctx: dict[str, Any] | None) -> dict[str, int] | None:
+    if sampler is None or not trace_ctx:
+        return None
+    try:
+        sampler.stop()
+        return dict(sampler.take(str(trace_ctx.get("job_id") or "")))
+    except Exception:
+        return None
+
+
+def _child_usage(meter: Any) -> dict[str, float] | None:
+    if meter is None:
+        return None
+    try:
+        return meter.finish()
+    except Exception:
+        return None
+
+
+def _child_main(
+    q: mp.Queue,
+    fn: Callable,
+    args: tuple,
+    kwargs: dict,
+    name: str = "",
+    trace_ctx: dict[str, Any] | None = None,
+) -> None:
+    rec = None
+    sp = None
+    sampler = None
+    meter = None
+    with suppress(Exception):
+        from dubbing_pipeline.runtime.capacity import PhaseMeter
+
+        meter = PhaseMeter(process=True)
+    try:
+        # Span recording inside the child (shipped back to the parent job recorder).
+        if trace_ctx:
+            with suppress(Exception):
+                from dubbing_pipeline.ops.spans import (
+                    SpanRecorder,
+                    bind_stage,
+                    install_recorder,
+                    start_span,
+                )
+
+                rec = SpanRecorder(
+                    str(trace_ctx.get("job_id") or ""),
+                    mode=str(trace_ctx.get("mode") or ""),
+                    device=str(trace_ctx.get("device") or ""),
+                )
+                install_recorder(rec)
+                bind_stage(str(trace_ctx.get("stage") or ""))
+                sp = start_span(
+                    str(name or "phase"), kind="phase", stage=str(trace_ctx.get("stage") or "")
+                )
+            # Sampling profiler (ops.profiler), when the parent job is being profiled.
+            if int(trace_ctx.get("profile_hz") or 0) > 0:
+                with suppress(Exception):
+                    from dubbing_pipeline.ops.profiler import start_child_sampler
+
+                    sampler = start_child_sampler(
+                        job_id=str(trace_ctx.get("job_id") or ""),
+                        stage=str(trace_ctx.get("stage") or name or ""),
+                        hz=int(trace_ctx["profile_hz"]),
+                    )
         # Optional: memory cap for watchdog child processes (best-effort; Linux only).
         try:
             from dubbing_pipeline.config import get_settings
@@ -40,9 +116,37 @@ def _child_main(q: mp.Queue, fn: Callable, args: tuple, kwargs: dict) -> None:
                 # Non-fatal: continue without memory cap.
                 pass
         v = fn(*args, **kwargs)
-        q.put(PhaseResult(ok=True, value=v))
-    except BaseException:
-        q.put(PhaseResult(ok=False, error=traceback.format_exc()))
+        if sp is not None:
+            sp.finish(outcome="ok")
+        q.put(
+            PhaseResult(
+                ok=True,
+                value=v,
+                spans=_child_spans(rec),
+                profile=_child_profile(sampler, trace_ctx),
+                usage=_child_usage(meter),
+            )
+        )
+    except BaseException as ex:
+        if sp is not None:
+            with suppress(Exception):
+                sp.finish(outcome="failed", error=str(ex))
+        q.put(
+            PhaseResult(
+                ok=False,
+                error=traceback.format_exc(),
+                spans=_child_spans(rec),
+                profile=_child_profile(sampler, trace_ctx),
+            )
+        )
+
+
+def _forget_child_metrics(pid: int | None) -> None:
+    # Multi-process metrics: drop the exited child's live gauges (no-op otherwise).
+    with suppress(Exception):
+        from dubbing_pipeline.ops.metrics import mark_process_dead
+
+        mark_process_dead(pid)
 
 
 def run_with_timeout(
@@ -54,29 +158,58 @@ def run_with_timeout(
     kwargs: dict | None = None,
     cancel_check: Callable[[], bool] | None = None,
     cancel_exc: BaseException | None = None,
+    daemon: bool = True,
 ) -> Any:
     """
     Run a blocking phase in a separate process so we can SIGKILL on timeout.
+
+    `daemon=False` is for phases that start their own worker processes (multiprocessing refuses
+    to from a daemonic one). Such a child is not killed when this process exits normally, so the
+    phase must make its workers die with it.
     """
     kwargs = kwargs or {}
+    trace_ctx = None
+    with suppress(Exception):
+        from dubbing_pipeline.ops.spans import child_context
+
+        trace_ctx = child_context()
+        if trace_ctx:
+            from dubbing_pipeline.ops.profiler import child_hz
+
+            trace_ctx["profile_hz"] = child_hz(str(trace_ctx.get("job_id") or ""))
     q: mp.Queue = mp.Queue(maxsize=1)
-    p = mp.Process(target=_child_main, args=(q, fn, args, kwargs), daemon=True)
+    p = mp.Process(
+        target=_child_main, args=(q, fn, args, kwargs, str(name), trace_ctx), daemon=bool(daemon)
+    )
     p.start()
     deadline = __import__("time").monotonic() + float(timeout_s)
 
-    # Poll join so we can support cooperative cancellation (kill child early).
-    while True:
-        p.join(timeout=0.25)
-        if not p.is_alive():
-            break
-        if cancel_check is not None:
-            cancel_requested = False
-            try:
-                cancel_requested = bool(cancel_check())
-            except Exception:
+    try:
+        # Poll join so we can support cooperative cancellation (kill child early).
+        while True:
+            p.join(timeout=0.25)
+            if not p.is_alive():
+                break
+            if cancel_check is not None:
                 cancel_requested = False
-            if cancel_requested:
-                # Cancel requested: terminate quickly.
+                try:
+                    cancel_requested = bool(cancel_check())
+                except Exception:
+                    cancel_requested = False
+                if cancel_requested:
+                    # Cancel requested: terminate quickly.
+                    with suppress(Exception):
+                        p.terminate()
+                    p.join(timeout=2.0)
+                    if p.is_alive():
+                        with suppress(Exception):
+                            os.kill(p.pid, signal.SIGKILL)  # type: ignore[arg-type]
+                        p.join(timeout=2.0)
+                    if cancel_exc is not None:
+                        raise cancel_exc
+                    raise PhaseTimeout(f"Phase '{name}' canceled and was killed")
+            if __import__("time").monotonic() >= deadline:
+                # Timeout: kill.
                 with suppress(Exception):
                     p.terminate()
                 p.join(timeout=2.0)
@@ -84,25 +217,32 @@ def run_with_timeout(
                     with suppress(Exception):
                         os.kill(p.pid, signal.SIGKILL)  # type: ignore[arg-type]
                     p.join(timeout=2.0)
-                if cancel_exc is not None:
-                    raise cancel_exc
-                raise PhaseTimeout(f"Phase '{name}' canceled and was killed")
-        if __import__("time").monotonic() >= deadline:
-            # Timeout: kill.
-            with suppress(Exception):
-                p.terminate()
-            p.join(timeout=2.0)
-            if p.is_alive():
-                with suppress(Exception):
-                    os.kill(p.pid, signal.SIGKILL)  # type: ignore[arg-type]
-                p.join(timeout=2.0)
-            raise PhaseTimeout(f"Phase '{name}' exceeded timeout ({timeout_s}s) and was killed")
+                raise PhaseTimeout(f"Phase '{name}' exceeded timeout ({timeout_s}s) and was killed")
+    finally:
+        _forget_child_metrics(p.pid)
 
     try:
         res: PhaseResult = q.get_nowait()
     except Exception as ex:
         raise RuntimeError(f"Phase '{name}' failed without returning a result") from ex
 
+    if res.spans:
+        with suppress(Exception):
+            from dubbing_pipeline.ops.spans import current_recorder
+
+            rec = current_recorder()
+            if rec is not None:
+                rec.extend(res.spans)
+    if res.usage:
+        with suppress(Exception):
+            from dubbing_pipeline.runtime.capacity import record_child_usage
+
+            record_child_usage(res.usage)
+    if res.profile and trace_ctx:
+        with suppress(Exception):
+            from dubbing_pipeline.ops.profiler import merge_child_samples
+
+            merge_child_samples(str(trace_ctx.get("job_id") or ""), res.profile)
     if not res.ok:
         raise RuntimeError(f"Phase '{name}' failed:\n{res.error}")
     return res.value
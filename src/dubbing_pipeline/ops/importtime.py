@@ -0,0 +1,150 @@
+"""
+Startup budgets, measured with `python -X importtime`.
+
+Batch orchestration starts a fresh CLI process per job and per status poll, so import cost is
+paid thousands of times a day. Each budget names an entry module, a ceiling for its cumulative
+import time in a fresh interpreter, and modules it must never pull in: the ML stacks stay
+behind lazy imports inside the functions that use them, and the CLI does not load FastAPI or
+the settings model until a command needs them.
+
+Used by tests/test_import_time.py and scripts/import_report.py. Standard library only.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Loaded lazily by the stages that need them; no entry point may import these at startup.
+HEAVY_MODULES = (
+    "numpy",
+    "torch",
+    "whisper",
+    "TTS",
+    "transformers",
+    "scipy",
+    "librosa",
+    "pyannote",
+    "speechbrain",
+    "cv2",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True, slots=True)
+class StartupBudget:
+    module: str
+    max_ms: float
+    forbidden: tuple[str, ...] = HEAVY_MODULES
+
+
+STARTUP_BUDGETS = (
+    # Group + lazy command table only; commands import on first use.
+    StartupBudget(
+        "dubbing_pipeline.cli",
+        max_ms=150.0,
+        forbidden=(
+            *HEAVY_MODULES,
+            "fastapi",
+            "pydantic",
+            "structlog",
+            "dubbing_pipeline.config",
+            "dubbing_pipeline.cli.commands_run",
+        ),
+    ),
+    StartupBudget("dubbing_pipeline.cli.commands_run", 1500.0, (*HEAVY_MODULES, "fastapi")),
+    StartupBudget("dubbing_pipeline.doctor.cli", 1500.0, (*HEAVY_MODULES, "fastapi")),
+    StartupBudget("dubbing_pipeline.server", 4000.0),
+)
+
+
+def parse_importtime(text: str) -> list[ImportRecord]:
+    """
+    Records from `-X importtime` stderr, in the order Python printed them (children first).
+    """
+    out: list[ImportRecord] = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cum_us = int(parts[1])
+        except ValueError:
+            continue  # header row
+        raw = parts[2].rstrip()
+        name = raw.lstrip()
+        out.append(ImportRecord(name, self_us, cum_us, (len(raw) - len(name) - 1) // 2))
+    return out
+
+
+def measure_imports(
+    module: str, *, python: str | None = None, timeout_s: float = 120.0
+) -> list[ImportRecord]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime`. Raises RuntimeError when the
+    import fails.
+    """
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        timeout=timeout_s,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"import {module} failed:\n{tail}")
+    return parse_importtime(proc.stderr)
+
+
+def total_ms(records: list[ImportRecord], module: str) -> float:
+    for r in records:
+        if r.name == module:
+            return r.cumulative_us / 1000.0
+    return 0.0
+
+
+def import_chain(records: list[ImportRecord], module: str) -> list[str]:
+    """
+    `module` followed by the importers that pulled it in, up to the top-level import.
+    """
+    for i, r in enumerate(records):
+        if r.name != module:
+            continue
+        chain = [r.name]
+        depth = r.depth
+        for parent in records[i + 1 :]:
+            if parent.depth < depth:
+                chain.append(parent.name)
+                depth = parent.depth
+        return chain
+    return []
+
+
+def check_budget(budget: StartupBudget, records: list[ImportRecord]) -> list[str]:
+    """
+    Human-readable violations of `budget` (empty when within budget).
+    """
+    problems: list[str] = []
+    names = {r.name for r in records}
+    for mod in budget.forbidden:
+        hits = sorted(n for n in names if n == mod or n.startswith(mod + "."))
+        if hits:
+            chain = " <- ".join(import_chain(records, hits[0]))
+            problems.append(f"{budget.module} imports {hits[0]} ({chain})")
+    ms = total_ms(records, budget.module)
+    if ms > budget.max_ms:
+        problems.append(f"{budget.module} took {ms:.0f} ms to import (budget {budget.max_ms:.0f})")
+    return problems
@@ -1,10 +1,28 @@
+"""
+Prometheus instruments for the whole system.
+
+Multi-process: when PROMETHEUS_MULTIPROC_DIR is set (before the first import of
+prometheus_client, so in the environment of the server / `dubbing-worker` process), every
+process, including watchdog children and pool workers that inherit the environment, writes its
+samples to mmap files in that directory and /metrics aggregates them at scrape time. Point it at
+an empty directory per deployment and wipe it on restart. Gauges declare how per-process values
+combine: `livesum` for things each process holds (active phases, resident models, subscribers),
+`livemax` for global state every process sees the same way (cache entries).
+
+Hot paths resolve label children once (`LabelCache`, module-level bound children) instead of
+calling `.labels(...)` per event.
+"""
+
 from __future__ import annotations
 
+import os
+import threading
 import time
 from collections.abc import Callable, Iterator
 from contextlib import contextmanager, suppress
+from typing import Any
 
-from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
 
 REGISTRY = CollectorRegistry()
 
@@ -28,6 +46,28 @@ PIPELINE_BUCKETS = (
     3600.0,
 )
 
+# Finer buckets for sub-steps (ffmpeg calls, per-line TTS, MT calls, model loads).
+SPAN_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+    3600.0,
+)
+
+SPAN_LABELS = ("kind", "stage", "mode", "device")
+
 # Jobs
 jobs_queued = Counter("dubbing_pipeline_jobs_queued_total", "Jobs queued", registry=REGISTRY)
 jobs_finished = Counter(
@@ -76,6 +116,269 @@ pipeline_job_degraded_total = Counter(
     "pipeline_job_degraded_total", "Pipeline jobs marked degraded", registry=REGISTRY
 )
 
+# Per-stage / sub-step spans (see ops.spans)
+span_seconds = Histogram(
+    "dubbing_pipeline_span_seconds",
+    "Wall time of pipeline stages and sub-steps (seconds)",
+    labelnames=SPAN_LABELS,
+    registry=REGISTRY,
+    buckets=SPAN_BUCKETS,
+)
+span_cpu_seconds = Histogram(
+    "dubbing_pipeline_span_cpu_seconds",
+    "CPU time (thread + reaped children) of pipeline stages and sub-steps (seconds)",
+    labelnames=SPAN_LABELS,
+    registry=REGISTRY,
+    buckets=SPAN_BUCKETS,
+)
+span_io_bytes = Counter(
+    "dubbing_pipeline_span_io_bytes_total",
+    "Bytes read/written during pipeline stages and sub-steps",
+    labelnames=("kind", "stage", "direction"),
+    registry=REGISTRY,
+)
+
+
+class LabelCache:
+    """
+    Label children of one metric, resolved once per label-value tuple.
+
+    `metric.labels(...)` validates and stringifies its arguments and takes the metric lock on
+    every call; this is a single dict lookup after the first use. Label values must come from a
+    small fixed set (stage names, result codes), never from ids or paths.
+    """
+
+    __slots__ = ("_metric", "_children", "_lock")
+
+    def __init__(self, metric: Any) -> None:
+        self._metric = metric
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._metric.labels(*values)
+                    self._children[values] = child
+        return child
+
+
+_span_seconds = LabelCache(span_seconds)
+_span_cpu_seconds = LabelCache(span_cpu_seconds)
+_span_io_bytes = LabelCache(span_io_bytes)
+
+
+def observe_span(event: dict) -> None:
+    """
+    Record a finished span (ops.spans event dict) into the span histograms.
+    """
+    kind = str(event.get("kind") or "step")
+    stage = str(event.get("stage") or "")
+    labels = (kind, stage, str(event.get("mode") or ""), str(event.get("device") or ""))
+    _span_seconds(*labels).observe(float(event.get("duration_s") or 0.0))
+    _span_cpu_seconds(*labels).observe(
+        float(event.get("cpu_s") or 0.0) + float(event.get("child_cpu_s") or 0.0)
+    )
+    rb = int(event.get("read_bytes") or 0)
+    wb = int(event.get("write_bytes") or 0)
+    if rb > 0:
+        _span_io_bytes(kind, stage, "read").inc(rb)
+    if wb > 0:
+        _span_io_bytes(kind, stage, "write").inc(wb)
+
+
+# Scheduler (runtime.scheduler)
+sched_queue_depth = Gauge(
+    "dubbing_pipeline_sched_queue_depth",
+    "Jobs waiting in the in-process scheduler heap",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+sched_active_jobs = Gauge(
+    "dubbing_pipeline_sched_active_jobs",
+    "Jobs dispatched by the scheduler and not finished yet",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+sched_active_phases = Gauge(
+    "dubbing_pipeline_sched_active_phases",
+    "Admitted pipeline phases currently running",
+    labelnames=("phase",),
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+sched_phase_wait_seconds = Histogram(
+    "dubbing_pipeline_sched_phase_wait_seconds",
+    "Time a phase waited for admission (seconds)",
+    labelnames=("phase",),
+    registry=REGISTRY,
+    buckets=SPAN_BUCKETS,
+)
+SCHED_PHASES = ("audio", "transcribe", "tts", "mux")
+sched_active_phase = {p: sched_active_phases.labels(p) for p in SCHED_PHASES}
+sched_phase_wait = {p: sched_phase_wait_seconds.labels(p) for p in SCHED_PHASES}
+
+# Queue backends (queue.fallback_local_queue, queue.redis_queue_impl)
+queue_events = Counter(
+    "dubbing_pipeline_queue_events_total",
+    "Queue backend events (submitted, started, finished, cancelled, deferred, dead_lettered)",
+    labelnames=("backend", "event"),
+    registry=REGISTRY,
+)
+queue_event = LabelCache(queue_events)
+
+# ModelManager (runtime.model_manager)
+models_resident = Gauge(
+    "dubbing_pipeline_models_resident",
+    "Models held in ModelManager caches",
+    labelnames=("kind",),
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+model_requests = Counter(
+    "dubbing_pipeline_model_requests_total",
+    "ModelManager lookups by result (hit = already resident, load = loaded from disk)",
+    labelnames=("kind", "result"),
+    registry=REGISTRY,
+)
+model_resident = LabelCache(models_resident)
+model_request = LabelCache(model_requests)
+
+# Result caches (cache.store namespaces, cache.segments kinds)
+cache_requests = Counter(
+    "dubbing_pipeline_cache_requests_total",
+    "Result cache lookups by cache and result (hit/miss)",
+    labelnames=("cache", "result"),
+    registry=REGISTRY,
+)
+cache_entries = Gauge(
+    "dubbing_pipeline_cache_entries",
+    "Entries in result caches (refreshed at scrape time)",
+    labelnames=("cache",),
+    registry=REGISTRY,
+    multiprocess_mode="livemax",
+)
+cache_request = LabelCache(cache_requests)
+
+# Uploads (web.routes.uploads)
+upload_bytes = Counter(
+    "dubbing_pipeline_upload_bytes_total",
+    "Bytes of upload chunks written",
+    registry=REGISTRY,
+)
+upload_chunks = Counter(
+    "dubbing_pipeline_upload_chunks_total",
+    "Upload chunks by result (stored, dedup)",
+    labelnames=("result",),
+    registry=REGISTRY,
+)
+upload_chunk_stored = upload_chunks.labels("stored")
+upload_chunk_dedup = upload_chunks.labels("dedup")
+
+# Media serving (/files, /video, previews and stream chunks)
+media_responses = Counter(
+    "dubbing_pipeline_media_responses_total",
+    "Media responses by HTTP status (200, 206, 304, 416)",
+    labelnames=("status",),
+    registry=REGISTRY,
+)
+media_bytes = Counter(
+    "dubbing_pipeline_media_bytes_total",
+    "Media bytes streamed to clients",
+    registry=REGISTRY,
+)
+media_response = LabelCache(media_responses)
+
+# Live subscribers (SSE streams)
+sse_subscribers = Gauge(
+    "dubbing_pipeline_sse_subscribers",
+    "Open server-sent event streams",
+    labelnames=("stream",),
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+sse_jobs = sse_subscribers.labels("jobs")
+sse_job = sse_subscribers.labels("job")
+sse_logs = sse_subscribers.labels("logs")
+
+# ffmpeg / ffprobe subprocesses (utils.ffmpeg_safe); durations are in span_seconds{kind="ffmpeg"}
+ffmpeg_calls = Counter(
+    "dubbing_pipeline_ffmpeg_calls_total",
+    "ffmpeg/ffprobe invocations by result (ok, failed, timeout)",
+    labelnames=("tool", "result"),
+    registry=REGISTRY,
+)
+ffmpeg_inflight = Gauge(
+    "dubbing_pipeline_ffmpeg_inflight",
+    "ffmpeg/ffprobe processes currently running",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+ffmpeg_call = LabelCache(ffmpeg_calls)
+
+
+_scrape_hooks: list[Callable[[], None]] = []
+
+
+def on_scrape(fn: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register `fn` to refresh state gauges (e.g. cache sizes) right before each render.
+    """
+    _scrape_hooks.append(fn)
+    return fn
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+def mark_process_dead(pid: int | None) -> None:
+    """
+    Drop the live-gauge samples of an exited child (watchdog phases, pool workers).
+    """
+    if pid is None or multiprocess_dir() is None:
+        return
+    with suppress(Exception):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(int(pid))
+
+
+# Concurrent scrapes (several Prometheus replicas, dashboards) share one render per window.
+_RENDER_MAX_AGE_S = 1.0
+_render_lock = threading.Lock()
+_rendered: tuple[float, bytes] | None = None
+
+
+def render_latest(*, max_age_s: float = _RENDER_MAX_AGE_S) -> bytes:
+    """
+    Text exposition of all metrics: this process's registry, or the aggregate of every
+    process in multi-process mode. Blocking (reads the mmap files); call off the event loop.
+    """
+    global _rendered
+    from prometheus_client import generate_latest
+
+    with _render_lock:
+        now = time.monotonic()
+        if _rendered is not None and now - _rendered[0] < float(max_age_s):
+            return _rendered[1]
+        for fn in list(_scrape_hooks):
+            with suppress(Exception):
+                fn()
+        registry = REGISTRY
+        mp_dir = multiprocess_dir()
+        if mp_dir:
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=mp_dir)
+        body = generate_latest(registry)
+        _rendered = (time.monotonic(), body)
+        return body
+
 
 @contextmanager
 def time_hist(h: Histogram) -> Iterator[Callable[[], float]]:
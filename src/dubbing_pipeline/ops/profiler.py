@@ -0,0 +1,437 @@
+"""
+Opt-in sampling profiler for job workers and watchdog children.
+
+A daemon thread samples Python stacks (`sys._current_frames`) at PROFILING_HZ and attributes
+each sample to the job/stage active on the sampled thread (ops.spans thread context). Output is
+written under `<job>/logs/`:
+  - profile.collapsed          collapsed stacks (flamegraph.pl, speedscope, inferno)
+  - profile.speedscope.json    https://www.speedscope.app
+
+Profiling is armed for a job or for a time window via `/api/runtime/profiler`; the arm state
+lives in `<state_dir>/profiler.json` so every worker process sees it. With PROFILING_ENABLED=0
+(default) nothing is sampled and no thread is started.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.utils.log import logger
+
+COLLAPSED_FILENAME = "profile.collapsed"
+SPEEDSCOPE_FILENAME = "profile.speedscope.json"
+
+_CONTROL_POLL_S = 1.0
+_FLUSH_EVERY_S = 15.0
+_MAX_DEPTH = 128
+_MAX_WINDOW_S = 6 * 3600
+
+
+def profiling_enabled() -> bool:
+    return bool(getattr(get_settings(), "profiling_enabled", False))
+
+
+def _hz() -> int:
+    return max(1, min(1000, int(getattr(get_settings(), "profiling_hz", 50) or 50)))
+
+
+# --- arm state (shared across processes via a small JSON file) ---
+
+
+def _control_path() -> Path:
+    s = get_settings()
+    root = Path(getattr(s, "state_dir", None) or (Path(s.output_dir) / "_state"))
+    return root / "profiler.json"
+
+
+def read_control() -> dict[str, Any]:
+    p = _control_path()
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    jobs = data.get("jobs")
+    return {
+        "jobs": dict(jobs) if isinstance(jobs, dict) else {},
+        "window_until": float(data.get("window_until") or 0.0),
+        "updated_at": float(data.get("updated_at") or 0.0),
+    }
+
+
+@contextmanager
+def _control_locked() -> Iterator[None]:
+    # Serializes read-modify-write of the control file across API/worker processes.
+    from dubbing_pipeline.utils.locks import file_lock
+
+    with file_lock(_control_path().with_suffix(".lock")):
+        yield
+
+
+def _write_control(ctl: dict[str, Any]) -> dict[str, Any]:
+    from dubbing_pipeline.utils.io import atomic_write_text
+
+    now = time.time()
+    # Drop expired entries so the file never grows unbounded.
+    ctl["jobs"] = {
+        str(k): float(v or 0.0)
+        for k, v in (ctl.get("jobs") or {}).items()
+        if not v or float(v) > now
+    }
+    if float(ctl.get("window_until") or 0.0) <= now:
+        ctl["window_until"] = 0.0
+    ctl["updated_at"] = now
+    p = _control_path()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(p, json.dumps(ctl, sort_keys=True))
+    return ctl
+
+
+def _clamp_seconds(seconds: float | None) -> float:
+    return max(0.0, min(float(seconds or 0.0), float(_MAX_WINDOW_S)))
+
+
+def arm_job(job_id: str, *, seconds: float | None = None) -> dict[str, Any]:
+    """
+    Profile `job_id` (now if it is running, otherwise when it starts). `seconds` bounds how long
+    the request stays armed (0/None => until disarmed or the job finishes).
+    """
+    secs = _clamp_seconds(seconds)
+    with _control_locked():
+        ctl = read_control()
+        ctl["jobs"][str(job_id)] = (time.time() + secs) if secs > 0 else 0.0
+        return _write_control(ctl)
+
+
+def arm_window(seconds: float) -> dict[str, Any]:
+    """
+    Profile every job running in the next `seconds`.
+    """
+    with _control_locked():
+        ctl = read_control()
+        ctl["window_until"] = time.time() + _clamp_seconds(seconds)
+        return _write_control(ctl)
+
+
+def disarm(job_id: str | None = None) -> dict[str, Any]:
+    with _control_locked():
+        ctl = read_control()
+        if job_id:
+            ctl["jobs"].pop(str(job_id), None)
+        else:
+            ctl["jobs"] = {}
+            ctl["window_until"] = 0.0
+        return _write_control(ctl)
+
+
+def is_armed(job_id: str, ctl: dict[str, Any], *, now: float | None = None) -> bool:
+    if bool(getattr(get_settings(), "profiling_all_jobs", False)):
+        return True
+    now = time.time() if now is None else float(now)
+    if float(ctl.get("window_until") or 0.0) > now:
+        return True
+    jobs = ctl.get("jobs") or {}
+    if str(job_id) not in jobs:
+        return False
+    until = float(jobs.get(str(job_id)) or 0.0)
+    return until <= 0.0 or until > now
+
+
+# --- sampling ---
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    fn = code.co_filename.replace("\\", "/")
+    parts = fn.rsplit("/", 2)
+    short = "/".join(parts[-2:]) if len(parts) >= 2 else fn
+    # First line of the function (not the current line) keeps stacks mergeable.
+    return f"{code.co_name} ({short}:{code.co_firstlineno})"
+
+
+def collapse_frame(frame, *, max_depth: int = _MAX_DEPTH) -> str:
+    """
+    Root-first `a;b;c` stack string for a frame.
+    """
+    out: list[str] = []
+    f = frame
+    while f is not None and len(out) < max_depth:
+        out.append(_frame_label(f).replace(";", ":"))
+        f = f.f_back
+    out.reverse()
+    return ";".join(out)
+
+
+class StackSampler:
+    """
+    Background sampler. `resolve(tid)` returns (job_id, stage) for threads that should be
+    sampled, or None to skip the thread.
+    """
+
+    def __init__(self, *, hz: int, resolve) -> None:
+        self.interval = 1.0 / float(max(1, int(hz)))
+        self._resolve = resolve
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.samples = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="dp-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        th = self._thread
+        if th is not None and th is not threading.current_thread():
+            th.join(timeout=2.0)
+        self._thread = None
+
+    def sample_once(self) -> None:
+        me = threading.get_ident()
+        frames = sys._current_frames()
+        taken: list[tuple[str, str]] = []
+        for tid, frame in frames.items():
+            if tid == me:
+                continue
+            who = self._resolve(tid)
+            if who is None:
+                continue
+            job_id, stage = who
+            taken.append((str(job_id), f"stage:{stage or '-'};{collapse_frame(frame)}"))
+        del frames
+        if not taken:
+            return
+        with self._lock:
+            for job_id, stack in taken:
+                self._counts.setdefault(job_id, Counter())[stack] += 1
+            self.samples += len(taken)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            with suppress(Exception):
+                self.sample_once()
+            self.on_tick()
+
+    def on_tick(self) -> None:  # overridden by the job profiler
+        return
+
+    def take(self, job_id: str) -> Counter:
+        with self._lock:
+            return self._counts.pop(str(job_id), Counter())
+
+    def merge(self, job_id: str, counts: dict[str, int]) -> None:
+        with self._lock:
+            c = self._counts.setdefault(str(job_id), Counter())
+            for k, v in (counts or {}).items():
+                c[str(k)] += int(v)
+
+
+def write_profile(logs_dir: Path, *, job_id: str, counts: Counter, interval_s: float) -> None:
+    """
+    Merge `counts` into `<logs_dir>/profile.collapsed` and regenerate the speedscope file.
+    """
+    from dubbing_pipeline.utils.io import atomic_write_text
+
+    logs_dir = Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    coll = logs_dir / COLLAPSED_FILENAME
+    total: Counter = Counter()
+    if coll.exists():
+        with suppress(Exception):
+            for ln in coll.read_text(encoding="utf-8").splitlines():
+                stack, _, n = ln.rpartition(" ")
+                if stack and n.isdigit():
+                    total[stack] += int(n)
+    total.update(counts)
+    atomic_write_text(coll, "".join(f"{k} {v}\n" for k, v in sorted(total.items())))
+    atomic_write_text(
+        logs_dir / SPEEDSCOPE_FILENAME,
+        json.dumps(to_speedscope(total, name=f"job {job_id}", interval_s=interval_s)),
+    )
+
+
+def to_speedscope(counts: Counter, *, name: str, interval_s: float) -> dict[str, Any]:
+    frames: list[dict[str, Any]] = []
+    index: dict[str, int] = {}
+    samples: list[list[int]] = []
+    weights: list[float] = []
+    for stack, n in sorted(counts.items()):
+        idxs: list[int] = []
+        for label in stack.split(";"):
+            i = index.get(label)
+            if i is None:
+                i = index[label] = len(frames)
+                frames.append({"name": label})
+            idxs.append(i)
+        samples.append(idxs)
+        weights.append(float(n) * float(interval_s))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": str(name),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": float(sum(weights)),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+        "name": str(name),
+        "exporter": "dubbing_pipeline",
+    }
+
+
+class _JobProfiler(StackSampler):
+    """
+    Process-wide sampler for job runners: samples only threads working on armed live jobs.
+    """
+
+    def __init__(self, *, hz: int) -> None:
+        super().__init__(hz=hz, resolve=self._resolve_tid)
+        self.live: dict[str, Path] = {}
+        self.active: set[str] = set()
+        self._next_poll = 0.0
+        self._next_flush = time.monotonic() + _FLUSH_EVERY_S
+
+    def _resolve_tid(self, tid: int) -> tuple[str, str] | None:
+        from dubbing_pipeline.ops.spans import thread_context
+
+        ctx = thread_context(tid)
+        if ctx is None or ctx[0] not in self.active:
+            return None
+        return ctx
+
+    def poll(self) -> None:
+        ctl = read_control()
+        now = time.time()
+        with self._lock:
+            live = list(self.live)
+        active = {j for j in live if is_armed(j, ctl, now=now)}
+        for j in active - self.active:
+            logger.info("profiler_job_started", job_id=j, hz=int(round(1.0 / self.interval)))
+        self.active = active
+
+    def on_tick(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + _CONTROL_POLL_S
+            with suppress(Exception):
+                self.poll()
+        if now >= self._next_flush:
+            self._next_flush = now + _FLUSH_EVERY_S
+            with self._lock:
+                live = dict(self.live)
+            for job_id, logs_dir in live.items():
+                self.flush(job_id, logs_dir)
+
+    def flush(self, job_id: str, logs_dir: Path) -> None:
+        counts = self.take(job_id)
+        if not counts:
+            return
+        try:
+            write_profile(logs_dir, job_id=job_id, counts=counts, interval_s=self.interval)
+        except Exception as ex:
+            logger.warning("profiler_write_failed", job_id=job_id, error=str(ex))
+
+
+_job_profiler: _JobProfiler | None = None
+_job_profiler_lock = threading.Lock()
+
+
+def register_job(job_id: str, logs_dir: Path) -> None:
+    """
+    Mark a job as running in this process so it can be profiled when armed.
+    No-op unless PROFILING_ENABLED=1.
+    """
+    global _job_profiler
+    if not profiling_enabled():
+        return
+    with _job_profiler_lock:
+        if _job_profiler is None:
+            _job_profiler = _JobProfiler(hz=_hz())
+        prof = _job_profiler
+        with prof._lock:
+            prof.live[str(job_id)] = Path(logs_dir)
+        with suppress(Exception):
+            prof.poll()
+        prof.start()
+
+
+def unregister_job(job_id: str) -> None:
+    """
+    Flush a job's samples to its logs/, drop its arm request and stop the sampler when no jobs
+    remain.
+    """
+    global _job_profiler
+    if not profiling_enabled():
+        return
+    if str(job_id) in read_control()["jobs"]:
+        with suppress(Exception):
+            disarm(str(job_id))
+    with _job_profiler_lock:
+        prof = _job_profiler
+        if prof is None:
+            return
+        with prof._lock:
+            logs_dir = prof.live.pop(str(job_id), None)
+            remaining = bool(prof.live)
+        prof.active.discard(str(job_id))
+        if not remaining:
+            prof.stop()
+            _job_profiler = None
+    if logs_dir is not None:
+        prof.flush(str(job_id), logs_dir)
+
+
+def active_jobs() -> list[str]:
+    prof = _job_profiler
+    return sorted(prof.active) if prof is not None else []
+
+
+def child_hz(job_id: str) -> int:
+    """
+    Sampling rate for a watchdog child of `job_id` (0 => do not profile the child).
+    """
+    prof = _job_profiler
+    if prof is None or str(job_id) not in prof.active:
+        return 0
+    return max(1, int(round(1.0 / prof.interval)))
+
+
+def merge_child_samples(job_id: str, counts: dict[str, int] | None) -> None:
+    prof = _job_profiler
+    if prof is None or not counts:
+        return
+    prof.merge(str(job_id), counts)
+
+
+def start_child_sampler(*, job_id: str, stage: str, hz: int) -> StackSampler:
+    """
+    Sampler for a watchdog child: every thread in the child belongs to `job_id`.
+    """
+    from dubbing_pipeline.ops.spans import thread_context
+
+    def _resolve(tid: int) -> tuple[str, str]:
+        ctx = thread_context(tid)
+        return str(job_id), str((ctx[1] if ctx else "") or stage)
+
+    s = StackSampler(hz=hz, resolve=_resolve)
+    s.start()
+    return s
@@ -267,6 +267,10 @@ def delete_job_artifacts(*, job: Job, output_root: Path) -> tuple[bool, int, lis
     unsafe_paths = [p for p in paths if p.exists() and not _safe_under_root(p, output_root)]
     if unsafe_paths:
         return False, 0, [str(p) for p in unsafe_paths], True
+    with suppress(Exception):
+        from dubbing_pipeline.review.store import drop_cache
+
+        drop_cache(base_dir)
     bytes_freed = 0
     for p in paths:
         if p.exists() and _safe_under_root(p, output_root):
@@ -0,0 +1,425 @@
+"""
+Lightweight span recording for job stages and sub-steps.
+
+Each span captures wall time, thread CPU time, CPU time of reaped child processes (ffmpeg,
+watchdog children), current RSS and bytes read/written (Linux /proc + rusage; best-effort).
+
+Child CPU, bytes read/written and the RSS delta are process-wide counters. They are only reported
+for spans that had the process to themselves; a span that overlapped spans on another thread or
+asyncio task is marked `shared` and leaves them unset, so concurrent stages do not double-count.
+
+Spans are:
+  - observed into Prometheus histograms labelled by kind/stage/mode/device (ops.metrics)
+  - collected per job by a SpanRecorder and written as Chrome trace JSON
+    (load in chrome://tracing or https://ui.perfetto.dev)
+
+Recording is a no-op (apart from metrics) when no recorder is installed in the current context.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_recorder: ContextVar[SpanRecorder | None] = ContextVar("dp_span_recorder", default=None)
+_stage: ContextVar[str] = ContextVar("dp_span_stage", default="")
+
+TRACE_FILENAME = "trace.json"
+
+# Thread ident -> {task key: (job_id, stage)} of the innermost open span. Context variables are
+# not visible from other threads, so out-of-band readers (ops.profiler sampler) use this instead.
+# Several jobs' coroutines interleave on an event-loop thread, so there the key is the asyncio
+# task (0 elsewhere) and `_thread_loops` lets readers find the task running right now.
+_thread_ctx: dict[int, dict[int, tuple[str, str]]] = {}
+_thread_loops: dict[int, asyncio.AbstractEventLoop] = {}
+
+# Open spans per lane ((thread ident, task key) as above). `_lane_opens` is bumped whenever a lane
+# goes from idle to busy, so a finishing span can tell whether another lane ran meanwhile.
+_lanes_lock = threading.Lock()
+_lanes: dict[tuple[int, int], int] = {}
+_lane_opens = 0
+
+
+def _rusage() -> tuple[float, int, int]:
+    """
+    Returns (children_cpu_s, children_inblock, children_oublock).
+    """
+    try:
+        import resource
+
+        ch = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return float(ch.ru_utime + ch.ru_stime), int(ch.ru_inblock), int(ch.ru_oublock)
+    except Exception:
+        return 0.0, 0, 0
+
+
+def _rss_bytes() -> int:
+    """
+    Current resident set size of this process from /proc/self/statm (Linux only; 0 otherwise).
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+
+def _proc_io() -> tuple[int, int]:
+    """
+    (read_bytes, write_bytes) for this process from /proc/self/io (Linux only; 0 otherwise).
+    """
+    try:
+        rb = wb = 0
+        with open("/proc/self/io", encoding="ascii") as f:
+            for ln in f:
+                if ln.startswith("read_bytes:"):
+                    rb = int(ln.split(":", 1)[1])
+                elif ln.startswith("write_bytes:"):
+                    wb = int(ln.split(":", 1)[1])
+        return rb, wb
+    except Exception:
+        return 0, 0
+
+
+class SpanRecorder:
+    """
+    Thread-safe per-job span sink.
+    """
+
+    def __init__(self, job_id: str, *, mode: str = "", device: str = "") -> None:
+        self.job_id = str(job_id)
+        self.mode = str(mode or "")
+        self.device = str(device or "")
+        self._lock = threading.Lock()
+        self._events: list[dict[str, Any]] = []
+
+    def add(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            self._events.append(dict(event))
+
+    def extend(self, events: list[dict[str, Any]], *, observe: bool = True) -> None:
+        """
+        Merge spans recorded elsewhere (e.g. a watchdog child process).
+        """
+        good = [dict(e) for e in (events or []) if isinstance(e, dict)]
+        with self._lock:
+            self._events.extend(good)
+        if observe:
+            for e in good:
+                _observe(e)
+
+    def events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(e) for e in self._events]
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        evs = sorted(self.events(), key=lambda e: float(e.get("ts_us") or 0.0))
+        trace: list[dict[str, Any]] = []
+        pids: dict[int, str] = {}
+        for e in evs:
+            pid = int(e.get("pid") or 0)
+            pids.setdefault(pid, str(e.get("process") or "worker"))
+            args = {
+                k: e.get(k)
+                for k in (
+                    "stage",
+                    "cpu_s",
+                    "child_cpu_s",
+                    "rss_bytes",
+                    "rss_delta_bytes",
+                    "read_bytes",
+                    "write_bytes",
+                    "shared",
+                    "outcome",
+                    "error",
+                )
+                if e.get(k) not in (None, "")
+            }
+            attrs = e.get("attrs")
+            if isinstance(attrs, dict):
+                args.update(attrs)
+            trace.append(
+                {
+                    "name": str(e.get("name") or ""),
+                    "cat": str(e.get("kind") or "span"),
+                    "ph": "X",
+                    "ts": float(e.get("ts_us") or 0.0),
+                    "dur": float(e.get("dur_us") or 0.0),
+                    "pid": pid,
+                    "tid": int(e.get("tid") or 0),
+                    "args": args,
+                }
+            )
+        for pid, pname in pids.items():
+            trace.append(
+                {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": pname}}
+            )
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"job_id": self.job_id, "mode": self.mode, "device": self.device},
+        }
+
+    def write(self, path: Path) -> Path:
+        from dubbing_pipeline.utils.io import atomic_write_text
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path, json.dumps(self.to_chrome_trace(), separators=(",", ":")))
+        return path
+
+
+def install_recorder(rec: SpanRecorder | None):
+    """
+    Install a recorder for the current context; returns a token for `reset_recorder`.
+    """
+    return _recorder.set(rec)
+
+
+def reset_recorder(token) -> None:
+    with suppress(Exception):
+        _recorder.reset(token)
+
+
+def current_recorder() -> SpanRecorder | None:
+    return _recorder.get()
+
+
+def current_stage() -> str:
+    return _stage.get()
+
+
+def bind_stage(stage: str):
+    """
+    Set the stage label for spans started in the current context (returns a reset token).
+    """
+    rec = _recorder.get()
+    _set_thread_ctx((rec.job_id if rec is not None else "", str(stage or "")))
+    return _stage.set(str(stage or ""))
+
+
+def thread_context(tid: int) -> tuple[str, str] | None:
+    """
+    (job_id, stage) currently active on thread `tid` (None when no span is open there).
+    """
+    slots = _thread_ctx.get(int(tid))
+    if not slots:
+        return None
+    loop = _thread_loops.get(int(tid))
+    if loop is None:
+        return slots.get(0)
+    try:
+        task = asyncio.current_task(loop)
+    except Exception:
+        return None
+    return slots.get(id(task) if task is not None else 0)
+
+
+def _lane() -> tuple[int, int, asyncio.AbstractEventLoop | None]:
+    """
+    (thread ident, task key, running loop) identifying where the caller runs.
+    """
+    tid = threading.get_ident()
+    key, loop = 0, None
+    with suppress(RuntimeError):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task(loop)
+        key = id(task) if task is not None else 0
+    return tid, key, loop
+
+
+def _set_thread_ctx(ctx: tuple[str, str] | None) -> tuple[str, str] | None:
+    # Only the owning thread writes its entries, so no lock is needed.
+    tid, key, loop = _lane()
+    slots = _thread_ctx.setdefault(tid, {})
+    prev = slots.get(key)
+    if ctx is None:
+        slots.pop(key, None)
+    else:
+        slots[key] = ctx
+        if loop is not None:
+            _thread_loops[tid] = loop
+    if not slots:
+        _thread_ctx.pop(tid, None)
+        _thread_loops.pop(tid, None)
+    return prev
+
+
+def _lane_enter(lane: tuple[int, int]) -> tuple[bool, int]:
+    """
+    Register an open span on `lane`; returns (other lanes busy, lane-open counter).
+    """
+    global _lane_opens
+    with _lanes_lock:
+        n = _lanes.get(lane, 0)
+        if n == 0:
+            _lane_opens += 1
+        _lanes[lane] = n + 1
+        return any(k != lane for k in _lanes), _lane_opens
+
+
+def _lane_exit(lane: tuple[int, int], opens0: int) -> bool:
+    """
+    Unregister an open span on `lane`; True when another lane was busy at any point since
+    `_lane_enter` returned `opens0`.
+    """
+    with _lanes_lock:
+        shared = _lane_opens != opens0 or any(k != lane for k in _lanes)
+        n = _lanes.get(lane, 0) - 1
+        if n > 0:
+            _lanes[lane] = n
+        else:
+            _lanes.pop(lane, None)
+        return shared
+
+
+def _observe(e: dict[str, Any]) -> None:
+    with suppress(Exception):
+        from dubbing_pipeline.ops.metrics import observe_span
+
+        observe_span(e)
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    stage: str
+    attrs: dict[str, Any] = field(default_factory=dict)
+    _rec: SpanRecorder | None = None
+    _stage_token: Any = None
+    _t0: float = 0.0
+    _wall0: float = 0.0
+    _cpu0: float = 0.0
+    _child_cpu0: float = 0.0
+    _inblk0: int = 0
+    _oublk0: int = 0
+    _io0: tuple[int, int] = (0, 0)
+    _rss0: int = 0
+    _lane: tuple[int, int] = (0, 0)
+    _lane_opens0: int = 0
+    _shared: bool = False
+    _thread_prev: tuple[str, str] | None = None
+    _done: bool = False
+
+    def finish(self, *, outcome: str = "ok", error: str | None = None) -> dict[str, Any] | None:
+        if self._done:
+            return None
+        self._done = True
+        dt = max(0.0, time.perf_counter() - self._t0)
+        cpu = max(0.0, time.thread_time() - self._cpu0)
+        child_cpu, inblk, oublk = _rusage()
+        rb, wb = _proc_io()
+        rss = _rss_bytes()
+        shared = _lane_exit(self._lane, self._lane_opens0) or self._shared
+        rec = self._rec
+        event = {
+            "name": self.name,
+            "kind": self.kind,
+            "stage": self.stage,
+            "mode": rec.mode if rec is not None else "",
+            "device": rec.device if rec is not None else "",
+            "ts_us": self._wall0 * 1e6,
+            "dur_us": dt * 1e6,
+            "duration_s": dt,
+            "cpu_s": cpu,
+            "child_cpu_s": None if shared else max(0.0, child_cpu - self._child_cpu0),
+            "rss_bytes": rss,
+            "rss_delta_bytes": None if shared or not rss else rss - self._rss0,
+            "read_bytes": (
+                None if shared else max(0, rb - self._io0[0]) + max(0, inblk - self._inblk0) * 512
+            ),
+            "write_bytes": (
+                None if shared else max(0, wb - self._io0[1]) + max(0, oublk - self._oublk0) * 512
+            ),
+            "shared": shared,
+            "outcome": str(outcome),
+            "error": (str(error)[:200] if error else None),
+            "pid": os.getpid(),
+            "tid": threading.get_ident() % 1_000_000,
+            "process": "worker" if rec is None else f"job {rec.job_id}",
+            "attrs": dict(self.attrs),
+        }
+        if self._stage_token is not None:
+            with suppress(Exception):
+                _stage.reset(self._stage_token)
+        _set_thread_ctx(self._thread_prev)
+        if rec is not None:
+            rec.add(event)
+        _observe(event)
+        return event
+
+
+def start_span(name: str, *, kind: str = "step", stage: str | None = None, **attrs: Any) -> Span:
+    """
+    Begin a span. Spans of kind "stage" also become the stage label for nested spans.
+    Always pair with `Span.finish()` (or use the `span()` context manager).
+    """
+    st = str(stage if stage is not None else (name if kind == "stage" else _stage.get()))
+    child_cpu, inblk, oublk = _rusage()
+    sp = Span(
+        name=str(name),
+        kind=str(kind),
+        stage=st,
+        attrs={k: v for k, v in attrs.items() if v is not None},
+        _rec=_recorder.get(),
+    )
+    if kind == "stage":
+        sp._stage_token = _stage.set(st)
+    sp._thread_prev = _set_thread_ctx((sp._rec.job_id if sp._rec is not None else "", st))
+    tid, key, _ = _lane()
+    sp._lane = (tid, key)
+    sp._shared, sp._lane_opens0 = _lane_enter(sp._lane)
+    sp._t0 = time.perf_counter()
+    sp._wall0 = time.time()
+    sp._cpu0 = time.thread_time()
+    sp._child_cpu0 = child_cpu
+    sp._inblk0 = inblk
+    sp._oublk0 = oublk
+    sp._io0 = _proc_io()
+    sp._rss0 = _rss_bytes()
+    return sp
+
+
+@contextmanager
+def span(
+    name: str, *, kind: str = "step", stage: str | None = None, **attrs: Any
+) -> Iterator[Span]:
+    sp = start_span(name, kind=kind, stage=stage, **attrs)
+    try:
+        yield sp
+    except BaseException as ex:
+        sp.finish(outcome="failed", error=str(ex))
+        raise
+    else:
+        sp.finish(outcome="ok")
+
+
+def child_context() -> dict[str, Any] | None:
+    """
+    Picklable trace context for a watchdog child process (None when not recording).
+    """
+    rec = _recorder.get()
+    if rec is None:
+        return None
+    return {"job_id": rec.job_id, "mode": rec.mode, "device": rec.device, "stage": _stage.get()}
+
+
+def load_job_trace(job_dir: Path) -> dict[str, Any] | None:
+    p = Path(job_dir) / "logs" / TRACE_FILENAME
+    if not p.exists():
+        return None
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
@@ -5,8 +5,6 @@ import shutil
 import time
 from pathlib import Path
 
-from fastapi import HTTPException
-
 from dubbing_pipeline.library.paths import get_job_output_root, get_library_root_for_job
 from dubbing_pipeline.jobs.models import Job
 
@@ -29,6 +27,9 @@ def ensure_free_space(*, min_gb: int, path: Path) -> None:
     usage = shutil.disk_usage(str(p))
     free_gb = usage.free / (1024**3)
     if free_gb < float(min_gb):
+        # Imported here: lifecycle (and with it the CLI doctor) uses this module without FastAPI.
+        from fastapi import HTTPException
+
         raise HTTPException(
             status_code=507,
             detail=f"Insufficient storage: {free_gb:.1f}GB free (<{min_gb}GB). Free space or increase MIN_FREE_GB.",
@@ -64,7 +65,16 @@ def prune_stale_workdirs(*, output_root: Path, max_age_hours: int = 24) -> int:
 
 def periodic_prune_tick(*, output_root: Path) -> int:
     s = get_settings()
-    return prune_stale_workdirs(output_root=output_root, max_age_hours=int(s.work_stale_max_hours))
+    removed = prune_stale_workdirs(
+        output_root=output_root, max_age_hours=int(s.work_stale_max_hours)
+    )
+    try:
+        from dubbing_pipeline.cache.segments import prune_segment_cache
+
+        prune_segment_cache()
+    except Exception as ex:
+        logger.warning("segment_cache_prune_failed", error=str(ex))
+    return removed
 
 
 def _safe_under_root(path: Path, root: Path) -> bool:
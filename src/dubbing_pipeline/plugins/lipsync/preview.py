@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
 from dubbing_pipeline.config import get_settings
-from dubbing_pipeline.utils.ffmpeg_safe import ffprobe_duration_seconds, run_ffmpeg
+from dubbing_pipeline.utils.ffmpeg_safe import (
+    ffprobe_duration_seconds,
+    ffprobe_media_info,
+    pipe_rawvideo,
+)
 from dubbing_pipeline.utils.io import atomic_write_text
 from dubbing_pipeline.utils.log import logger
 
@@ -65,101 +74,269 @@ def _try_import_cv2() -> Any | None:
         return None
 
 
-def _extract_frames(
-    *,
-    video: Path,
-    frames_dir: Path,
-    sample_every_s: float,
-    max_frames: int,
-    scale_width: int = 320,
-) -> tuple[float, float]:
+def _sample_grid(*, duration_s: float, sample_every_s: float, max_frames: int) -> tuple[int, float]:
     """
-    Extract frames at ~1/sample_every_s FPS to frames_dir/frame_%06d.jpg.
-    Returns (duration_s, effective_sample_every_s).
+    Returns (n_samples, effective_sample_every_s); long videos are clamped to max_frames.
     """
-    s = get_settings()
-    duration = float(ffprobe_duration_seconds(video))
-    if duration <= 0:
-        return 0.0, float(sample_every_s)
-
-    # Clamp extraction count to avoid huge jobs on long videos.
     sample_every_s = float(max(0.10, sample_every_s))
     if int(max_frames) > 0:
-        est = int(duration / sample_every_s) + 1
+        est = int(duration_s / sample_every_s) + 1
         if est > int(max_frames):
-            sample_every_s = float(duration / float(max_frames))
-
-    fps = 1.0 / float(sample_every_s)
-    frames_dir.mkdir(parents=True, exist_ok=True)
-    out_pat = frames_dir / "frame_%06d.jpg"
-    vf = f"fps={fps:.6f},scale={int(scale_width)}:-1"
-    argv = [
-        str(s.ffmpeg_bin),
-        "-y",
-        "-i",
-        str(video),
-        "-vf",
-        vf,
-        "-q:v",
-        "4",
-        str(out_pat),
-    ]
-    run_ffmpeg(argv, timeout_s=600, retries=0, capture=True)
-    return duration, float(sample_every_s)
+            sample_every_s = float(duration_s / float(max_frames))
+    return max(1, int(duration_s / sample_every_s) + 1), float(sample_every_s)
+
+
+def _frame_size(width: int, height: int, scale_width: int) -> tuple[int, int]:
+    w = int(scale_width)
+    if width <= 0 or height <= 0:
+        return w, (w * 9 // 16) // 2 * 2
+    return w, max(2, int(round(float(height) * w / float(width) / 2.0)) * 2)
 
 
-def _detect_faces_opencv(frames_dir: Path) -> tuple[list[FaceSample], str, list[str]]:
+def _gray_frames(
+    *,
+    video: Path,
+    size: tuple[int, int],
+    every_s: float,
+    start_s: float = 0.0,
+    count: int | None = None,
+) -> Iterator[Any]:
     """
-    Returns (samples, method, warnings). Each sample corresponds to extracted frames in order.
+    Decode frames at 1/every_s FPS straight into (h, w) uint8 grayscale arrays (ffmpeg rawvideo
+    pipe; nothing is encoded or written to disk).
     """
+    import numpy as np  # type: ignore
+
+    s = get_settings()
+    w, h = size
+    argv = [str(s.ffmpeg_bin), "-v", "error", "-nostdin"]
+    if start_s > 0:
+        argv += ["-ss", f"{float(start_s):.3f}"]
+    argv += ["-i", str(video), "-an", "-sn"]
+    if count is not None:
+        argv += ["-frames:v", str(int(count))]
+    argv += [
+        "-vf",
+        f"fps={1.0 / float(every_s):.6f},scale={w}:{h}",
+        "-pix_fmt",
+        "gray",
+        "-f",
+        "rawvideo",
+        "pipe:1",
+    ]
+    for buf in pipe_rawvideo(argv, frame_bytes=w * h, timeout_s=600):
+        yield np.frombuffer(buf, dtype=np.uint8).reshape(h, w)
+
+
+_CASCADE: Any | None = None
+
+
+def _load_cascade() -> tuple[Any | None, str | None]:
+    """(cascade, error) for the OpenCV frontal-face Haar cascade."""
     cv2 = _try_import_cv2()
     if cv2 is None:
-        return (
-            [],
-            "none",
-            [
-                "opencv-python not installed; face detection unavailable (preview will be heuristic-only)."
-            ],
+        return None, (
+            "opencv-python not installed; face detection unavailable "
+            "(preview will be heuristic-only)."
         )
-
     try:
         cascade_path = (
             Path(str(getattr(cv2.data, "haarcascades", ""))) / "haarcascade_frontalface_default.xml"
         )
         if not cascade_path.exists():
-            return [], "none", ["OpenCV haar cascade not found; face detection unavailable."]
-        cascade = cv2.CascadeClassifier(str(cascade_path))
+            return None, "OpenCV haar cascade not found; face detection unavailable."
+        return cv2.CascadeClassifier(str(cascade_path)), None
     except Exception as ex:
-        return [], "none", [f"OpenCV face detector init failed: {ex}"]
+        return None, f"OpenCV face detector init failed: {ex}"
+
+
+def _count_faces(gray: Any) -> int | None:
+    """Haar face count for one grayscale frame (runs in pool workers)."""
+    global _CASCADE
+    if _CASCADE is None:
+        _CASCADE, _err = _load_cascade()
+        if _CASCADE is None:
+            return None
+    try:
+        faces = _CASCADE.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+        return int(len(faces)) if faces is not None else 0
+    except Exception:
+        return None
+
+
+class _FaceCounter:
+    """
+    Ordered face counts for frame batches; fans out to a process pool for larger batches.
+    """
+
+    _POOL_MIN_FRAMES = 16
+
+    def __init__(self, *, workers: int) -> None:
+        self.workers = max(1, int(workers))
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __call__(self, frames: list[Any]) -> list[int | None]:
+        if self.workers <= 1 or len(frames) < self._POOL_MIN_FRAMES:
+            return [_count_faces(f) for f in frames]
+        if self._pool is None:
+            # spawn: callers may be threaded (job workers); forking them is unsafe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        chunk = max(1, len(frames) // (self.workers * 4))
+        return list(self._pool.map(_count_faces, frames, chunksize=chunk))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
 
-    frames = sorted(frames_dir.glob("frame_*.jpg"))
-    if not frames:
-        return [], "none", ["No frames extracted (ffmpeg produced none)."]
+
+def _adaptive_face_samples(
+    *,
+    n: int,
+    stride: int,
+    fetch: Callable[[int, int, int], list[Any]],
+    detect: Callable[[list[Any]], list[int | None]],
+    method: str = "opencv_haar",
+) -> tuple[list[FaceSample], int]:
+    """
+    Face samples for grid indices 0..n-1 while only decoding/detecting a fraction of them.
+
+    Every `stride`-th index is detected first (plus the last one); only gaps whose two coarse
+    neighbours disagree (face <-> no face) are then detected densely. Indices inside agreeing
+    gaps inherit that value (method="inferred"). `fetch(start, step, count)` returns frames for
+    indices start, start+step, ...
+
+    Returns (samples ordered by index, number of frames actually detected).
+    """
+    stride = max(1, int(stride))
+    coarse = list(range(0, n, stride))
+    if coarse[-1] != n - 1:
+        coarse.append(n - 1)
+    counts: dict[int, int | None] = {}
+
+    frames = fetch(0, stride, len(range(0, n, stride)))
+    if coarse[-1] % stride:
+        frames = frames + fetch(coarse[-1], 1, 1)
+    for idx, c in zip(coarse, detect(frames), strict=False):
+        counts[idx] = c
+
+    def _found(i: int) -> bool:
+        return bool(counts.get(i))
+
+    for a, b in zip(coarse, coarse[1:], strict=False):
+        if b - a > 1 and _found(a) != _found(b):
+            for idx, c in zip(range(a + 1, b), detect(fetch(a + 1, 1, b - a - 1)), strict=False):
+                counts[idx] = c
 
     out: list[FaceSample] = []
-    for idx, fp in enumerate(frames):
-        try:
-            img = cv2.imread(str(fp))
-            if img is None:
-                out.append(
-                    FaceSample(
-                        t_s=float(idx), face_found=False, face_count=None, method="opencv_haar"
-                    )
-                )
-                continue
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    last_found = False
+    for i in range(n):
+        if i in counts:
+            c = counts[i]
+            last_found = bool(c)
+            out.append(FaceSample(t_s=float(i), face_found=bool(c), face_count=c, method=method))
+        else:
+            out.append(FaceSample(t_s=float(i), face_found=last_found, method="inferred"))
+    return out, len(counts)
+
+
+def _detect_faces_sampled(
+    *,
+    video: Path,
+    n: int,
+    every_s: float,
+    scale_width: int,
+    width: int,
+    height: int,
+    coarse_stride: int,
+    workers: int,
+) -> tuple[list[FaceSample], str, list[str]]:
+    """
+    Returns (samples, method, warnings); one sample per grid index, in order.
+    """
+    cascade, err = _load_cascade()
+    if cascade is None:
+        return [], "none", [str(err)]
+    global _CASCADE
+    _CASCADE = cascade
+    size = _frame_size(width, height, scale_width)
+
+    def _fetch(start: int, step: int, count: int) -> list[Any]:
+        got = list(
+            _gray_frames(
+                video=video,
+                size=size,
+                every_s=every_s * step,
+                start_s=start * every_s,
+                count=count,
+            )
+        )
+        return got[:count]
+
+    counter = _FaceCounter(workers=workers)
+    try:
+        samples, detected = _adaptive_face_samples(
+            n=n, stride=coarse_stride, fetch=_fetch, detect=counter
+        )
+    finally:
+        counter.close()
+    if detected == 0:
+        return [], "none", ["No frames extracted (ffmpeg produced none)."]
+    logger.info("lipsync_preview_sampled", grid=int(n), detected=int(detected))
+    return samples, "opencv_haar", []
+
+
+def detect_face_box(
+    *,
+    video: Path,
+    start_s: float,
+    end_s: float,
+    width: int,
+    height: int,
+    samples: int = 6,
+    scale_width: int = 320,
+    pad: float = 0.15,
+) -> tuple[int, int, int, int] | None:
+    """
+    One face box (x1, y1, x2, y2 in source pixels) covering the largest face across `samples`
+    frames spread over [start_s, end_s); None if no detector or no face was found.
+
+    Wav2Lip accepts a fixed `--box`, which lets it skip its own per-frame face detection.
+    """
+    cascade, _err = _load_cascade()
+    if cascade is None or width <= 0 or height <= 0 or end_s <= start_s:
+        return None
+    n = max(1, int(samples))
+    every_s = max(0.04, (float(end_s) - float(start_s)) / float(n))
+    size = _frame_size(width, height, scale_width)
+    boxes: list[tuple[int, int, int, int]] = []
+    for gray in _gray_frames(
+        video=video, size=size, every_s=every_s, start_s=float(start_s), count=n
+    ):
+        with suppress(Exception):
             faces = cascade.detectMultiScale(
                 gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
             )
-            n = int(len(faces)) if faces is not None else 0
-            out.append(
-                FaceSample(t_s=float(idx), face_found=(n > 0), face_count=n, method="opencv_haar")
-            )
-        except Exception:
-            out.append(
-                FaceSample(t_s=float(idx), face_found=False, face_count=None, method="opencv_haar")
-            )
-    return out, "opencv_haar", []
+            if faces is not None and len(faces):
+                x, y, w, h = max(faces, key=lambda f: int(f[2]) * int(f[3]))
+                boxes.append((int(x), int(y), int(x + w), int(y + h)))
+    if not boxes:
+        return None
+    fx = float(width) / float(size[0])
+    fy = float(height) / float(size[1])
+    x1 = min(b[0] for b in boxes) * fx
+    y1 = min(b[1] for b in boxes) * fy
+    x2 = max(b[2] for b in boxes) * fx
+    y2 = max(b[3] for b in boxes) * fy
+    px, py = (x2 - x1) * float(pad), (y2 - y1) * float(pad)
+    return (
+        max(0, int(x1 - px)),
+        max(0, int(y1 - py)),
+        min(int(width), int(x2 + px)),
+        min(int(height), int(y2 + py)),
+    )
 
 
 def _recommend_ranges_from_samples(
@@ -244,10 +421,16 @@ def preview_lipsync_ranges(
     min_face_ratio: float = 0.60,
     min_range_s: float = 2.0,
     merge_gap_s: float = 0.6,
+    coarse_stride: int = 4,
+    workers: int | None = None,
 ) -> LipSyncPreviewReport:
     """
     Offline preview: sample frames and estimate where face visibility is good enough for scene-limited lip-sync.
     Always returns a report (even when face detection isn't available).
+
+    Frames are decoded as raw grayscale straight from an ffmpeg pipe. Every `coarse_stride`-th
+    sample is detected first and only face/no-face transitions are refined at the full rate
+    (`coarse_stride=1` detects every sample); detection fans out over `workers` processes.
     """
     video = Path(video).resolve()
     work_dir = Path(work_dir).resolve()
@@ -255,23 +438,36 @@ def preview_lipsync_ranges(
 
     warnings: list[str] = []
     duration_s = 0.0
+    width = height = 0
     eff_sample_every_s = float(sample_every_s)
     try:
-        frames_dir = work_dir / "frames"
-        duration_s, eff_sample_every_s = _extract_frames(
-            video=video,
-            frames_dir=frames_dir,
-            sample_every_s=float(sample_every_s),
-            max_frames=int(max_frames),
-        )
+        info = ffprobe_media_info(video)
+        duration_s = float(info.get("duration_s") or 0.0)
+        width, height = int(info.get("width") or 0), int(info.get("height") or 0)
+        if duration_s <= 0.0:
+            duration_s = float(ffprobe_duration_seconds(video))
     except Exception as ex:
         warnings.append(f"Frame extraction failed: {ex}")
 
     samples: list[FaceSample] = []
     method = "none"
     if duration_s > 0.0:
+        n, eff_sample_every_s = _sample_grid(
+            duration_s=duration_s, sample_every_s=float(sample_every_s), max_frames=max_frames
+        )
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
         try:
-            samples, method, w2 = _detect_faces_opencv(work_dir / "frames")
+            samples, method, w2 = _detect_faces_sampled(
+                video=video,
+                n=n,
+                every_s=eff_sample_every_s,
+                scale_width=320,
+                width=width,
+                height=height,
+                coarse_stride=int(coarse_stride),
+                workers=int(workers),
+            )
             warnings.extend(w2)
         except Exception as ex:
             warnings.append(f"Face detection failed: {ex}")
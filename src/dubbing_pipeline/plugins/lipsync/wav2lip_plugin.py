@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.plugins.lipsync.base import LipSyncPlugin, LipSyncRequest
-from dubbing_pipeline.plugins.lipsync.preview import preview_lipsync_ranges, write_preview_report
-from dubbing_pipeline.utils.ffmpeg_safe import extract_audio_mono_16k, ffprobe_duration_seconds, run_ffmpeg
+from dubbing_pipeline.plugins.lipsync.preview import (
+    detect_face_box,
+    preview_lipsync_ranges,
+    write_preview_report,
+)
+from dubbing_pipeline.runtime.device_allocator import pick_device
+from dubbing_pipeline.utils.ffmpeg_safe import (
+    extract_audio_mono_16k,
+    ffprobe_duration_seconds,
+    ffprobe_keyframes,
+    ffprobe_media_info,
+    ffprobe_video_stream,
+    run_ffmpeg,
+)
 from dubbing_pipeline.utils.log import logger
 
 
@@ -111,6 +127,140 @@ def _center_box(video: Path) -> tuple[int, int, int, int] | None:
         return None
 
 
+def _plan_pieces(
+    ranges: list[tuple[float, float]],
+    *,
+    duration_s: float,
+    keyframes: list[float],
+    min_edge_s: float = 0.25,
+) -> list[tuple[float, float, str]]:
+    """
+    Split [0, duration_s) into (start, end, kind) pieces, kind in lipsync|copy|encode.
+
+    Pass-through gaps between lip-sync ranges are stream-copied between the first and last
+    keyframe they contain. The non-keyframe edges are re-encoded, or folded into the adjacent
+    lip-sync range when shorter than `min_edge_s`. Without keyframes (or when a gap holds
+    fewer than two), the whole gap is re-encoded.
+    """
+    eps = 1e-3
+    dur = float(duration_s)
+    out: list[list[Any]] = []
+
+    def _gap(a: float, b: float, *, prev_ls: bool, next_ls: bool) -> float:
+        """Emit pieces for the gap [a, b); returns where the next lip-sync range should start."""
+        ka = next((k for k in keyframes if k >= a - eps), None)
+        kb = dur if b >= dur - eps else max((k for k in keyframes if k <= b + eps), default=None)
+        if ka is None or kb is None or kb - ka < float(min_edge_s):
+            out.append([a, b, "encode"])
+            return b
+        ka, kb = max(a, ka), min(b, kb)
+        if ka - a > eps:
+            if prev_ls and ka - a < float(min_edge_s):
+                out[-1][1] = ka
+            else:
+                out.append([a, ka, "encode"])
+        out.append([ka, kb, "copy"])
+        if b - kb > eps:
+            if next_ls and b - kb < float(min_edge_s):
+                return kb
+            out.append([kb, b, "encode"])
+        return b
+
+    cur = 0.0
+    for i, (a, b) in enumerate(ranges):
+        start = float(a)
+        if start > cur + eps:
+            start = _gap(cur, start, prev_ls=i > 0, next_ls=True)
+        out.append([start, float(b), "lipsync"])
+        cur = float(b)
+    if cur < dur - eps:
+        _gap(cur, dur, prev_ls=bool(ranges), next_ls=False)
+    return [(float(a), float(b), str(k)) for a, b, k in out]
+
+
+# Stream parameters that must agree between stream-copied and re-encoded pieces before they
+# are concatenated with `-c copy` (the re-encode is H.264 baseline 3.0, yuv420p).
+_CONCAT_KEYS = ("codec_name", "profile", "level", "pix_fmt", "width", "height", "time_base")
+
+
+def _copy_compatible(src: dict[str, str]) -> bool:
+    """
+    True when the source video matches the re-encode settings, so its pieces may be copied.
+    """
+    return (
+        src.get("codec_name") == "h264"
+        and src.get("profile") in {"Baseline", "Constrained Baseline"}
+        and src.get("level") == "30"
+        and src.get("pix_fmt") == "yuv420p"
+    )
+
+
+def _range_workers(device: str, n_ranges: int) -> int:
+    """
+    Concurrent Wav2Lip processes for scene-limited ranges: LIPSYNC_GPU_WORKERS when the runs
+    land on CUDA, else LIPSYNC_WORKERS (bounded by CPU count).
+    """
+    s = get_settings()
+    dev = (device or "auto").lower()
+    # Wav2Lip picks CUDA by itself whenever it is available, so "auto" sizes like "cuda".
+    dev = "cpu" if dev == "cpu" else pick_device("cuda")
+    if dev == "cuda":
+        cap = int(s.lipsync_gpu_workers)
+    else:
+        cap = min(int(s.lipsync_workers), os.cpu_count() or 1)
+    return max(1, min(cap, int(n_ranges)))
+
+
+class _FaceBoxCache:
+    """
+    Per-range face boxes, detected once and persisted under the work dir so retries and
+    re-runs of the same job skip detection. Keyed by range and the source file's size/mtime.
+    """
+
+    def __init__(self, path: Path, *, video: Path) -> None:
+        self.path = Path(path)
+        self.video = Path(video)
+        self._lock = threading.Lock()
+        st = self.video.stat()
+        self._src = f"{int(st.st_size)}:{int(st.st_mtime_ns)}"
+        self._boxes: dict[str, list[int] | None] = {}
+        self._dims: tuple[int, int] | None = None
+        with suppress(Exception):
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("source") == self._src:
+                self._boxes = dict(data.get("boxes") or {})
+
+    def _video_dims(self) -> tuple[int, int]:
+        if self._dims is None:
+            info = ffprobe_media_info(self.video)
+            self._dims = (int(info.get("width") or 0), int(info.get("height") or 0))
+        return self._dims
+
+    def get(self, start_s: float, end_s: float) -> tuple[int, int, int, int] | None:
+        key = f"{float(start_s):.3f}-{float(end_s):.3f}"
+        with self._lock:
+            if key in self._boxes:
+                box = self._boxes[key]
+                return tuple(box) if box else None  # type: ignore[return-value]
+            w, h = self._video_dims()
+        box = None
+        with suppress(Exception):
+            box = detect_face_box(
+                video=self.video, start_s=start_s, end_s=end_s, width=w, height=h
+            )
+        with self._lock:
+            self._boxes[key] = list(box) if box else None
+            from dubbing_pipeline.utils.io import atomic_write_text
+
+            with suppress(Exception):
+                atomic_write_text(
+                    self.path,
+                    json.dumps({"source": self._src, "boxes": self._boxes}, sort_keys=True),
+                    encoding="utf-8",
+                )
+        return box
+
+
 class Wav2LipPlugin(LipSyncPlugin):
     name = "wav2lip"
 
@@ -296,6 +446,36 @@ class Wav2LipPlugin(LipSyncPlugin):
         run_ffmpeg(cmd, timeout_s=600, retries=0, capture=True)
         return out_mp4
 
+    def _cut_copy(self, *, src_video: Path, start_s: float, end_s: float, out_mp4: Path) -> Path:
+        """
+        Stream-copy [start_s, end_s) of the source video; start_s must be a keyframe.
+        """
+        s = get_settings()
+        out_mp4.parent.mkdir(parents=True, exist_ok=True)
+        # Input seeking lands on the last keyframe <= ts; nudge past rounding so it is start_s.
+        cmd = [
+            str(s.ffmpeg_bin),
+            "-y",
+            "-ss",
+            f"{float(start_s) + 0.0005:.4f}",
+            "-i",
+            str(src_video),
+            "-t",
+            f"{max(0.001, float(end_s) - float(start_s) - 0.0005):.4f}",
+            "-map",
+            "0:v:0",
+            "-an",
+            "-c:v",
+            "copy",
+            "-avoid_negative_ts",
+            "make_zero",
+            "-movflags",
+            "+faststart",
+            str(out_mp4),
+        ]
+        run_ffmpeg(cmd, timeout_s=600, retries=0, capture=True)
+        return out_mp4
+
     def _mux_video_audio(
         self, *, video_mp4: Path, audio_wav: Path, out_mp4: Path, timeout_s: int
     ) -> Path:
@@ -604,138 +784,76 @@ class Wav2LipPlugin(LipSyncPlugin):
         analysis_dir.mkdir(parents=True, exist_ok=True)
         range_log = analysis_dir / "lipsync_ranges.jsonl"
 
-        pieces: list[tuple[float, float, bool]] = []  # (start,end,do_lipsync)
-        cur = 0.0
-        for a, b in ranges:
-            if a > cur + 1e-3:
-                pieces.append((cur, a, False))
-            pieces.append((a, b, True))
-            cur = b
-        if cur < float(duration_s) - 1e-3:
-            pieces.append((cur, float(duration_s), False))
+        keyframes: list[float] = []
+        if bool(s.lipsync_passthrough_copy):
+            with suppress(Exception):
+                # Stream-copied pieces are concatenated with re-encoded H.264 ones.
+                if _copy_compatible(ffprobe_video_stream(req.input_video)):
+                    keyframes = ffprobe_keyframes(req.input_video)
+        pieces = _plan_pieces(ranges, duration_s=float(duration_s), keyframes=keyframes)
 
-        mp4s: list[Path] = []
-        from dubbing_pipeline.utils.io import atomic_write_text
+        boxes = None
+        if face_mode == "auto" and bbox is None and bool(s.lipsync_range_face_box):
+            boxes = _FaceBoxCache(req.work_dir / "face_boxes.json", video=req.input_video)
 
-        lines: list[str] = []
-        for i, (a, b, do_ls) in enumerate(pieces):
-            seg_id = f"{i:03d}"
-            seg_dir = req.work_dir / f"seg_{seg_id}"
-            seg_dir.mkdir(parents=True, exist_ok=True)
-            seg_video = seg_dir / "video.mp4"
-            seg_audio = seg_dir / "audio.wav"
-            out_seg = seg_dir / "out.mp4"
-            try:
-                self._slice_video_segment(
-                    src_video=req.input_video, start_s=float(a), end_s=float(b), out_mp4=seg_video
-                )
-                extract_audio_mono_16k(
-                    src=req.dubbed_audio_wav,
-                    dst=seg_audio,
-                    start_s=float(a),
-                    end_s=float(b),
-                    timeout_s=120,
-                )
-                if do_ls:
-                    raw = seg_dir / "lipsynced.raw.mp4"
-                    self._run_wav2lip_once(
+        n_ls = sum(1 for p in pieces if p[2] == "lipsync")
+        workers = _range_workers(str(req.device), n_ls)
+        logger.info(
+            "lipsync_ranges_start", pieces=len(pieces), lipsync=n_ls, workers=int(workers)
+        )
+
+        results: dict[int, tuple[Path | None, dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wav2lip") as pool:
+            futs = {
+                pool.submit(
+                    self._render_piece,
+                    req=req,
+                    paths=paths,
+                    idx=i,
+                    piece=piece,
+                    face_mode=face_mode,
+                    bbox=bbox,
+                    boxes=boxes,
+                ): i
+                for i, piece in enumerate(pieces)
+                if piece[2] == "lipsync"
+            }
+            # Passthrough pieces are cheap ffmpeg cuts; do them here while the pool runs inference.
+            for i, piece in enumerate(pieces):
+                if piece[2] != "lipsync":
+                    results[i] = self._render_piece(
+                        req=req,
                         paths=paths,
-                        face_video=seg_video,
-                        audio_wav=seg_audio,
-                        raw_out=raw,
+                        idx=i,
+                        piece=piece,
                         face_mode=face_mode,
                         bbox=bbox,
-                        device=str(req.device),
-                        timeout_s=int(req.timeout_s),
-                        dry_run=bool(req.dry_run),
-                    )
-                    if req.dry_run:
-                        mp4s.append(out_seg)
-                        lines.append(
-                            json.dumps(
-                                {
-                                    "range": [float(a), float(b)],
-                                    "mode": "lipsync",
-                                    "status": "dry_run",
-                                },
-                                sort_keys=True,
-                            )
-                        )
-                        continue
-                    self._mux_video_audio(
-                        video_mp4=raw,
-                        audio_wav=seg_audio,
-                        out_mp4=out_seg,
-                        timeout_s=int(req.timeout_s),
-                    )
-                    with suppress(Exception):
-                        raw.unlink(missing_ok=True)
-                    lines.append(
-                        json.dumps(
-                            {"range": [float(a), float(b)], "mode": "lipsync", "status": "ok"},
-                            sort_keys=True,
-                        )
-                    )
-                else:
-                    # pass-through segment (no Wav2Lip): just mux dubbed audio.
-                    if req.dry_run:
-                        mp4s.append(out_seg)
-                        lines.append(
-                            json.dumps(
-                                {
-                                    "range": [float(a), float(b)],
-                                    "mode": "passthrough",
-                                    "status": "dry_run",
-                                },
-                                sort_keys=True,
-                            )
-                        )
-                        continue
-                    self._mux_video_audio(
-                        video_mp4=seg_video,
-                        audio_wav=seg_audio,
-                        out_mp4=out_seg,
-                        timeout_s=int(req.timeout_s),
-                    )
-                    lines.append(
-                        json.dumps(
-                            {"range": [float(a), float(b)], "mode": "passthrough", "status": "ok"},
-                            sort_keys=True,
-                        )
-                    )
-                mp4s.append(out_seg)
-            except Exception as ex:
-                # Skip failed lipsync segments; fall back to passthrough for that range if possible.
-                logger.warning(
-                    "[dp] lipsync range failed; skipping",
-                    start=float(a),
-                    end=float(b),
-                    error=str(ex),
-                )
-                lines.append(
-                    json.dumps(
-                        {
-                            "range": [float(a), float(b)],
-                            "mode": "lipsync" if do_ls else "passthrough",
-                            "status": "fail",
-                            "error": str(ex),
-                        },
-                        sort_keys=True,
+                        boxes=None,
                     )
+            for fut in as_completed(futs):
+                results[futs[fut]] = fut.result()
+        if not req.dry_run:
+            for i in self._copies_to_reencode(pieces, results):
+                a, b, _ = pieces[i]
+                results[i] = self._render_piece(
+                    req=req,
+                    paths=paths,
+                    idx=i,
+                    piece=(a, b, "encode"),
+                    face_mode=face_mode,
+                    bbox=bbox,
+                    boxes=None,
                 )
-                if req.dry_run:
-                    continue
-                try:
-                    # best-effort passthrough
-                    self._mux_video_audio(
-                        video_mp4=seg_video,
-                        audio_wav=seg_audio,
-                        out_mp4=out_seg,
-                        timeout_s=int(req.timeout_s),
-                    )
-                    mp4s.append(out_seg)
-                except Exception:
-                    continue
+
+        from dubbing_pipeline.utils.io import atomic_write_text
+
+        mp4s: list[Path] = []
+        lines: list[str] = []
+        for i in range(len(pieces)):
+            out_seg, rec = results[i]
+            lines.append(json.dumps(rec, sort_keys=True))
+            if out_seg is not None:
+                mp4s.append(out_seg)
 
         atomic_write_text(range_log, "\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
         if req.dry_run:
@@ -745,6 +863,157 @@ class Wav2LipPlugin(LipSyncPlugin):
         self._concat_mp4s(mp4s=mp4s, out_mp4=req.output_video, timeout_s=int(req.timeout_s))
         return req.output_video
 
+    def _copies_to_reencode(
+        self,
+        pieces: list[tuple[float, float, str]],
+        results: dict[int, tuple[Path | None, dict[str, Any]]],
+    ) -> list[int]:
+        """
+        Stream-copied pieces whose video parameters differ from the re-encoded ones (level,
+        resolution, timebase, ...): concatenating those with `-c copy` glitches, so they are
+        re-encoded instead.
+        """
+        copies = [i for i, p in enumerate(pieces) if p[2] == "copy" and results[i][0] is not None]
+        if not copies:
+            return []
+        ref: tuple[str, ...] | None = None
+        for i, p in enumerate(pieces):
+            out_seg = results[i][0]
+            if p[2] != "copy" and out_seg is not None:
+                with suppress(Exception):
+                    info = ffprobe_video_stream(out_seg)
+                    ref = tuple(info.get(k, "") for k in _CONCAT_KEYS)
+                break
+        out: list[int] = []
+        for i in copies:
+            sig: tuple[str, ...] | None = None
+            with suppress(Exception):
+                info = ffprobe_video_stream(results[i][0])  # type: ignore[arg-type]
+                sig = tuple(info.get(k, "") for k in _CONCAT_KEYS)
+            if ref is None or sig != ref:
+                out.append(i)
+        if out:
+            logger.info("lipsync_copy_pieces_reencoded", pieces=len(out), of=len(copies))
+        return out
+
+    def _render_piece(
+        self,
+        *,
+        req: LipSyncRequest,
+        paths: Wav2LipPaths,
+        idx: int,
+        piece: tuple[float, float, str],
+        face_mode: str,
+        bbox: tuple[int, int, int, int] | None,
+        boxes: _FaceBoxCache | None,
+    ) -> tuple[Path | None, dict[str, Any]]:
+        """
+        Produce one muxed segment. Returns (segment mp4 or None, range-log record).
+
+        Lip-sync pieces run on pool threads; a failed piece falls back to pass-through.
+        """
+        a, b, kind = piece
+        do_ls = kind == "lipsync"
+        mode = "lipsync" if do_ls else "passthrough"
+        seg_dir = req.work_dir / f"seg_{idx:03d}"
+        seg_dir.mkdir(parents=True, exist_ok=True)
+        seg_video = seg_dir / "video.mp4"
+        seg_audio = seg_dir / "audio.wav"
+        out_seg = seg_dir / "out.mp4"
+        rec: dict[str, Any] = {"range": [float(a), float(b)], "mode": mode}
+        try:
+            if kind == "copy":
+                self._cut_copy(src_video=req.input_video, start_s=a, end_s=b, out_mp4=seg_video)
+                rec["cut"] = "copy"
+            else:
+                self._slice_video_segment(
+                    src_video=req.input_video, start_s=float(a), end_s=float(b), out_mp4=seg_video
+                )
+            extract_audio_mono_16k(
+                src=req.dubbed_audio_wav,
+                dst=seg_audio,
+                start_s=float(a),
+                end_s=float(b),
+                timeout_s=120,
+            )
+            if do_ls:
+                ls_mode, ls_box = face_mode, bbox
+                if boxes is not None:
+                    ls_box = boxes.get(float(a), float(b))
+                    if ls_box is not None:
+                        ls_mode = "bbox"
+                raw = seg_dir / "lipsynced.raw.mp4"
+                retries = max(0, int(get_settings().lipsync_range_retries))
+                for attempt in range(retries + 1):
+                    try:
+                        self._run_wav2lip_once(
+                            paths=paths,
+                            face_video=seg_video,
+                            audio_wav=seg_audio,
+                            raw_out=raw,
+                            face_mode=ls_mode,
+                            bbox=ls_box,
+                            device=str(req.device),
+                            timeout_s=int(req.timeout_s),
+                            dry_run=bool(req.dry_run),
+                        )
+                        break
+                    except Exception as ex:
+                        if attempt >= retries:
+                            raise
+                        logger.warning(
+                            "[dp] lipsync range retry",
+                            start=float(a),
+                            end=float(b),
+                            attempt=attempt + 1,
+                            error=str(ex),
+                        )
+                if req.dry_run:
+                    rec["status"] = "dry_run"
+                    return out_seg, rec
+                self._mux_video_audio(
+                    video_mp4=raw,
+                    audio_wav=seg_audio,
+                    out_mp4=out_seg,
+                    timeout_s=int(req.timeout_s),
+                )
+                with suppress(Exception):
+                    raw.unlink(missing_ok=True)
+            else:
+                # pass-through segment (no Wav2Lip): just mux dubbed audio.
+                if req.dry_run:
+                    rec["status"] = "dry_run"
+                    return out_seg, rec
+                self._mux_video_audio(
+                    video_mp4=seg_video,
+                    audio_wav=seg_audio,
+                    out_mp4=out_seg,
+                    timeout_s=int(req.timeout_s),
+                )
+            rec["status"] = "ok"
+            return out_seg, rec
+        except Exception as ex:
+            # Skip failed lipsync segments; fall back to passthrough for that range if possible.
+            logger.warning(
+                "[dp] lipsync range failed; skipping",
+                start=float(a),
+                end=float(b),
+                error=str(ex),
+            )
+            rec.update({"status": "fail", "error": str(ex)})
+            if req.dry_run:
+                return None, rec
+            try:
+                # best-effort passthrough
+                self._mux_video_audio(
+                    video_mp4=seg_video,
+                    audio_wav=seg_audio,
+                    out_mp4=out_seg,
+                    timeout_s=int(req.timeout_s),
+                )
+                return out_seg, rec
+            except Exception:
+                return None, rec
 
 def get_wav2lip_plugin(
     *, wav2lip_dir: Path | None = None, wav2lip_checkpoint: Path | None = None
@@ -18,16 +18,24 @@ def qa() -> None:
 @click.option("--top", "top_n", type=int, default=20, show_default=True)
 @click.option("--fail-only", is_flag=True, default=False, show_default=True)
 @click.option("--no-write", is_flag=True, default=False, show_default=True)
-def qa_run(job: str, top_n: int, fail_only: bool, no_write: bool) -> None:
+@click.option("--full", is_flag=True, default=False, help="Ignore cached per-segment results.")
+def qa_run(job: str, top_n: int, fail_only: bool, no_write: bool, full: bool) -> None:
     """
     Compute QA reports for Output/<job>/.
 
     JOB can be:
     - a job directory path, or
     - a job name under Output/ (same behavior as review commands).
+
+    Segments whose inputs are unchanged since the last run reuse their cached results.
     """
     summary = score_job(
-        job, enabled=True, write_outputs=(not no_write), top_n=top_n, fail_only=fail_only
+        job,
+        enabled=True,
+        write_outputs=(not no_write),
+        top_n=top_n,
+        fail_only=fail_only,
+        use_cache=(not full),
     )
     click.echo(json.dumps(summary, indent=2, sort_keys=True))
 
@@ -1,16 +1,50 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
 import time
 import wave
+from collections import OrderedDict
 from collections.abc import Iterable
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 from dubbing_pipeline.review.ops import resolve_job_dir
+from dubbing_pipeline.review.state import has_review_state, load_state
 from dubbing_pipeline.utils.io import atomic_write_text, read_json
 from dubbing_pipeline.utils.log import logger
+from dubbing_pipeline.utils.vad import pcm16_view
+
+SEGMENT_CACHE_NAME = "segment_cache.json"
+CACHE_VERSION = 1
+
+# LRU: path -> ((size, mtime_ns), parsed JSON); inputs are re-read only when the file changes.
+_JSON_CACHE_MAX = 64
+_JSON_CACHE: OrderedDict[str, tuple[tuple[int, ...], Any]] = OrderedDict()
+# LRU: segment_cache.json path -> ((cache sig, segment_scores.jsonl sig), cache with rows)
+_SEGMENT_CACHE_MAX = 8
+_SEGMENT_CACHE: OrderedDict[str, tuple[tuple[Any, Any], dict[str, Any]]] = OrderedDict()
+_CACHE_GUARD = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict[str, Any], key: str) -> Any | None:
+    with _CACHE_GUARD:
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+        return hit
+
+
+def _cache_put(cache: OrderedDict[str, Any], key: str, value: Any, max_n: int) -> None:
+    with _CACHE_GUARD:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_n:
+            cache.popitem(last=False)
 
 
 @dataclass(frozen=True, slots=True)
@@ -65,30 +99,56 @@ def _wav_duration_s(path: Path) -> float | None:
 
 def _wav_peak(path: Path) -> float | None:
     """
-    Return peak abs sample in [0..1] for PCM int16 WAV. Fast enough for per-job.
+    Return peak abs sample in [0..1] for PCM int16 WAV (any channel count).
     """
+    import numpy as np  # type: ignore
+
     try:
         with wave.open(str(path), "rb") as wf:
             if wf.getsampwidth() != 2:
                 return None
             n = wf.getnframes()
-            # read in chunks
             peak = 0
             chunk = 65536
             while n > 0:
                 buf = wf.readframes(min(chunk, n))
-                if not buf:
+                if len(buf) < 2:
                     break
-                n -= len(buf) // 2
-                for i in range(0, len(buf), 2):
-                    v = int.from_bytes(buf[i : i + 2], "little", signed=True)
-                    if abs(v) > peak:
-                        peak = abs(v)
+                n -= chunk
+                x = np.frombuffer(buf, dtype="<i2", count=len(buf) // 2)
+                peak = max(peak, int(x.max()), -int(x.min()))
             return float(peak) / 32768.0
     except Exception:
         return None
 
 
+def _clip_stats(path: Path) -> tuple[float | None, float | None]:
+    """
+    (duration_s, peak) of a segment clip. Mono int16 WAVs are memory-mapped, not decoded.
+    """
+    x, sr = pcm16_view(path)
+    if x is None or sr <= 0:
+        return _wav_duration_s(path), _wav_peak(path)
+    if x.shape[0] == 0:
+        return 0.0, 0.0
+    return float(x.shape[0]) / float(sr), float(max(int(x.max()), -int(x.min()))) / 32768.0
+
+
+def _read_json_cached(path: Path, default: Any) -> Any:
+    """
+    `read_json` memoized on size/mtime. Callers must treat the result as read-only.
+    """
+    sig = _file_sig(path)
+    if sig is None:
+        return default
+    hit = _cache_get(_JSON_CACHE, str(path))
+    if hit is not None and hit[0] == tuple(sig):
+        return hit[1]
+    data = read_json(path, default=default)
+    _cache_put(_JSON_CACHE, str(path), (tuple(sig), data), _JSON_CACHE_MAX)
+    return data
+
+
 def _word_count(text: str) -> int:
     t = str(text or "").strip()
     if not t:
@@ -98,9 +158,8 @@ def _word_count(text: str) -> int:
 
 
 def _char_count(text: str) -> int:
-    t = str(text or "")
     # exclude spaces/newlines
-    return len([c for c in t if not c.isspace()])
+    return len("".join(str(text or "").split()))
 
 
 def _median(xs: list[float]) -> float:
@@ -129,9 +188,11 @@ def _tts_line_for_segment(
     return ln if isinstance(ln, dict) else None
 
 
+_SEVERITY_RANK = {"fail": 3, "warn": 2, "info": 1}
+
+
 def _severity_rank(sev: str) -> int:
-    s = str(sev).lower().strip()
-    return {"fail": 3, "warn": 2, "info": 1}.get(s, 0)
+    return _SEVERITY_RANK.get(str(sev).lower().strip(), 0)
 
 
 def _norm_text_simple(s: str) -> str:
@@ -159,10 +220,9 @@ def _load_segments(job_dir: Path) -> tuple[list[dict[str, Any]], dict[int, dict[
     Returns (segments, review_by_id).
     """
     job_dir = Path(job_dir)
-    review_state = job_dir / "review" / "state.json"
     review_by_id: dict[int, dict[str, Any]] = {}
-    if review_state.exists():
-        st = read_json(review_state, default={})
+    if has_review_state(job_dir):
+        st = load_state(job_dir)
         segs = st.get("segments") if isinstance(st, dict) else None
         if isinstance(segs, list):
             for s in segs:
@@ -174,10 +234,10 @@ def _load_segments(job_dir: Path) -> tuple[list[dict[str, Any]], dict[int, dict[
 
     translated = job_dir / "translated.json"
     if translated.exists():
-        data = read_json(translated, default={})
+        data = _read_json_cached(translated, {})
         segs = data.get("segments") if isinstance(data, dict) else None
         if isinstance(segs, list):
-            out = []
+            out: list[dict[str, Any]] = []
             for i, s in enumerate(segs, 1):
                 if not isinstance(s, dict):
                     continue
@@ -189,11 +249,11 @@ def _load_segments(job_dir: Path) -> tuple[list[dict[str, Any]], dict[int, dict[
     # streaming fallback: aggregate per-chunk translated.json into absolute timeline segments
     stream_manifest = job_dir / "stream" / "manifest.json"
     if stream_manifest.exists():
-        man = read_json(stream_manifest, default={})
+        man = _read_json_cached(stream_manifest, {})
         chunks = man.get("chunks") if isinstance(man, dict) else None
         overlap_s = float(man.get("overlap_seconds", 0.0)) if isinstance(man, dict) else 0.0
         if isinstance(chunks, list):
-            out: list[dict[str, Any]] = []
+            out = []
             sid = 0
             for ch in chunks:
                 if not isinstance(ch, dict):
@@ -207,7 +267,7 @@ def _load_segments(job_dir: Path) -> tuple[list[dict[str, Any]], dict[int, dict[
                     ch_end = float(ch.get("end_s", ch_start))
                 except Exception:
                     continue
-                data = read_json(Path(str(tj)), default={})
+                data = _read_json_cached(Path(str(tj)), {})
                 segs = data.get("segments") if isinstance(data, dict) else None
                 if not isinstance(segs, list) or not segs:
                     continue
@@ -249,7 +309,7 @@ def _load_music_regions(job_dir: Path) -> list[dict[str, Any]]:
     p = Path(job_dir) / "analysis" / "music_regions.json"
     if not p.exists():
         return []
-    data = read_json(p, default={})
+    data = _read_json_cached(p, {})
     regs = data.get("regions") if isinstance(data, dict) else None
     return regs if isinstance(regs, list) else []
 
@@ -303,65 +363,54 @@ def _find_latest_tts_manifest(job_dir: Path) -> dict[str, Any] | None:
     path = find_latest_tts_manifest_path(job_dir)
     if path is None:
         return None
-    data = read_json(path, default=None)
+    data = _read_json_cached(path, None)
     return data if isinstance(data, dict) else None
 
 
-def score_job(
-    job: str | Path,
-    *,
-    enabled: bool = True,
-    write_outputs: bool = True,
-    top_n: int = 20,
-    fail_only: bool = False,
-) -> dict[str, Any]:
-    """
-    Compute QA checks for a job directory (Output/<job>/...).
-    Writes:
-      - qa/segment_scores.jsonl
-      - qa/summary.json
-      - qa/top_issues.md
-    """
-    t0 = time.perf_counter()
-    job_dir = resolve_job_dir(str(job))
-    job_dir.mkdir(parents=True, exist_ok=True)
-    qa_dir = job_dir / "qa"
-    qa_dir.mkdir(parents=True, exist_ok=True)
-
-    if not enabled:
-        summary = {
-            "version": 1,
-            "enabled": False,
-            "job_dir": str(job_dir),
-            "score": 100.0,
-            "counts": {"info": 0, "warn": 0, "fail": 0},
-            "segments": 0,
-            "wall_time_s": time.perf_counter() - t0,
-        }
-        if write_outputs:
-            atomic_write_text(
-                qa_dir / "summary.json", json.dumps(summary, indent=2, sort_keys=True), "utf-8"
-            )
-        return summary
+# Job-wide defaults; a project QA profile may override any of them.
+_DEFAULT_THRESHOLDS: dict[str, float | int] = {
+    "drift_warn_ratio": 1.10,
+    "drift_fail_ratio": 1.25,
+    "wps_warn": 3.2,
+    "wps_fail": 3.8,
+    "cps_warn": 18.0,
+    "cps_fail": 22.0,
+    "peak_warn": 0.98,
+    "peak_fail": 0.999,
+    "asr_lowconf_warn": -0.80,  # avg logprob approx
+    "asr_lowconf_fail": -1.05,
+    "rewrite_heavy_ratio_warn": 0.25,
+    "rewrite_heavy_ratio_fail": 0.40,
+    "rewrite_heavy_passes_warn": 3,
+    "rewrite_heavy_passes_fail": 4,
+    "pacing_near_limit_frac": 0.98,
+    "translation_outlier_ratio_warn": 2.2,
+    "translation_outlier_ratio_fail": 3.0,
+}
+
+
+def _load_thresholds(job_dir: Path) -> dict[str, float | int]:
+    th = dict(_DEFAULT_THRESHOLDS)
+    # Project profile overrides (best-effort; deterministic)
+    try:
+        from dubbing_pipeline.projects.loader import load_job_qa_profile
 
-    segments, review_by_id = _load_segments(job_dir)
-    music_regions = _load_music_regions(job_dir)
-    tts_manifest = _find_latest_tts_manifest(job_dir)
+        prof = load_job_qa_profile(job_dir)
+        over = prof.get("thresholds") if isinstance(prof, dict) else None
+        if isinstance(over, dict):
+            for k, v in _DEFAULT_THRESHOLDS.items():
+                if k in over:
+                    th[k] = int(over[k]) if isinstance(v, int) else float(over[k])
+    except Exception:
+        pass
+    return th
 
-    # Precompute translation length distribution for outlier detection.
-    seg_char_counts: list[float] = []
-    for s in segments:
-        if not isinstance(s, dict):
-            continue
-        t = str(s.get("text") or "").strip()
-        if t:
-            seg_char_counts.append(float(_char_count(t)))
-    median_cc = _median(seg_char_counts)
 
+def _load_subs_pre_problems(job_dir: Path) -> dict[int, list[str]]:
     # Feature E: subtitle constraint warnings (pre-format; best-effort)
     subs_pre_by_seg: dict[int, list[str]] = {}
     try:
-        summ = read_json(job_dir / "analysis" / "subs_formatting_summary.json", default={})
+        summ = _read_json_cached(job_dir / "analysis" / "subs_formatting_summary.json", {})
         variants = summ.get("variants", {}) if isinstance(summ, dict) else {}
         if isinstance(variants, dict):
             for vname, row in variants.items():
@@ -378,69 +427,10 @@ def score_job(
                         subs_pre_by_seg.setdefault(sid_i, []).append(str(vname))
     except Exception:
         subs_pre_by_seg = {}
+    return subs_pre_by_seg
 
-    # Configurable thresholds (safe defaults)
-    drift_warn_ratio = 1.10
-    drift_fail_ratio = 1.25
-    wps_warn = 3.2
-    wps_fail = 3.8
-    cps_warn = 18.0
-    cps_fail = 22.0
-    peak_warn = 0.98
-    peak_fail = 0.999
-    asr_lowconf_warn = -0.80  # avg logprob approx
-    asr_lowconf_fail = -1.05
-    rewrite_heavy_ratio_warn = 0.25
-    rewrite_heavy_ratio_fail = 0.40
-    rewrite_heavy_passes_warn = 3
-    rewrite_heavy_passes_fail = 4
-    pacing_near_limit_frac = 0.98
-    translation_outlier_ratio_warn = 2.2
-    translation_outlier_ratio_fail = 3.0
-
-    # Project profile overrides (best-effort; deterministic)
-    try:
-        from dubbing_pipeline.projects.loader import load_job_qa_profile
-
-        prof = load_job_qa_profile(job_dir)
-        th = prof.get("thresholds") if isinstance(prof, dict) else None
-        if isinstance(th, dict):
-            drift_warn_ratio = float(th.get("drift_warn_ratio", drift_warn_ratio))
-            drift_fail_ratio = float(th.get("drift_fail_ratio", drift_fail_ratio))
-            wps_warn = float(th.get("wps_warn", wps_warn))
-            wps_fail = float(th.get("wps_fail", wps_fail))
-            cps_warn = float(th.get("cps_warn", cps_warn))
-            cps_fail = float(th.get("cps_fail", cps_fail))
-            peak_warn = float(th.get("peak_warn", peak_warn))
-            peak_fail = float(th.get("peak_fail", peak_fail))
-            asr_lowconf_warn = float(th.get("asr_lowconf_warn", asr_lowconf_warn))
-            asr_lowconf_fail = float(th.get("asr_lowconf_fail", asr_lowconf_fail))
-            rewrite_heavy_ratio_warn = float(
-                th.get("rewrite_heavy_ratio_warn", rewrite_heavy_ratio_warn)
-            )
-            rewrite_heavy_ratio_fail = float(
-                th.get("rewrite_heavy_ratio_fail", rewrite_heavy_ratio_fail)
-            )
-            rewrite_heavy_passes_warn = int(
-                th.get("rewrite_heavy_passes_warn", rewrite_heavy_passes_warn)
-            )
-            rewrite_heavy_passes_fail = int(
-                th.get("rewrite_heavy_passes_fail", rewrite_heavy_passes_fail)
-            )
-            pacing_near_limit_frac = float(th.get("pacing_near_limit_frac", pacing_near_limit_frac))
-            translation_outlier_ratio_warn = float(
-                th.get("translation_outlier_ratio_warn", translation_outlier_ratio_warn)
-            )
-            translation_outlier_ratio_fail = float(
-                th.get("translation_outlier_ratio_fail", translation_outlier_ratio_fail)
-            )
-    except Exception:
-        pass
-
-    by_sev = {"info": 0, "warn": 0, "fail": 0}
-    seg_rows: list[SegmentQA] = []
-    all_issues: list[tuple[int, QAIssue]] = []
 
+def _speaker_flips(segments: list[dict[str, Any]]) -> dict[int, int]:
     # speaker flip suspicion: compute per window
     speaker_seq: list[tuple[int, float, str]] = []
     for s in segments:
@@ -456,474 +446,778 @@ def score_job(
         sid, tcur, sp = speaker_seq[i]
         if sp != sp_prev and (tcur - t_prev) <= 6.0:
             flip_flags[sid] = flip_flags.get(sid, 0) + 1
+    return flip_flags
+
+
+@dataclass(slots=True)
+class _JobContext:
+    """
+    Everything the per-segment checks read besides the segment list itself.
+    """
 
-    for i, seg in enumerate(segments):
-        sid = int(seg.get("segment_id") or (i + 1))
-        start = float(seg.get("start", 0.0))
-        end = float(seg.get("end", start))
-        dur = max(0.0, end - start)
-        speaker = str(seg.get("speaker") or seg.get("speaker_id") or "SPEAKER_01")
-        text = str(seg.get("text") or "")
-        status = "unknown"
-        if sid in review_by_id:
-            status = str(review_by_id[sid].get("status") or "unknown")
-
-        issues: list[QAIssue] = []
-        metrics: dict[str, Any] = {"duration_s": dur}
-
-        # streaming boundary coherence checks (Feature I; best-effort)
-        try:
-            if bool(seg.get("stream_is_chunk_first")) and i > 0:
-                prev = segments[i - 1]
-                if bool(prev.get("stream_is_chunk_last")) and int(
-                    prev.get("stream_chunk_idx") or -1
-                ) != int(seg.get("stream_chunk_idx") or -2):
-                    # Different chunk; treat as a boundary pair.
-                    t_prev = _norm_text_simple(str(prev.get("text") or ""))
-                    t_cur = _norm_text_simple(str(seg.get("text") or ""))
-                    if (
-                        t_prev
-                        and t_cur
-                        and (
-                            t_prev == t_cur
-                            or (len(t_prev) > 10 and (t_prev in t_cur or t_cur in t_prev))
+    review_by_id: dict[int, dict[str, Any]]
+    music_regions: list[dict[str, Any]]
+    tts_manifest: dict[str, Any] | None
+    median_cc: float
+    subs_pre_by_seg: dict[int, list[str]]
+    flip_flags: dict[int, int]
+    thresholds: dict[str, float | int]
+    audio_paths: dict[int, Path | None] = field(default_factory=dict)
+    clip_stats: dict[str, tuple[float | None, float | None]] = field(default_factory=dict)
+
+
+def _check_segment(i: int, segments: list[dict[str, Any]], ctx: _JobContext) -> SegmentQA:
+    """
+    Run every check for segments[i]. Reads only `ctx` (no I/O), so results can be cached.
+    """
+    seg = segments[i]
+    review_by_id = ctx.review_by_id
+    tts_manifest = ctx.tts_manifest
+    music_regions = ctx.music_regions
+    median_cc = ctx.median_cc
+    subs_pre_by_seg = ctx.subs_pre_by_seg
+    flip_flags = ctx.flip_flags
+    th = ctx.thresholds
+    drift_warn_ratio = th["drift_warn_ratio"]
+    drift_fail_ratio = th["drift_fail_ratio"]
+    wps_warn = th["wps_warn"]
+    wps_fail = th["wps_fail"]
+    cps_warn = th["cps_warn"]
+    cps_fail = th["cps_fail"]
+    peak_warn = th["peak_warn"]
+    peak_fail = th["peak_fail"]
+    asr_lowconf_fail = th["asr_lowconf_fail"]
+    rewrite_heavy_ratio_warn = th["rewrite_heavy_ratio_warn"]
+    rewrite_heavy_ratio_fail = th["rewrite_heavy_ratio_fail"]
+    rewrite_heavy_passes_warn = th["rewrite_heavy_passes_warn"]
+    rewrite_heavy_passes_fail = th["rewrite_heavy_passes_fail"]
+    pacing_near_limit_frac = th["pacing_near_limit_frac"]
+    translation_outlier_ratio_warn = th["translation_outlier_ratio_warn"]
+    translation_outlier_ratio_fail = th["translation_outlier_ratio_fail"]
+
+    sid = int(seg.get("segment_id") or (i + 1))
+    start = float(seg.get("start", 0.0))
+    end = float(seg.get("end", start))
+    dur = max(0.0, end - start)
+    speaker = str(seg.get("speaker") or seg.get("speaker_id") or "SPEAKER_01")
+    text = str(seg.get("text") or "")
+    status = "unknown"
+    if sid in review_by_id:
+        status = str(review_by_id[sid].get("status") or "unknown")
+
+    issues: list[QAIssue] = []
+    metrics: dict[str, Any] = {"duration_s": dur}
+
+    # streaming boundary coherence checks (Feature I; best-effort)
+    try:
+        if bool(seg.get("stream_is_chunk_first")) and i > 0:
+            prev = segments[i - 1]
+            if bool(prev.get("stream_is_chunk_last")) and int(
+                prev.get("stream_chunk_idx") or -1
+            ) != int(seg.get("stream_chunk_idx") or -2):
+                # Different chunk; treat as a boundary pair.
+                t_prev = _norm_text_simple(str(prev.get("text") or ""))
+                t_cur = _norm_text_simple(str(seg.get("text") or ""))
+                if (
+                    t_prev
+                    and t_cur
+                    and (
+                        t_prev == t_cur
+                        or (len(t_prev) > 10 and (t_prev in t_cur or t_cur in t_prev))
+                    )
+                ):
+                    issues.append(
+                        QAIssue(
+                            check_id="stream_boundary_duplicate",
+                            severity="warn",
+                            impact=0.06,
+                            message="Possible duplicate line across a streaming chunk boundary.",
+                            suggested_action="Increase --stream-context-seconds and/or --chunk-overlap; review boundary segments and lock corrections.",
+                            details={
+                                "prev_segment_id": int(prev.get("segment_id") or 0),
+                                "prev_chunk_idx": int(prev.get("stream_chunk_idx") or -1),
+                                "cur_chunk_idx": int(seg.get("stream_chunk_idx") or -1),
+                            },
                         )
-                    ):
+                    )
+
+                # missing content around boundary: a gap that spans the next chunk start
+                try:
+                    prev_end = float(prev.get("end", 0.0))
+                    cur_start = float(start)
+                    ch_start = float(seg.get("stream_chunk_start_s", cur_start))
+                    gap = cur_start - prev_end
+                    if gap > 0.60 and prev_end <= ch_start <= cur_start:
                         issues.append(
                             QAIssue(
-                                check_id="stream_boundary_duplicate",
+                                check_id="stream_boundary_gap",
                                 severity="warn",
                                 impact=0.06,
-                                message="Possible duplicate line across a streaming chunk boundary.",
-                                suggested_action="Increase --stream-context-seconds and/or --chunk-overlap; review boundary segments and lock corrections.",
+                                message="Potential missing content around streaming chunk boundary (gap between segments).",
+                                suggested_action="Increase --chunk-overlap or re-run with --stream-context-seconds 0 if de-dup is too aggressive; spot-check boundary audio.",
                                 details={
-                                    "prev_segment_id": int(prev.get("segment_id") or 0),
-                                    "prev_chunk_idx": int(prev.get("stream_chunk_idx") or -1),
-                                    "cur_chunk_idx": int(seg.get("stream_chunk_idx") or -1),
+                                    "gap_s": gap,
+                                    "boundary_s": ch_start,
+                                    "prev_end_s": prev_end,
+                                    "cur_start_s": cur_start,
                                 },
                             )
                         )
+                except Exception:
+                    pass
+    except Exception:
+        pass
 
-                    # missing content around boundary: a gap that spans the next chunk start
-                    try:
-                        prev_end = float(prev.get("end", 0.0))
-                        cur_start = float(start)
-                        ch_start = float(seg.get("stream_chunk_start_s", cur_start))
-                        gap = cur_start - prev_end
-                        if gap > 0.60 and prev_end <= ch_start <= cur_start:
-                            issues.append(
-                                QAIssue(
-                                    check_id="stream_boundary_gap",
-                                    severity="warn",
-                                    impact=0.06,
-                                    message="Potential missing content around streaming chunk boundary (gap between segments).",
-                                    suggested_action="Increase --chunk-overlap or re-run with --stream-context-seconds 0 if de-dup is too aggressive; spot-check boundary audio.",
-                                    details={
-                                        "gap_s": gap,
-                                        "boundary_s": ch_start,
-                                        "prev_end_s": prev_end,
-                                        "cur_start_s": cur_start,
-                                    },
-                                )
-                            )
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+    # subtitle pre-format constraint warning (informational but actionable)
+    if sid in subs_pre_by_seg:
+        variants = sorted(set(subs_pre_by_seg.get(sid) or []))
+        issues.append(
+            QAIssue(
+                check_id="subtitle_constraints_pre_format",
+                severity="warn",
+                impact=0.04,
+                message="Subtitle text exceeded formatting constraints before formatting.",
+                suggested_action="Shorten or simplify this line; consider timing-fit or manual edit + regen + lock.",
+                details={"variants": variants},
+            )
+        )
 
-        # subtitle pre-format constraint warning (informational but actionable)
-        if sid in subs_pre_by_seg:
-            variants = sorted(set(subs_pre_by_seg.get(sid) or []))
+    # speaking rate
+    wc = _word_count(text)
+    cc = _char_count(text)
+    metrics["word_count"] = wc
+    metrics["char_count"] = cc
+
+    # translation length outlier (relative to median)
+    if median_cc > 0 and cc > 0:
+        ratio = float(cc) / float(median_cc) if median_cc else 1.0
+        if ratio >= float(translation_outlier_ratio_fail) and cc >= 120:
+            issues.append(
+                QAIssue(
+                    check_id="translation_length_outlier",
+                    severity="fail",
+                    impact=0.14,
+                    message="Translated line is extremely long relative to the episode median.",
+                    suggested_action="Open segment editor; reduce style rules; consider timing-fit or manual tightening.",
+                    details={"char_count": cc, "median_char_count": median_cc, "ratio": ratio},
+                )
+            )
+        elif ratio >= float(translation_outlier_ratio_warn) and cc >= 90:
             issues.append(
                 QAIssue(
-                    check_id="subtitle_constraints_pre_format",
+                    check_id="translation_length_outlier",
                     severity="warn",
-                    impact=0.04,
-                    message="Subtitle text exceeded formatting constraints before formatting.",
-                    suggested_action="Shorten or simplify this line; consider timing-fit or manual edit + regen + lock.",
-                    details={"variants": variants},
+                    impact=0.07,
+                    message="Translated line is unusually long relative to the episode median.",
+                    suggested_action="Open segment editor; consider minor rewrite or timing-fit.",
+                    details={"char_count": cc, "median_char_count": median_cc, "ratio": ratio},
                 )
             )
-
-        # speaking rate
-        wc = _word_count(text)
-        cc = _char_count(text)
-        metrics["word_count"] = wc
-        metrics["char_count"] = cc
-
-        # translation length outlier (relative to median)
-        if median_cc > 0 and cc > 0:
-            ratio = float(cc) / float(median_cc) if median_cc else 1.0
-            if ratio >= float(translation_outlier_ratio_fail) and cc >= 120:
+    if dur >= 0.25 and text.strip():
+        wps = float(wc) / dur if wc else 0.0
+        cps = float(cc) / dur if cc else 0.0
+        metrics["wps"] = wps
+        metrics["cps"] = cps
+        # Prefer WPS if it looks like spaced language
+        use_wps = wc >= 2
+        if use_wps:
+            if wps >= wps_fail:
                 issues.append(
                     QAIssue(
-                        check_id="translation_length_outlier",
+                        check_id="speaking_rate",
                         severity="fail",
-                        impact=0.14,
-                        message="Translated line is extremely long relative to the episode median.",
-                        suggested_action="Open segment editor; reduce style rules; consider timing-fit or manual tightening.",
-                        details={"char_count": cc, "median_char_count": median_cc, "ratio": ratio},
+                        impact=0.20,
+                        message=f"Speaking rate high ({wps:.2f} wps).",
+                        suggested_action="Shorten translation, enable timing-fit/pacing, or regenerate this segment.",
+                        details={"wps": wps, "threshold": wps_fail},
                     )
                 )
-            elif ratio >= float(translation_outlier_ratio_warn) and cc >= 90:
+            elif wps >= wps_warn:
                 issues.append(
                     QAIssue(
-                        check_id="translation_length_outlier",
+                        check_id="speaking_rate",
                         severity="warn",
-                        impact=0.07,
-                        message="Translated line is unusually long relative to the episode median.",
-                        suggested_action="Open segment editor; consider minor rewrite or timing-fit.",
-                        details={"char_count": cc, "median_char_count": median_cc, "ratio": ratio},
+                        impact=0.10,
+                        message=f"Speaking rate elevated ({wps:.2f} wps).",
+                        suggested_action="Consider timing-fit/pacing or minor text tightening.",
+                        details={"wps": wps, "threshold": wps_warn},
                     )
                 )
-        if dur >= 0.25 and text.strip():
-            wps = float(wc) / dur if wc else 0.0
-            cps = float(cc) / dur if cc else 0.0
-            metrics["wps"] = wps
-            metrics["cps"] = cps
-            # Prefer WPS if it looks like spaced language
-            use_wps = wc >= 2
-            if use_wps:
-                if wps >= wps_fail:
-                    issues.append(
-                        QAIssue(
-                            check_id="speaking_rate",
-                            severity="fail",
-                            impact=0.20,
-                            message=f"Speaking rate high ({wps:.2f} wps).",
-                            suggested_action="Shorten translation, enable timing-fit/pacing, or regenerate this segment.",
-                            details={"wps": wps, "threshold": wps_fail},
-                        )
-                    )
-                elif wps >= wps_warn:
-                    issues.append(
-                        QAIssue(
-                            check_id="speaking_rate",
-                            severity="warn",
-                            impact=0.10,
-                            message=f"Speaking rate elevated ({wps:.2f} wps).",
-                            suggested_action="Consider timing-fit/pacing or minor text tightening.",
-                            details={"wps": wps, "threshold": wps_warn},
-                        )
-                    )
-            else:
-                if cps >= cps_fail:
-                    issues.append(
-                        QAIssue(
-                            check_id="speaking_rate",
-                            severity="fail",
-                            impact=0.20,
-                            message=f"Character rate high ({cps:.1f} cps).",
-                            suggested_action="Shorten translation or adjust segment pacing.",
-                            details={"cps": cps, "threshold": cps_fail},
-                        )
-                    )
-                elif cps >= cps_warn:
-                    issues.append(
-                        QAIssue(
-                            check_id="speaking_rate",
-                            severity="warn",
-                            impact=0.10,
-                            message=f"Character rate elevated ({cps:.1f} cps).",
-                            suggested_action="Consider timing-fit/pacing or minor text tightening.",
-                            details={"cps": cps, "threshold": cps_warn},
-                        )
-                    )
-
-        # low ASR confidence (use available logprob/conf; fallback heuristic)
-        conf = _safe_float(seg.get("conf") if "conf" in seg else seg.get("logprob"))
-        lowconf = bool(seg.get("lowconf")) if "lowconf" in seg else False
-        if conf is not None:
-            metrics["asr_conf"] = conf
-            if conf <= asr_lowconf_fail or lowconf:
+        else:
+            if cps >= cps_fail:
                 issues.append(
                     QAIssue(
-                        check_id="low_asr_confidence",
-                        severity="warn" if conf > asr_lowconf_fail else "fail",
-                        impact=0.10 if conf > asr_lowconf_fail else 0.18,
-                        message=f"Low ASR/MT confidence ({conf:.2f}).",
-                        suggested_action="Review transcript/translation for this segment; consider manual edit + regen + lock.",
-                        details={"conf": conf, "lowconf": bool(lowconf)},
+                        check_id="speaking_rate",
+                        severity="fail",
+                        impact=0.20,
+                        message=f"Character rate high ({cps:.1f} cps).",
+                        suggested_action="Shorten translation or adjust segment pacing.",
+                        details={"cps": cps, "threshold": cps_fail},
                     )
                 )
-        else:
-            # heuristic: too short/garbled text
-            if text.strip() and sum(c.isalnum() for c in text) / max(1, len(text)) < 0.55:
+            elif cps >= cps_warn:
                 issues.append(
                     QAIssue(
-                        check_id="low_asr_confidence",
-                        severity="info",
-                        impact=0.03,
-                        message="Text looks noisy/low-signal (no ASR confidence available).",
-                        suggested_action="Spot-check this segment in the review loop.",
-                        details={},
+                        check_id="speaking_rate",
+                        severity="warn",
+                        impact=0.10,
+                        message=f"Character rate elevated ({cps:.1f} cps).",
+                        suggested_action="Consider timing-fit/pacing or minor text tightening.",
+                        details={"cps": cps, "threshold": cps_warn},
                     )
                 )
 
-        # music overlap warning (informational)
-        if music_regions and dur > 0.0 and text.strip():
-            for r in music_regions:
-                rs = _safe_float(r.get("start"), 0.0) or 0.0
-                re = _safe_float(r.get("end"), 0.0) or 0.0
-                if _overlaps(start, end, rs, re):
-                    issues.append(
-                        QAIssue(
-                            check_id="music_overlap",
-                            severity="info",
-                            impact=0.0,
-                            message="Segment overlaps detected music region (dialogue may be suppressed).",
-                            suggested_action="If false-positive, lower music threshold or disable music-detect.",
-                            details={
-                                "music_kind": str(r.get("kind") or "music"),
-                                "confidence": r.get("confidence"),
-                            },
-                        )
-                    )
-                    break
-
-        # speaker flip suspicion
-        flips = int(flip_flags.get(sid, 0))
-        if flips:
+    # low ASR confidence (use available logprob/conf; fallback heuristic)
+    conf = _safe_float(seg.get("conf") if "conf" in seg else seg.get("logprob"))
+    lowconf = bool(seg.get("lowconf")) if "lowconf" in seg else False
+    if conf is not None:
+        metrics["asr_conf"] = conf
+        if conf <= asr_lowconf_fail or lowconf:
             issues.append(
                 QAIssue(
-                    check_id="speaker_flip_suspicion",
-                    severity="warn",
-                    impact=0.07,
-                    message="Frequent speaker changes in a short window (possible diarization flip).",
-                    suggested_action="Check diarization/voice map; consider locking corrected segments.",
-                    details={"flip_count": flips},
+                    check_id="low_asr_confidence",
+                    severity="warn" if conf > asr_lowconf_fail else "fail",
+                    impact=0.10 if conf > asr_lowconf_fail else 0.18,
+                    message=f"Low ASR/MT confidence ({conf:.2f}).",
+                    suggested_action="Review transcript/translation for this segment; consider manual edit + regen + lock.",
+                    details={"conf": conf, "lowconf": bool(lowconf)},
+                )
+            )
+    else:
+        # heuristic: too short/garbled text
+        if text.strip() and sum(c.isalnum() for c in text) / max(1, len(text)) < 0.55:
+            issues.append(
+                QAIssue(
+                    check_id="low_asr_confidence",
+                    severity="info",
+                    impact=0.03,
+                    message="Text looks noisy/low-signal (no ASR confidence available).",
+                    suggested_action="Spot-check this segment in the review loop.",
+                    details={},
                 )
             )
 
-        # alignment drift + overlap: requires per-seg audio path
-        audio_p = _audio_path_for_segment(
-            seg_id=sid, review_by_id=review_by_id, tts_manifest=tts_manifest
+    # music overlap warning (informational)
+    if music_regions and dur > 0.0 and text.strip():
+        for r in music_regions:
+            rs = _safe_float(r.get("start"), 0.0) or 0.0
+            re = _safe_float(r.get("end"), 0.0) or 0.0
+            if _overlaps(start, end, rs, re):
+                issues.append(
+                    QAIssue(
+                        check_id="music_overlap",
+                        severity="info",
+                        impact=0.0,
+                        message="Segment overlaps detected music region (dialogue may be suppressed).",
+                        suggested_action="If false-positive, lower music threshold or disable music-detect.",
+                        details={
+                            "music_kind": str(r.get("kind") or "music"),
+                            "confidence": r.get("confidence"),
+                        },
+                    )
+                )
+                break
+
+    # speaker flip suspicion
+    flips = int(flip_flags.get(sid, 0))
+    if flips:
+        issues.append(
+            QAIssue(
+                check_id="speaker_flip_suspicion",
+                severity="warn",
+                impact=0.07,
+                message="Frequent speaker changes in a short window (possible diarization flip).",
+                suggested_action="Check diarization/voice map; consider locking corrected segments.",
+                details={"flip_count": flips},
+            )
         )
-        if audio_p is not None and dur > 0.0:
-            adur = _wav_duration_s(audio_p)
-            peak = _wav_peak(audio_p)
-            metrics["audio_path"] = str(audio_p)
-            if adur is not None:
-                metrics["audio_duration_s"] = adur
-                ratio = adur / dur if dur else 1.0
-                if ratio >= drift_fail_ratio:
-                    issues.append(
-                        QAIssue(
-                            check_id="alignment_drift",
-                            severity="fail",
-                            impact=0.22,
-                            message=f"Audio duration exceeds segment window ({adur:.2f}s > {dur:.2f}s).",
-                            suggested_action="Enable pacing or regenerate with shorter text; if locked, unlock/regenerate then re-lock.",
-                            details={
-                                "audio_duration_s": adur,
-                                "segment_duration_s": dur,
-                                "ratio": ratio,
-                            },
-                        )
+
+    # alignment drift + overlap: requires per-seg audio path
+    audio_p = ctx.audio_paths.get(sid)
+    if audio_p is not None and dur > 0.0:
+        adur, peak = ctx.clip_stats.get(str(audio_p), (None, None))
+        metrics["audio_path"] = str(audio_p)
+        if adur is not None:
+            metrics["audio_duration_s"] = adur
+            ratio = adur / dur if dur else 1.0
+            if ratio >= drift_fail_ratio:
+                issues.append(
+                    QAIssue(
+                        check_id="alignment_drift",
+                        severity="fail",
+                        impact=0.22,
+                        message=f"Audio duration exceeds segment window ({adur:.2f}s > {dur:.2f}s).",
+                        suggested_action="Enable pacing or regenerate with shorter text; if locked, unlock/regenerate then re-lock.",
+                        details={
+                            "audio_duration_s": adur,
+                            "segment_duration_s": dur,
+                            "ratio": ratio,
+                        },
                     )
-                elif ratio >= drift_warn_ratio:
-                    issues.append(
-                        QAIssue(
-                            check_id="alignment_drift",
-                            severity="warn",
-                            impact=0.12,
-                            message=f"Audio slightly long for window ({adur:.2f}s vs {dur:.2f}s).",
-                            suggested_action="Consider pacing or a small text edit for this segment.",
-                            details={
-                                "audio_duration_s": adur,
-                                "segment_duration_s": dur,
-                                "ratio": ratio,
-                            },
-                        )
+                )
+            elif ratio >= drift_warn_ratio:
+                issues.append(
+                    QAIssue(
+                        check_id="alignment_drift",
+                        severity="warn",
+                        impact=0.12,
+                        message=f"Audio slightly long for window ({adur:.2f}s vs {dur:.2f}s).",
+                        suggested_action="Consider pacing or a small text edit for this segment.",
+                        details={
+                            "audio_duration_s": adur,
+                            "segment_duration_s": dur,
+                            "ratio": ratio,
+                        },
                     )
+                )
 
-                # overlap next segment start (if we can infer)
-                if i + 1 < len(segments):
-                    nstart = float(segments[i + 1].get("start", end))
-                    if start + adur > nstart + 0.02:
-                        issues.append(
-                            QAIssue(
-                                check_id="segment_overlap",
-                                severity="fail",
-                                impact=0.20,
-                                message="Segment audio likely overlaps the next segment.",
-                                suggested_action="Regenerate with pacing/shorter text; verify segment boundaries.",
-                                details={"segment_end_est": start + adur, "next_start": nstart},
-                            )
-                        )
-
-            # clipping
-            if peak is not None:
-                metrics["audio_peak"] = peak
-                if peak >= peak_fail:
+            # overlap next segment start (if we can infer)
+            if i + 1 < len(segments):
+                nstart = float(segments[i + 1].get("start", end))
+                if start + adur > nstart + 0.02:
                     issues.append(
                         QAIssue(
-                            check_id="audio_clipping",
+                            check_id="segment_overlap",
                             severity="fail",
-                            impact=0.18,
-                            message="Audio appears clipped (peak too hot).",
-                            suggested_action="Lower energy, enable limiter, or regenerate this segment.",
-                            details={"peak": peak},
+                            impact=0.20,
+                            message="Segment audio likely overlaps the next segment.",
+                            suggested_action="Regenerate with pacing/shorter text; verify segment boundaries.",
+                            details={"segment_end_est": start + adur, "next_start": nstart},
                         )
                     )
-                elif peak >= peak_warn:
-                    issues.append(
-                        QAIssue(
-                            check_id="audio_clipping",
-                            severity="warn",
-                            impact=0.08,
-                            message="Audio peak is very high (risk of clipping).",
-                            suggested_action="Consider limiter or slightly lower energy/volume.",
-                            details={"peak": peak},
-                        )
+
+        # clipping
+        if peak is not None:
+            metrics["audio_peak"] = peak
+            if peak >= peak_fail:
+                issues.append(
+                    QAIssue(
+                        check_id="audio_clipping",
+                        severity="fail",
+                        impact=0.18,
+                        message="Audio appears clipped (peak too hot).",
+                        suggested_action="Lower energy, enable limiter, or regenerate this segment.",
+                        details={"peak": peak},
                     )
-        else:
-            # fallback: can't measure drift/clipping without wav
-            metrics["audio_path"] = None
-
-        # rewrite-heavy timing-fit (text shortened a lot or max passes reached)
-        try:
-            pre = str(seg.get("text_pre_fit") or "").strip()
-            post = str(seg.get("text") or "").strip()
-            tf = seg.get("timing_fit")
-            passes = int(tf.get("passes") or 0) if isinstance(tf, dict) else 0
-            if pre and post and len(pre) > 0:
-                ratio = max(0.0, float(len(pre) - len(post)) / float(len(pre)))
-                if ratio >= float(rewrite_heavy_ratio_fail) or passes >= int(
-                    rewrite_heavy_passes_fail
-                ):
-                    issues.append(
-                        QAIssue(
-                            check_id="rewrite_heavy",
-                            severity="fail",
-                            impact=0.16,
-                            message="Timing-fit required heavy rewriting (risk of meaning loss).",
-                            suggested_action="Open segment editor; reduce style rules; increase tolerance if safe.",
-                            details={
-                                "pre_len": len(pre),
-                                "post_len": len(post),
-                                "rewrite_ratio": ratio,
-                                "passes": passes,
-                            },
-                        )
+                )
+            elif peak >= peak_warn:
+                issues.append(
+                    QAIssue(
+                        check_id="audio_clipping",
+                        severity="warn",
+                        impact=0.08,
+                        message="Audio peak is very high (risk of clipping).",
+                        suggested_action="Consider limiter or slightly lower energy/volume.",
+                        details={"peak": peak},
                     )
-                elif ratio >= float(rewrite_heavy_ratio_warn) or passes >= int(
-                    rewrite_heavy_passes_warn
-                ):
-                    issues.append(
-                        QAIssue(
-                            check_id="rewrite_heavy",
-                            severity="warn",
-                            impact=0.08,
-                            message="Timing-fit applied multiple passes or substantial shortening.",
-                            suggested_action="Open segment editor; consider a more natural rewrite or raise tolerance slightly.",
-                            details={
-                                "pre_len": len(pre),
-                                "post_len": len(post),
-                                "rewrite_ratio": ratio,
-                                "passes": passes,
-                            },
-                        )
+                )
+    else:
+        # fallback: can't measure drift/clipping without wav
+        metrics["audio_path"] = None
+
+    # rewrite-heavy timing-fit (text shortened a lot or max passes reached)
+    try:
+        pre = str(seg.get("text_pre_fit") or "").strip()
+        post = str(seg.get("text") or "").strip()
+        tf = seg.get("timing_fit")
+        passes = int(tf.get("passes") or 0) if isinstance(tf, dict) else 0
+        if pre and post and len(pre) > 0:
+            ratio = max(0.0, float(len(pre) - len(post)) / float(len(pre)))
+            if ratio >= float(rewrite_heavy_ratio_fail) or passes >= int(rewrite_heavy_passes_fail):
+                issues.append(
+                    QAIssue(
+                        check_id="rewrite_heavy",
+                        severity="fail",
+                        impact=0.16,
+                        message="Timing-fit required heavy rewriting (risk of meaning loss).",
+                        suggested_action="Open segment editor; reduce style rules; increase tolerance if safe.",
+                        details={
+                            "pre_len": len(pre),
+                            "post_len": len(post),
+                            "rewrite_ratio": ratio,
+                            "passes": passes,
+                        },
                     )
-        except Exception:
-            pass
-
-        # pacing-heavy (near stretch limits or hard trim)
-        try:
-            ln = _tts_line_for_segment(tts_manifest, sid)
-            pacing = ln.get("pacing") if isinstance(ln, dict) else None
-            if isinstance(pacing, dict) and bool(pacing.get("enabled")):
-                hard_trim = bool(pacing.get("hard_trim"))
-                atempo_ratio = _safe_float(pacing.get("atempo_ratio"))
-                min_r = _safe_float(pacing.get("min_ratio"), 0.88) or 0.88
-                max_r = _safe_float(pacing.get("max_ratio"), 1.18) or 1.18
-                near = float(pacing_near_limit_frac)
-                near_limit = False
-                if atempo_ratio is not None and (
-                    atempo_ratio >= float(max_r) * near
-                    or atempo_ratio <= float(min_r) / max(near, 1e-6)
-                ):
-                    near_limit = True
-                if hard_trim:
-                    issues.append(
-                        QAIssue(
-                            check_id="pacing_heavy",
-                            severity="fail",
-                            impact=0.18,
-                            message="Pacing hit last-resort hard trim to fit the segment window.",
-                            suggested_action="Open segment editor; shorten text; increase tolerance only if safe; regenerate then lock.",
-                            details={
-                                "hard_trim": True,
-                                "atempo_ratio": atempo_ratio,
-                                "min_ratio": min_r,
-                                "max_ratio": max_r,
-                            },
-                        )
+                )
+            elif ratio >= float(rewrite_heavy_ratio_warn) or passes >= int(
+                rewrite_heavy_passes_warn
+            ):
+                issues.append(
+                    QAIssue(
+                        check_id="rewrite_heavy",
+                        severity="warn",
+                        impact=0.08,
+                        message="Timing-fit applied multiple passes or substantial shortening.",
+                        suggested_action="Open segment editor; consider a more natural rewrite or raise tolerance slightly.",
+                        details={
+                            "pre_len": len(pre),
+                            "post_len": len(post),
+                            "rewrite_ratio": ratio,
+                            "passes": passes,
+                        },
                     )
-                elif near_limit:
-                    issues.append(
-                        QAIssue(
-                            check_id="pacing_heavy",
-                            severity="warn",
-                            impact=0.10,
-                            message="Pacing is near stretch limits (risk of artifacts or unnatural delivery).",
-                            suggested_action="Open segment editor; consider a rewrite; adjust pacing/stretch limits if needed.",
-                            details={
-                                "atempo_ratio": atempo_ratio,
-                                "min_ratio": min_r,
-                                "max_ratio": max_r,
-                            },
-                        )
+                )
+    except Exception:
+        pass
+
+    # pacing-heavy (near stretch limits or hard trim)
+    try:
+        ln = _tts_line_for_segment(tts_manifest, sid)
+        pacing = ln.get("pacing") if isinstance(ln, dict) else None
+        if isinstance(pacing, dict) and bool(pacing.get("enabled")):
+            hard_trim = bool(pacing.get("hard_trim"))
+            atempo_ratio = _safe_float(pacing.get("atempo_ratio"))
+            min_r = _safe_float(pacing.get("min_ratio"), 0.88) or 0.88
+            max_r = _safe_float(pacing.get("max_ratio"), 1.18) or 1.18
+            near = float(pacing_near_limit_frac)
+            near_limit = False
+            if atempo_ratio is not None and (
+                atempo_ratio >= float(max_r) * near
+                or atempo_ratio <= float(min_r) / max(near, 1e-6)
+            ):
+                near_limit = True
+            if hard_trim:
+                issues.append(
+                    QAIssue(
+                        check_id="pacing_heavy",
+                        severity="fail",
+                        impact=0.18,
+                        message="Pacing hit last-resort hard trim to fit the segment window.",
+                        suggested_action="Open segment editor; shorten text; increase tolerance only if safe; regenerate then lock.",
+                        details={
+                            "hard_trim": True,
+                            "atempo_ratio": atempo_ratio,
+                            "min_ratio": min_r,
+                            "max_ratio": max_r,
+                        },
+                    )
+                )
+            elif near_limit:
+                issues.append(
+                    QAIssue(
+                        check_id="pacing_heavy",
+                        severity="warn",
+                        impact=0.10,
+                        message="Pacing is near stretch limits (risk of artifacts or unnatural delivery).",
+                        suggested_action="Open segment editor; consider a rewrite; adjust pacing/stretch limits if needed.",
+                        details={
+                            "atempo_ratio": atempo_ratio,
+                            "min_ratio": min_r,
+                            "max_ratio": max_r,
+                        },
                     )
-        except Exception:
-            pass
+                )
+    except Exception:
+        pass
 
-        # compute segment score
-        score = 100.0
-        for iss in issues:
-            score *= max(0.0, 1.0 - float(iss.impact))
-        score = max(0.0, min(100.0, score))
+    # compute segment score
+    score = 100.0
+    for iss in issues:
+        score *= max(0.0, 1.0 - float(iss.impact))
+    score = max(0.0, min(100.0, score))
+
+    return SegmentQA(
+        segment_id=sid,
+        start=start,
+        end=end,
+        speaker=speaker,
+        status=status,
+        text=text,
+        score=float(score),
+        issues=issues,
+        metrics=metrics,
+    )
 
+
+def _file_sig(path: Path | None) -> list[int] | None:
+    if path is None:
+        return None
+    try:
+        st = path.stat()
+    except Exception:
+        return None
+    return [int(st.st_size), int(st.st_mtime_ns)]
+
+
+def _digest(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _segment_key(
+    i: int,
+    segments: list[dict[str, Any]],
+    ctx: _JobContext,
+    *,
+    job_key: str,
+    clip: list[Any] | None,
+) -> str:
+    """
+    Hash of every input `_check_segment` reads for segments[i].
+    """
+    seg = segments[i]
+    sid = int(seg.get("segment_id") or (i + 1))
+    prev = segments[i - 1] if i > 0 and seg.get("stream_is_chunk_first") else None
+    nxt = segments[i + 1].get("start") if i + 1 < len(segments) else None
+    rec = ctx.review_by_id.get(sid)
+    return _digest(
+        [
+            job_key,
+            i > 0,
+            seg,
+            prev,
+            nxt,
+            rec.get("status") if isinstance(rec, dict) else None,
+            ctx.subs_pre_by_seg.get(sid),
+            ctx.flip_flags.get(sid, 0),
+            _tts_line_for_segment(ctx.tts_manifest, sid),
+            clip,
+        ]
+    )
+
+
+def _measure_clips(paths: list[Path]) -> dict[str, tuple[float | None, float | None]]:
+    if len(paths) <= 1:
+        return {str(p): _clip_stats(p) for p in paths}
+    workers = min(len(paths), (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return {str(p): r for p, r in zip(paths, ex.map(_clip_stats, paths), strict=True)}
+
+
+def segment_cache_path(job_dir: Path) -> Path:
+    return Path(job_dir) / "qa" / SEGMENT_CACHE_NAME
+
+
+def _load_segment_cache(job_dir: Path) -> dict[str, Any]:
+    """
+    Cached results of the last pass: segment_cache.json holds per-segment input keys and clip
+    stats, and the rows themselves are the lines of segment_scores.jsonl (same order).
+    """
+    empty: dict[str, Any] = {"version": CACHE_VERSION, "segments": [], "clips": {}}
+    meta_p = segment_cache_path(job_dir)
+    rows_p = meta_p.parent / "segment_scores.jsonl"
+    sigs = (_file_sig(meta_p), _file_sig(rows_p))
+    if sigs[0] is None or sigs[1] is None:
+        return empty
+    hit = _cache_get(_SEGMENT_CACHE, str(meta_p))
+    if hit is not None and hit[0] == sigs:
+        return hit[1]
+    try:
+        meta = json.loads(meta_p.read_text(encoding="utf-8"))
+        lines = rows_p.read_text(encoding="utf-8").splitlines()
+        metas = meta.get("segments")
+        if (
+            meta.get("version") != CACHE_VERSION
+            or meta.get("rows_sig") != sigs[1]
+            or not isinstance(metas, list)
+            or len(metas) != len(lines)
+        ):
+            return empty
+        for m, line in zip(metas, lines, strict=True):
+            row = json.loads(line)
+            m.update(score=row["score"], issues=row["issues"], line=line)
+    except Exception:
+        return empty
+    _cache_put(_SEGMENT_CACHE, str(meta_p), (sigs, meta), _SEGMENT_CACHE_MAX)
+    return meta
+
+
+def _save_segment_cache(job_dir: Path, data: dict[str, Any]) -> None:
+    meta_p = segment_cache_path(job_dir)
+    rows_sig = _file_sig(meta_p.parent / "segment_scores.jsonl")
+    lean = dict(data, rows_sig=rows_sig)
+    lean["segments"] = [
+        {"segment_id": e["segment_id"], "key": e["key"], "clip": e["clip"]}
+        for e in data["segments"]
+    ]
+    atomic_write_text(meta_p, json.dumps(lean, separators=(",", ":")), encoding="utf-8")
+    # The next pass in this process reuses the rows instead of re-parsing both files.
+    meta_sig = _file_sig(meta_p)
+    if meta_sig is not None and rows_sig is not None:
+        _cache_put(
+            _SEGMENT_CACHE,
+            str(meta_p),
+            ((meta_sig, rows_sig), dict(data, rows_sig=rows_sig)),
+            _SEGMENT_CACHE_MAX,
+        )
+
+
+def score_job(
+    job: str | Path,
+    *,
+    enabled: bool = True,
+    write_outputs: bool = True,
+    top_n: int = 20,
+    fail_only: bool = False,
+    segment_ids: Iterable[int] | None = None,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """
+    Compute QA checks for a job directory (Output/<job>/...).
+    Writes:
+      - qa/segment_scores.jsonl
+      - qa/summary.json
+      - qa/top_issues.md
+      - qa/segment_cache.json (per-segment results keyed by a hash of their inputs)
+
+    Only segments whose inputs changed since the cached pass are re-checked. With
+    `segment_ids`, the remaining segments are taken from the cache without even looking at
+    their clips, unless a job-wide input (thresholds, music regions, manifests, ...) changed.
+    """
+    t0 = time.perf_counter()
+    job_dir = resolve_job_dir(str(job))
+    job_dir.mkdir(parents=True, exist_ok=True)
+    qa_dir = job_dir / "qa"
+    qa_dir.mkdir(parents=True, exist_ok=True)
+
+    if not enabled:
+        summary = {
+            "version": 1,
+            "enabled": False,
+            "job_dir": str(job_dir),
+            "score": 100.0,
+            "counts": {"info": 0, "warn": 0, "fail": 0},
+            "segments": 0,
+            "wall_time_s": time.perf_counter() - t0,
+        }
+        if write_outputs:
+            atomic_write_text(
+                qa_dir / "summary.json", json.dumps(summary, indent=2, sort_keys=True), "utf-8"
+            )
+        return summary
+
+    segments, review_by_id = _load_segments(job_dir)
+    tts_path = find_latest_tts_manifest_path(job_dir)
+    tts_manifest = _read_json_cached(tts_path, None) if tts_path is not None else None
+
+    # Precompute translation length distribution for outlier detection.
+    seg_char_counts: list[float] = []
+    for s in segments:
+        if not isinstance(s, dict):
+            continue
+        t = str(s.get("text") or "").strip()
+        if t:
+            seg_char_counts.append(float(_char_count(t)))
+
+    ctx = _JobContext(
+        review_by_id=review_by_id,
+        music_regions=_load_music_regions(job_dir),
+        tts_manifest=tts_manifest if isinstance(tts_manifest, dict) else None,
+        median_cc=_median(seg_char_counts),
+        subs_pre_by_seg=_load_subs_pre_problems(job_dir),
+        flip_flags=_speaker_flips(segments),
+        thresholds=_load_thresholds(job_dir),
+    )
+    job_key = _digest(
+        [
+            CACHE_VERSION,
+            ctx.median_cc,
+            ctx.thresholds,
+            ctx.music_regions,
+            str(tts_path),
+            _file_sig(tts_path),
+            _file_sig(job_dir / "analysis" / "subs_formatting_summary.json"),
+        ]
+    )
+
+    old = _load_segment_cache(job_dir) if use_cache else {"segments": [], "clips": {}}
+    old_entries = old.get("segments") if isinstance(old.get("segments"), list) else []
+    old_clips = old.get("clips") if isinstance(old.get("clips"), dict) else {}
+    order = [int(s.get("segment_id") or (i + 1)) for i, s in enumerate(segments)]
+
+    # Segments that may be taken from the cache untouched (targeted rescore only).
+    trusted: set[int] = set()
+    if (
+        segment_ids is not None
+        and old.get("job_key") == job_key
+        and old.get("order") == order
+        and len(old_entries) == len(order)
+    ):
+        wanted = {int(x) for x in segment_ids}
+        # A segment's checks also read its neighbours (boundary, overlap, speaker flips).
+        dirty = {j for i, sid in enumerate(order) if sid in wanted for j in (i - 1, i, i + 1)}
+        trusted = {i for i in range(len(order)) if i not in dirty}
+    by_sid = {
+        int(e.get("segment_id") or 0): e
+        for e in old_entries
+        if isinstance(e, dict) and isinstance(e.get("line"), str)
+    }
+
+    entries: list[dict[str, Any] | None] = [None] * len(segments)
+    todo: list[tuple[int, str, list[Any] | None]] = []
+    for i, sid in enumerate(order):
+        if i in trusted:
+            entries[i] = old_entries[i]
+            continue
+        audio_p = _audio_path_for_segment(
+            seg_id=sid, review_by_id=review_by_id, tts_manifest=ctx.tts_manifest
+        )
+        ctx.audio_paths[sid] = audio_p
+        clip = [str(audio_p), *(_file_sig(audio_p) or [0, 0])] if audio_p is not None else None
+        key = _segment_key(i, segments, ctx, job_key=job_key, clip=clip)
+        hit = by_sid.get(sid)
+        if hit is not None and hit.get("key") == key:
+            entries[i] = hit
+        else:
+            todo.append((i, key, clip))
+
+    # Audio checks need (duration, peak) per clip; reuse measurements of unchanged files.
+    clips: dict[str, Any] = {}
+    measure: dict[str, list[Any]] = {}
+    for _i, _key, clip in todo:
+        if clip is None or clip[0] in clips or clip[0] in measure:
+            continue
+        prev = old_clips.get(clip[0])
+        if isinstance(prev, dict) and prev.get("sig") == clip[1:]:
+            clips[clip[0]] = prev
+        else:
+            measure[clip[0]] = clip[1:]
+    for path_s, (adur, peak) in _measure_clips([Path(p) for p in measure]).items():
+        clips[path_s] = {"sig": measure[path_s], "duration_s": adur, "peak": peak}
+    for path_s, c in clips.items():
+        ctx.clip_stats[path_s] = (c["duration_s"], c["peak"])
+
+    for i, key, clip in todo:
+        row = _check_segment(i, segments, ctx).to_dict()
+        entries[i] = {
+            "segment_id": order[i],
+            "key": key,
+            "clip": clip,
+            "score": row["score"],
+            "issues": row["issues"],
+            # segment_scores.jsonl line, kept serialized so unchanged rows cost nothing
+            "line": json.dumps(row, sort_keys=True),
+        }
+
+    rows = [e for e in entries if e is not None]
+    for e in rows:
+        c = e.get("clip")
+        if c and c[0] not in clips and isinstance(old_clips.get(c[0]), dict):
+            clips[c[0]] = old_clips[c[0]]
+
+    by_sev = {"info": 0, "warn": 0, "fail": 0}
+    all_issues: list[tuple[int, dict[str, Any]]] = []
+    for r in rows:
         # counts and top list
-        for iss in issues:
-            sev = str(iss.severity).lower()
+        for iss in r["issues"]:
+            sev = str(iss["severity"]).lower()
             if sev in by_sev:
                 by_sev[sev] += 1
-            all_issues.append((sid, iss))
-
-        seg_rows.append(
-            SegmentQA(
-                segment_id=sid,
-                start=start,
-                end=end,
-                speaker=speaker,
-                status=status,
-                text=text,
-                score=float(score),
-                issues=issues,
-                metrics=metrics,
-            )
-        )
+            all_issues.append((int(r["segment_id"]), iss))
 
     # job score: average segment scores, penalize failures
-    avg = sum(s.score for s in seg_rows) / float(len(seg_rows)) if seg_rows else 100.0
+    avg = sum(float(r["score"]) for r in rows) / float(len(rows)) if rows else 100.0
     fails = by_sev["fail"]
     job_score = max(0.0, min(100.0, avg - float(fails) * 2.0))
 
     # top issues
-    def issue_key(tup: tuple[int, QAIssue]) -> tuple[int, float]:
-        sid, iss = tup
-        return (-_severity_rank(iss.severity), float(iss.impact))
-
-    issues_sorted = sorted(all_issues, key=issue_key, reverse=False)
-    # reverse sorting trick above is messy; just sort explicitly:
     issues_sorted = sorted(
         all_issues,
-        key=lambda x: (-_severity_rank(x[1].severity), float(x[1].impact)),
+        key=lambda x: (-_severity_rank(x[1]["severity"]), float(x[1]["impact"])),
         reverse=False,
     )
     if fail_only:
-        issues_sorted = [x for x in issues_sorted if str(x[1].severity).lower() == "fail"]
+        issues_sorted = [x for x in issues_sorted if str(x[1]["severity"]).lower() == "fail"]
     issues_sorted = issues_sorted[: max(1, int(top_n))]
 
     summary = {
@@ -932,12 +1226,13 @@ def score_job(
         "job_dir": str(job_dir),
         "score": float(job_score),
         "segment_average_score": float(avg),
-        "segments": int(len(seg_rows)),
+        "segments": int(len(rows)),
         "counts": dict(by_sev),
+        "rescored": int(len(todo)),
         "top_issues": [
             {
                 "segment_id": sid,
-                **iss.to_dict(),
+                **iss,
                 "fix": {
                     "ui_url": f"/ui/jobs/{job_dir.name}?tab=transcript&seg={int(sid)}",
                     "cli": [
@@ -957,15 +1252,16 @@ def score_job(
         "qa_done",
         job_dir=str(job_dir),
         score=float(job_score),
-        segments=int(len(seg_rows)),
+        segments=int(len(rows)),
         info=int(by_sev["info"]),
         warn=int(by_sev["warn"]),
         fail=int(by_sev["fail"]),
+        rescored=int(len(todo)),
         wall_time_s=float(summary["wall_time_s"]),
     )
     for sid, iss in issues_sorted:
-        if str(iss.severity).lower() == "fail":
-            logger.info("qa_fail", segment_id=int(sid), check_id=iss.check_id)
+        if str(iss["severity"]).lower() == "fail":
+            logger.info("qa_fail", segment_id=int(sid), check_id=iss["check_id"])
 
     if write_outputs:
         seg_path = qa_dir / "segment_scores.jsonl"
@@ -974,9 +1270,19 @@ def score_job(
 
         # jsonl segment file
         lines = []
-        for s in seg_rows:
-            lines.append(json.dumps(s.to_dict(), sort_keys=True))
+        for r in rows:
+            lines.append(r["line"])
         atomic_write_text(seg_path, "\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+        _save_segment_cache(
+            job_dir,
+            {
+                "version": CACHE_VERSION,
+                "job_key": job_key,
+                "order": order,
+                "segments": rows,
+                "clips": clips,
+            },
+        )
 
         atomic_write_text(
             summary_path, json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8"
@@ -984,7 +1290,7 @@ def score_job(
 
         md = ["## Quality report", ""]
         md.append(f"- **Score**: {job_score:.1f}/100")
-        md.append(f"- **Segments**: {len(seg_rows)}")
+        md.append(f"- **Segments**: {len(rows)}")
         md.append(
             f"- **Counts**: fail={by_sev['fail']} warn={by_sev['warn']} info={by_sev['info']}"
         )
@@ -996,10 +1302,28 @@ def score_job(
         else:
             for sid, iss in issues_sorted:
                 md.append(
-                    f"- **seg {sid}** [{iss.severity}] `{iss.check_id}`: {iss.message}  \n"
-                    f"  **Suggested**: {iss.suggested_action}"
+                    f"- **seg {sid}** [{iss['severity']}] `{iss['check_id']}`: {iss['message']}  \n"
+                    f"  **Suggested**: {iss['suggested_action']}"
                 )
         md.append("")
         atomic_write_text(top_md, "\n".join(md) + "\n", encoding="utf-8")
 
     return summary
+
+
+def rescore(
+    job: str | Path, segment_ids: Iterable[int], *, top_n: int = 20, fail_only: bool = False
+) -> dict[str, Any]:
+    """
+    Re-check only `segment_ids` (and their neighbours) after a review edit, then refresh the
+    QA reports. Falls back to a cache-validated pass over every segment when job-wide inputs
+    or the segment list changed since the last scoring.
+    """
+    return score_job(
+        job,
+        enabled=True,
+        write_outputs=True,
+        top_n=top_n,
+        fail_only=fail_only,
+        segment_ids=list(segment_ids),
+    )
@@ -9,6 +9,7 @@ from typing import Any, Callable
 from dubbing_pipeline.jobs.limits import resolve_user_quotas
 from dubbing_pipeline.jobs.models import JobState
 from dubbing_pipeline.ops import audit
+from dubbing_pipeline.ops.metrics import queue_event
 from dubbing_pipeline.runtime.scheduler import JobRecord, Scheduler
 from dubbing_pipeline.utils.log import logger
 
@@ -29,7 +30,10 @@ class FallbackLocalQueue(QueueBackend):
     - a light poller re-submits any QUEUED jobs (crash-safe single-writer local loop)
 
     Notes:
-    - This does not attempt to be multi-instance safe (it's the fallback when Redis is unavailable).
+    - Without a `registry` this is single-instance only (the web process runs jobs itself).
+    - With a `registry` (dubbing-worker processes sharing the state dir), a job runs only on the
+      worker holding its claim in workers.db.
+    - consume=False (web with WEB_RUN_JOBS=0): submissions stay QUEUED in SQLite for workers.
     - SQLite remains the source of truth for job state.
     """
 
@@ -38,9 +42,17 @@ class FallbackLocalQueue(QueueBackend):
         *,
         get_store_cb: Callable[[], Any],
         scheduler: Scheduler,
+        registry: Any | None = None,
+        worker_id: str = "",
+        stale_after_s: float = 30.0,
+        consume: bool = True,
     ) -> None:
         self._get_store = get_store_cb
         self._scheduler = scheduler
+        self._registry = registry
+        self._worker_id = str(worker_id or "")
+        self._stale_after_s = float(stale_after_s)
+        self._consume = bool(consume)
         self._task: asyncio.Task | None = None
         self._stopping = False
         self._seen: set[str] = set()
@@ -56,7 +68,7 @@ class FallbackLocalQueue(QueueBackend):
         )
 
     async def start(self) -> None:
-        if self._task is not None:
+        if self._task is not None or not self._consume:
             return
         self._stopping = False
         self._task = asyncio.create_task(self._scan_loop(), name="queue.fallback.scan")
@@ -91,6 +103,20 @@ class FallbackLocalQueue(QueueBackend):
         job_id = str(job_id or "").strip()
         if not job_id:
             return
+        if not self._consume:
+            # Job is already persisted as QUEUED; a worker's scan loop will pick it up.
+            logger.info(
+                "queue_submit", queue_mode="fallback", job_id=job_id, user_id=str(user_id or "")
+            )
+            audit.emit(
+                "queue.submit",
+                request_id=None,
+                user_id=str(user_id or "") or None,
+                meta={"mode": "fallback", "job_id": job_id, "priority": int(priority)},
+                job_id=job_id,
+            )
+            queue_event("local", "submitted").inc()
+            return
         self._seen.discard(job_id)
         self._scheduler.submit(
             JobRecord(
@@ -102,6 +128,7 @@ class FallbackLocalQueue(QueueBackend):
             )
         )
         logger.info("queue_submit", queue_mode="fallback", job_id=job_id, user_id=str(user_id or ""))
+        queue_event("local", "submitted").inc()
         audit.emit(
             "queue.submit",
             request_id=None,
@@ -116,6 +143,7 @@ class FallbackLocalQueue(QueueBackend):
         if not job_id:
             return
         logger.info("queue_cancel", queue_mode="fallback", job_id=job_id, user_id=str(user_id or ""))
+        queue_event("local", "cancelled").inc()
 
     async def user_counts(self, *, user_id: str) -> dict[str, int]:
         # Best-effort from SQLite store; used for submission-time policy in fallback mode.
@@ -186,7 +214,16 @@ class FallbackLocalQueue(QueueBackend):
         return {}
 
     async def before_job_run(self, *, job_id: str, user_id: str | None) -> bool:
-        # No distributed lock in fallback mode, but enforce per-user concurrency caps.
+        # Per-user concurrency caps, then the workers.db claim when running as a worker pool.
+        if not self._quota_ok(job_id, user_id):
+            queue_event("local", "deferred").inc()
+            return False
+        if not self._claim(job_id):
+            return False
+        queue_event("local", "started").inc()
+        return True
+
+    def _quota_ok(self, job_id: str, user_id: str | None) -> bool:
         uid = str(user_id or "").strip()
         if not uid:
             return True
@@ -215,6 +252,52 @@ class FallbackLocalQueue(QueueBackend):
             return True
         return True
 
+    def _claim(self, job_id: str) -> bool:
+        if self._registry is None:
+            return True
+        try:
+            ok = bool(
+                self._registry.claim(
+                    str(job_id), self._worker_id, stale_after_s=self._stale_after_s
+                )
+            )
+        except Exception as ex:
+            logger.warning(
+                "queue_claim_failed", queue_mode="fallback", job_id=str(job_id), error=str(ex)
+            )
+            ok = False
+        if not ok:
+            # Running (or about to run) on another worker; rescan later in case that worker dies.
+            self._seen.discard(str(job_id))
+        return ok
+
+    def record_claim(self, job_id: str) -> None:
+        """
+        Record a claim granted by another lock (Redis) so worker listings and reaping see it.
+        """
+        if self._registry is None:
+            return
+        try:
+            self._registry.claim(
+                str(job_id), self._worker_id, stale_after_s=self._stale_after_s, force=True
+            )
+        except Exception as ex:
+            logger.warning(
+                "queue_claim_record_failed", queue_mode="redis", job_id=str(job_id), error=str(ex)
+            )
+
+    def is_claimed_elsewhere(self, job_id: str) -> bool:
+        if self._registry is None:
+            return False
+        try:
+            return bool(
+                self._registry.is_claimed_elsewhere(
+                    str(job_id), self._worker_id, stale_after_s=self._stale_after_s
+                )
+            )
+        except Exception:
+            return False
+
     async def after_job_run(
         self,
         *,
@@ -224,8 +307,10 @@ class FallbackLocalQueue(QueueBackend):
         ok: bool,
         error: str | None = None,
     ) -> None:
-        # No-op.
-        return
+        queue_event("local", "finished").inc()
+        if self._registry is not None:
+            with suppress(Exception):
+                self._registry.release(str(job_id), self._worker_id)
 
     async def _scan_loop(self) -> None:
         """
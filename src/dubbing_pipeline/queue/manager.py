@@ -31,6 +31,9 @@ class AutoQueueBackend(QueueBackend):
         get_store_cb: Callable[[], Any],
         enqueue_job_id_cb: Callable[[str], "asyncio.Future[None] | asyncio.Task[None] | Any"],
         mode_override: str | None = None,
+        registry: Any | None = None,
+        worker_id: str = "",
+        consume: bool = True,
     ) -> None:
         s = get_settings()
         mode_cfg = str(mode_override or "").strip().lower()
@@ -50,8 +53,16 @@ class AutoQueueBackend(QueueBackend):
         redis_url = str(getattr(s, "redis_url", "") or "").strip()
         self._redis_url = redis_url
         self._scheduler = scheduler
-
-        self._fallback = FallbackLocalQueue(get_store_cb=get_store_cb, scheduler=scheduler)
+        self._consume = bool(consume)
+
+        self._fallback = FallbackLocalQueue(
+            get_store_cb=get_store_cb,
+            scheduler=scheduler,
+            registry=registry,
+            worker_id=worker_id,
+            stale_after_s=float(getattr(s, "worker_stale_sec", 30.0) or 30.0),
+            consume=consume,
+        )
         def _job_state(job_id: str) -> str:
             st = ""
             store = get_store_cb()
@@ -71,6 +82,7 @@ class AutoQueueBackend(QueueBackend):
                 redis_url=redis_url,
                 enqueue_job_id_cb=enqueue_job_id_cb,
                 get_job_state_cb=_job_state,
+                consume=consume,
             )
             if redis_url
             else None
@@ -192,6 +204,20 @@ class AutoQueueBackend(QueueBackend):
         with suppress(Exception):
             await self._fallback.cancel_job(job_id=job_id, user_id=user_id)
 
+    async def is_claimed_elsewhere(self, job_id: str) -> bool:
+        """
+        True when another live worker holds the job (startup recovery must leave it alone):
+        a workers.db claim, or the Redis job lock when Redis is active.
+        """
+        if self._fallback.is_claimed_elsewhere(job_id):
+            return True
+        if self._redis_allowed() and self._redis is not None and self._redis_active():
+            try:
+                return await self._redis.is_locked_elsewhere(job_id)
+            except Exception:
+                return False
+        return False
+
     async def user_counts(self, *, user_id: str) -> dict[str, int]:
         if self._redis_allowed() and self._redis is not None and self._redis_active():
             return await self._redis.user_counts(user_id=user_id)
@@ -225,7 +251,11 @@ class AutoQueueBackend(QueueBackend):
 
     async def before_job_run(self, *, job_id: str, user_id: str | None) -> bool:
         if self._redis_allowed() and self._redis is not None and self._redis_active():
-            return await self._redis.before_job_run(job_id=job_id, user_id=user_id)
+            ok = await self._redis.before_job_run(job_id=job_id, user_id=user_id)
+            if ok:
+                # Redis holds the lock; mirror it in workers.db for heartbeats and reaping.
+                self._fallback.record_claim(job_id)
+            return ok
         return await self._fallback.before_job_run(job_id=job_id, user_id=user_id)
 
     async def after_job_run(
@@ -274,7 +304,7 @@ class AutoQueueBackend(QueueBackend):
                             meta={"active": "redis"},
                         )
                     else:
-                        # Redis down => enable fallback scan loop.
+                        # Redis down => enable fallback scan loop (no-op when consume=False).
                         with suppress(Exception):
                             await self._fallback.start()
                         audit.emit(
@@ -18,6 +18,9 @@ def build_queue_backend(
     scheduler: Scheduler,
     get_store_cb: Callable[[], Any],
     enqueue_job_id_cb: Callable[[str], "Any"],
+    registry: Any | None = None,
+    worker_id: str = "",
+    consume: bool = True,
 ) -> AutoQueueBackend:
     """
     Return the canonical queue backend with optional scale-path override.
@@ -26,6 +29,9 @@ def build_queue_backend(
       - local  -> force fallback queue
       - redis  -> require Redis queue
       - unset  -> keep existing auto behavior
+
+    registry/worker_id: dubbing-worker claim table (see dubbing_pipeline.worker.registry).
+    consume=False: submit-only (web process with WEB_RUN_JOBS=0).
     """
     s = get_settings()
     backend = str(getattr(s, "queue_backend", "") or "").strip().lower()
@@ -42,4 +48,7 @@ def build_queue_backend(
         get_store_cb=get_store_cb,
         enqueue_job_id_cb=enqueue_job_id_cb,
         mode_override=mode_override,
+        registry=registry,
+        worker_id=worker_id,
+        consume=consume,
     )
@@ -8,8 +8,9 @@ from typing import Any, Callable
 
 from dubbing_pipeline.api.models import Role
 from dubbing_pipeline.config import get_settings
-from dubbing_pipeline.jobs.policy import evaluate_dispatch
+from dubbing_pipeline.jobs.policy import dispatch_limits, evaluate_dispatch
 from dubbing_pipeline.ops import audit
+from dubbing_pipeline.ops.metrics import queue_event
 from dubbing_pipeline.utils.log import logger
 
 from .interfaces import QueueBackend, QueueStatus
@@ -30,6 +31,132 @@ class RedisQueueConfig:
     backoff_cap_ms: int
     cancel_ttl_ms: int
     active_set_ttl_ms: int
+    block_s: float = 2.0
+    dispatch_scan: int = 16
+    promote_batch: int = 100
+
+
+# Shared by both scripts: move due delayed jobs back into pending (priority from meta).
+# KEYS[1]=delayed_zset, KEYS[2]=pending_zset; ARGV[1]=prefix, ARGV[2]=now_s, ARGV[3]=limit
+_PROMOTE_DUE_LUA = """
+local function promote_due(delayed, pending, prefix, now_s, limit)
+  local due = redis.call('ZRANGEBYSCORE', delayed, '-inf', now_s, 'LIMIT', 0, limit)
+  for _, jid in ipairs(due) do
+    local pr = tonumber(redis.call('HGET', prefix .. ':job:' .. jid .. ':meta', 'priority'))
+    redis.call('ZADD', pending, pr or 100, jid)
+    redis.call('ZREM', delayed, jid)
+  end
+  return due
+end
+"""
+
+# Delayed mover: promote a batch and wake one blocked consumer per promoted job.
+# KEYS[3]=wake_list
+_PROMOTE_LUA = (
+    _PROMOTE_DUE_LUA
+    + """
+local due = promote_due(KEYS[1], KEYS[2], ARGV[1], ARGV[2], tonumber(ARGV[3]))
+if #due > 0 then
+  redis.call('LPUSH', KEYS[3], unpack(due))
+  redis.call('LTRIM', KEYS[3], 0, 1023)
+end
+return #due
+"""
+)
+
+# Claim + dispatch in one round trip. Mirrors jobs.policy.evaluate_dispatch:
+# - high mode is admin-only when configured
+# - non-admins are capped at max_running (per-user quota hash overrides the default)
+# - high mode is capped globally
+# A job that fails policy is deferred (exponential backoff on its `defers` counter) and the
+# next candidate is tried; a job is removed from pending only once its lock is held.
+#
+# KEYS: 1 pending, 2 delayed, 3 running, 4 running_high, 5 dlq
+# ARGV: 1 prefix, 2 now_s, 3 now_ms, 4 token, 5 lock_ttl_ms, 6 max_attempts, 7 base_backoff_ms,
+#       8 backoff_cap_ms, 9 active_ttl_ms, 10 default_max_running, 11 high_admin_only,
+#       12 max_high_running_global, 13 scan, 14 promote_limit
+# Returns {job_id, user_id, mode, role, attempts, dead_letter_ids_csv, deferred_csv};
+# job_id is '' when nothing was dispatchable.
+_DISPATCH_LUA = (
+    _PROMOTE_DUE_LUA
+    + """
+local pending, delayed, running, running_high, dlq = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local prefix = ARGV[1]
+local now_s = tonumber(ARGV[2])
+local ttl_active = tonumber(ARGV[9])
+local default_max = tonumber(ARGV[10])
+local high_admin_only = ARGV[11] == '1'
+local max_high = tonumber(ARGV[12])
+
+promote_due(delayed, pending, prefix, ARGV[2], tonumber(ARGV[14]))
+
+local dead, deferred = {}, {}
+local cands = redis.call('ZREVRANGE', pending, 0, tonumber(ARGV[13]) - 1)
+for _, jid in ipairs(cands) do
+  local jkey = prefix .. ':job:' .. jid
+  local meta = jkey .. ':meta'
+  local m = redis.call('HMGET', meta, 'user_id', 'user_role', 'mode')
+  local uid = m[1] or ''
+  local role = string.lower(m[2] or '')
+  local mode = string.lower(m[3] or '')
+  if mode == '' then mode = 'medium' end
+  local user = prefix .. ':user:' .. uid
+  if redis.call('EXISTS', jkey .. ':cancel') == 1 then
+    redis.call('ZREM', pending, jid)
+    if uid ~= '' then redis.call('SREM', user .. ':queued', jid) end
+  else
+    local denied = false
+    if mode == 'high' and high_admin_only and role ~= 'admin' then
+      denied = true
+    end
+    if (not denied) and role ~= 'admin' and uid ~= '' then
+      local cap = tonumber(redis.call('HGET', user .. ':quota', 'max_running')) or default_max
+      if cap > 0 and redis.call('SCARD', user .. ':running') >= cap then denied = true end
+    end
+    if (not denied) and mode == 'high' and max_high > 0
+        and redis.call('SCARD', running_high) >= max_high then
+      denied = true
+    end
+    if denied then
+      local n = redis.call('HINCRBY', meta, 'defers', 1)
+      local delay = math.min(tonumber(ARGV[8]), tonumber(ARGV[7]) * (2 ^ (n - 1)))
+      redis.call('ZREM', pending, jid)
+      redis.call('ZADD', delayed, now_s + delay / 1000.0, jid)
+      table.insert(deferred, jid)
+    else
+      local attempts = redis.call('HINCRBY', meta, 'attempts', 1)
+      if attempts > tonumber(ARGV[6]) then
+        redis.call('ZREM', pending, jid)
+        if uid ~= '' then redis.call('SREM', user .. ':queued', jid) end
+        redis.call('LPUSH', dlq,
+          jid .. '|' .. uid .. '|max_attempts_exceeded:' .. attempts .. '|' .. ARGV[3])
+        table.insert(dead, jid)
+      elseif redis.call('SET', jkey .. ':lock', ARGV[4], 'NX', 'PX', ARGV[5]) then
+        redis.call('ZREM', pending, jid)
+        redis.call('HDEL', meta, 'defers')
+        if uid ~= '' then
+          redis.call('SADD', user .. ':running', jid)
+          redis.call('SREM', user .. ':queued', jid)
+          redis.call('PEXPIRE', user .. ':running', ttl_active)
+        end
+        redis.call('SADD', running, jid)
+        redis.call('PEXPIRE', running, ttl_active)
+        if mode == 'high' then
+          redis.call('SADD', running_high, jid)
+          redis.call('PEXPIRE', running_high, ttl_active)
+        end
+        return {jid, uid, mode, role, attempts, table.concat(dead, ','),
+                table.concat(deferred, ',')}
+      else
+        -- Lock held by another worker (crash re-delivery in progress): not an attempt.
+        redis.call('HINCRBY', meta, 'attempts', -1)
+      end
+    end
+  end
+end
+return {'', '', '', '', 0, table.concat(dead, ','), table.concat(deferred, ',')}
+"""
+)
 
 
 class RedisQueue(QueueBackend):
@@ -50,8 +177,11 @@ class RedisQueue(QueueBackend):
         redis_url: str,
         enqueue_job_id_cb: Callable[[str], "asyncio.Future[None] | asyncio.Task[None] | Any"],
         get_job_state_cb: Callable[[str], str] | None = None,
+        consume: bool = True,
     ) -> None:
         self._redis_url = str(redis_url or "").strip()
+        # consume=False: submit/admin only (web with WEB_RUN_JOBS=0); workers claim the jobs.
+        self._consume = bool(consume)
         self._enqueue_cb = enqueue_job_id_cb
         self._get_job_state = get_job_state_cb
         self._tasks: list[asyncio.Task] = []
@@ -63,6 +193,8 @@ class RedisQueue(QueueBackend):
         self._claimed_user_by_job: dict[str, str] = {}
         self._claimed_mode_by_job: dict[str, str] = {}
         self._claimed_role_by_job: dict[str, str] = {}
+        # Jobs claimed by the dispatch script: lock, counters and policy already applied.
+        self._dispatched: set[str] = set()
 
         s = get_settings()
         prefix = str(getattr(s, "redis_queue_prefix", "dp") or "dp").strip().strip(":") or "dp"
@@ -78,10 +210,12 @@ class RedisQueue(QueueBackend):
             active_set_ttl_ms=max(
                 30_000, int(getattr(s, "redis_active_set_ttl_ms", 6 * 3600_000) or 6 * 3600_000)
             ),
+            block_s=max(0.1, float(getattr(s, "redis_queue_block_sec", 2.0) or 2.0)),
         )
 
         self._client = None
-        self._claim_lua = None
+        self._dispatch_script = None
+        self._promote_script = None
 
     def _redis(self):
         if self._client is not None:
@@ -132,8 +266,11 @@ class RedisQueue(QueueBackend):
         await self._prepare_scripts()
 
         self._tasks.append(asyncio.create_task(self._health_loop(), name="queue.redis.health"))
-        self._tasks.append(asyncio.create_task(self._consume_loop(), name="queue.redis.consume"))
-        self._tasks.append(asyncio.create_task(self._delayed_mover_loop(), name="queue.redis.delayed"))
+        if self._consume:
+            self._tasks.append(asyncio.create_task(self._consume_loop(), name="queue.redis.consume"))
+            self._tasks.append(
+                asyncio.create_task(self._delayed_mover_loop(), name="queue.redis.delayed")
+            )
 
         logger.info("queue_backend_started", queue_mode="redis", prefix=self._cfg.prefix)
         audit.emit(
@@ -162,6 +299,7 @@ class RedisQueue(QueueBackend):
         self._claimed_user_by_job.clear()
         self._claimed_mode_by_job.clear()
         self._claimed_role_by_job.clear()
+        self._dispatched.clear()
 
     async def submit_job(
         self,
@@ -185,7 +323,10 @@ class RedisQueue(QueueBackend):
         if isinstance(meta, dict):
             with suppress(Exception):
                 role = str(meta.get("user_role") or "")
-        await r.hset(
+        # One round trip: metadata, pending priority queue, per-user queued set, and a wake
+        # token for a consumer blocked in BLPOP.
+        pipe = r.pipeline(transaction=True)
+        pipe.hset(
             self._job_meta_key(job_id),
             mapping={
                 "job_id": job_id,
@@ -197,16 +338,16 @@ class RedisQueue(QueueBackend):
                 "created_ms": str(_now_ms()),
             },
         )
-        with suppress(Exception):
-            await r.pexpire(self._job_meta_key(job_id), self._cfg.active_set_ttl_ms)
-
-        # Add to pending priority queue and per-user queued set.
-        await r.zadd(self._pending_key(), {job_id: float(int(priority))})
+        pipe.pexpire(self._job_meta_key(job_id), self._cfg.active_set_ttl_ms)
+        pipe.zadd(self._pending_key(), {job_id: float(int(priority))})
         if str(user_id or "").strip():
-            await r.sadd(self._user_queued_set_key(str(user_id)), job_id)
-            with suppress(Exception):
-                await r.pexpire(self._user_queued_set_key(str(user_id)), self._cfg.active_set_ttl_ms)
+            pipe.sadd(self._user_queued_set_key(str(user_id)), job_id)
+            pipe.pexpire(self._user_queued_set_key(str(user_id)), self._cfg.active_set_ttl_ms)
+        pipe.lpush(self._wake_key(), job_id)
+        pipe.ltrim(self._wake_key(), 0, 1023)
+        await pipe.execute()
 
+        queue_event("redis", "submitted").inc()
         logger.info("queue_submit", queue_mode="redis", job_id=job_id, user_id=str(user_id or ""), mode=str(mode or ""))
         audit.emit(
             "queue.submit",
@@ -236,6 +377,7 @@ class RedisQueue(QueueBackend):
             if uid:
                 with suppress(Exception):
                     await r.srem(self._user_queued_set_key(uid), job_id)
+            queue_event("redis", "cancelled").inc()
             logger.info(
                 "queue_cancel_flag_set",
                 queue_mode="redis",
@@ -265,6 +407,9 @@ class RedisQueue(QueueBackend):
             # If redis is down mid-run, refuse to start new work in redis mode.
             return False
 
+        if job_id in self._dispatched:
+            return await self._start_dispatched(job_id)
+
         # Terminal job states (SQLite source of truth) should never be re-run.
         if self._get_job_state is not None:
             with suppress(Exception):
@@ -322,11 +467,6 @@ class RedisQueue(QueueBackend):
             if not await self._acquire_lock(job_id, token):
                 await self._defer(job_id, reason="lock_busy")
                 return False
-            self._lock_token_by_job[job_id] = token
-            self._lock_refresh_task_by_job[job_id] = asyncio.create_task(
-                self._lock_refresh_loop(job_id=job_id, token=str(token)),
-                name=f"queue.redis.lock_refresh:{job_id}",
-            )
 
         # Mark local lock token and keep it alive.
         self._lock_token_by_job[job_id] = token
@@ -346,11 +486,40 @@ class RedisQueue(QueueBackend):
                     await r.sadd(self._running_high_set_key(), job_id)
                     await r.pexpire(self._running_high_set_key(), self._cfg.active_set_ttl_ms)
 
+        self._start_lock_refresh(job_id, token)
+        self._log_lock_acquired(job_id, uid)
+        return True
+
+    async def _start_dispatched(self, job_id: str) -> bool:
+        """
+        Fast path for jobs claimed by the dispatch script: lock, counters and policy were applied
+        atomically in Redis, so only the SQLite terminal-state check is left.
+        """
+        self._dispatched.discard(job_id)
+        if self._get_job_state is not None:
+            with suppress(Exception):
+                st = str(self._get_job_state(job_id) or "")
+                if st in {"DONE", "FAILED", "CANCELED"}:
+                    await self._release_and_cleanup(job_id, reason=f"terminal_state:{st}")
+                    return False
+        token = self._lock_token_by_job.get(job_id, "")
+        if not token:
+            return False
+        self._start_lock_refresh(job_id, token)
+        self._log_lock_acquired(job_id, self._claimed_user_by_job.get(job_id, ""))
+        return True
+
+    def _start_lock_refresh(self, job_id: str, token: str) -> None:
+        old = self._lock_refresh_task_by_job.pop(job_id, None)
+        if old is not None:
+            old.cancel()
         self._lock_refresh_task_by_job[job_id] = asyncio.create_task(
-            self._lock_refresh_loop(job_id=job_id, token=token),
+            self._lock_refresh_loop(job_id=job_id, token=str(token)),
             name=f"queue.redis.lock_refresh:{job_id}",
         )
 
+    def _log_lock_acquired(self, job_id: str, uid: str) -> None:
+        queue_event("redis", "started").inc()
         logger.info(
             "queue_lock_acquired",
             queue_mode="redis",
@@ -365,7 +534,6 @@ class RedisQueue(QueueBackend):
             meta={"mode": "redis", "job_id": job_id},
             job_id=job_id,
         )
-        return True
 
     async def after_job_run(
         self,
@@ -391,14 +559,15 @@ class RedisQueue(QueueBackend):
                 await t
 
         r = self._redis()
-        if r is not None and uid:
-            with suppress(Exception):
-                await r.srem(self._user_running_set_key(uid), job_id)
+        if r is not None:
             with suppress(Exception):
-                await r.srem(self._running_set_key(), job_id)
-            if mode == "high":
-                with suppress(Exception):
-                    await r.srem(self._running_high_set_key(), job_id)
+                pipe = r.pipeline(transaction=False)
+                if uid:
+                    pipe.srem(self._user_running_set_key(uid), job_id)
+                pipe.srem(self._running_set_key(), job_id)
+                if mode == "high":
+                    pipe.srem(self._running_high_set_key(), job_id)
+                await pipe.execute()
 
         # Release lock
         token = self._lock_token_by_job.pop(job_id, "")
@@ -409,6 +578,8 @@ class RedisQueue(QueueBackend):
         self._claimed_user_by_job.pop(job_id, None)
         self._claimed_mode_by_job.pop(job_id, None)
         self._claimed_role_by_job.pop(job_id, None)
+        self._dispatched.discard(job_id)
+        queue_event("redis", "finished").inc()
 
         logger.info(
             "queue_job_done",
@@ -441,9 +612,11 @@ class RedisQueue(QueueBackend):
         if r is None:
             return {"running": 0, "queued": 0, "today": 0}
         try:
-            running = int(await r.scard(self._user_running_set_key(uid)) or 0)
-            queued = int(await r.scard(self._user_queued_set_key(uid)) or 0)
-            return {"running": running, "queued": queued, "today": 0}
+            pipe = r.pipeline(transaction=False)
+            pipe.scard(self._user_running_set_key(uid))
+            pipe.scard(self._user_queued_set_key(uid))
+            running, queued = await pipe.execute()
+            return {"running": int(running or 0), "queued": int(queued or 0), "today": 0}
         except Exception:
             return {"running": 0, "queued": 0, "today": 0}
 
@@ -576,6 +749,9 @@ class RedisQueue(QueueBackend):
         """
         Claim jobs from Redis pending queue and enqueue into the local executor.
 
+        One EVALSHA per claim (promote due delayed jobs, policy, lock, counters); when nothing is
+        dispatchable the loop blocks on the wake list instead of polling.
+
         Crash safety:
         - A job is removed from pending only when a lock has been acquired.
         - If the worker crashes, lock TTL expiry makes the job re-queueable by admin/poller tools.
@@ -586,31 +762,23 @@ class RedisQueue(QueueBackend):
         try:
             while not self._stopping:
                 try:
-                    job_id = await self._claim_one()
-                    if not job_id:
-                        await asyncio.sleep(0.25)
+                    got = await self._dispatch_one()
+                    if got is None:
+                        await r.blpop([self._wake_key()], timeout=self._cfg.block_s)
                         continue
-                    # Attempts + max attempts
-                    attempt = 0
-                    with suppress(Exception):
-                        attempt = int(await r.hincrby(self._job_meta_key(job_id), "attempts", 1))
-                    if attempt and attempt > int(self._cfg.max_attempts):
-                        await self._send_to_dlq(job_id=job_id, reason=f"max_attempts_exceeded:{attempt}")
-                        await self._release_and_cleanup(job_id, reason="max_attempts")
-                        continue
-
+                    job_id, uid, attempt = got
                     logger.info(
                         "queue_claimed",
                         queue_mode="redis",
                         job_id=job_id,
-                        user_id=str((await self._read_meta(job_id)).get("user_id") or ""),
-                        attempt=int(attempt or 0),
+                        user_id=uid,
+                        attempt=int(attempt),
                     )
                     audit.emit(
                         "queue.claimed",
                         request_id=None,
-                        user_id=str((await self._read_meta(job_id)).get("user_id") or "") or None,
-                        meta={"mode": "redis", "job_id": job_id, "attempt": int(attempt or 0)},
+                        user_id=uid or None,
+                        meta={"mode": "redis", "job_id": job_id, "attempt": int(attempt)},
                         job_id=job_id,
                     )
 
@@ -626,9 +794,61 @@ class RedisQueue(QueueBackend):
             logger.info("task stopped", task="queue.redis.consume")
             return
 
+    async def _dispatch_one(self) -> tuple[str, str, int] | None:
+        """
+        Run the dispatch script once. Returns (job_id, user_id, attempt) for a claimed job.
+        """
+        r = self._redis()
+        if r is None or self._dispatch_script is None:
+            return None
+        lim = dispatch_limits()
+        token = _lock_token("claim")
+        now = time.time()
+        res = await self._dispatch_script(
+            keys=[
+                self._pending_key(),
+                self._delayed_key(),
+                self._running_set_key(),
+                self._running_high_set_key(),
+                self._dlq_key(),
+            ],
+            args=[
+                self._cfg.prefix,
+                repr(now),
+                str(int(now * 1000)),
+                token,
+                str(int(self._cfg.lock_ttl_ms)),
+                str(int(self._cfg.max_attempts)),
+                str(int(self._cfg.base_backoff_ms)),
+                str(int(self._cfg.backoff_cap_ms)),
+                str(int(self._cfg.active_set_ttl_ms)),
+                str(int(lim["default_max_running"])),
+                str(int(lim["high_admin_only"])),
+                str(int(lim["max_high_running_global"])),
+                str(int(self._cfg.dispatch_scan)),
+                str(int(self._cfg.promote_batch)),
+            ],
+        )
+        job_id, uid, mode, role, attempt, dead, deferred = (list(res) + [""] * 7)[:7]
+        for jid in [x for x in str(dead or "").split(",") if x]:
+            self._log_dead_letter(jid, reason="max_attempts_exceeded")
+        for jid in [x for x in str(deferred or "").split(",") if x]:
+            logger.info("queue_deferred", queue_mode="redis", job_id=jid, reason="policy")
+        job_id = str(job_id or "").strip()
+        if not job_id:
+            return None
+        self._lock_token_by_job[job_id] = token
+        self._claimed_user_by_job[job_id] = str(uid or "")
+        self._claimed_mode_by_job[job_id] = str(mode or "")
+        self._claimed_role_by_job[job_id] = str(role or "")
+        self._dispatched.add(job_id)
+        return job_id, str(uid or ""), int(attempt or 0)
+
     async def _delayed_mover_loop(self) -> None:
         """
-        Move delayed jobs (zset) back into the stream when due.
+        Move delayed jobs (zset) back into pending when due, waking blocked consumers.
+
+        Sleeps until the earliest delayed job is due (capped at `block_s`).
         """
         r = self._redis()
         if r is None:
@@ -636,18 +856,26 @@ class RedisQueue(QueueBackend):
         try:
             while not self._stopping:
                 try:
-                    now = float(time.time())
-                    due = await r.zrangebyscore(self._delayed_key(), min="-inf", max=now, start=0, num=50)
-                    if due:
-                        for job_id in due:
-                            jid = str(job_id)
-                            with suppress(Exception):
-                                await r.zrem(self._delayed_key(), jid)
-                            meta = await self._read_meta(jid)
-                            pr = int(meta.get("priority") or 100) if str(meta.get("priority") or "").isdigit() else 100
-                            with suppress(Exception):
-                                await r.zadd(self._pending_key(), {jid: float(pr)})
-                    await asyncio.sleep(0.5 if due else 1.5)
+                    moved = 0
+                    if self._promote_script is not None:
+                        moved = int(
+                            await self._promote_script(
+                                keys=[self._delayed_key(), self._pending_key(), self._wake_key()],
+                                args=[
+                                    self._cfg.prefix,
+                                    repr(time.time()),
+                                    str(int(self._cfg.promote_batch)),
+                                ],
+                            )
+                            or 0
+                        )
+                    if moved >= int(self._cfg.promote_batch):
+                        continue
+                    wait = float(self._cfg.block_s)
+                    nxt = await r.zrange(self._delayed_key(), 0, 0, withscores=True)
+                    if nxt:
+                        wait = min(wait, max(0.05, float(nxt[0][1]) - time.time()))
+                    await asyncio.sleep(wait)
                 except asyncio.CancelledError:
                     raise
                 except Exception:
@@ -676,6 +904,7 @@ class RedisQueue(QueueBackend):
         due = time.time() + (float(delay_ms) / 1000.0)
         with suppress(Exception):
             await r.zadd(self._delayed_key(), {str(job_id): float(due)})
+        queue_event("redis", "deferred").inc()
         logger.info(
             "queue_deferred",
             queue_mode="redis",
@@ -701,6 +930,11 @@ class RedisQueue(QueueBackend):
         # Optional dead-letter list.
         with suppress(Exception):
             await r.lpush(self._dlq_key(), f"{job_id}|{uid}|{reason}|{_now_ms()}")
+        self._log_dead_letter(job_id, reason=reason, user_id=uid)
+
+    def _log_dead_letter(self, job_id: str, *, reason: str, user_id: str = "") -> None:
+        uid = str(user_id or "")
+        queue_event("redis", "dead_lettered").inc()
         logger.warning(
             "queue_dead_letter",
             queue_mode="redis",
@@ -727,6 +961,34 @@ class RedisQueue(QueueBackend):
         except Exception:
             return False
 
+    async def is_locked_elsewhere(self, job_id: str) -> bool:
+        """
+        True when another live process holds the job lock. Locks left by a dead process on
+        this host (e.g. before a restart) do not count; remote holders are trusted until the
+        lock TTL lapses.
+        """
+        r = self._redis()
+        if r is None:
+            return False
+        token = await r.get(self._lock_key(str(job_id)))
+        if isinstance(token, bytes):
+            token = token.decode("utf-8", "replace")
+        if not token or token in self._lock_token_by_job.values():
+            return False
+        import os
+        import socket
+
+        host, _, rest = str(token).partition(":")
+        pid_s = rest.split(":", 1)[0]
+        if host == socket.gethostname() and pid_s.isdigit() and int(pid_s) != os.getpid():
+            try:
+                os.kill(int(pid_s), 0)
+            except ProcessLookupError:
+                return False
+            except Exception:
+                pass
+        return True
+
     async def _release_lock(self, job_id: str, token: str) -> None:
         """
         Best-effort safe release (only delete if token matches).
@@ -776,57 +1038,13 @@ class RedisQueue(QueueBackend):
         r = self._redis()
         if r is None:
             return
-        # Lua: claim one job from pending by priority and acquire lock.
-        # KEYS[1]=pending_zset, KEYS[2]=lock_key_prefix
-        # ARGV[1]=lock_ttl_ms, ARGV[2]=token
-        lua = """
-        local pending = KEYS[1]
-        local lock_prefix = KEYS[2]
-        local ttl = tonumber(ARGV[1])
-        local token = ARGV[2]
-        local items = redis.call('ZREVRANGE', pending, 0, 0)
-        if (not items) or (#items == 0) then
-          return nil
-        end
-        local job_id = items[1]
-        local lock_key = lock_prefix .. job_id .. ':lock'
-        local ok = redis.call('SET', lock_key, token, 'NX', 'PX', ttl)
-        if not ok then
-          return nil
-        end
-        redis.call('ZREM', pending, job_id)
-        return job_id
-        """
+        # register_script: EVALSHA with transparent reload after SCRIPT FLUSH / failover.
         try:
-            self._claim_lua = await r.script_load(lua)
+            self._dispatch_script = r.register_script(_DISPATCH_LUA)
+            self._promote_script = r.register_script(_PROMOTE_LUA)
         except Exception:
-            self._claim_lua = None
-
-    async def _claim_one(self) -> str:
-        r = self._redis()
-        if r is None:
-            return ""
-        token = _lock_token("claim")
-        try:
-            if self._claim_lua:
-                jid = await r.evalsha(
-                    self._claim_lua,
-                    2,
-                    self._pending_key(),
-                    self._lock_key_prefix(),
-                    str(int(self._cfg.lock_ttl_ms)),
-                    str(token),
-                )
-            else:
-                jid = None
-            job_id = str(jid or "").strip()
-            if not job_id:
-                return ""
-            # Remember token; before_job_run will convert this into a running lease/counters update.
-            self._lock_token_by_job[job_id] = str(token)
-            return job_id
-        except Exception:
-            return ""
+            self._dispatch_script = None
+            self._promote_script = None
 
     async def _read_meta(self, job_id: str) -> dict[str, Any]:
         r = self._redis()
@@ -874,6 +1092,9 @@ class RedisQueue(QueueBackend):
     def _dlq_key(self) -> str:
         return f"{self._cfg.prefix}:queue:dlq"
 
+    def _wake_key(self) -> str:
+        return f"{self._cfg.prefix}:queue:wake"
+
     def _lock_key_prefix(self) -> str:
         return f"{self._cfg.prefix}:job:"
 
@@ -15,7 +15,7 @@ from dubbing_pipeline.review.ops import (
     resolve_job_dir,
     unlock_segment,
 )
-from dubbing_pipeline.review.state import load_state, short_preview
+from dubbing_pipeline.review.state import load_state, short_preview, undo_edit
 
 
 @click.group()
@@ -27,7 +27,7 @@ def review() -> None:
 @click.argument("input_video", type=click.Path(dir_okay=False, path_type=Path))
 def review_init(input_video: Path) -> None:
     """
-    Initialize Output/<stem>/review/state.json from existing job artifacts.
+    Initialize the review state (Output/<stem>/review/) from existing job artifacts.
     """
     from dubbing_pipeline.utils.paths import output_dir_for
 
@@ -115,10 +115,22 @@ def review_unlock(job: str, segment_id: int) -> None:
     click.echo("OK")
 
 
+@review.command("undo")
+@click.argument("job", type=str)
+@click.option("--segment", "segment_id", type=int, default=None, help="Only this segment.")
+def review_undo(job: str, segment_id: int | None) -> None:
+    job_dir = resolve_job_dir(job)
+    ent = undo_edit(job_dir, segment_id=segment_id)
+    if ent is None:
+        raise click.ClickException("Nothing to undo")
+    click.echo(f"undid {ent['op']} segment={ent['segment_id']} seq={ent['seq']}")
+
+
 @review.command("render")
 @click.argument("job", type=str)
-def review_render(job: str) -> None:
+@click.option("--full", is_flag=True, default=False, help="Ignore the render map and rebuild.")
+def review_render(job: str, full: bool) -> None:
     job_dir = resolve_job_dir(job)
-    outs = render(job_dir)
+    outs = render(job_dir, full=full)
     for k, v in outs.items():
         click.echo(f"{k}={v}")
@@ -4,6 +4,8 @@ import os
 import re
 import shutil
 import sys
+import wave
+from collections.abc import Iterator
 from contextlib import suppress
 from pathlib import Path
 
@@ -11,12 +13,14 @@ from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.review.state import (
     bump_status,
     find_segment,
+    has_review_state,
     init_state_from_job,
     load_state,
     now_utc,
     review_audio_dir,
-    review_state_path,
+    review_store_path,
     save_state,
+    update_segments,
 )
 from dubbing_pipeline.utils.io import atomic_copy, atomic_write_text
 from dubbing_pipeline.utils.log import logger
@@ -31,8 +35,8 @@ def resolve_job_dir(job: str) -> Path:
 
 def ensure_review_state(*, job_dir: Path, video_path: Path | None = None) -> Path:
     job_dir = Path(job_dir)
-    p = review_state_path(job_dir)
-    if p.exists():
+    p = review_store_path(job_dir)
+    if has_review_state(job_dir):
         return p
     raise FileNotFoundError(f"Missing review state: {p} (run `dubbing-pipeline review init ...`)")
 
@@ -64,19 +68,31 @@ def init_review(job_dir: Path, *, video_path: Path | None) -> Path:
         voice_mapping_snapshot={},
     )
     save_state(job_dir, state)
-    return review_state_path(job_dir)
+    return review_store_path(job_dir)
 
 
-def edit_segment(job_dir: Path, segment_id: int, *, text: str) -> None:
-    st = load_state(job_dir)
-    seg = find_segment(st, int(segment_id))
-    if seg is None:
-        raise KeyError(f"segment_id {segment_id} not found")
-    if str(seg.get("status")) == "locked":
-        raise RuntimeError("Segment is locked; unlock before editing.")
-    seg["chosen_text"] = str(text)
-    bump_status(seg, "regenerated")
-    save_state(job_dir, st)
+def _edit(text: str):
+    def _apply(seg: dict) -> None:
+        if str(seg.get("status")) == "locked":
+            raise RuntimeError("Segment is locked; unlock before editing.")
+        seg["chosen_text"] = str(text)
+        bump_status(seg, "regenerated")
+
+    return _apply
+
+
+def edit_segment(job_dir: Path, segment_id: int, *, text: str, actor: str = "") -> None:
+    update_segments(job_dir, {int(segment_id): _edit(text)}, op="edit", actor=actor)
+
+
+def edit_segments(job_dir: Path, edits: dict[int, str], *, actor: str = "") -> list[int]:
+    """
+    Edit several segments in one write; nothing is applied if any segment is missing or locked.
+    """
+    done = update_segments(
+        job_dir, {int(k): _edit(v) for k, v in edits.items()}, op="edit", actor=actor
+    )
+    return sorted(done)
 
 
 def _next_audio_version(audio_dir: Path, segment_id: int) -> int:
@@ -91,28 +107,60 @@ def _next_audio_version(audio_dir: Path, segment_id: int) -> int:
     return best + 1
 
 
-def regen_segment(job_dir: Path, segment_id: int) -> Path:
-    job_dir = Path(job_dir)
-    st = load_state(job_dir)
+def _regen_target(st: dict, segment_id: int) -> dict:
     seg = find_segment(st, int(segment_id))
     if seg is None:
         raise KeyError(f"segment_id {segment_id} not found")
     if str(seg.get("status")) == "locked":
         raise RuntimeError("Segment is locked; unlock before regenerating.")
+    return seg
 
-    start = float(seg.get("start", 0.0))
-    end = float(seg.get("end", 0.0))
-    dur = max(0.05, end - start)
-    speaker = str(seg.get("speaker") or "SPEAKER_01")
-    text = str(seg.get("chosen_text") or "")
 
+def _commit_regen(job_dir: Path, segment_id: int, clip: Path) -> Path:
+    """Store `clip` as the next audio version of a segment and mark it regenerated."""
+    _regen_target(load_state(job_dir), int(segment_id))
     audio_dir = review_audio_dir(job_dir)
     audio_dir.mkdir(parents=True, exist_ok=True)
     v = _next_audio_version(audio_dir, int(segment_id))
     out = audio_dir / f"{int(segment_id)}_v{v}.wav"
+    atomic_copy(Path(clip), out)
+
+    def _apply(seg: dict) -> None:
+        if str(seg.get("status")) == "locked":
+            raise RuntimeError("Segment is locked; unlock before regenerating.")
+        seg["audio_path_current"] = str(out)
+        bump_status(seg, "regenerated")
+
+    update_segments(job_dir, {int(segment_id): _apply}, op="regen")
+    return out
+
+
+def _synth_via_stage(
+    job_dir: Path,
+    st: dict,
+    seg: dict,
+    out: Path,
+    *,
+    pronunciations: list[dict] | None = None,
+    pronunciation_overrides: dict[int, list[dict]] | None = None,
+) -> None:
+    """
+    Single-segment synthesis through the full TTS stage (cold path; never raises).
+    """
+    segment_id = int(seg.get("segment_id") or 0)
+    # The stage keys overrides by position; the clip's only line is position 1.
+    own = next(
+        (v for k, v in (pronunciation_overrides or {}).items() if str(k) == str(segment_id)),
+        None,
+    )
+    start = float(seg.get("start", 0.0))
+    end = float(seg.get("end", 0.0))
+    dur = max(0.05, end - start)
+    speaker = str(seg.get("speaker") or "SPEAKER_01")
+    text = str(seg.get("chosen_text") or "")
 
     # Use the existing TTS stage as a single-segment synthesizer (with fallbacks).
-    tmp_dir = job_dir / "review" / "tmp" / f"{int(segment_id)}"
+    tmp_dir = job_dir / "review" / "tmp" / f"{segment_id}"
     if tmp_dir.exists():
         with suppress(Exception):
             shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -190,6 +238,8 @@ def regen_segment(job_dir: Path, segment_id: int) -> Path:
                 if getattr(get_settings(), "voice_memory_dir", None)
                 else None
             ),
+            pronunciation_dict=pronunciations,
+            pronunciation_overrides=({1: own} if own else None),
         )
         # Grab the first clip as the segment audio
         clip = None
@@ -202,36 +252,125 @@ def regen_segment(job_dir: Path, segment_id: int) -> Path:
         atomic_copy(Path(clip), out)
     except Exception as ex:
         # hard fallback: silence clip (never crash)
-        logger.warning("review_regen_failed", segment_id=int(segment_id), error=str(ex))
+        logger.warning("review_regen_failed", segment_id=segment_id, error=str(ex))
         from dubbing_pipeline.stages.tts import _write_silence_wav
 
         _write_silence_wav(out, duration_s=float(dur))
 
-    seg["audio_path_current"] = str(out)
-    bump_status(seg, "regenerated")
-    save_state(job_dir, st)
-    return out
 
+def regen_segment(
+    job_dir: Path,
+    segment_id: int,
+    *,
+    warm: bool | None = None,
+    pronunciations: list[dict] | None = None,
+    pronunciation_overrides: dict[int, list[dict]] | None = None,
+) -> Path:
+    """
+    Re-synthesize one segment from its chosen_text and make it the current audio version.
 
-def lock_segment(job_dir: Path, segment_id: int) -> None:
+    Uses the resident per-job synthesis session (`review.synth`) unless REVIEW_SYNTH_WARM=0;
+    falls back to running the TTS stage for the single segment.
+    """
+    job_dir = Path(job_dir)
     st = load_state(job_dir)
-    seg = find_segment(st, int(segment_id))
-    if seg is None:
-        raise KeyError(f"segment_id {segment_id} not found")
-    p = Path(str(seg.get("audio_path_current") or ""))
-    if not p.exists():
-        raise RuntimeError("Cannot lock: audio_path_current is missing. Run review regen first.")
-    bump_status(seg, "locked")
-    save_state(job_dir, st)
+    seg = _regen_target(st, int(segment_id))
+
+    if get_settings().review_synth_warm if warm is None else warm:
+        from dubbing_pipeline.review.synth import SynthUnavailable, get_session
+
+        try:
+            sess = get_session(job_dir)
+            if pronunciations is not None or pronunciation_overrides is not None:
+                sess.set_pronunciations(pronunciations, pronunciation_overrides)
+            return _commit_regen(job_dir, int(segment_id), sess.synthesize(seg))
+        except SynthUnavailable as ex:
+            logger.info("review_synth_fallback", segment_id=int(segment_id), reason=str(ex))
+
+    tmp_out = job_dir / "review" / "tmp" / f"{int(segment_id)}.regen.wav"
+    tmp_out.parent.mkdir(parents=True, exist_ok=True)
+    _synth_via_stage(
+        job_dir,
+        st,
+        seg,
+        tmp_out,
+        pronunciations=pronunciations,
+        pronunciation_overrides=pronunciation_overrides,
+    )
+    return _commit_regen(job_dir, int(segment_id), tmp_out)
 
 
-def unlock_segment(job_dir: Path, segment_id: int) -> None:
-    st = load_state(job_dir)
-    seg = find_segment(st, int(segment_id))
-    if seg is None:
-        raise KeyError(f"segment_id {segment_id} not found")
-    bump_status(seg, "regenerated")
-    save_state(job_dir, st)
+def regen_segment_stream(
+    job_dir: Path,
+    segment_id: int,
+    *,
+    pronunciations: list[dict] | None = None,
+    pronunciation_overrides: dict[int, list[dict]] | None = None,
+) -> Iterator[bytes]:
+    """
+    Like `regen_segment`, but returns a WAV byte stream that starts as soon as the engine
+    produces audio. The timing-fitted clip is committed when the stream completes.
+    """
+    from dubbing_pipeline.review.synth import (
+        SynthUnavailable,
+        get_session,
+        wav_stream_header,
+    )
+
+    job_dir = Path(job_dir)
+    seg = _regen_target(load_state(job_dir), int(segment_id))
+
+    def _gen() -> Iterator[bytes]:
+        yield wav_stream_header()
+        done: list[Path] = []
+        sent = False
+        try:
+            if not get_settings().review_synth_warm:
+                raise SynthUnavailable("REVIEW_SYNTH_WARM=0")
+            sess = get_session(job_dir)
+            if pronunciations is not None or pronunciation_overrides is not None:
+                sess.set_pronunciations(pronunciations, pronunciation_overrides)
+            for chunk in sess.stream(seg, result=done):
+                sent = True
+                yield chunk
+        except SynthUnavailable as ex:
+            if sent:
+                raise
+            logger.info("review_synth_fallback", segment_id=int(segment_id), reason=str(ex))
+            p = regen_segment(
+                job_dir,
+                int(segment_id),
+                warm=False,
+                pronunciations=pronunciations,
+                pronunciation_overrides=pronunciation_overrides,
+            )
+            with wave.open(str(p), "rb") as wf:
+                yield wf.readframes(wf.getnframes())
+            return
+        _commit_regen(job_dir, int(segment_id), done[0])
+
+    return _gen()
+
+
+def lock_segment(job_dir: Path, segment_id: int, *, actor: str = "") -> None:
+    def _apply(seg: dict) -> None:
+        p = Path(str(seg.get("audio_path_current") or ""))
+        if not p.exists():
+            raise RuntimeError(
+                "Cannot lock: audio_path_current is missing. Run review regen first."
+            )
+        bump_status(seg, "locked")
+
+    update_segments(job_dir, {int(segment_id): _apply}, op="lock", actor=actor)
+
+
+def unlock_segment(job_dir: Path, segment_id: int, *, actor: str = "") -> None:
+    update_segments(
+        job_dir,
+        {int(segment_id): lambda seg: bump_status(seg, "regenerated")},
+        op="unlock",
+        actor=actor,
+    )
 
 
 def play_segment(job_dir: Path, segment_id: int) -> Path:
@@ -256,9 +395,12 @@ def play_segment(job_dir: Path, segment_id: int) -> Path:
     return p
 
 
-def render(job_dir: Path) -> dict[str, Path]:
+def render(job_dir: Path, *, full: bool = False) -> dict[str, Path]:
     """
     Build full episode audio from segment audio files and mux to a review MKV when possible.
+
+    Re-renders only the windows touched by changed segments unless `full=True` (see
+    `review.render`); the mux stream-copies video, so only the audio is re-encoded.
     """
     job_dir = Path(job_dir)
     st = load_state(job_dir)
@@ -266,9 +408,9 @@ def render(job_dir: Path) -> dict[str, Path]:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     out_wav = out_dir / "review_render.wav"
-    from dubbing_pipeline.review.state import render_audio_only
+    from dubbing_pipeline.review.render import render_review_audio
 
-    render_audio_only(job_dir, st, out_wav)
+    info = render_review_audio(job_dir, st, out_wav, full=full)
 
     outs: dict[str, Path] = {"wav": out_wav}
 
@@ -277,14 +419,21 @@ def render(job_dir: Path) -> dict[str, Path]:
     if vpath:
         src_video = Path(vpath)
         if src_video.exists():
-            try:
-                from dubbing_pipeline.stages.mkv_export import mux
-
-                mkv = out_dir / "dub.review.mkv"
-                mux(src_video=src_video, dub_wav=out_wav, srt_path=None, out_mkv=mkv)
+            mkv = out_dir / "dub.review.mkv"
+            if (
+                info["mode"] == "unchanged"
+                and mkv.exists()
+                and mkv.stat().st_mtime_ns >= out_wav.stat().st_mtime_ns
+            ):
                 outs["mkv"] = mkv
-            except Exception as ex:
-                logger.warning("review_mux_failed", error=str(ex))
+            else:
+                try:
+                    from dubbing_pipeline.stages.mkv_export import mux
+
+                    mux(src_video=src_video, dub_wav=out_wav, srt_path=None, out_mkv=mkv)
+                    outs["mkv"] = mkv
+                except Exception as ex:
+                    logger.warning("review_mux_failed", error=str(ex))
 
     # update state snapshot
     (st.setdefault("job", {}) if isinstance(st.get("job"), dict) else st).__setitem__(
@@ -306,7 +455,7 @@ def lock_from_tts_manifest(
 
     Reads a tts_manifest.json produced by `dubbing_pipeline.stages.tts.run` and:
     - copies each clip into Output/<job>/review/audio/<segment_id>_vN.wav
-    - updates Output/<job>/review/state.json
+    - updates the review state (Output/<job>/review/state.db)
     - locks segments with non-empty text (by default)
     """
     from dubbing_pipeline.utils.io import read_json
@@ -324,8 +473,7 @@ def lock_from_tts_manifest(
         raise ValueError("Invalid tts_manifest: expected equal-length clips + lines")
 
     # Ensure state exists.
-    sp = review_state_path(job_dir)
-    if not sp.exists():
+    if not has_review_state(job_dir):
         st = init_state_from_job(
             job_dir=job_dir, video_path=video_path, pipeline_params={}, voice_mapping_snapshot={}
         )
@@ -0,0 +1,273 @@
+"""
+Incremental review render.
+
+`review render` used to rebuild the whole episode WAV from every segment clip after each edit.
+The compositor has overwrite semantics (later clips win), so any output sample depends only on
+the clips that cover it. That makes a windowed re-composite exact: for every changed segment we
+rebuild the window spanned by its old and new clip from all clips intersecting it, in segment
+order, and write those samples into the existing WAV in place.
+
+`review/render_map.json` records the layout of the last render (per-segment placement and clip
+mtime/size) plus the size/mtime of the WAV it describes. Anything that does not line up with the
+map (timing edits, a different segment list, a WAV touched by someone else) falls back to a full
+render, which rewrites the map.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import wave
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.review.state import review_audio_dir, review_dir
+from dubbing_pipeline.utils.io import atomic_write_text
+from dubbing_pipeline.utils.log import logger
+
+RENDER_MAP_NAME = "render_map.json"
+MAP_VERSION = 1
+SR = 16000
+# Above this fraction of the timeline, patching saves little over a straight rewrite.
+FULL_RENDER_FRACTION = 0.5
+
+
+def render_map_path(job_dir: Path) -> Path:
+    return review_dir(job_dir) / RENDER_MAP_NAME
+
+
+def _clip_entry(sid: int, start: float, end: float, clip: Path, *, sr: int) -> dict[str, Any]:
+    frames = 0
+    try:
+        with wave.open(str(clip), "rb") as wf:
+            if wf.getnchannels() == 1 and wf.getsampwidth() == 2 and wf.getframerate() == sr:
+                frames = int(wf.getnframes())
+    except Exception:
+        frames = 0  # the compositor skips unreadable / wrong-format clips
+    st = clip.stat() if clip.exists() else None
+    return {
+        "segment_id": int(sid),
+        "start": float(start),
+        "end": float(end),
+        "clip": str(clip),
+        "mtime_ns": int(st.st_mtime_ns) if st else 0,
+        "size": int(st.st_size) if st else 0,
+        "frames": frames,
+    }
+
+
+def _layout(job_dir: Path, state: dict[str, Any], *, sr: int) -> list[dict[str, Any]]:
+    """
+    Resolve segment clips exactly like `render_audio_only` (missing audio => silence clip).
+    """
+    from dubbing_pipeline.stages.tts import _write_silence_wav
+
+    segs = state.get("segments", [])
+    if not isinstance(segs, list) or not segs:
+        raise ValueError("No segments in review state")
+    out: list[dict[str, Any]] = []
+    for s in segs:
+        if not isinstance(s, dict):
+            continue
+        try:
+            start = float(s.get("start", 0.0))
+            end = float(s.get("end", 0.0))
+            sid = int(s.get("segment_id") or 0)
+            p = Path(str(s.get("audio_path_current") or ""))
+            if not p.exists():
+                p = review_audio_dir(job_dir) / f"_silence_{sid}.wav"
+                if not p.exists():
+                    _write_silence_wav(p, duration_s=max(0.0, end - start), sr=sr)
+            out.append(_clip_entry(sid, start, end, p, sr=sr))
+        except Exception:
+            continue
+    if not out:
+        raise ValueError("No segments in review state")
+    return out
+
+
+def _total_frames(entries: list[dict[str, Any]], *, sr: int) -> int:
+    return max(1, int(max(float(e["end"]) for e in entries) * sr))
+
+
+def _placement(e: dict[str, Any], *, sr: int, total: int) -> tuple[int, int]:
+    s = max(0, int(float(e["start"]) * sr))
+    return s, min(total, s + int(e["frames"]))
+
+
+def _wav_stat(p: Path) -> dict[str, int]:
+    st = p.stat()
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def _data_offset(p: Path) -> int:
+    """
+    Byte offset of the PCM data chunk in a RIFF/WAVE file.
+    """
+    with p.open("rb") as f:
+        hdr = f.read(12)
+        if len(hdr) != 12 or hdr[:4] != b"RIFF" or hdr[8:12] != b"WAVE":
+            raise ValueError(f"not a WAV file: {p}")
+        while True:
+            ch = f.read(8)
+            if len(ch) != 8:
+                raise ValueError(f"WAV has no data chunk: {p}")
+            cid, size = ch[:4], struct.unpack("<I", ch[4:])[0]
+            if cid == b"data":
+                return f.tell()
+            f.seek(size + (size & 1), 1)
+
+
+def _load_map(job_dir: Path) -> dict[str, Any] | None:
+    p = render_map_path(job_dir)
+    if not p.exists():
+        return None
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _save_map(job_dir: Path, *, sr: int, total: int, wav: Path, entries: list[dict]) -> None:
+    data = {
+        "version": MAP_VERSION,
+        "sr": int(sr),
+        "total_frames": int(total),
+        "wav": str(wav),
+        "wav_stat": _wav_stat(wav),
+        "segments": entries,
+    }
+    atomic_write_text(render_map_path(job_dir), json.dumps(data, indent=2), encoding="utf-8")
+
+
+def _changed_windows(
+    old: list[dict[str, Any]], new: list[dict[str, Any]], *, sr: int, total: int
+) -> list[tuple[int, int]] | None:
+    """
+    Merged [a, b) frame windows that must be recomposited, or None if the segment structure
+    (ids / timing) changed and only a full render is safe.
+    """
+    if len(old) != len(new):
+        return None
+    spans: list[tuple[int, int]] = []
+    for o, n in zip(old, new, strict=True):
+        if (
+            int(o.get("segment_id", -1)) != n["segment_id"]
+            or float(o.get("start", -1.0)) != n["start"]
+            or float(o.get("end", -1.0)) != n["end"]
+        ):
+            return None
+        if all(o.get(k) == n[k] for k in ("clip", "mtime_ns", "size", "frames")):
+            continue
+        s0, e0 = _placement(o, sr=sr, total=total)
+        s1, e1 = _placement(n, sr=sr, total=total)
+        a, b = min(s0, s1), max(e0, e1)
+        if b > a:
+            spans.append((a, b))
+    spans.sort()
+    merged: list[tuple[int, int]] = []
+    for a, b in spans:
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _composite_window(
+    entries: list[dict[str, Any]], a: int, b: int, *, sr: int, total: int
+) -> bytes:
+    buf = bytearray(2 * (b - a))
+    for e in entries:
+        if int(e["frames"]) <= 0:
+            continue
+        s, end = _placement(e, sr=sr, total=total)
+        lo, hi = max(a, s), min(b, end)
+        if hi <= lo:
+            continue
+        with wave.open(str(e["clip"]), "rb") as wf:
+            wf.setpos(lo - s)
+            frames = wf.readframes(hi - lo)
+        buf[(lo - a) * 2 : (lo - a) * 2 + len(frames)] = frames
+    return bytes(buf)
+
+
+def _wav_matches(out_wav: Path, m: dict[str, Any], *, sr: int, total: int) -> bool:
+    if not out_wav.exists() or m.get("wav_stat") != _wav_stat(out_wav):
+        return False
+    try:
+        with wave.open(str(out_wav), "rb") as wf:
+            return (
+                wf.getnchannels() == 1
+                and wf.getsampwidth() == 2
+                and wf.getframerate() == sr
+                and wf.getnframes() == total
+            )
+    except Exception:
+        return False
+
+
+def render_review_audio(
+    job_dir: Path,
+    state: dict[str, Any],
+    out_wav: Path,
+    *,
+    full: bool = False,
+    sr: int = SR,
+) -> dict[str, Any]:
+    """
+    Bring `out_wav` up to date with the review state, patching only changed windows when a
+    valid render map exists.
+
+    Returns {"mode": "full"|"patched"|"unchanged", "windows": n, "patched_s": seconds}.
+    """
+    from dubbing_pipeline.review.state import render_audio_only
+
+    job_dir = Path(job_dir)
+    out_wav = Path(out_wav)
+    entries = _layout(job_dir, state, sr=sr)
+    total = _total_frames(entries, sr=sr)
+
+    windows: list[tuple[int, int]] | None = None
+    m = None if full else _load_map(job_dir)
+    if (
+        m is not None
+        and int(m.get("version") or 0) == MAP_VERSION
+        and int(m.get("sr") or 0) == sr
+        and int(m.get("total_frames") or 0) == total
+        and str(m.get("wav") or "") == str(out_wav)
+        and _wav_matches(out_wav, m, sr=sr, total=total)
+    ):
+        old = m.get("segments")
+        if isinstance(old, list):
+            windows = _changed_windows(old, entries, sr=sr, total=total)
+
+    if windows is not None and not windows:
+        return {"mode": "unchanged", "windows": 0, "patched_s": 0.0}
+
+    patched = sum(b - a for a, b in windows or [])
+    if windows is None or patched > FULL_RENDER_FRACTION * total:
+        render_audio_only(job_dir, state, out_wav)
+        entries = _layout(job_dir, state, sr=sr)  # silence clips were rewritten
+        _save_map(job_dir, sr=sr, total=total, wav=out_wav, entries=entries)
+        logger.info("review_render_full", job_dir=str(job_dir), segments=len(entries))
+        return {"mode": "full", "windows": 0, "patched_s": total / float(sr)}
+
+    # Drop the map first: if we die mid-patch the next render sees a stale map and goes full.
+    with suppress(Exception):
+        render_map_path(job_dir).unlink()
+    off = _data_offset(out_wav)
+    with out_wav.open("r+b") as f:
+        for a, b in windows:
+            f.seek(off + 2 * a)
+            f.write(_composite_window(entries, a, b, sr=sr, total=total))
+    _save_map(job_dir, sr=sr, total=total, wav=out_wav, entries=entries)
+    logger.info(
+        "review_render_patched",
+        job_dir=str(job_dir),
+        windows=len(windows),
+        patched_s=round(patched / float(sr), 3),
+    )
+    return {"mode": "patched", "windows": len(windows), "patched_s": patched / float(sr)}
@@ -5,11 +5,14 @@ Tier-2B review loop state + helpers.
 from __future__ import annotations
 
 import json
+import threading
+from collections.abc import Callable
 from contextlib import suppress
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from dubbing_pipeline.review.store import _JSON_SIG_KEY, ReviewStateDB, SegmentNotFound
 from dubbing_pipeline.security.crypto import (
     decrypt_bytes,
     encryption_enabled_for,
@@ -35,25 +38,84 @@ def review_audio_dir(job_dir: Path) -> Path:
     return review_dir(job_dir) / "audio"
 
 
-def load_state(job_dir: Path) -> dict[str, Any]:
+def _empty_state() -> dict[str, Any]:
+    return {"version": 1, "segments": [], "job": {}}
+
+
+def _row_store_enabled() -> bool:
+    # The SQLite row store is plaintext; encrypted review state stays in state.json.
+    return not encryption_enabled_for("review")
+
+
+def _json_sig(p: Path) -> str:
+    try:
+        st = p.stat()
+        return f"{int(st.st_mtime_ns)}:{int(st.st_size)}"
+    except Exception:
+        return ""
+
+
+_JSON_SEEN: dict[str, str] = {}
+
+
+def _sync_json(job_dir: Path) -> ReviewStateDB:
+    """
+    Import review/state.json into the row store when it is new or was rewritten externally
+    (older jobs, scripts, hand edits); the row store is authoritative otherwise.
+    """
+    db = ReviewStateDB(job_dir)
     p = review_state_path(job_dir)
-    if encryption_enabled_for("review") and is_encrypted_path(p):
-        blob = p.read_bytes()
-        pt = decrypt_bytes(blob, kind="review", job_id=str(Path(job_dir).name))
-        try:
-            data = json.loads(pt.decode("utf-8"))
-        except Exception:
-            data = None
+    sig = _json_sig(p)
+    if not sig or _JSON_SEEN.get(db.key) == sig or is_encrypted_path(p):
+        return db
+    if db.get_meta(_JSON_SIG_KEY) != sig:
+        data = read_json(p, default=None)
         if isinstance(data, dict):
-            return data
-        return {"version": 1, "segments": [], "job": {}}
-    v = read_json(p, default={"version": 1, "segments": [], "job": {}})
-    return v if isinstance(v, dict) else {"version": 1, "segments": [], "job": {}}
+            data.setdefault("version", 1)
+            data.setdefault("job", {})
+            data.setdefault("segments", [])
+            db.replace(data, op="import", meta={_JSON_SIG_KEY: sig})
+    _JSON_SEEN[db.key] = sig
+    return db
+
+
+def review_store_path(job_dir: Path) -> Path:
+    """
+    File backing the review state: review/state.db, or review/state.json when encrypted.
+    """
+    return ReviewStateDB(job_dir).db_path if _row_store_enabled() else review_state_path(job_dir)
+
 
+def has_review_state(job_dir: Path) -> bool:
+    return review_state_path(job_dir).exists() or ReviewStateDB(job_dir).exists()
 
-def save_state(job_dir: Path, state: dict[str, Any]) -> None:
+
+def load_state(job_dir: Path) -> dict[str, Any]:
+    p = review_state_path(job_dir)
+    if not _row_store_enabled():
+        if is_encrypted_path(p):
+            blob = p.read_bytes()
+            pt = decrypt_bytes(blob, kind="review", job_id=str(Path(job_dir).name))
+            try:
+                data = json.loads(pt.decode("utf-8"))
+            except Exception:
+                data = None
+            if isinstance(data, dict):
+                return data
+            return _empty_state()
+        v = read_json(p, default=_empty_state())
+        return v if isinstance(v, dict) else _empty_state()
+    db = _sync_json(job_dir)
+    return db.load() if db.exists() else _empty_state()
+
+
+def save_state(job_dir: Path, state: dict[str, Any], *, actor: str = "") -> None:
     p = review_state_path(job_dir)
     p.parent.mkdir(parents=True, exist_ok=True)
+    if _row_store_enabled():
+        # Only segment rows that differ from the stored state are written (and journaled).
+        _sync_json(job_dir).replace(state, actor=actor)
+        return
     payload = json.dumps(state, indent=2, sort_keys=True).encode("utf-8")
     if encryption_enabled_for("review"):
         # Fail-safe: if encryption is enabled but misconfigured, this will raise and we will not write plaintext.
@@ -62,6 +124,60 @@ def save_state(job_dir: Path, state: dict[str, Any]) -> None:
         atomic_write_text(p, payload.decode("utf-8"), encoding="utf-8")
 
 
+_JSON_WRITE_LOCK = threading.Lock()
+
+
+def update_segments(
+    job_dir: Path,
+    mutations: dict[int, Callable[[dict[str, Any]], None]],
+    *,
+    op: str,
+    actor: str = "",
+) -> dict[int, dict[str, Any]]:
+    """
+    Apply `mutations[segment_id](seg)` to several segments atomically and return the updated
+    segments. Raises KeyError for unknown ids; a mutation may raise to abort the batch.
+    With the row store only the touched rows are read and written.
+    """
+    if _row_store_enabled():
+        db = _sync_json(job_dir)
+        if not db.exists():
+            raise SegmentNotFound(f"segment_id {next(iter(mutations), 0)} not found")
+        return db.update_segments(mutations, op=op, actor=actor)
+    with _JSON_WRITE_LOCK:
+        st = load_state(job_dir)
+        out: dict[int, dict[str, Any]] = {}
+        for sid, mutate in mutations.items():
+            seg = find_segment(st, int(sid))
+            if seg is None:
+                raise SegmentNotFound(f"segment_id {sid} not found")
+            mutate(seg)
+            out[int(sid)] = dict(seg)
+        save_state(job_dir, st)
+        return out
+
+
+def review_journal(job_dir: Path, *, since: int = 0, limit: int = 500) -> list[dict[str, Any]]:
+    """
+    Edit journal entries after sequence number `since` (empty without the row store).
+    """
+    if not _row_store_enabled():
+        return []
+    return _sync_json(job_dir).journal(since=since, limit=limit)
+
+
+def undo_edit(
+    job_dir: Path, *, segment_id: int | None = None, actor: str = ""
+) -> dict[str, Any] | None:
+    if not _row_store_enabled():
+        raise RuntimeError("Undo needs the row-level review store (review encryption is on).")
+    return _sync_json(job_dir).undo(segment_id=segment_id, actor=actor)
+
+
+def state_revision(job_dir: Path) -> int:
+    return ReviewStateDB(job_dir).revision() if _row_store_enabled() else 0
+
+
 def _parse_srt(path: Path) -> list[dict[str, Any]]:
     if not path.exists():
         return []
@@ -0,0 +1,414 @@
+"""
+Row-level review state (SQLite inside the job dir: Output/<job>/review/state.db).
+
+One row per segment plus an append-only edit journal (undo + client sync). The database
+`user_version` is the state revision: every write bumps it, and readers keep a process-level
+parsed copy that is reused until the revision moves.
+
+`review.state.load_state/save_state` front this store; callers normally go through them.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+REVIEW_DB_NAME = "state.db"
+_DOC_KEY = "doc"
+_JSON_SIG_KEY = "json_sig"
+
+# Parsed states are whole jobs; keep only the most recently used ones resident.
+_CACHE_MAX = 32
+_CACHE: OrderedDict[str, tuple[int, dict[str, Any]]] = OrderedDict()
+_CACHE_GUARD = threading.Lock()
+_LOCKS: dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+class SegmentNotFound(KeyError):
+    pass
+
+
+def _dumps(v: Any) -> str:
+    return json.dumps(v, sort_keys=True, separators=(",", ":"))
+
+
+def copy_state(state: dict[str, Any]) -> dict[str, Any]:
+    """
+    Copy deep enough for callers to mutate segments and job metadata without touching the cache.
+    """
+    out = dict(state)
+    out["job"] = json.loads(_dumps(state.get("job") or {}))
+    out["segments"] = [copy.deepcopy(s) for s in state.get("segments") or [] if isinstance(s, dict)]
+    return out
+
+
+def _cache_get(key: str) -> tuple[int, dict[str, Any]] | None:
+    with _CACHE_GUARD:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+        return hit
+
+
+def _cache_put(key: str, rev: int, state: dict[str, Any]) -> None:
+    with _CACHE_GUARD:
+        _CACHE[key] = (rev, state)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_MAX:
+            _CACHE.popitem(last=False)
+
+
+def _cache_pop(key: str) -> None:
+    with _CACHE_GUARD:
+        _CACHE.pop(key, None)
+
+
+def _seg_id(seg: dict[str, Any]) -> int:
+    return int(seg.get("segment_id") or 0)
+
+
+class ReviewStateDB:
+    def __init__(self, job_dir: Path) -> None:
+        self.job_dir = Path(job_dir)
+        self.db_path = self.job_dir / "review" / REVIEW_DB_NAME
+        self.key = str(self.db_path.resolve())
+        with _LOCKS_GUARD:
+            self._lock = _LOCKS.setdefault(self.key, threading.Lock())
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Autocommit; writes open their own IMMEDIATE transaction.
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+        con.row_factory = sqlite3.Row
+        with suppress(Exception):
+            con.execute("PRAGMA journal_mode=WAL;")
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+              segment_id INTEGER PRIMARY KEY,
+              ord INTEGER NOT NULL,
+              data_json TEXT NOT NULL
+            );
+            """
+        )
+        con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);")
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+              seq INTEGER PRIMARY KEY AUTOINCREMENT,
+              rev INTEGER NOT NULL,
+              ts TEXT NOT NULL,
+              segment_id INTEGER NOT NULL,
+              op TEXT NOT NULL,
+              before_json TEXT,
+              after_json TEXT,
+              actor TEXT NOT NULL DEFAULT ''
+            );
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS idx_journal_segment ON journal(segment_id, seq);")
+        return con
+
+    @staticmethod
+    def _rev(con: sqlite3.Connection) -> int:
+        return int(con.execute("PRAGMA user_version;").fetchone()[0])
+
+    def revision(self) -> int:
+        if not self.exists():
+            return 0
+        con = self._conn()
+        try:
+            return self._rev(con)
+        finally:
+            con.close()
+
+    def _read(self, con: sqlite3.Connection) -> dict[str, Any]:
+        row = con.execute("SELECT value FROM meta WHERE key=?;", (_DOC_KEY,)).fetchone()
+        try:
+            doc = json.loads(str(row["value"])) if row else {}
+        except Exception:
+            doc = {}
+        if not isinstance(doc, dict):
+            doc = {}
+        doc.setdefault("version", 1)
+        doc.setdefault("job", {})
+        segs = []
+        for r in con.execute("SELECT data_json FROM segments ORDER BY ord, segment_id;"):
+            with suppress(Exception):
+                segs.append(json.loads(str(r["data_json"])))
+        doc["segments"] = segs
+        return doc
+
+    def _cached(self, con: sqlite3.Connection) -> tuple[int, dict[str, Any]]:
+        rev = self._rev(con)
+        hit = _cache_get(self.key)
+        if hit is not None and hit[0] == rev:
+            return hit
+        state = self._read(con)
+        _cache_put(self.key, rev, state)
+        return rev, state
+
+    def load(self) -> dict[str, Any]:
+        con = self._conn()
+        try:
+            return copy_state(self._cached(con)[1])
+        finally:
+            con.close()
+
+    def get_meta(self, key: str) -> str | None:
+        if not self.exists():
+            return None
+        con = self._conn()
+        try:
+            row = con.execute("SELECT value FROM meta WHERE key=?;", (str(key),)).fetchone()
+            return str(row["value"]) if row else None
+        finally:
+            con.close()
+
+    def _write(
+        self,
+        fn: Callable[[sqlite3.Connection, dict[str, Any], int], list[tuple[Any, ...]]],
+        *,
+        actor: str = "",
+        meta: dict[str, str] | None = None,
+        result: dict[str, Any] | None = None,
+    ) -> int:
+        """
+        Run `fn(con, current_state, new_rev)` inside one IMMEDIATE transaction. `fn` performs row
+        writes and returns journal entries (segment_id, op, before, after); the revision is
+        bumped only when something changed. The cached copy is patched from the entries (or
+        replaced by `result`) instead of re-reading every row.
+        """
+        from dubbing_pipeline.review.state import now_utc
+
+        with self._lock:
+            con = self._conn()
+            try:
+                con.execute("BEGIN IMMEDIATE;")
+                try:
+                    rev, current = self._cached(con)
+                    entries = fn(con, current, rev + 1)
+                    for k, v in (meta or {}).items():
+                        con.execute(
+                            "INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?);", (k, str(v))
+                        )
+                    if entries:
+                        ts = now_utc()
+                        con.executemany(
+                            """
+                            INSERT INTO journal(rev, ts, segment_id, op, before_json, after_json,
+                                                actor)
+                            VALUES(?, ?, ?, ?, ?, ?, ?);
+                            """,
+                            [
+                                (
+                                    rev + 1,
+                                    ts,
+                                    int(sid),
+                                    str(op),
+                                    _dumps(before) if before is not None else None,
+                                    _dumps(after) if after is not None else None,
+                                    str(actor or ""),
+                                )
+                                for sid, op, before, after in entries
+                            ],
+                        )
+                        con.execute(f"PRAGMA user_version = {int(rev) + 1};")
+                        rev += 1
+                    con.execute("COMMIT;")
+                except BaseException:
+                    with suppress(Exception):
+                        con.execute("ROLLBACK;")
+                    _cache_pop(self.key)
+                    raise
+                patched = _patched(current, entries) if result is None else result
+                if patched is None:
+                    _cache_pop(self.key)
+                else:
+                    _cache_put(self.key, rev, patched)
+                return rev
+            finally:
+                con.close()
+
+    def replace(
+        self,
+        state: dict[str, Any],
+        *,
+        actor: str = "",
+        op: str = "update",
+        meta: dict[str, str] | None = None,
+    ) -> int:
+        """
+        Store a whole state document, writing only the segment rows that differ.
+        """
+
+        def _fn(con: sqlite3.Connection, current: dict[str, Any], _rev: int) -> list[tuple]:
+            old = {_seg_id(s): s for s in current.get("segments") or []}
+            old_ord = [_seg_id(s) for s in current.get("segments") or []]
+            new_segs = [s for s in state.get("segments") or [] if isinstance(s, dict)]
+            new_ord = [_seg_id(s) for s in new_segs]
+            entries: list[tuple] = []
+            reorder = new_ord != [i for i in old_ord if i in set(new_ord)]
+            for i, seg in enumerate(new_segs):
+                sid = _seg_id(seg)
+                before = old.get(sid)
+                if before == seg and not reorder:
+                    continue
+                con.execute(
+                    "INSERT OR REPLACE INTO segments(segment_id, ord, data_json) VALUES(?, ?, ?);",
+                    (sid, i, _dumps(seg)),
+                )
+                if before != seg:
+                    entries.append((sid, op if before is not None else "insert", before, seg))
+            for sid in set(old) - set(new_ord):
+                con.execute("DELETE FROM segments WHERE segment_id=?;", (sid,))
+                entries.append((sid, "delete", old[sid], None))
+            doc = {k: v for k, v in state.items() if k != "segments"}
+            cur_doc = {k: v for k, v in current.items() if k != "segments"}
+            if doc != cur_doc:
+                con.execute(
+                    "INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?);", (_DOC_KEY, _dumps(doc))
+                )
+                entries.append((0, "job", cur_doc, doc))
+            if op == "import" and entries:
+                # A bulk (re)import is one journal entry, not one per row.
+                return [(0, "import", None, {"segments": len(new_segs)})]
+            return entries
+
+        return self._write(_fn, actor=actor, meta=meta, result=copy_state(state))
+
+    def update_segments(
+        self,
+        mutations: dict[int, Callable[[dict[str, Any]], None]],
+        *,
+        op: str,
+        actor: str = "",
+    ) -> dict[int, dict[str, Any]]:
+        """
+        Apply per-segment mutations atomically (all or nothing); only those rows are written.
+        A mutation may raise to abort the whole batch.
+        """
+        out: dict[int, dict[str, Any]] = {}
+
+        def _fn(con: sqlite3.Connection, _current: dict[str, Any], _rev: int) -> list[tuple]:
+            entries: list[tuple] = []
+            for sid, mutate in mutations.items():
+                row = con.execute(
+                    "SELECT data_json FROM segments WHERE segment_id=?;", (int(sid),)
+                ).fetchone()
+                if row is None:
+                    raise SegmentNotFound(f"segment_id {sid} not found")
+                before = json.loads(str(row["data_json"]))
+                seg = dict(before)
+                mutate(seg)
+                out[int(sid)] = seg
+                if seg == before:
+                    continue
+                con.execute(
+                    "UPDATE segments SET data_json=? WHERE segment_id=?;", (_dumps(seg), int(sid))
+                )
+                entries.append((int(sid), op, before, seg))
+            return entries
+
+        self._write(_fn, actor=actor)
+        return out
+
+    def journal(self, *, since: int = 0, limit: int = 500) -> list[dict[str, Any]]:
+        if not self.exists():
+            return []
+        con = self._conn()
+        try:
+            rows = con.execute(
+                "SELECT * FROM journal WHERE seq > ? ORDER BY seq LIMIT ?;",
+                (int(since), max(1, int(limit))),
+            ).fetchall()
+        finally:
+            con.close()
+        out = []
+        for r in rows:
+            d = dict(r)
+            for k in ("before_json", "after_json"):
+                raw = d.pop(k)
+                d[k[: -len("_json")]] = json.loads(raw) if raw else None
+            out.append(d)
+        return out
+
+    def undo(self, *, segment_id: int | None = None, actor: str = "") -> dict[str, Any] | None:
+        """
+        Revert the newest segment edit (optionally of one segment) that is not itself undone.
+        Returns the journal entry that was reverted, or None.
+        """
+        undone: dict[str, Any] = {}
+
+        def _fn(con: sqlite3.Connection, _current: dict[str, Any], _rev: int) -> list[tuple]:
+            q = (
+                "SELECT * FROM journal j WHERE j.segment_id > 0 AND j.op NOT LIKE 'undo%' "
+                "AND NOT EXISTS (SELECT 1 FROM journal u WHERE u.op = 'undo:' || j.seq) "
+            )
+            args: tuple = ()
+            if segment_id is not None:
+                q += "AND j.segment_id = ? "
+                args = (int(segment_id),)
+            row = con.execute(q + "ORDER BY j.seq DESC LIMIT 1;", args).fetchone()
+            if row is None:
+                return []
+            sid = int(row["segment_id"])
+            cur = con.execute(
+                "SELECT ord, data_json FROM segments WHERE segment_id=?;", (sid,)
+            ).fetchone()
+            before = json.loads(row["before_json"]) if row["before_json"] else None
+            current = json.loads(str(cur["data_json"])) if cur else None
+            if before is None:
+                con.execute("DELETE FROM segments WHERE segment_id=?;", (sid,))
+            else:
+                ord_ = int(cur["ord"]) if cur else sid
+                con.execute(
+                    "INSERT OR REPLACE INTO segments(segment_id, ord, data_json) VALUES(?, ?, ?);",
+                    (sid, ord_, _dumps(before)),
+                )
+            undone.update({"seq": int(row["seq"]), "segment_id": sid, "op": str(row["op"])})
+            return [(sid, f"undo:{int(row['seq'])}", current, before)]
+
+        self._write(_fn, actor=actor)
+        return undone or None
+
+
+def _patched(current: dict[str, Any], entries: list[tuple]) -> dict[str, Any] | None:
+    out = dict(current)
+    segs = list(current.get("segments") or [])
+    pos = {_seg_id(s): i for i, s in enumerate(segs)}
+    for sid, _op, _before, after in entries:
+        if int(sid) == 0:
+            out = {**dict(after or {}), "segments": segs}
+        elif int(sid) not in pos or after is None:
+            return None
+        else:
+            segs[pos[int(sid)]] = after
+    out["segments"] = segs
+    return out
+
+
+def drop_cache(job_dir: Path | None = None) -> None:
+    """
+    Forget cached state (all jobs, or one job dir). Job deletion calls this so a removed job
+    leaves nothing resident.
+    """
+    if job_dir is None:
+        with _CACHE_GUARD:
+            _CACHE.clear()
+        return
+    key = str((Path(job_dir) / "review" / REVIEW_DB_NAME).resolve())
+    _cache_pop(key)
+    with _LOCKS_GUARD:
+        _LOCKS.pop(key, None)
@@ -0,0 +1,598 @@
+"""
+Warm single-segment synthesis for the interactive review loop.
+
+`regen_segment` used to write a one-line translated.json and run the whole TTS stage for it
+(voice map parsing, voice memory setup, delivery profile loading, manifests, checkpoints). A
+`SynthSession` keeps those inputs resident per job and shares one engine per process, with XTTS
+speaker conditioning latents cached per reference WAV, so a regen only pays for the
+synthesis itself.
+
+- identical requests (same segment, text, voice and timing) are coalesced: concurrent callers
+  wait on the same synthesis and recent results are reused
+- `stream()` yields 16 kHz PCM as XTTS generates it (engine streaming API); the final clip is
+  the timing-fitted version written once generation completes
+- anything the warm path cannot do raises `SynthUnavailable`, and callers fall back to the TTS
+  stage (which carries the basic/espeak/silence fallbacks). That includes jobs with voice memory,
+  the dub director or expressive mode enabled, which shape delivery per segment in the stage
+- speaker refs the stage resolved from job-level sources (series character refs, voice profiles)
+  are reused from its tts_manifest.json speaker report
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import queue
+import threading
+import time
+import wave
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.review.overrides import load_overrides, overrides_path
+from dubbing_pipeline.review.state import load_state, review_dir
+from dubbing_pipeline.utils.io import atomic_copy, read_json
+from dubbing_pipeline.utils.log import logger
+
+SR = 16000
+_RECENT_MAX = 64
+
+
+class SynthUnavailable(RuntimeError):
+    """The warm path cannot serve this request; use the TTS stage instead."""
+
+
+_ENGINE_LOCK = threading.Lock()
+_ENGINE: Any | None = None
+_ENGINE_ERR: str | None = None
+
+
+def shared_engine() -> Any:
+    """
+    Process-wide TTS engine for review sessions (model weights stay in ModelManager).
+    """
+    global _ENGINE, _ENGINE_ERR
+    with _ENGINE_LOCK:
+        if _ENGINE is None and _ENGINE_ERR is None:
+            try:
+                from dubbing_pipeline.stages.tts_engine import CoquiXTTS
+
+                _ENGINE = CoquiXTTS()
+            except Exception as ex:
+                _ENGINE_ERR = str(ex)
+        if _ENGINE is None:
+            raise SynthUnavailable(f"TTS engine unavailable: {_ENGINE_ERR}")
+        return _ENGINE
+
+
+def _to_pcm16(samples: Any, sr: int) -> bytes:
+    import numpy as np  # type: ignore
+
+    y = np.asarray(samples, dtype=np.float32).reshape(-1)
+    if sr != SR and y.size:
+        n = max(1, int(round(y.size * SR / float(sr))))
+        y = np.interp(np.arange(n) * (sr / float(SR)), np.arange(y.size), y).astype(np.float32)
+    return (np.clip(y, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def _write_pcm16(path: Path, pcm: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(pcm)
+    return path
+
+
+def _is_pcm16k(path: Path) -> bool:
+    try:
+        with wave.open(str(path), "rb") as wf:
+            return wf.getnchannels() == 1 and wf.getsampwidth() == 2 and wf.getframerate() == SR
+    except Exception:
+        return False
+
+
+def wav_stream_header(*, sr: int = SR) -> bytes:
+    """
+    RIFF header for a 16-bit mono WAV of unknown length (streamed to the browser).
+    """
+    import struct
+
+    size = 0xFFFFFFFF
+    return (
+        b"RIFF"
+        + struct.pack("<I", size)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, 1, sr, sr * 2, 2, 16)
+        + b"data"
+        + struct.pack("<I", size)
+    )
+
+
+class SynthSession:
+    """
+    Resident synthesizer for one job's review loop.
+
+    Job-level inputs (voice maps, refs, delivery profiles, speaker overrides, pronunciations,
+    pacing params) are loaded once and reloaded only when one of their files changes.
+    """
+
+    def __init__(self, job_dir: Path, *, engine: Any | None = None) -> None:
+        self.job_dir = Path(job_dir).resolve()
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._gen_lock = threading.Lock()  # one synthesis at a time per session
+        self._inflight: dict[str, Future] = {}
+        self._recent: OrderedDict[str, Path] = OrderedDict()
+        self._fingerprint: tuple = ()
+        self._pron_raw: tuple[Any, Any] = (None, None)
+        self.pron_global: list[Any] = []
+        self.pron_overrides: dict[int, list[Any]] = {}
+        self.last_used = time.monotonic()
+        self.cache_dir = review_dir(self.job_dir) / "tmp" / "warm"
+        self._load()
+
+    # ---- job inputs ----
+    def _input_paths(self) -> list[Path]:
+        s = get_settings()
+        # Review state is not tracked: regen rewrites it on every call and only its
+        # pipeline_params snapshot (fixed at init) is read here.
+        paths = [
+            overrides_path(self.job_dir),
+            self.job_dir / "analysis" / "delivery_profiles.json",
+        ]
+        for p in (s.voice_map_json, s.voice_bank_map_path or s.voice_map_path):
+            if p:
+                paths.append(Path(p))
+        with suppress(Exception):
+            from dubbing_pipeline.qa.scoring import find_latest_tts_manifest_path
+
+            mp = find_latest_tts_manifest_path(self.job_dir)
+            if mp is not None:
+                paths.append(mp)
+        return paths
+
+    def _stat_fingerprint(self) -> tuple:
+        out = []
+        for p in self._input_paths():
+            try:
+                st = p.stat()
+                out.append((str(p), int(st.st_mtime_ns), int(st.st_size)))
+            except Exception:
+                out.append((str(p), 0, 0))
+        return tuple(out)
+
+    def _load(self) -> None:
+        from dubbing_pipeline.stages.tts_impl import load_voice_bank_map, load_voice_map_items
+
+        s = get_settings()
+        st = load_state(self.job_dir)
+        params = dict((st.get("job") or {}).get("pipeline_params") or {})
+        self.lang = str(params.get("tts_lang") or s.tts_lang or "en")
+        self.default_speaker = str(params.get("tts_speaker") or s.tts_speaker or "default")
+        wp = str(params.get("tts_speaker_wav") or s.tts_speaker_wav or "")
+        self.default_wav = Path(wp) if wp else None
+        vm = str(s.voice_mode or "clone").strip().lower()
+        self.voice_mode = vm if vm in {"clone", "preset", "single"} else "clone"
+        self.voice_map = load_voice_bank_map()
+        (
+            self.wav_override,
+            self.preset_override,
+            self.speaker_mode,
+            self.keep_original,
+        ) = load_voice_map_items(Path(s.voice_map_json) if s.voice_map_json else None)
+        ref_dir = s.voice_ref_dir
+        if not ref_dir:
+            refs = self.job_dir / "analysis" / "voice_refs"
+            ref_dir = refs if refs.exists() else None
+        self.voice_ref_dir = Path(ref_dir).expanduser() if ref_dir else None
+
+        self.delivery: dict[str, dict[str, Any]] = {}
+        with suppress(Exception):
+            dpx = read_json(self.job_dir / "analysis" / "delivery_profiles.json", default={})
+            chars = dpx.get("characters") if isinstance(dpx, dict) else None
+            if isinstance(chars, dict):
+                self.delivery = {str(k): dict(v) for k, v in chars.items() if isinstance(v, dict)}
+
+        self.speaker_overrides: dict[str, str] = {}
+        with suppress(Exception):
+            ov = load_overrides(self.job_dir)
+            sp = ov.get("speaker_overrides", {}) if isinstance(ov, dict) else {}
+            if isinstance(sp, dict):
+                self.speaker_overrides = {str(k): str(v) for k, v in sp.items() if str(v).strip()}
+
+        self.pacing = bool(params.get("pacing", s.pacing))
+        self.pacing_min = float(params.get("pacing_min_ratio", s.pacing_min_ratio))
+        self.pacing_max = float(params.get("pacing_max_ratio", s.pacing_max_ratio))
+        self.tolerance = float(params.get("timing_tolerance", s.timing_tolerance))
+        self.max_stretch = float(getattr(s, "max_stretch", 0.15))
+
+        # Per-segment features of the TTS stage this session does not reproduce.
+        self.unsupported: list[str] = []
+        if bool(params.get("voice_memory", getattr(s, "voice_memory", False))):
+            self.unsupported.append("voice_memory")
+        if bool(params.get("director", getattr(s, "director", False))):
+            self.unsupported.append("director")
+        if str(getattr(s, "expressive", "off") or "off").strip().lower() != "off":
+            self.unsupported.append("expressive")
+
+        # speaker -> refs the stage cloned from (covers refs resolved from job runtime data).
+        self.stage_refs: dict[str, list[str]] = {}
+        with suppress(Exception):
+            from dubbing_pipeline.qa.scoring import find_latest_tts_manifest_path
+
+            mp = find_latest_tts_manifest_path(self.job_dir)
+            man = read_json(mp, default={}) if mp is not None else {}
+            rep = man.get("speaker_report") if isinstance(man, dict) else None
+            if isinstance(rep, dict):
+                for spk, r in rep.items():
+                    refs = r.get("refs_used") if isinstance(r, dict) else None
+                    if isinstance(refs, list) and refs:
+                        self.stage_refs[str(spk)] = [str(x) for x in refs]
+        self._fingerprint = self._stat_fingerprint()
+
+    def refresh(self) -> None:
+        """Reload job inputs if any of their files changed since the last load."""
+        if self._stat_fingerprint() != self._fingerprint:
+            with self._lock:
+                self._load()
+
+    def set_pronunciations(self, entries: Any, overrides: Any) -> None:
+        if (entries, overrides) == self._pron_raw:
+            return
+        from dubbing_pipeline.stages.tts_impl import load_pronunciations
+
+        self.pron_global, self.pron_overrides = load_pronunciations(entries, overrides)
+        self._pron_raw = (entries, overrides)
+
+    @property
+    def engine(self) -> Any:
+        if self._engine is None:
+            self._engine = shared_engine()
+        return self._engine
+
+    # ---- request planning ----
+    def plan(self, seg: dict[str, Any]) -> dict[str, Any]:
+        if self.unsupported:
+            raise SynthUnavailable(f"warm path does not support {', '.join(self.unsupported)}")
+        sid = int(seg.get("segment_id") or 0)
+        start = float(seg.get("start", 0.0))
+        end = float(seg.get("end", 0.0))
+        text = str(seg.get("chosen_text") or "").strip()
+        forced = self.speaker_overrides.get(str(sid))
+        speaker = str(forced or seg.get("speaker") or self.default_speaker or "default")
+        if self.voice_mode == "single":
+            speaker = self.default_speaker
+
+        delivery = self.delivery.get(speaker, {})
+        speed = 1.0
+        with suppress(Exception):
+            if str(delivery.get("rate_mul") or "").strip():
+                speed = float(delivery["rate_mul"])
+        mode = self.voice_mode
+        pref = str(delivery.get("preferred_voice_mode") or "").strip().lower()
+        if pref in {"clone", "preset", "single"}:
+            mode = pref
+        mode = self.speaker_mode.get(speaker, mode)
+        if speaker in self.keep_original:
+            mode = "original"
+
+        tts_text = text
+        if text and (self.pron_global or self.pron_overrides):
+            with suppress(Exception):
+                from dubbing_pipeline.text.pronunciation import apply_pronunciation
+
+                entries = list(self.pron_global) + list(self.pron_overrides.get(sid, []))
+                if entries:
+                    tts_text, _warn = apply_pronunciation(text, entries, provider="xtts")
+
+        ref = self._ref_for(speaker) if mode == "clone" else None
+        preset = None
+        if ref is None and mode in {"clone", "preset", "single"}:
+            preset = str(
+                self.preset_override.get(speaker)
+                or self.voice_map.get(speaker)
+                or self.default_speaker
+                or "default"
+            )
+        ref_sig = ""
+        if ref is not None:
+            with suppress(Exception):
+                ref_sig = f"{ref}:{ref.stat().st_mtime_ns}"
+        plan = {
+            "segment_id": sid,
+            "text": tts_text,
+            "speaker": speaker,
+            "mode": mode,
+            "ref": ref,
+            "preset": preset,
+            "speed": speed,
+            "duration_s": max(0.05, end - start),
+        }
+        raw = json.dumps(
+            [
+                self.lang,
+                sid,
+                tts_text,
+                mode,
+                ref_sig,
+                preset,
+                speed,
+                round(end - start, 4),
+                self.pacing,
+            ],
+            sort_keys=True,
+        )
+        plan["key"] = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+        return plan
+
+    def _ref_for(self, speaker: str) -> Path | None:
+        p = self.wav_override.get(speaker)
+        if p is not None and p.exists():
+            return p
+        used = self.stage_refs.get(speaker)
+        if used:
+            if len(used) == 1 and Path(used[0]).is_file():
+                return Path(used[0])
+            raise SynthUnavailable(f"stage reference for speaker {speaker} is not reusable")
+        if self.voice_ref_dir is not None:
+            base = self.voice_ref_dir
+            for c in (base / f"{speaker}.wav", base / speaker / "ref.wav"):
+                if c.is_file():
+                    return c
+        if self.default_wav is not None and self.default_wav.exists():
+            return self.default_wav
+        return None
+
+    # ---- synthesis ----
+    def _fit(self, clip: Path, target_s: float) -> Path:
+        """Timing fit with the same helpers (and params) as the TTS stage."""
+        if self.pacing:
+            with suppress(Exception):
+                from dubbing_pipeline.timing.pacing import (
+                    measure_wav_seconds,
+                    pad_or_trim_wav,
+                    time_stretch_wav,
+                )
+
+                actual = measure_wav_seconds(clip)
+                if actual > target_s * (1.0 + self.tolerance):
+                    ratio = max(self.pacing_min, min(self.pacing_max, actual / target_s))
+                    clip = time_stretch_wav(
+                        clip,
+                        clip.with_suffix(".pacing.stretch.wav"),
+                        ratio,
+                        min_ratio=self.pacing_min,
+                        max_ratio=self.pacing_max,
+                        timeout_s=120,
+                    )
+                    actual = measure_wav_seconds(clip)
+                if abs(actual - target_s) > target_s * self.tolerance:
+                    clip = pad_or_trim_wav(
+                        clip, clip.with_suffix(".pacing.fit.wav"), target_s, timeout_s=120
+                    )
+            return clip
+        with suppress(Exception):
+            from dubbing_pipeline.stages.align import retime_tts
+
+            clip = retime_tts(clip, target_duration_s=target_s, max_stretch=self.max_stretch)
+        return clip
+
+    def _finish(self, plan: dict[str, Any], raw16k: Path) -> Path:
+        clip = self._fit(raw16k, float(plan["duration_s"]))
+        out = self.cache_dir / f"{plan['key']}.wav"
+        if Path(clip) != out:
+            atomic_copy(Path(clip), out)
+        return out
+
+    def _silence(self, plan: dict[str, Any]) -> Path:
+        n = int(float(plan["duration_s"]) * SR)
+        return _write_pcm16(self.cache_dir / f"{plan['key']}.wav", b"\x00\x00" * n)
+
+    def _render(self, plan: dict[str, Any]) -> Path:
+        if plan["mode"] == "original" or not plan["text"]:
+            return self._silence(plan)
+        raw = self.cache_dir / f"{plan['key']}.raw.wav"
+        raw.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with self._gen_lock:
+                self.engine.synthesize(
+                    plan["text"],
+                    language=self.lang,
+                    speaker_wav=plan["ref"],
+                    speaker_id=plan["preset"],
+                    speed=plan["speed"] if plan["speed"] != 1.0 else None,
+                    out_path=raw,
+                )
+        except SynthUnavailable:
+            raise
+        except Exception as ex:
+            raise SynthUnavailable(f"warm synthesis failed: {ex}") from ex
+        if not _is_pcm16k(raw):
+            from dubbing_pipeline.stages.tts_impl import _ffmpeg_to_pcm16k
+
+            norm = raw.with_suffix(".16k.wav")
+            try:
+                _ffmpeg_to_pcm16k(raw, norm)
+            except Exception as ex:
+                raise SynthUnavailable(f"clip normalization failed: {ex}") from ex
+            raw = norm
+        return self._finish(plan, raw)
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """(future, owner): owner must produce the result; others just wait on it."""
+        with self._lock:
+            self.last_used = time.monotonic()
+            hit = self._recent.get(key)
+            if hit is not None and hit.exists():
+                self._recent.move_to_end(key)
+                fut: Future = Future()
+                fut.set_result(hit)
+                return fut, False
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            return fut, True
+
+    def _settle(self, key: str, fut: Future, *, result: Path | None, error: BaseException | None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if result is not None:
+                self._recent[key] = result
+                while len(self._recent) > _RECENT_MAX:
+                    self._recent.popitem(last=False)
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    def synthesize(self, seg: dict[str, Any], *, timeout_s: float = 600.0) -> Path:
+        """
+        Produce the (timing-fitted, 16 kHz mono) clip for a review segment.
+        Identical concurrent requests share one synthesis.
+        """
+        plan = self.plan(seg)
+        fut, owner = self._claim(plan["key"])
+        if not owner:
+            return fut.result(timeout=timeout_s)
+        t0 = time.perf_counter()
+        try:
+            out = self._render(plan)
+        except BaseException as ex:
+            self._settle(plan["key"], fut, result=None, error=ex)
+            raise
+        self._settle(plan["key"], fut, result=out, error=None)
+        logger.info(
+            "review_synth_done",
+            segment_id=plan["segment_id"],
+            seconds=round(time.perf_counter() - t0, 3),
+        )
+        return out
+
+    def stream(self, seg: dict[str, Any], *, result: list[Path] | None = None) -> Iterator[bytes]:
+        """
+        Yield 16 kHz pcm_s16le chunks as they are generated. The fitted clip (also used by later
+        identical requests) is appended to `result` once generation finishes.
+        """
+        plan = self.plan(seg)
+        fut, owner = self._claim(plan["key"])
+        engine = None
+        if owner and plan["mode"] != "original" and plan["text"]:
+            with suppress(Exception):
+                engine = self.engine
+        can_stream = bool(engine is not None and getattr(engine, "can_stream", lambda: False)())
+        if not can_stream:
+            if owner:
+                try:
+                    out = self._render(plan)
+                except BaseException as ex:
+                    self._settle(plan["key"], fut, result=None, error=ex)
+                    raise
+                self._settle(plan["key"], fut, result=out, error=None)
+            else:
+                out = fut.result(timeout=600.0)
+            if result is not None:
+                result.append(out)
+            with wave.open(str(out), "rb") as wf:
+                while True:
+                    b = wf.readframes(SR // 4)
+                    if not b:
+                        break
+                    yield b
+            return
+
+        import numpy as np  # type: ignore
+
+        t0 = time.perf_counter()
+        chunks: queue.SimpleQueue = queue.SimpleQueue()
+
+        def _produce() -> None:
+            # Generation holds _gen_lock but never waits on the client: chunks are queued, and a
+            # slow (or gone) reader does not stall other syntheses for this session.
+            parts: list[Any] = []
+            native_sr = SR
+            try:
+                with self._gen_lock:
+                    first = True
+                    for chunk, sr in engine.synthesize_stream(
+                        plan["text"],
+                        language=self.lang,
+                        speaker_wav=plan["ref"],
+                        speaker_id=plan["preset"],
+                        speed=plan["speed"],
+                    ):
+                        if first:
+                            logger.info(
+                                "review_synth_first_audio",
+                                segment_id=plan["segment_id"],
+                                seconds=round(time.perf_counter() - t0, 3),
+                            )
+                            first = False
+                        native_sr = int(sr)
+                        parts.append(chunk)
+                        chunks.put(_to_pcm16(chunk, native_sr))
+                y = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+                raw = _write_pcm16(
+                    self.cache_dir / f"{plan['key']}.raw.wav", _to_pcm16(y, native_sr)
+                )
+                out = self._finish(plan, raw)
+            except BaseException as ex:
+                err = ex if isinstance(ex, SynthUnavailable) else SynthUnavailable(str(ex))
+                self._settle(plan["key"], fut, result=None, error=err)
+                chunks.put(err)
+                return
+            self._settle(plan["key"], fut, result=out, error=None)
+            chunks.put(out)
+
+        threading.Thread(
+            target=_produce, name=f"review-synth-{plan['segment_id']}", daemon=True
+        ).start()
+        while True:
+            item = chunks.get()
+            if isinstance(item, BaseException):
+                raise item
+            if isinstance(item, Path):
+                if result is not None:
+                    result.append(item)
+                return
+            yield item
+
+
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS: OrderedDict[str, SynthSession] = OrderedDict()
+
+
+def get_session(job_dir: Path, *, engine: Any | None = None) -> SynthSession:
+    """
+    Resident session for a job (LRU, bounded by REVIEW_SYNTH_SESSIONS, idle-expired).
+    """
+    s = get_settings()
+    key = str(Path(job_dir).resolve())
+    idle_s = float(getattr(s, "review_synth_idle_sec", 900.0) or 900.0)
+    max_n = max(1, int(getattr(s, "review_synth_sessions", 4) or 4))
+    now = time.monotonic()
+    with _SESSIONS_LOCK:
+        for k in [k for k, v in _SESSIONS.items() if now - v.last_used > idle_s]:
+            _SESSIONS.pop(k, None)
+        sess = _SESSIONS.get(key)
+        if sess is None:
+            sess = SynthSession(Path(key), engine=engine)
+            _SESSIONS[key] = sess
+        _SESSIONS.move_to_end(key)
+        while len(_SESSIONS) > max_n:
+            _SESSIONS.popitem(last=False)
+    sess.refresh()
+    return sess
+
+
+def drop_sessions() -> None:
+    with _SESSIONS_LOCK:
+        _SESSIONS.clear()
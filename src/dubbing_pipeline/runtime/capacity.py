@@ -0,0 +1,443 @@
+"""
+Resource budgets for the scheduler.
+
+- `ResourceCost`: CPU cores / RAM / VRAM a unit of stage work needs (or a host offers).
+- `CostModel`: per-(stage, mode, model, device) estimates learned from measured phases, persisted
+  as JSON next to jobs.db. Until a key has measurements, conservative priors are used.
+- `host_budget()`: what this box can give (auto-detected; SCHED_* settings override).
+
+Measurements are best-effort: CPU is thread CPU + reaped child CPU over the phase, RAM is RSS
+growth (or a child's peak RSS), VRAM is torch's peak allocation when torch+CUDA are loaded.
+Phase bodies that run in a watchdog child measure themselves there (whole-process CPU, peak RSS
+and VRAM) and hand the numbers back via `record_child_usage`. Reaped-child CPU, RSS and the CUDA
+peak are process-wide, so a phase that overlapped another in-process phase only keeps what its
+children reported (and is not recorded without such reports). A RAM/VRAM reading of 0 means
+"not measured" and never replaces an estimate.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.utils.log import logger
+
+PHASES = ("audio", "transcribe", "tts", "mux")
+COSTS_FILENAME = "sched_costs.json"
+
+# Mode -> Whisper model, as chosen by modes.resolve_effective_settings (GPU case for high).
+ASR_MODEL_BY_MODE = {"high": "large-v3", "medium": "medium", "low": "small"}
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceCost:
+    cpu: float = 0.0
+    ram_mb: float = 0.0
+    vram_mb: float = 0.0
+
+    def __add__(self, other: ResourceCost) -> ResourceCost:
+        return ResourceCost(
+            self.cpu + other.cpu, self.ram_mb + other.ram_mb, self.vram_mb + other.vram_mb
+        )
+
+    def __sub__(self, other: ResourceCost) -> ResourceCost:
+        return ResourceCost(
+            max(0.0, self.cpu - other.cpu),
+            max(0.0, self.ram_mb - other.ram_mb),
+            max(0.0, self.vram_mb - other.vram_mb),
+        )
+
+    def fits(self, free: ResourceCost) -> bool:
+        eps = 1e-6
+        return (
+            self.cpu <= free.cpu + eps
+            and self.ram_mb <= free.ram_mb + eps
+            and self.vram_mb <= free.vram_mb + eps
+        )
+
+    def clamp(self, total: ResourceCost) -> ResourceCost:
+        """
+        Never ask for more than the whole box (a stage must always be able to run alone).
+        """
+        return ResourceCost(
+            min(self.cpu, total.cpu),
+            min(self.ram_mb, total.ram_mb),
+            min(self.vram_mb, total.vram_mb),
+        )
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "cpu": round(self.cpu, 3),
+            "ram_mb": round(self.ram_mb, 1),
+            "vram_mb": round(self.vram_mb, 1),
+        }
+
+
+# Conservative priors (medium mode); scaled by _MODE_SCALE. VRAM only applies on cuda.
+_PRIOR_COST = {
+    "audio": ResourceCost(cpu=1.0, ram_mb=256.0),
+    "transcribe": ResourceCost(cpu=4.0, ram_mb=3000.0, vram_mb=4000.0),
+    "tts": ResourceCost(cpu=2.0, ram_mb=3000.0, vram_mb=3000.0),
+    "mux": ResourceCost(cpu=2.0, ram_mb=512.0),
+}
+_MODE_SCALE = {"low": 0.5, "medium": 1.0, "high": 1.75}
+# Wall seconds per media second (cpu); used for shortest-expected-job-first before history.
+_PRIOR_RATE = {"audio": 0.02, "transcribe": 0.6, "tts": 0.8, "mux": 0.05}
+
+
+def read_meminfo() -> dict[str, int]:
+    """
+    Total/available RAM in MiB from /proc/meminfo (Linux). Empty dict elsewhere.
+    """
+    out: dict[str, int] = {}
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in {"MemTotal", "MemAvailable"}:
+                    out[key] = int(rest.strip().split()[0]) // 1024
+    except Exception:
+        return {}
+    return {"ram_total_mb": out.get("MemTotal", 0), "ram_free_mb": out.get("MemAvailable", 0)}
+
+
+def read_gpus() -> list[dict[str, Any]]:
+    """
+    Per-GPU name/VRAM via nvidia-smi (best-effort; [] when unavailable).
+    """
+    try:
+        raw = subprocess.check_output(
+            [
+                "nvidia-smi",
+                "--query-gpu=index,name,memory.total,memory.free",
+                "--format=csv,noheader,nounits",
+            ],
+            stderr=subprocess.DEVNULL,
+            timeout=1.5,
+        ).decode("utf-8", errors="replace")
+    except Exception:
+        return []
+    gpus: list[dict[str, Any]] = []
+    for line in raw.splitlines():
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) < 4:
+            continue
+        try:
+            gpus.append(
+                {
+                    "index": int(parts[0]),
+                    "name": parts[1],
+                    "vram_total_mb": int(float(parts[2])),
+                    "vram_free_mb": int(float(parts[3])),
+                }
+            )
+        except Exception:
+            continue
+    return gpus
+
+
+def host_budget() -> ResourceCost:
+    """
+    Schedulable resources of this host: SCHED_CPU_CORES / SCHED_RAM_MB / SCHED_VRAM_MB when set,
+    else all cores, 85% of RAM and 90% of total GPU memory.
+    """
+    s = get_settings()
+    cpu = float(getattr(s, "sched_cpu_cores", 0) or 0) or float(os.cpu_count() or 1)
+    ram = float(getattr(s, "sched_ram_mb", 0) or 0)
+    if ram <= 0:
+        ram = float(read_meminfo().get("ram_total_mb", 0)) * 0.85 or 4096.0
+    vram = float(getattr(s, "sched_vram_mb", 0) or 0)
+    if vram <= 0:
+        vram = 0.9 * float(sum(int(g.get("vram_total_mb") or 0) for g in read_gpus()))
+    return ResourceCost(cpu=max(1.0, cpu), ram_mb=max(256.0, ram), vram_mb=max(0.0, vram))
+
+
+def _key(stage: str, mode: str, model: str, device: str) -> str:
+    return "|".join(
+        [
+            str(stage or ""),
+            str(mode or "medium").lower(),
+            str(model or "*"),
+            "cuda" if str(device or "").lower().startswith("cuda") else "cpu",
+        ]
+    )
+
+
+class CostModel:
+    """
+    Learned per-(stage, mode, model, device) resource costs.
+
+    CPU cores and throughput (wall s per media s) are EWMAs; RAM/VRAM use a decaying max so one
+    large observation is honored immediately and forgotten only slowly. Every observation also
+    updates the model-agnostic `stage|mode|*|device` entry used when the model is unknown.
+    """
+
+    def __init__(self, path: Path | None = None, *, alpha: float = 0.3) -> None:
+        self.path = Path(path) if path is not None else None
+        self.alpha = float(alpha)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        if self.path is not None and self.path.exists():
+            with suppress(Exception):
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(data, dict):
+                    self._stats = {
+                        str(k): {str(a): float(b) for a, b in v.items()}
+                        for k, v in dict(data.get("costs") or {}).items()
+                        if isinstance(v, dict)
+                    }
+
+    def _lookup(self, stage: str, mode: str, model: str, device: str) -> dict[str, float] | None:
+        with self._lock:
+            st = self._stats.get(_key(stage, mode, model, device))
+            if st is None and model:
+                st = self._stats.get(_key(stage, mode, "", device))
+            return dict(st) if st else None
+
+    def estimate(
+        self, stage: str, *, mode: str = "medium", model: str = "", device: str = "cpu"
+    ) -> ResourceCost:
+        prior = _PRIOR_COST.get(str(stage), ResourceCost(cpu=1.0, ram_mb=512.0))
+        k = _MODE_SCALE.get(str(mode or "medium").lower(), 1.0)
+        cuda = str(device or "").lower().startswith("cuda")
+        est = ResourceCost(
+            cpu=prior.cpu * k, ram_mb=prior.ram_mb * k, vram_mb=(prior.vram_mb * k if cuda else 0.0)
+        )
+        st = self._lookup(stage, mode, model, device)
+        if st is None:
+            return est
+        # Resources never measured for this key keep their prior.
+        return ResourceCost(
+            cpu=max(0.1, st.get("cpu", est.cpu)),
+            ram_mb=max(0.0, st.get("ram_mb", est.ram_mb)),
+            vram_mb=max(0.0, st.get("vram_mb", est.vram_mb)),
+        )
+
+    def rate(
+        self, stage: str, *, mode: str = "medium", model: str = "", device: str = "cpu"
+    ) -> float:
+        st = self._lookup(stage, mode, model, device)
+        if st is not None and st.get("rate", 0.0) > 0:
+            return float(st["rate"])
+        r = _PRIOR_RATE.get(str(stage), 0.1) * _MODE_SCALE.get(str(mode or "medium").lower(), 1.0)
+        return r * (0.25 if str(device or "").lower().startswith("cuda") else 1.0)
+
+    def expected_seconds(self, *, mode: str, media_s: float, device: str = "cpu") -> float:
+        """
+        Expected wall time of a whole job (all phases) for `media_s` seconds of input.
+        """
+        media = max(1.0, float(media_s or 0.0))
+        return float(sum(self.rate(p, mode=mode, device=device) * media for p in PHASES))
+
+    def observe(
+        self,
+        stage: str,
+        *,
+        mode: str,
+        model: str = "",
+        device: str = "cpu",
+        wall_s: float,
+        cpu_s: float,
+        ram_mb: float,
+        vram_mb: float = 0.0,
+        media_s: float = 0.0,
+    ) -> None:
+        wall = max(1e-3, float(wall_s))
+        obs = {"cpu": max(0.0, float(cpu_s)) / wall}
+        # Zero RAM/VRAM means the phase could not be measured: keep the prior / learned value.
+        if float(ram_mb) > 0:
+            obs["ram_mb"] = float(ram_mb)
+        if float(vram_mb) > 0:
+            obs["vram_mb"] = float(vram_mb)
+        if media_s and media_s > 0:
+            obs["rate"] = wall / float(media_s)
+        keys = {_key(stage, mode, model, device), _key(stage, mode, "", device)}
+        a = self.alpha
+        with self._lock:
+            for k in keys:
+                st = self._stats.setdefault(k, {"n": 0.0})
+                first = st["n"] <= 0
+                for name, v in obs.items():
+                    old = st.get(name)
+                    if first or old is None:
+                        st[name] = v
+                    elif name in {"ram_mb", "vram_mb"}:
+                        st[name] = max(v, (1.0 - a / 3.0) * old + (a / 3.0) * v)
+                    else:
+                        st[name] = (1.0 - a) * old + a * v
+                st["n"] += 1.0
+            self._dirty = True
+        if time.monotonic() - self._saved_at > 30.0:
+            self.save()
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        from dubbing_pipeline.utils.io import atomic_write_text
+
+        data = {"version": 1, "costs": self.snapshot()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.path, json.dumps(data, indent=2, sort_keys=True))
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except Exception as ex:
+            logger.warning("sched_costs_save_failed", error=str(ex))
+
+
+def default_costs_path() -> Path:
+    s = get_settings()
+    out_root = Path(s.output_dir).resolve()
+    state_root = Path(getattr(s, "state_dir", None) or (out_root / "_state")).resolve()
+    return state_root / COSTS_FILENAME
+
+
+# Usage reported by watchdog children of the phase being metered on this context.
+_child_usage: ContextVar[list[dict[str, float]] | None] = ContextVar(
+    "phase_child_usage", default=None
+)
+
+
+def record_child_usage(usage: dict[str, float]) -> None:
+    """
+    Attach a child process's measurement (PhaseMeter(process=True).finish()) to the phase
+    currently metered by the caller, if any.
+    """
+    sink = _child_usage.get()
+    if sink is not None:
+        sink.append(dict(usage))
+
+
+class PhaseMeter:
+    """
+    Measures one phase on the calling thread (thread CPU + reaped children, RSS growth, VRAM).
+
+    `process=True` is for a process that exists only to run the phase (watchdog child): it
+    counts the whole process's CPU and its peak RSS. `shared=True` means other phases already run
+    in this process, so the process-wide CUDA peak counter is left alone.
+    """
+
+    def __init__(self, *, process: bool = False, shared: bool = False) -> None:
+        self._process = bool(process)
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time() if self._process else time.thread_time()
+        self._child0, self._child_rss0 = _children_usage()
+        self._rss0 = _rss_mb()
+        self._vram0 = _cuda_allocated_mb(reset_peak=not shared)
+        self._reported: list[dict[str, float]] = []
+        self._token = None if self._process else _child_usage.set(self._reported)
+
+    def finish(self, *, shared: bool = False) -> dict[str, float] | None:
+        """
+        `shared=True`: other in-process phases overlapped this one, so the process-wide readings
+        are not ours. Only thread CPU and what watchdog children reported count then; None when
+        no child reported anything.
+        """
+        if self._token is not None:
+            with suppress(ValueError):
+                _child_usage.reset(self._token)
+            self._token = None
+        wall = max(1e-3, time.perf_counter() - self._t0)
+        if shared:
+            if not self._reported:
+                return None
+            return {
+                "wall_s": wall,
+                "cpu_s": max(0.0, time.thread_time() - self._cpu0)
+                + sum(float(u.get("cpu_s") or 0.0) for u in self._reported),
+                "ram_mb": max(float(u.get("ram_mb") or 0.0) for u in self._reported),
+                "vram_mb": max(float(u.get("vram_mb") or 0.0) for u in self._reported),
+            }
+        child, child_rss = _children_usage()
+        ram = max(0.0, _rss_mb() - self._rss0)
+        if child_rss > self._child_rss0:
+            ram = max(ram, child_rss)
+        if self._process:
+            ram = max(ram, _peak_rss_mb() - self._rss0)
+        # torch loaded during the phase: its peak is all ours (or an overestimate).
+        vram = max(0.0, (_cuda_peak_mb() or 0.0) - (self._vram0 or 0.0))
+        cpu = time.process_time() if self._process else time.thread_time()
+        # Child CPU already reaches us through RUSAGE_CHILDREN; take only RAM/VRAM from them.
+        for u in self._reported:
+            ram = max(ram, float(u.get("ram_mb") or 0.0))
+            vram = max(vram, float(u.get("vram_mb") or 0.0))
+        return {
+            "wall_s": wall,
+            "cpu_s": max(0.0, cpu - self._cpu0) + max(0.0, child - self._child0),
+            "ram_mb": ram,
+            "vram_mb": vram,
+        }
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except Exception:
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) / 1024.0
+    except Exception:
+        return 0.0
+
+
+def _children_usage() -> tuple[float, float]:
+    """
+    (cpu seconds, peak RSS MiB) of reaped child processes.
+    """
+    try:
+        import resource
+
+        ch = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return float(ch.ru_utime + ch.ru_stime), float(ch.ru_maxrss) / 1024.0
+    except Exception:
+        return 0.0, 0.0
+
+
+def _cuda_allocated_mb(*, reset_peak: bool = False) -> float | None:
+    # Only when torch is already loaded by a stage; never import it here.
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        if not torch.cuda.is_available():
+            return None
+        if reset_peak:
+            torch.cuda.reset_peak_memory_stats()
+        return float(torch.cuda.memory_allocated()) / (1024.0 * 1024.0)
+    except Exception:
+        return None
+
+
+def _cuda_peak_mb() -> float | None:
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        if not torch.cuda.is_available() or not torch.cuda.is_initialized():
+            return None
+        return float(torch.cuda.max_memory_allocated()) / (1024.0 * 1024.0)
+    except Exception:
+        return None
@@ -292,23 +292,31 @@ async def start_all(app_state: Any) -> None:
         with suppress(Exception):
             await queue_backend.start()
 
+    run_jobs = bool(getattr(app_state, "run_jobs", True))
     q = getattr(app_state, "job_queue", None)
-    if q is not None:
+    if q is not None and run_jobs:
         await q.start()
 
     out_root = getattr(app_state, "output_root", None) or s.output_dir
     interval = float(getattr(s, "work_prune_interval_sec", 300) or 300)
+    # Maintenance loops stay with the web process; dubbing-worker processes set maintenance=False.
+    maintenance = bool(getattr(app_state, "maintenance", True))
     await st.open()
-    with suppress(Exception):
-        periodic_prune_tick(output_root=Path(out_root))
-    with suppress(Exception):
-        st.create_task(
-            _prune_loop(output_root=str(out_root), interval_s=interval),
-            name="workdir.prune",
-        )
+    if maintenance:
+        with suppress(Exception):
+            periodic_prune_tick(output_root=Path(out_root))
+        with suppress(Exception):
+            st.create_task(
+                _prune_loop(output_root=str(out_root), interval_s=interval),
+                name="workdir.prune",
+            )
     # Retention sweeper (best-effort; safe defaults enabled).
     retention_interval = float(getattr(s, "retention_interval_sec", 0) or 0)
-    if bool(getattr(s, "retention_enabled", False)) and retention_interval > 0:
+    if (
+        maintenance
+        and bool(getattr(s, "retention_enabled", False))
+        and retention_interval > 0
+    ):
         with suppress(Exception):
             from dubbing_pipeline.ops.retention import retention_loop
 
@@ -324,10 +332,11 @@ async def start_all(app_state: Any) -> None:
                     name="retention.sweep",
                 )
 
-    try:
-        ModelManager.instance().prewarm()
-    except Exception as ex:
-        logger.warning("model_prewarm_exception", error=str(ex))
+    if run_jobs:
+        try:
+            ModelManager.instance().prewarm()
+        except Exception as ex:
+            logger.warning("model_prewarm_exception", error=str(ex))
 
     st.started = True
     logger.info("startup end", component="lifecycle")
@@ -9,11 +9,23 @@ from typing import Any
 
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.gates.license import require_coqui_tos
+from dubbing_pipeline.ops.spans import span
 from dubbing_pipeline.runtime.device_allocator import pick_device
 from dubbing_pipeline.utils.log import logger
 from dubbing_pipeline.utils.net import egress_guard
 
 
+def _record(kind: str, result: str, *, resident: int = 0) -> None:
+    # Imported here: ops.metrics pulls in prometheus_client, which the CLI does not need.
+    with suppress(Exception):
+        from dubbing_pipeline.ops.metrics import model_request, model_resident
+
+        if result:
+            model_request(kind, result).inc()
+        if resident:
+            model_resident(kind).inc(resident)
+
+
 @dataclass
 class _Entry:
     kind: str  # whisper|tts
@@ -69,6 +81,7 @@ class ModelManager:
             v = victims.pop(0)
             key = (v.kind, v.model_name, v.device)
             self._cache.pop(key, None)
+            _record(v.kind, "", resident=-1)
             logger.info("model_evicted", kind=v.kind, model=v.model_name, device=v.device)
 
     def _load_whisper(self, model_name: str, device: str) -> Any:
@@ -77,7 +90,7 @@ class ModelManager:
         except Exception as ex:
             raise RuntimeError(f"whisper not installed: {ex}") from ex
         # Respect global egress policy (OFFLINE_MODE etc.)
-        with egress_guard():
+        with span(f"whisper:{model_name}", kind="model_load", device=device), egress_guard():
             return whisper.load_model(model_name, device=device)
 
     def _load_tts(self, model_name: str, device: str) -> Any:
@@ -86,14 +99,15 @@ class ModelManager:
             from TTS.api import TTS  # type: ignore
         except Exception as ex:
             raise RuntimeError(f"Coqui TTS not installed: {ex}") from ex
-        # Coqui downloads models if missing; respect egress guard.
-        with egress_guard():
-            tts = TTS(model_name)
-        # Best-effort: move to GPU if requested and supported.
-        with suppress(Exception):
-            # Some versions support `.to(device)`; others use internal torch modules.
-            if device == "cuda" and hasattr(tts, "to"):
-                tts.to("cuda")
+        with span(f"tts:{model_name}", kind="model_load", device=device):
+            # Coqui downloads models if missing; respect egress guard.
+            with egress_guard():
+                tts = TTS(model_name)
+            # Best-effort: move to GPU if requested and supported.
+            with suppress(Exception):
+                # Some versions support `.to(device)`; others use internal torch modules.
+                if device == "cuda" and hasattr(tts, "to"):
+                    tts.to("cuda")
         return tts
 
     def get_whisper(self, model_name: str, device: str) -> Any:
@@ -103,6 +117,7 @@ class ModelManager:
             if e is not None:
                 e.refcount += 1
                 self._touch(e)
+                _record("whisper", "hit")
                 return e.model
         # Load outside lock (expensive)
         model = self._load_whisper(str(model_name), str(device))
@@ -122,6 +137,7 @@ class ModelManager:
                 last_used=time.monotonic(),
             )
             self._cache[key] = e
+            _record("whisper", "load", resident=1)
             self._evict_if_needed()
             logger.info("model_loaded", kind="whisper", model=str(model_name), device=str(device))
             return model
@@ -133,6 +149,7 @@ class ModelManager:
             if e is not None:
                 e.refcount += 1
                 self._touch(e)
+                _record("tts", "hit")
                 return e.model
         model = self._load_tts(str(model_name), str(device))
         with self._lock:
@@ -150,6 +167,7 @@ class ModelManager:
                 last_used=time.monotonic(),
             )
             self._cache[key] = e
+            _record("tts", "load", resident=1)
             self._evict_if_needed()
             logger.info("model_loaded", kind="tts", model=str(model_name), device=str(device))
             return model
@@ -7,16 +7,34 @@ import threading
 import time
 from collections.abc import Iterator
 from contextlib import contextmanager, suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.models import JobState
 from dubbing_pipeline.jobs.store import JobStore
-from dubbing_pipeline.ops.metrics import pipeline_job_degraded_total
+from dubbing_pipeline.ops.metrics import (
+    pipeline_job_degraded_total,
+    sched_active_jobs,
+    sched_active_phase,
+    sched_phase_wait,
+    sched_queue_depth,
+)
 from dubbing_pipeline.runtime import lifecycle
+from dubbing_pipeline.runtime.capacity import (
+    ASR_MODEL_BY_MODE,
+    CostModel,
+    PhaseMeter,
+    ResourceCost,
+    default_costs_path,
+    host_budget,
+)
+from dubbing_pipeline.runtime.model_manager import ModelManager
 from dubbing_pipeline.utils.log import logger
 
+# A phase waiting longer than this blocks later (smaller) phases from jumping ahead of it.
+_PHASE_STARVATION_S = 30.0
+
 
 @dataclass(frozen=True, slots=True)
 class JobRecord:
@@ -25,6 +43,7 @@ class JobRecord:
     device_pref: str
     created_at: float
     priority: int = 100
+    duration_s: float = 0.0
 
 
 def _next_lower_mode(mode: str) -> str:
@@ -86,15 +105,26 @@ class Scheduler:
     In-process priority scheduler for job execution + phase concurrency.
 
     - submit() adds JobRecord into a priority/delay heap
-    - dispatcher thread enqueues jobs into JobQueue only when global capacity allows
-    - JobQueue uses `phase()` context managers to obey per-phase concurrency caps
+    - dispatcher thread enqueues jobs into JobQueue only when global capacity allows;
+      among due jobs of equal priority it prefers ones whose ASR model is already resident in
+      ModelManager, then the shortest expected runtime (learned CostModel)
+    - JobQueue uses `phase()` context managers; with SCHED_RESOURCE_AWARE a phase is admitted when
+      its estimated CPU/RAM/VRAM fits the host budget, otherwise fixed per-phase semaphores apply
+    - every completed phase is measured and fed back into the CostModel
     - optional Redis mutex reduces multi-instance scheduling stampede (best-effort)
     """
 
     _singleton: Scheduler | None = None
     _singleton_lock = threading.Lock()
 
-    def __init__(self, *, store: JobStore, enqueue_cb) -> None:
+    def __init__(
+        self,
+        *,
+        store: JobStore,
+        enqueue_cb,
+        costs: CostModel | None = None,
+        budget: ResourceCost | None = None,
+    ) -> None:
         self.store = store
         self._enqueue_cb = enqueue_cb  # callable(job: Job) -> None (thread-safe)
         self._lock = threading.Lock()
@@ -130,6 +160,16 @@ class Scheduler:
             "mux": threading.Semaphore(max(1, self._max_global)),
         }
 
+        self._resource_aware = bool(getattr(s, "sched_resource_aware", True))
+        self.costs = costs if costs is not None else CostModel(default_costs_path())
+        self._budget = budget or (host_budget() if self._resource_aware else ResourceCost())
+        self._in_use = ResourceCost()
+        self._phase_ticket = 0
+        self._phase_waiters: dict[int, float] = {}  # ticket -> wait start (insertion = FIFO)
+        self._phase_starts = 0
+        # job_id -> (mode, device, media seconds) for dispatched jobs (phase cost lookup)
+        self._job_info: dict[str, tuple[str, str, float]] = {}
+
         self._redis_mutex = (
             _RedisMutex(s.redis_url, "dubbing_pipeline:scheduler:dispatch") if s.redis_url else None
         )
@@ -162,12 +202,16 @@ class Scheduler:
                 transcribe=self._max_transcribe,
                 tts=self._max_tts,
                 bp_qmax=self._bp_qmax,
+                resource_aware=self._resource_aware,
+                budget=self._budget.to_dict(),
             )
 
     def stop(self) -> None:
         with self._cv:
             self._stop = True
             self._cv.notify_all()
+        with suppress(Exception):
+            self.costs.save()
 
     def submit(self, job: JobRecord) -> None:
         """
@@ -179,6 +223,11 @@ class Scheduler:
         """
         if lifecycle.is_draining():
             raise RuntimeError("draining")
+        if job.duration_s <= 0:
+            with suppress(Exception):
+                cur = self.store.get(job.job_id)
+                if cur is not None:
+                    job = replace(job, duration_s=float(cur.duration_s or 0.0))
         with self._cv:
             qlen = len(self._heap)
             mode = (job.mode or "medium").lower().strip()
@@ -234,37 +283,124 @@ class Scheduler:
                 device_pref=job.device_pref,
                 created_at=job.created_at,
                 priority=job.priority,
+                duration_s=job.duration_s,
             )
             self._seq += 1
             heapq.heappush(
                 self._heap, (available_at, int(rec.priority), float(rec.created_at), self._seq, rec)
             )
+            sched_queue_depth.set(len(self._heap))
             self._cv.notify_all()
 
     def on_job_done(self, job_id: str) -> None:
         with self._cv:
             self._active_global = max(0, int(self._active_global) - 1)
+            sched_active_jobs.set(self._active_global)
             mode = self._active_job_mode.pop(str(job_id), "")
+            self._job_info.pop(str(job_id), None)
             if mode:
                 self._active_by_mode[mode] = max(0, int(self._active_by_mode.get(mode, 0)) - 1)
             self._cv.notify_all()
 
     @contextmanager
-    def phase(self, name: str) -> Iterator[None]:
+    def phase(
+        self, name: str, *, job_id: str = "", model: str = "", device: str = ""
+    ) -> Iterator[None]:
         name = str(name)
         sem = self._phase_sem.get(name)
         if sem is None:
             yield
             return
+        mode, dev0, media_s = self._job_info.get(str(job_id), ("medium", "cpu", 0.0))
+        dev = str(device or dev0 or "cpu")
+        cost: ResourceCost | None = None
+        t_wait = time.monotonic()
+        # MAX_CONCURRENCY_* stay a hard ceiling; resource-aware admission works underneath it.
         sem.acquire()
         try:
-            with self._cv:
-                self._active_phase[name] = int(self._active_phase.get(name, 0)) + 1
+            if self._resource_aware:
+                cost = self.costs.estimate(name, mode=mode, model=model, device=dev)
+                cost = cost.clamp(self._budget)
+                shared, starts0 = self._admit(name, cost)
+            else:
+                with self._cv:
+                    shared, starts0 = self._enter_phase_locked(name)
+        except BaseException:
+            sem.release()
+            raise
+        active = sched_active_phase.get(name)
+        if active is not None:
+            sched_phase_wait[name].observe(time.monotonic() - t_wait)
+            active.inc()
+        meter = PhaseMeter(shared=shared)
+        ok = False
+        try:
             yield
+            ok = True
         finally:
+            if active is not None:
+                active.dec()
             with self._cv:
+                shared = shared or self._phase_starts != starts0
                 self._active_phase[name] = max(0, int(self._active_phase.get(name, 0)) - 1)
+                if cost is not None:
+                    self._in_use = self._in_use - cost
+                    self._cv.notify_all()
             sem.release()
+            if ok:
+                with suppress(Exception):
+                    usage = meter.finish(shared=shared)
+                    if usage is not None:
+                        self.costs.observe(
+                            name, mode=mode, model=model, device=dev, media_s=media_s, **usage
+                        )
+
+    def _enter_phase_locked(self, name: str) -> tuple[bool, int]:
+        """
+        Count `name` as running (caller holds `_cv`). Returns (another phase is running too,
+        phase-start counter); the meter uses both to tell whether it had the process alone.
+        """
+        self._active_phase[name] = int(self._active_phase.get(name, 0)) + 1
+        self._phase_starts += 1
+        return sum(int(v) for v in self._active_phase.values()) > 1, self._phase_starts
+
+    def _admit(self, name: str, cost: ResourceCost) -> tuple[bool, int]:
+        """
+        Block until `cost` fits the free budget (or nothing else is running). Waiters are FIFO
+        unless they fit: later phases may overtake a waiting one until it has starved.
+        """
+        with self._cv:
+            self._phase_ticket += 1
+            ticket = self._phase_ticket
+            self._phase_waiters[ticket] = time.monotonic()
+            try:
+                while True:
+                    idle = sum(int(v) for v in self._active_phase.values()) == 0
+                    fits = idle or cost.fits(self._budget - self._in_use)
+                    head = next(iter(self._phase_waiters))
+                    starving = (
+                        head != ticket
+                        and time.monotonic() - self._phase_waiters[head] > _PHASE_STARVATION_S
+                    )
+                    if fits and not starving:
+                        break
+                    self._cv.wait(timeout=0.5)
+                self._in_use = self._in_use + cost
+                return self._enter_phase_locked(name)
+            finally:
+                self._phase_waiters.pop(ticket, None)
+                self._cv.notify_all()
+
+    def expected_seconds(self, rec: JobRecord) -> float:
+        return self.costs.expected_seconds(
+            mode=rec.mode, media_s=rec.duration_s, device=self._device_for(rec.device_pref)
+        )
+
+    def _device_for(self, pref: str) -> str:
+        p = str(pref or "auto").lower()
+        if p == "auto":
+            return "cuda" if self._budget.vram_mb > 0 else "cpu"
+        return p
 
     def state(self) -> dict[str, Any]:
         with self._cv:
@@ -278,6 +414,12 @@ class Scheduler:
                     "backpressure_q_max": int(self._bp_qmax),
                 },
                 "active_phase": dict(self._active_phase),
+                "resource_aware": bool(self._resource_aware),
+                "budget": {
+                    "total": self._budget.to_dict(),
+                    "in_use": self._in_use.to_dict(),
+                    "waiting_phases": len(self._phase_waiters),
+                },
             }
 
     def snapshot_queue(self, *, limit: int = 200) -> list[dict[str, Any]]:
@@ -300,6 +442,7 @@ class Scheduler:
                     "priority": int(priority),
                     "created_at": float(created_at),
                     "seq": int(seq),
+                    "expected_s": round(self.expected_seconds(rec), 1),
                 }
             )
         return out
@@ -318,6 +461,7 @@ class Scheduler:
             heapq.heapify(self._heap)
             removed = before - len(self._heap)
             if removed:
+                sched_queue_depth.set(len(self._heap))
                 self._cv.notify_all()
             return int(removed)
 
@@ -336,9 +480,13 @@ class Scheduler:
             for available_at, pr0, created_at, seq, rec in self._heap:
                 if str(rec.job_id) == jid:
                     updated = True
-                    new_heap.append((float(available_at), int(pr), float(created_at), int(seq), rec))
+                    new_heap.append(
+                        (float(available_at), int(pr), float(created_at), int(seq), rec)
+                    )
                 else:
-                    new_heap.append((float(available_at), int(pr0), float(created_at), int(seq), rec))
+                    new_heap.append(
+                        (float(available_at), int(pr0), float(created_at), int(seq), rec)
+                    )
             if updated:
                 self._heap = new_heap
                 heapq.heapify(self._heap)
@@ -354,10 +502,15 @@ class Scheduler:
                 if not self._heap:
                     self._cv.wait(timeout=0.5)
                     continue
-                available_at, _, _, _, rec = self._heap[0]
+                idx = self._pick_locked(now) if self._resource_aware else 0
+                available_at, _, _, _, rec = self._heap[idx]
                 if available_at > now:
                     self._cv.wait(timeout=min(0.5, available_at - now))
                     continue
+                # No global slot: wait without reordering (delaying here would undo the pick).
+                if self._active_global >= self._max_global:
+                    self._cv.wait(timeout=0.25)
+                    continue
                 # Per-mode caps (best-effort). If top-of-heap is blocked, delay it slightly
                 # so other queued jobs can proceed.
                 mode = (rec.mode or "medium").lower().strip()
@@ -368,20 +521,27 @@ class Scheduler:
                     cap = int(self._max_global)
                 if int(self._active_by_mode.get(mode, 0)) >= cap:
                     # Delay this record slightly; keep heap moving.
-                    heapq.heapreplace(
-                        self._heap,
-                        (now + 0.5, int(rec.priority), float(rec.created_at), self._seq + 1, rec),
-                    )
                     self._seq += 1
+                    self._heap[idx] = (
+                        now + 0.5, int(rec.priority), float(rec.created_at), self._seq, rec
+                    )
+                    heapq.heapify(self._heap)
                     self._cv.wait(timeout=0.25)
                     continue
-                if self._active_global >= self._max_global:
-                    self._cv.wait(timeout=0.25)
-                    continue
-                heapq.heappop(self._heap)
+                last = self._heap.pop()
+                if idx < len(self._heap):
+                    self._heap[idx] = last
+                    heapq.heapify(self._heap)
                 self._active_global += 1
+                sched_active_jobs.set(self._active_global)
+                sched_queue_depth.set(len(self._heap))
                 self._active_by_mode[mode] = int(self._active_by_mode.get(mode, 0)) + 1
                 self._active_job_mode[str(rec.job_id)] = mode
+                self._job_info[str(rec.job_id)] = (
+                    mode,
+                    self._device_for(rec.device_pref),
+                    float(rec.duration_s or 0.0),
+                )
 
             # Optional redis mutex (best-effort)
             if self._redis_mutex is not None:
@@ -390,6 +550,34 @@ class Scheduler:
             else:
                 self._enqueue_one(rec)
 
+    def _pick_locked(self, now: float) -> int:
+        """
+        Heap index to dispatch next (caller holds the lock). Among due records with the best
+        priority: resident ASR model first, then shortest expected job, then FIFO.
+        """
+        due = [i for i, it in enumerate(self._heap) if float(it[0]) <= now]
+        if len(due) <= 1:
+            return due[0] if due else 0
+        best_pr = min(int(self._heap[i][1]) for i in due)
+        due = [i for i in due if int(self._heap[i][1]) == best_pr]
+        if len(due) == 1:
+            return due[0]
+        resident: set[str] = set()
+        with suppress(Exception):
+            resident = {
+                str(m.get("model_name"))
+                for m in ModelManager.instance().state()
+                if m.get("kind") == "whisper"
+            }
+
+        def _score(i: int) -> tuple[int, float, float, int]:
+            _, _, created_at, seq, rec = self._heap[i]
+            mode = str(rec.mode or "medium").lower()
+            warm = ASR_MODEL_BY_MODE.get(mode, "medium") in resident
+            return (0 if warm else 1, self.expected_seconds(rec), float(created_at), int(seq))
+
+        return min(due, key=_score)
+
     def _enqueue_one(self, rec: JobRecord) -> None:
         job = self.store.get(rec.job_id)
         if job is None:
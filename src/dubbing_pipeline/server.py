@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import mimetypes
 import os
@@ -38,7 +39,13 @@ from dubbing_pipeline.jobs.models import Job
 from dubbing_pipeline.jobs.queue import JobQueue
 from dubbing_pipeline.store_backend import build_store
 from dubbing_pipeline.ops import audit
-from dubbing_pipeline.ops.metrics import REGISTRY
+from dubbing_pipeline.ops.metrics import (
+    cache_entries,
+    media_bytes,
+    media_response,
+    on_scrape,
+    render_latest,
+)
 from dubbing_pipeline.runtime import lifecycle
 from dubbing_pipeline.runtime.scheduler import Scheduler
 from dubbing_pipeline.security.runtime_db import UnsafeRuntimeDbPath, assert_safe_runtime_db_path
@@ -121,6 +128,9 @@ async def lifespan(app: FastAPI):
     app.state.job_store = store
     app.state.job_queue = q
     app.state.output_root = out_root
+    # WEB_RUN_JOBS=0: API/UI only; jobs are executed by `dubbing-worker` processes.
+    run_jobs = bool(getattr(s, "web_run_jobs", True))
+    app.state.run_jobs = run_jobs
     # runtime scheduler (in-proc)
     import asyncio as _asyncio
 
@@ -139,7 +149,8 @@ async def lifespan(app: FastAPI):
 
     sched = Scheduler(store=store, enqueue_cb=_enqueue_threadsafe)
     Scheduler.install(sched)
-    sched.start()
+    if run_jobs:
+        sched.start()
     app.state.scheduler = sched
 
     # Queue backend (Level 2 Redis with Level 1 fallback).
@@ -148,6 +159,7 @@ async def lifespan(app: FastAPI):
         scheduler=sched,
         get_store_cb=lambda: app.state.job_store,
         enqueue_job_id_cb=lambda job_id: q.enqueue_id(job_id),
+        consume=run_jobs,
     )
     if queue_backend is None:
         logger.error("queue_backend_init_failed")
@@ -438,6 +450,7 @@ def _range_stream(path: Path, range_header: str | None):
                 if not chunk:
                     break
                 remaining -= len(chunk)
+                media_bytes.inc(len(chunk))
                 yield chunk
 
     return gen(), start, end, size
@@ -470,13 +483,28 @@ async def healthz():
     return {"ok": True}
 
 
+@on_scrape
+def _refresh_cache_entries() -> None:
+    from dubbing_pipeline.cache.segments import segment_cache
+    from dubbing_pipeline.cache.store import cache_counts
+
+    counts = cache_counts()
+    sc = segment_cache()
+    if sc is not None:
+        counts.update({f"segment_{k}": n for k, n in sc.counts().items()})
+    for name, n in counts.items():
+        cache_entries.labels(name).set(n)
+
+
 @app.get("/metrics")
 async def metrics():
     try:
-        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest  # type: ignore
+        from prometheus_client import CONTENT_TYPE_LATEST  # type: ignore
     except Exception as ex:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"prometheus-client unavailable: {ex}") from ex
-    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+    # Multi-process mode reads one file per process: keep that off the event loop.
+    body = await asyncio.to_thread(render_latest)
+    return Response(content=body, media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/readyz")
@@ -543,6 +571,7 @@ async def video(
         status_code = 206
     else:
         status_code = 200
+    media_response(str(status_code)).inc()
     return StreamingResponse(gen, status_code=status_code, media_type=ctype, headers=headers)
 
 
@@ -580,4 +609,5 @@ async def files(
         status_code = 206
     else:
         status_code = 200
+    media_response(str(status_code)).inc()
     return StreamingResponse(gen, status_code=status_code, media_type=ctype, headers=headers)
@@ -0,0 +1,295 @@
+"""
+Multi-process ASR for CPU-only nodes.
+
+A long episode is cut into a few shards at long silences (VAD) and the shards are decoded in
+parallel by a process pool. Every worker keeps its own warm Whisper model (ModelManager is
+per-process) and gets an even share of the cores for torch's intra-op threads.
+
+The pool needs a non-daemonic process: in a watchdog phase, run it with
+`run_with_timeout(..., daemon=False)`. A SIGTERM from the watchdog drops the queued shards and the
+workers die with the phase process (Linux parent-death signal).
+
+Each shard is decoded with a short pre-roll taken from the end of the previous shard, so Whisper
+conditions on that speech (the previous text becomes the prompt) instead of starting the shard
+cold. Segments are then stitched by midpoint: a segment belongs to the shard whose core range
+contains it, which drops the copies decoded in the overlap.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.runtime.model_manager import ModelManager
+from dubbing_pipeline.stages.transcription import _run_whisper, _shift_segment
+from dubbing_pipeline.stages.translation import whisper_segments
+from dubbing_pipeline.utils.log import logger
+from dubbing_pipeline.utils.net import egress_guard
+from dubbing_pipeline.utils.vad import VADConfig, iter_speech_segments, pcm16_view
+
+# spawn: callers may be threaded (job workers); forking them is unsafe.
+_MP_CONTEXT = "spawn"
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    idx: int
+    start_s: float  # core range: segments whose midpoint falls here are kept
+    end_s: float
+    audio_start_s: float  # decode range starts earlier by the context pre-roll
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+def plan_shards(
+    audio_path: Path,
+    *,
+    workers: int,
+    min_shard_s: float = 120.0,
+    context_s: float = 5.0,
+    min_gap_s: float = 0.8,
+    vad: VADConfig = VADConfig(),
+) -> list[Shard]:
+    """
+    Cut a mono 16 kHz WAV into about 2x `workers` shards (at least `min_shard_s` long) at the
+    middle of VAD silences of `min_gap_s` or more. Returns [] for other audio formats.
+    """
+    x, sr = pcm16_view(Path(audio_path))
+    if x is None or sr != vad.sample_rate:
+        return []
+    total = float(x.shape[0]) / float(sr)
+    # Two shards per worker evens out shards that hold more speech than others.
+    target = max(float(min_shard_s), total / float(max(1, 2 * int(workers))))
+    cuts: list[float] = []
+    start = 0.0
+    last_end: float | None = None
+    for s0, e0 in iter_speech_segments(audio_path, vad):
+        if last_end is not None and float(s0) - last_end >= float(min_gap_s):
+            cut = (last_end + float(s0)) / 2.0
+            # Never leave a short tail shard behind.
+            if cut - start >= target and total - cut >= 0.5 * target:
+                cuts.append(cut)
+                start = cut
+        last_end = float(e0)
+    bounds = [0.0, *cuts, total]
+    return [
+        Shard(
+            idx=i,
+            start_s=a,
+            end_s=b,
+            audio_start_s=max(0.0, a - max(0.0, float(context_s))),
+        )
+        for i, (a, b) in enumerate(zip(bounds, bounds[1:], strict=False))
+    ]
+
+
+class _Terminated(BaseException):
+    """SIGTERM (watchdog timeout/cancel) arrived while shards were being decoded."""
+
+
+def _init_worker(threads: int) -> None:
+    # Forked workers inherit the phase child's `_sigterm_raises` handler.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Linux: die with the process that started the pool, even when it is SIGKILLed.
+    with suppress(Exception):
+        import ctypes
+
+        ctypes.CDLL("libc.so.6", use_errno=True).prctl(1, int(signal.SIGTERM))  # PR_SET_PDEATHSIG
+    # Before torch is imported in this (fresh, spawned) interpreter.
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    with suppress(Exception):
+        import torch  # type: ignore
+
+        torch.set_num_threads(int(threads))
+
+
+def _decode_shard(job: dict[str, Any]) -> dict[str, Any]:
+    """
+    Pool task: decode one shard on this worker's warm model. Times are absolute.
+    """
+    import numpy as np  # type: ignore
+
+    t0 = time.perf_counter()
+    x, sr = pcm16_view(Path(job["audio_path"]))
+    if x is None:
+        raise RuntimeError(f"unreadable audio: {job['audio_path']}")
+    a0 = float(job["audio_start_s"])
+    audio = np.asarray(x[int(a0 * sr) : int(float(job["end_s"]) * sr)], dtype=np.float32)
+    audio /= 32768.0
+    lang = job.get("language")
+    out: dict[str, Any] = {"idx": int(job["idx"]), "language": lang, "segments": []}
+    with (
+        egress_guard(),
+        ModelManager.instance().acquire_whisper(job["model"], job["device"]) as model,
+    ):
+        t_loaded = time.perf_counter()
+        kw = {"task": job["task"], "language": lang, "verbose": False}
+        res = _run_whisper(model, audio, kw, want_words=bool(job["want_words"]))
+        det = str(res.get("language") or lang or "")
+        out["language"] = det or None
+        out["segments"] = [_shift_segment(sg, a0) for sg in res.get("segments") or []]
+        if job["combined"] and det.lower() != "en":
+            tkw = {"task": "translate", "language": det or None, "verbose": False}
+            if job.get("translate_hint"):
+                tkw["initial_prompt"] = str(job["translate_hint"])
+            wt = model.transcribe(audio, **tkw)
+            out["wt_segments"] = [
+                {**sg, "start": sg["start"] + a0, "end": sg["end"] + a0}
+                for sg in whisper_segments(wt)
+            ]
+    out["load_s"] = t_loaded - t0
+    out["wall_s"] = time.perf_counter() - t0
+    out["pid"] = os.getpid()
+    return out
+
+
+def _owned(segments: list[dict], shard: Shard, *, last: bool) -> list[dict]:
+    keep = []
+    for sg in segments:
+        mid = (float(sg["start"]) + float(sg["end"])) / 2.0
+        if mid >= shard.start_s and (last or mid < shard.end_s):
+            keep.append(sg)
+    return keep
+
+
+@contextmanager
+def _sigterm_raises() -> Iterator[None]:
+    """
+    Turn SIGTERM into `_Terminated` in the main thread, so the pool can be shut down outside
+    the signal handler (and outside any executor lock the interrupted code held).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _on_term(signum: int, frame: Any) -> None:
+        raise _Terminated()
+
+    prev = signal.signal(signal.SIGTERM, _on_term)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, prev)
+
+
+def transcribe_shards(
+    audio_path: Path,
+    shards: list[Shard],
+    *,
+    workers: int,
+    model_name: str,
+    device: str,
+    task: str,
+    language: str | None,
+    want_words: bool,
+    combined: bool,
+    translate_hint: str | None,
+) -> tuple[dict, dict | None, dict[str, Any]]:
+    """
+    Decode `shards` in a pool of `workers` processes and stitch them.
+
+    Returns (result, translate_result, report) where the results have the shape of a single
+    Whisper call ({"language", "segments"}) and the report holds per-shard timings. Without a
+    `language`, shard 0 is decoded first and its detected language is pinned for the rest.
+    """
+    t0 = time.perf_counter()
+    workers = max(1, min(int(workers), len(shards)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    hint = str(translate_hint or "").strip() or None
+
+    def _job(sh: Shard, lang: str | None) -> dict[str, Any]:
+        return {
+            "idx": sh.idx,
+            "audio_path": str(audio_path),
+            "audio_start_s": sh.audio_start_s,
+            "end_s": sh.end_s,
+            "model": model_name,
+            "device": device,
+            "task": task,
+            "language": lang,
+            "want_words": bool(want_words),
+            "combined": bool(combined),
+            "translate_hint": hint,
+        }
+
+    outs: dict[int, dict[str, Any]] = {}
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(_MP_CONTEXT),
+        initializer=_init_worker,
+        initargs=(threads,),
+    )
+    try:
+        with _sigterm_raises():
+            rest = shards
+            if language is None:
+                first = pool.submit(_decode_shard, _job(shards[0], None)).result()
+                outs[0] = first
+                language = first.get("language")
+                rest = shards[1:]
+            futs = [pool.submit(_decode_shard, _job(sh, language)) for sh in rest]
+            for fut in futs:
+                out = fut.result()
+                outs[int(out["idx"])] = out
+    except _Terminated:
+        # Watchdog timeout/cancel: drop queued shards, then take the SIGTERM action we
+        # interrupted. Running workers die with this process (parent-death signal).
+        pool.shutdown(wait=False, cancel_futures=True)
+        os.kill(os.getpid(), signal.SIGTERM)
+        raise
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    with suppress(Exception):
+        # Multi-process metrics: the shard workers have exited, drop their live gauges.
+        from dubbing_pipeline.ops.metrics import mark_process_dead
+
+        for pid in {out.get("pid") for out in outs.values()}:
+            mark_process_dead(pid)
+
+    segments: list[dict] = []
+    wt_segments: list[dict] = []
+    report_shards: list[dict[str, Any]] = []
+    for sh in shards:
+        out = outs[sh.idx]
+        last = sh.idx == len(shards) - 1
+        kept = _owned(list(out.get("segments") or []), sh, last=last)
+        segments.extend(kept)
+        wt_segments.extend(_owned(list(out.get("wt_segments") or []), sh, last=last))
+        rec = {
+            "idx": sh.idx,
+            "start": round(sh.start_s, 3),
+            "end": round(sh.end_s, 3),
+            "context_s": round(sh.start_s - sh.audio_start_s, 3),
+            "segments": len(kept),
+            "dropped_overlap": len(out.get("segments") or []) - len(kept),
+            "load_s": round(float(out.get("load_s") or 0.0), 3),
+            "wall_s": round(float(out.get("wall_s") or 0.0), 3),
+            "rtf": round(float(out.get("wall_s") or 0.0) / max(1e-6, sh.duration_s), 3),
+            "pid": out.get("pid"),
+        }
+        report_shards.append(rec)
+        logger.info("asr_shard_done", **rec)
+
+    result = {"language": language, "segments": segments}
+    wt = {"segments": wt_segments} if any("wt_segments" in o for o in outs.values()) else None
+    report = {
+        "workers": workers,
+        "threads_per_worker": threads,
+        "wall_s": round(time.perf_counter() - t0, 3),
+        "shards": report_shards,
+    }
+    return result, wt, report
@@ -1,31 +1,349 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import os
 import time
+from collections.abc import Callable, Iterator
 from contextlib import suppress
 from pathlib import Path
+from typing import Any
 
+from dubbing_pipeline.cache.segments import (
+    CacheCounter,
+    SegmentCache,
+    asr_window_key,
+    pcm_fingerprint,
+    segment_cache,
+)
 from dubbing_pipeline.cache.store import cache_get, cache_put, make_key
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.checkpoint import read_ckpt, stage_is_done, write_ckpt
 from dubbing_pipeline.runtime.model_manager import ModelManager
+from dubbing_pipeline.stages.translation import audio_identity, whisper_segments
 from dubbing_pipeline.utils.circuit import Circuit
 from dubbing_pipeline.utils.log import logger
 from dubbing_pipeline.utils.net import egress_guard
 from dubbing_pipeline.utils.retry import retry_call
 from dubbing_pipeline.utils.time import format_srt_timestamp
+from dubbing_pipeline.utils.vad import VADConfig, iter_speech_segments, pcm16_view
 
+ASR_JOURNAL_VERSION = 1
 
-def _write_srt(segments: list[dict], srt_path: Path) -> None:
+
+def _write_srt(segments: list[dict], srt_path: Path, *, first_index: int = 1) -> None:
+    # first_index > 1 appends cues to a partial SRT (streaming mode).
     srt_path.parent.mkdir(parents=True, exist_ok=True)
-    with srt_path.open("w", encoding="utf-8") as f:
-        for i, seg in enumerate(segments, 1):
+    with srt_path.open("w" if first_index <= 1 else "a", encoding="utf-8") as f:
+        for i, seg in enumerate(segments, first_index):
             start = format_srt_timestamp(float(seg["start"]))
             end = format_srt_timestamp(float(seg["end"]))
             text = (seg.get("text") or "").strip()
             f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
 
 
+def asr_journal_path(srt_out: Path) -> Path:
+    """
+    Streaming ASR journal next to the SRT: one JSON line per finished window.
+    """
+    return Path(srt_out).with_suffix(".asr_journal.jsonl")
+
+
+def asr_windows(
+    audio_path: Path, *, window_s: float, vad: VADConfig = VADConfig()
+) -> Iterator[tuple[float, float]]:
+    """
+    Contiguous windows of about `window_s` covering a mono 16 kHz WAV, cut in the silence
+    between VAD speech segments. Speech running past 2x `window_s` is split at `window_s`.
+    Deterministic for a given file, so a resumed run sees the same boundaries.
+    """
+    x, sr = pcm16_view(Path(audio_path))
+    if x is None or sr <= 0:
+        return
+    total = float(x.shape[0]) / float(sr)
+    window_s = max(1.0, float(window_s))
+    start = 0.0
+    last_end: float | None = None
+    for s0, e0 in iter_speech_segments(audio_path, vad):
+        if last_end is not None and last_end - start >= window_s:
+            cut = (last_end + float(s0)) / 2.0
+            yield start, cut
+            start = cut
+        while float(e0) - start >= 2.0 * window_s:
+            yield start, start + window_s
+            start += window_s
+        last_end = float(e0)
+    if total > start:
+        yield start, total
+
+
+def _shift_segment(seg: dict, offset: float) -> dict:
+    rec: dict[str, Any] = {
+        "start": float(seg.get("start", 0.0)) + offset,
+        "end": float(seg.get("end", 0.0)) + offset,
+        "text": str(seg.get("text") or ""),
+        "avg_logprob": seg.get("avg_logprob"),
+        "no_speech_prob": seg.get("no_speech_prob"),
+    }
+    words = seg.get("words")
+    if isinstance(words, list):
+        rec["words"] = [
+            {
+                **w,
+                "start": float(w.get("start", 0.0)) + offset,
+                "end": float(w.get("end", 0.0)) + offset,
+            }
+            for w in words
+            if isinstance(w, dict)
+        ]
+    return rec
+
+
+def _read_journal_lines(path: Path) -> tuple[list[dict], int]:
+    """
+    Parsed records and the byte length of the intact prefix (a crash can tear the last line).
+    """
+    try:
+        raw = path.read_bytes()
+    except Exception:
+        return [], 0
+    recs: list[dict] = []
+    good = 0
+    for line in raw.split(b"\n")[:-1]:
+        try:
+            rec = json.loads(line)
+        except Exception:
+            break
+        if not isinstance(rec, dict):
+            break
+        recs.append(rec)
+        good += len(line) + 1
+    return recs, good
+
+
+class AsrJournal:
+    """
+    Append-only record of finished ASR windows (header, window..., done), fsynced per window.
+    Reopening with the same key resumes after the last intact window; another key starts over.
+    """
+
+    def __init__(self, path: Path, key: dict[str, Any]) -> None:
+        self.path = Path(path)
+        self.key = dict(key)
+        self.windows: list[dict] = []
+        self.done = False
+
+    def open(self) -> AsrJournal:
+        recs, good = _read_journal_lines(self.path)
+        head = recs[0] if recs else {}
+        if head.get("type") == "header" and head.get("key") == self.key:
+            self.windows = [r for r in recs[1:] if r.get("type") == "window"]
+            self.done = any(r.get("type") == "done" for r in recs[1:])
+            if good != self.path.stat().st_size:
+                with self.path.open("r+b") as f:
+                    f.truncate(good)
+            return self
+        self.windows, self.done = [], False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        header = {"type": "header", "version": ASR_JOURNAL_VERSION, "key": self.key}
+        tmp.write_text(json.dumps(header, sort_keys=True) + "\n", encoding="utf-8")
+        # Replace (new inode) so followers of an older run notice the restart.
+        os.replace(tmp, self.path)
+        return self
+
+    def _append(self, rec: dict) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, sort_keys=True, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append_window(self, rec: dict) -> None:
+        rec = {"type": "window", **rec}
+        self._append(rec)
+        self.windows.append(rec)
+
+    def finish(self) -> None:
+        if not self.done:
+            self._append({"type": "done", "windows": len(self.windows)})
+            self.done = True
+
+    @property
+    def language(self) -> str | None:
+        for w in self.windows:
+            if w.get("language"):
+                return str(w["language"])
+        return None
+
+    def segments(self, field: str = "segments") -> list[dict]:
+        return [s for w in self.windows for s in (w.get(field) or [])]
+
+
+def follow_asr_journal(
+    path: Path,
+    *,
+    poll_s: float = 0.5,
+    stop: Callable[[], bool] | None = None,
+    until_done: bool = True,
+) -> Iterator[dict]:
+    """
+    Tail a streaming ASR journal from another thread/process: yields header, window and done
+    records as they are appended, and returns after `done` (or once `stop()` is true).
+    A header record means the journal was (re)started; consumers should reset on it.
+    With until_done=False only `stop()` ends the tail, for followers that start before the
+    writer (a `done` left by an earlier run is then followed by a new header).
+    """
+    path = Path(path)
+    ino = None
+    offset = 0
+    buf = b""
+    while True:
+        stopping = stop is not None and stop()
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is not None and (st.st_ino != ino or st.st_size < offset):
+            ino, offset, buf = st.st_ino, 0, b""
+        if st is not None and st.st_size > offset:
+            with path.open("rb") as f:
+                f.seek(offset)
+                chunk = f.read(st.st_size - offset)
+            offset += len(chunk)
+            *lines, buf = (buf + chunk).split(b"\n")
+            for line in lines:
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue
+                if not isinstance(rec, dict):
+                    continue
+                yield rec
+                if until_done and rec.get("type") == "done":
+                    return
+        if stopping:
+            return
+        time.sleep(float(poll_s))
+
+
+def _run_whisper(model: Any, audio: Any, kw: dict[str, Any], *, want_words: bool) -> dict:
+    # Word-level timestamps are optional and model-dependent; try only when requested.
+    res = None
+    if want_words:
+        # Older whisper implementations may not support this flag.
+        with suppress(TypeError):
+            res = model.transcribe(audio, **kw, word_timestamps=True)
+    if res is None:
+        res = model.transcribe(audio, **kw)
+    return res
+
+
+def _transcribe_windows(
+    model: Any,
+    journal: AsrJournal,
+    *,
+    audio_path: Path,
+    pcm: Any,
+    sr: int,
+    window_s: float,
+    task: str,
+    lang: str | None,
+    model_name: str,
+    want_words: bool,
+    combined: bool,
+    translate_hint: str | None,
+    srt_out: Path,
+    on_segments: Callable[[list[dict]], None] | None,
+    cache: SegmentCache | None = None,
+    counter: CacheCounter | None = None,
+) -> None:
+    """
+    Transcribe the windows not yet in `journal`, journaling and publishing each as it finishes.
+    With a segment `cache`, windows whose PCM was decoded before (same options) are reused.
+    """
+    import numpy as np  # type: ignore
+
+    # Later windows keep the language detected on the first one.
+    lang = lang or journal.language
+    n_done = len(journal.windows)
+    n_cues = len(journal.segments())
+    for idx, (w0, w1) in enumerate(asr_windows(audio_path, window_s=window_s)):
+        if idx < n_done:
+            continue
+        audio = np.asarray(pcm[int(w0 * sr) : int(w1 * sr)], dtype=np.float32) / 32768.0
+        rec: dict[str, Any] = {
+            "idx": idx,
+            "start": float(w0),
+            "end": float(w1),
+            "model": model_name,
+            "language": lang,
+            "segments": [],
+        }
+        if audio.size:
+            key = None
+            hit = None
+            if cache is not None:
+                key = asr_window_key(
+                    pcm_fingerprint(pcm[int(w0 * sr) : int(w1 * sr)]),
+                    model=model_name,
+                    task=task,
+                    language=lang,
+                    words=want_words,
+                    combined=combined,
+                    hint=str(translate_hint or "").strip(),
+                )
+                with suppress(Exception):
+                    hit = cache.get("asr", key)
+            if isinstance(hit, dict):
+                # Cached windows are stored at offset 0.
+                res = hit
+                if counter is not None:
+                    counter.hits += 1
+            else:
+                res = {"segments": []}
+                kw = {"task": task, "language": lang, "verbose": False}
+                raw = _run_whisper(model, audio, kw, want_words=want_words)
+                det = str(raw.get("language") or lang or "")
+                res["language"] = det or None
+                res["segments"] = [_shift_segment(sg, 0.0) for sg in raw.get("segments") or []]
+                if combined and det.lower() != "en":
+                    tkw = {"task": "translate", "language": det or None, "verbose": False}
+                    if translate_hint and str(translate_hint).strip():
+                        tkw["initial_prompt"] = str(translate_hint).strip()
+                    res["wt_segments"] = whisper_segments(model.transcribe(audio, **tkw))
+                if counter is not None and key is not None:
+                    counter.misses += 1
+                if cache is not None and key is not None:
+                    with suppress(Exception):
+                        cache.put("asr", key, res)
+            det = str(res.get("language") or "")
+            lang = lang or det or None
+            rec["language"] = det or None
+            rec["segments"] = [_shift_segment(sg, w0) for sg in res.get("segments") or []]
+            if "wt_segments" in res:
+                rec["wt_segments"] = [
+                    {**sg, "start": sg["start"] + w0, "end": sg["end"] + w0}
+                    for sg in res["wt_segments"]
+                ]
+        journal.append_window(rec)
+        _write_srt(rec["segments"], srt_out, first_index=n_cues + 1)
+        n_cues += len(rec["segments"])
+        if on_segments is not None and rec["segments"]:
+            try:
+                on_segments(rec["segments"])
+            except Exception as ex:
+                logger.warning("asr_segments_consumer_failed", error=str(ex))
+    journal.finish()
+
+
+def whisper_translate_sidecar(srt_out: Path) -> Path:
+    """
+    Where the combined pass (transcribe(..., also_translate=True)) writes Whisper translate-task
+    segments; stages.translation reads them via TranslationConfig.whisper_translate_path.
+    """
+    return Path(srt_out).with_suffix(".whisper_translate.json")
+
+
 def transcribe(
     audio_path: Path,
     srt_out: Path,
@@ -38,6 +356,13 @@ def transcribe(
     job_id: str | None = None,
     audio_hash: str | None = None,
     word_timestamps: bool | None = None,
+    also_translate: bool = False,
+    translate_hint: str | None = None,
+    streaming: bool | None = None,
+    window_s: float | None = None,
+    on_segments: Callable[[list[dict]], None] | None = None,
+    shard_workers: int | None = None,
+    use_segment_cache: bool = True,
 ) -> Path:
     """
     Whisper transcription/translation producing SRT and JSON metadata next to it.
@@ -45,6 +370,23 @@ def transcribe(
     - task:
         - "translate": Whisper translate pathway (outputs English). If src_lang != "auto", pass it.
         - "transcribe": plain transcription, in src_lang (or autodetect if src_lang="auto")
+    - also_translate: with task="transcribe", also run Whisper's translate task on the same model
+      handle and decoded audio (reusing the detected language) and write
+      `whisper_translate_sidecar(srt_out)`, so MT does not load/decode everything a second time.
+    - streaming (default: ASR_STREAMING): transcribe VAD-aligned windows of ~window_s
+      (ASR_WINDOW_S) one at a time. Each finished window is appended to
+      `asr_journal_path(srt_out)` and to a partial SRT, and handed to `on_segments`; a rerun
+      resumes after the last journaled window; the journal is keyed by the model and device
+      that decoded it, so a fallback to another model starts it over. Other processes can tail
+      the journal with `follow_asr_journal()`; in the job queue that only drives progress.
+      Translation does not start on early windows: its lines are diarization utterances
+      filled from every overlapping cue, and diarization may still be running alongside.
+      Windows are looked up in the segment cache (SEGMENT_CACHE) by PCM hash first (unless
+      use_segment_cache=False, e.g. for privacy-mode jobs); hit/miss counts land in the
+      metadata under "segment_cache".
+    - shard_workers (default: ASR_SHARD_WORKERS): on CPU, cut the audio at long silences and
+      decode the shards in that many processes (see stages.asr_shards). Same SRT/JSON output;
+      per-shard timings land in the metadata under "sharding".
     """
     task = task.lower().strip()
     if task not in {"translate", "transcribe"}:
@@ -88,7 +430,7 @@ def transcribe(
             return srt_out
 
     try:
-        import whisper  # type: ignore  # noqa: F401
+        import whisper  # type: ignore
     except Exception as ex:  # pragma: no cover
         # Degraded mode: still produce an empty SRT + metadata so the pipeline can
         # persist artifacts even when Whisper isn't installed in the environment.
@@ -155,9 +497,82 @@ def transcribe(
                     srt_out.parent.mkdir(parents=True, exist_ok=True)
                     srt_out.write_bytes(src_srt.read_bytes())
                     srt_out.with_suffix(".json").write_bytes(src_meta.read_bytes())
+                    src_wt = Path(str(paths.get("whisper_translate") or ""))
+                    if paths.get("whisper_translate") and src_wt.exists():
+                        # Same audio content (audio_hash): re-bind the sidecar to this file.
+                        wt_doc = json.loads(src_wt.read_text(encoding="utf-8"))
+                        wt_doc["audio"] = audio_identity(audio_path)
+                        whisper_translate_sidecar(srt_out).write_text(
+                            json.dumps(wt_doc, indent=2, sort_keys=True), encoding="utf-8"
+                        )
                     logger.info("[dp] transcribe cache hit", key=key)
                     return srt_out
 
+    want_words = (
+        bool(word_timestamps)
+        if word_timestamps is not None
+        else bool(get_settings().whisper_word_timestamps)
+    )
+    combined = bool(also_translate) and task == "transcribe"
+
+    journal: AsrJournal | None = None
+    pcm, pcm_sr = None, 0
+    win_s = float(window_s or getattr(s, "asr_window_s", 30.0) or 30.0)
+    if bool(getattr(s, "asr_streaming", False)) if streaming is None else bool(streaming):
+        pcm, pcm_sr = pcm16_view(Path(audio_path))
+        if pcm is None or pcm_sr != VADConfig().sample_rate:
+            logger.warning("asr_streaming_unsupported_audio", audio=str(audio_path))
+        else:
+            st = Path(audio_path).stat()
+            journal = AsrJournal(
+                asr_journal_path(srt_out),
+                {
+                    "audio": {"size": int(st.st_size), "mtime": float(st.st_mtime)},
+                    "model": model_name,
+                    "device": str(chosen_device),
+                    "task": task,
+                    "src_lang": src_lang,
+                    "window_s": win_s,
+                    "word_timestamps": want_words,
+                    "also_translate": combined,
+                    "translate_hint": str(translate_hint or ""),
+                },
+            ).open()
+            if journal.windows:
+                logger.info(
+                    "asr_journal_resume",
+                    windows=len(journal.windows),
+                    resume_s=float(journal.windows[-1].get("end") or 0.0),
+                )
+            # Partial SRT of what is already final; windows append to it as they finish.
+            _write_srt(journal.segments(), srt_out)
+    # Windowed decoding reuses windows seen by earlier jobs (cache.segments).
+    seg_cache = segment_cache() if journal is not None and use_segment_cache else None
+    seg_counter = CacheCounter()
+
+    shards: list[Any] = []
+    shard_report: dict[str, Any] = {}
+    n_shard_workers = int(
+        (getattr(s, "asr_shard_workers", 0) or 0) if shard_workers is None else shard_workers
+    )
+    sharding = journal is None and n_shard_workers > 1 and str(device) == "cpu"
+    if sharding and multiprocessing.current_process().daemon:
+        # Daemonic watchdog phase: no pool allowed (run_with_timeout(..., daemon=False)).
+        logger.warning("asr_shard_skipped", reason="daemonic_process")
+        sharding = False
+    if sharding:
+        from dubbing_pipeline.stages.asr_shards import plan_shards
+
+        shards = plan_shards(
+            audio_path,
+            workers=n_shard_workers,
+            min_shard_s=float(getattr(s, "asr_shard_min_s", 120.0)),
+            context_s=float(getattr(s, "asr_shard_context_s", 5.0)),
+        )
+        if len(shards) < 2:
+            shards = []
+        logger.info("asr_shard_plan", workers=n_shard_workers, shards=len(shards))
+
     for cand_model in _fallback_chain(model_name):
         # circuit open => degrade to CPU for this attempt (and skip if even CPU is blocked by circuit)
         breaker_state = cb.snapshot().state
@@ -187,19 +602,76 @@ def transcribe(
                         "language": lang_opt,
                         "verbose": False,
                     }
-                    # Word-level timestamps are optional and model-dependent; try only when requested.
-                    want_words = (
-                        bool(word_timestamps)
-                        if word_timestamps is not None
-                        else bool(get_settings().whisper_word_timestamps)
-                    )
-                    if want_words:
-                        try:
-                            return model.transcribe(str(audio_path), **kw, word_timestamps=True)
-                        except TypeError:
-                            # Older whisper implementations may not support this flag.
-                            pass
-                    return model.transcribe(str(audio_path), **kw)
+                    audio = str(audio_path)
+                    if combined:
+                        # Decode once; both passes below take the same sample array.
+                        with suppress(Exception):
+                            audio = whisper.load_audio(str(audio_path))
+                    res = _run_whisper(model, audio, kw, want_words=want_words)
+                    wt = None
+                    det = str(res.get("language") or lang_opt or "")
+                    if combined and det.lower() != "en":
+                        # Same handle, detected language reused => no second load/detection.
+                        tkw = {"task": "translate", "language": det or None, "verbose": False}
+                        if translate_hint and str(translate_hint).strip():
+                            tkw["initial_prompt"] = str(translate_hint).strip()
+                        wt = model.transcribe(audio, **tkw)
+                    return res, wt
+
+        def _do_stream(*, cand_model=cand_model, cand_device=cand_device):
+            assert journal is not None
+            key = {**journal.key, "model": cand_model, "device": str(cand_device)}
+            if key != journal.key:
+                # Fallback moved to another model/device: never mix its windows with the old ones.
+                journal.key = key
+                journal.open()
+                _write_srt(journal.segments(), srt_out)
+            if not journal.done:
+                with egress_guard():
+                    mm = ModelManager.instance()
+                    with mm.acquire_whisper(cand_model, cand_device) as model:
+                        _transcribe_windows(
+                            model,
+                            journal,
+                            audio_path=audio_path,
+                            pcm=pcm,
+                            sr=pcm_sr,
+                            window_s=win_s,
+                            task=task,
+                            lang=lang_opt,
+                            model_name=cand_model,
+                            want_words=want_words,
+                            combined=combined,
+                            translate_hint=translate_hint,
+                            srt_out=srt_out,
+                            on_segments=on_segments,
+                            cache=seg_cache,
+                            counter=seg_counter,
+                        )
+            res = {"language": journal.language or lang_opt, "segments": journal.segments()}
+            wt = None
+            if combined and any("wt_segments" in w for w in journal.windows):
+                wt = {"segments": journal.segments("wt_segments")}
+            return res, wt
+
+        def _do_sharded(*, cand_model=cand_model, cand_device=cand_device):
+            from dubbing_pipeline.stages.asr_shards import transcribe_shards
+
+            res, wt, report = transcribe_shards(
+                audio_path,
+                shards,
+                workers=n_shard_workers,
+                model_name=cand_model,
+                device=cand_device,
+                task=task,
+                language=lang_opt,
+                want_words=want_words,
+                combined=combined,
+                translate_hint=translate_hint,
+            )
+            shard_report.clear()
+            shard_report.update(report)
+            return res, wt
 
         tries = {"n": 0}
 
@@ -215,8 +687,9 @@ def transcribe(
             )
 
         try:
-            result = retry_call(
-                _do_once,
+            do = _do_stream if journal is not None else (_do_sharded if shards else _do_once)
+            result, wt_result = retry_call(
+                do,
                 retries=s.retry_max,
                 base=s.retry_base_sec,
                 cap=s.retry_cap_sec,
@@ -308,9 +781,35 @@ def transcribe(
         "fallback_used": (chosen_model != model_name) if chosen_model else True,
         "breaker_state": cb.snapshot().state,
     }
+    if journal is not None:
+        meta["streaming"] = {
+            "windows": len(journal.windows),
+            "window_s": win_s,
+            "journal": str(journal.path),
+        }
+    if shard_report:
+        meta["sharding"] = shard_report
+    if seg_cache is not None:
+        meta["segment_cache"] = seg_counter.as_dict()
     meta_path = srt_out.with_suffix(".json")
     meta_path.write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
 
+    paths = {"srt": srt_out, "meta": meta_path}
+    if wt_result is not None:
+        wt_path = whisper_translate_sidecar(srt_out)
+        wt_doc = {
+            "version": 1,
+            "model_name": chosen_model or model_name,
+            "requested_model": model_name,
+            "requested_src_lang": src_lang,
+            "audio": audio_identity(audio_path),
+            "language": detected_lang,
+            "segments": whisper_segments(wt_result),
+        }
+        wt_path.write_text(json.dumps(wt_doc, indent=2, sort_keys=True), encoding="utf-8")
+        paths["whisper_translate"] = wt_path
+        logger.info("[dp] Wrote whisper translate segments → %s", wt_path)
+
     if audio_hash:
         with suppress(Exception):
             key = make_key(
@@ -323,7 +822,7 @@ def transcribe(
                     "tgt": tgt_lang,
                 },
             )
-            cache_put(key, {"srt": srt_out, "meta": meta_path}, meta={"created_at": time.time()})
+            cache_put(key, paths, meta={"created_at": time.time()})
 
     if job_id:
         with suppress(Exception):
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import json
 import re
 from contextlib import suppress
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from dubbing_pipeline.cache.segments import CacheCounter, mt_key, segment_cache
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.ops.spans import span
+from dubbing_pipeline.runtime.model_manager import ModelManager
 from dubbing_pipeline.utils.log import logger
 from dubbing_pipeline.utils.net import egress_guard
 
@@ -24,6 +28,80 @@ class TranslationConfig:
     # Streaming context bridging: best-effort prompt/hint for providers that support it.
     # This MUST NOT contain secrets; it is derived from prior segment text.
     context_hint: str | None = None
+    # Whisper translate-task segments precomputed by the combined transcribe+translate pass
+    # (stages.transcription, also_translate=True). Used instead of a second Whisper run.
+    whisper_translate_path: str | None = None
+    # Cross-job segment cache for text-engine output (cache.segments); off for privacy modes.
+    use_segment_cache: bool = True
+    # Where to write segment-cache hit/miss counters for this call.
+    cache_stats_path: str | None = None
+
+
+def wants_whisper_translate(mt_engine: str, src_lang: str, tgt_lang: str) -> bool:
+    """
+    True when translate_segments would use Whisper's translate task as the base translation.
+    """
+    engine = str(mt_engine or "auto").lower()
+    return (
+        engine in {"auto", "whisper"}
+        and str(tgt_lang or "").lower() == "en"
+        and str(src_lang or "").lower() != "en"
+    )
+
+
+def whisper_segments(res: dict[str, Any]) -> list[dict]:
+    out = []
+    for s in res.get("segments") or []:
+        out.append(
+            {
+                "start": float(s.get("start", 0.0)),
+                "end": float(s.get("end", 0.0)),
+                "text": (s.get("text") or "").strip(),
+                "avg_logprob": s.get("avg_logprob"),
+            }
+        )
+    return out
+
+
+def audio_identity(audio_path: str | Path | None) -> dict[str, Any] | None:
+    """
+    Size + mtime of the audio a combined-pass sidecar was decoded from (like the ASR journal).
+    """
+    try:
+        st = Path(str(audio_path)).stat()
+    except Exception:
+        return None
+    return {"size": int(st.st_size), "mtime": float(st.st_mtime)}
+
+
+def read_whisper_translate(
+    path: str | Path | None, *, model_name: str, src_lang: str, audio_path: str | Path | None
+) -> list[dict] | None:
+    """
+    Load combined-pass translate segments if they were produced from `audio_path` for this
+    model/source language.
+    """
+    if not path:
+        return None
+    p = Path(path)
+    if not p.exists():
+        return None
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("segments"), list):
+        return None
+    models = {str(data.get("model_name") or ""), str(data.get("requested_model") or "")}
+    if str(model_name) not in models:
+        return None
+    if str(data.get("requested_src_lang") or "").lower() != str(src_lang or "").lower():
+        return None
+    audio = audio_identity(audio_path)
+    if audio is None or data.get("audio") != audio:
+        logger.info("mt_whisper_translate_stale", path=str(p))
+        return None
+    return [s for s in data["segments"] if isinstance(s, dict)]
 
 
 def _read_glossary(path: str | None, *, show_id: str | None = None) -> list[tuple[str, str]]:
@@ -162,9 +240,10 @@ def _translate_marian(text: str, src_lang: str, tgt_lang: str) -> str:
     settings = get_settings()
     cache_dir = str(settings.transformers_cache) if settings.transformers_cache else None
     model = f"Helsinki-NLP/opus-mt-{src_lang}-{tgt_lang}"
-    with egress_guard():
-        pipe = _try_make_pipeline(model, cache_dir=cache_dir)
-    out = pipe([text])[0].get("translation_text", "")
+    with span("mt.marian", kind="mt", chars=len(text)):
+        with egress_guard():
+            pipe = _try_make_pipeline(model, cache_dir=cache_dir)
+        out = pipe([text])[0].get("translation_text", "")
     return str(out or "")
 
 
@@ -174,7 +253,7 @@ def _translate_nllb(text: str, src_lang: str, tgt_lang: str) -> str:
 
     settings = get_settings()
     cache_dir = str(settings.transformers_cache) if settings.transformers_cache else None
-    with egress_guard():
+    with span("mt.nllb", kind="mt", chars=len(text)), egress_guard():
         out = _translate_with_nllb([text], src_lang, tgt_lang, cache_dir=cache_dir)[0]
     return str(out or "")
 
@@ -182,31 +261,21 @@ def _translate_nllb(text: str, src_lang: str, tgt_lang: str) -> str:
 def _whisper_translate(
     audio_path: str, *, device: str, model_name: str, src_lang: str, context_hint: str | None = None
 ) -> list[dict]:
-    try:
-        import whisper  # type: ignore
-    except Exception as ex:
-        raise RuntimeError(f"whisper not installed: {ex}") from ex
     lang_opt = None if src_lang.lower() == "auto" else src_lang
-    with egress_guard():
-        model = whisper.load_model(model_name, device=device)
+    # Shared model handle: reuses the Whisper instance transcription already loaded.
+    mm = ModelManager.instance()
+    with (
+        span("mt.whisper_translate", kind="mt"),
+        egress_guard(),
+        mm.acquire_whisper(model_name, device) as model,
+    ):
         # Whisper supports a lightweight prompt for improved coherence across windows.
         # (Used by streaming context bridging; offline-only.)
         kw: dict[str, Any] = {"task": "translate", "language": lang_opt, "verbose": False}
         if context_hint and str(context_hint).strip():
             kw["initial_prompt"] = str(context_hint).strip()
         res = model.transcribe(audio_path, **kw)
-    segs = res.get("segments") or []
-    out = []
-    for s in segs:
-        out.append(
-            {
-                "start": float(s.get("start", 0.0)),
-                "end": float(s.get("end", 0.0)),
-                "text": (s.get("text") or "").strip(),
-                "avg_logprob": s.get("avg_logprob"),
-            }
-        )
-    return out
+    return whisper_segments(res)
 
 
 def _overlap(a0: float, a1: float, b0: float, b1: float) -> float:
@@ -238,7 +307,19 @@ def translate_segments(
     # Prepare baseline Whisper translate segments (single pass) when possible.
     whisper_segs: list[dict] = []
     whisper_ok = False
+    pre = None
     if (engine in {"auto", "whisper"}) and tgt_lang.lower() == "en":
+        pre = read_whisper_translate(
+            cfg.whisper_translate_path,
+            model_name=cfg.whisper_model,
+            src_lang=src_lang,
+            audio_path=cfg.audio_path,
+        )
+    if pre is not None:
+        whisper_segs = pre
+        whisper_ok = True
+        logger.info("mt_whisper_translate_reused", segments=len(pre))
+    elif (engine in {"auto", "whisper"}) and tgt_lang.lower() == "en":
         try:
             if not cfg.audio_path:
                 raise RuntimeError("audio_path not provided for whisper translate")
@@ -253,6 +334,33 @@ def translate_segments(
         except Exception:
             whisper_ok = False
 
+    # Text-engine results: cross-job segment cache, plus a per-call memo (repeated lines and
+    # the base/fallback pair of marian/nllb runs translate the same input twice).
+    cache = segment_cache() if cfg.use_segment_cache else None
+    counter = CacheCounter()
+    memo: dict[tuple[str, str], str] = {}
+
+    def _mt(name: str, text: str) -> str:
+        if (name, text) in memo:
+            return memo[(name, text)]
+        key = mt_key(text, engine=name, src_lang=src_lang, tgt_lang=tgt_lang)
+        hit = None
+        if cache is not None:
+            with suppress(Exception):
+                hit = cache.get("mt", key)
+        if isinstance(hit, dict) and isinstance(hit.get("text"), str):
+            counter.hits += 1
+            memo[(name, text)] = hit["text"]
+            return hit["text"]
+        counter.misses += 1
+        fn = _translate_marian if name == "marian" else _translate_nllb
+        res = fn(text, src_lang, tgt_lang)
+        memo[(name, text)] = res
+        if cache is not None:
+            with suppress(Exception):
+                cache.put("mt", key, {"text": res})
+        return res
+
     out: list[dict[str, Any]] = []
     for seg in segments:
         start = float(seg["start"])
@@ -296,10 +404,7 @@ def translate_segments(
             # Direct MT (line-by-line)
             injected, glossary_ann = _glossary_inject(src_text, required)
             try:
-                if base_engine == "marian":
-                    base_text = _translate_marian(injected, src_lang, tgt_lang)
-                else:
-                    base_text = _translate_nllb(injected, src_lang, tgt_lang)
+                base_text = _mt("marian" if base_engine == "marian" else "nllb", injected)
             except Exception as ex:
                 logger.warning("MT base translation failed (%s)", ex)
                 base_text = ""
@@ -320,12 +425,9 @@ def translate_segments(
             injected, glossary_ann2 = _glossary_inject(src_text, required)
             glossary_ann.extend(glossary_ann2)
             try:
-                if preferred == "marian":
-                    final_text = _translate_marian(injected, src_lang, tgt_lang).strip()
-                    final_engine = "marian"
-                else:
-                    final_text = _translate_nllb(injected, src_lang, tgt_lang).strip()
-                    final_engine = "nllb"
+                name = "marian" if preferred == "marian" else "nllb"
+                final_text = _mt(name, injected).strip()
+                final_engine = name
                 fallback_used = True
             except Exception as ex:
                 logger.warning("Fallback MT failed (%s)", ex)
@@ -357,4 +459,12 @@ def translate_segments(
             }
         )
 
+    stats = counter.as_dict()
+    if stats["lookups"]:
+        logger.info("mt_segment_cache", **stats)
+    if cfg.cache_stats_path:
+        with suppress(Exception):
+            p = Path(cfg.cache_stats_path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text(json.dumps(stats, sort_keys=True), encoding="utf-8")
     return out
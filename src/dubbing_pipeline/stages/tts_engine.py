@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import abc
 import math
+from collections import OrderedDict
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -13,6 +15,8 @@ from dubbing_pipeline.utils.config import get_settings
 from dubbing_pipeline.utils.io import read_json, write_json
 from dubbing_pipeline.utils.log import logger
 
+_LATENTS_MAX = 64
+
 
 class TTSEngine(abc.ABC):
     @abc.abstractmethod
@@ -48,6 +52,9 @@ class CoquiXTTS(TTSEngine):
         self.model_name = settings.tts_model or "tts_models/multilingual/multi-dataset/xtts_v2"
         self._tts = None
         self._device = pick_device("auto")
+        # (ref path, mtime_ns) -> (gpt_cond_latent, speaker_embedding); reused across lines,
+        # least recently used dropped beyond _LATENTS_MAX (edited refs leave stale keys behind).
+        self._latents: OrderedDict[tuple[str, int], tuple[Any, Any]] = OrderedDict()
 
     def _load(self):
         if self._tts is not None:
@@ -146,6 +153,85 @@ class CoquiXTTS(TTSEngine):
                 )
         return out_path
 
+    def _xtts_model(self) -> Any | None:
+        tts = self._load()
+        model = getattr(getattr(tts, "synthesizer", None), "tts_model", None)
+        if model is None or not hasattr(model, "inference_stream"):
+            return None
+        return model
+
+    def can_stream(self) -> bool:
+        try:
+            return self._xtts_model() is not None
+        except Exception:
+            return False
+
+    def conditioning_latents(
+        self, *, speaker_wav: Path | None = None, speaker_id: str | None = None
+    ) -> tuple[Any, Any]:
+        """
+        XTTS speaker conditioning (GPT latent + speaker embedding), cached per reference WAV.
+        Presets come from the model's built-in speaker manager.
+        """
+        model = self._xtts_model()
+        if model is None:
+            raise RuntimeError("XTTS streaming API unavailable")
+        if speaker_wav is not None:
+            p = Path(speaker_wav)
+            key = (str(p.resolve()), int(p.stat().st_mtime_ns))
+            hit = self._latents.get(key)
+            if hit is None:
+                hit = tuple(model.get_conditioning_latents(audio_path=[str(p)]))
+                self._latents[key] = hit
+                while len(self._latents) > _LATENTS_MAX:
+                    self._latents.popitem(last=False)
+            else:
+                self._latents.move_to_end(key)
+            return hit
+        spk = str(speaker_id or get_settings().tts_speaker or "")
+        speakers = getattr(getattr(model, "speaker_manager", None), "speakers", None) or {}
+        if spk not in speakers:
+            raise ValueError(f"unknown XTTS speaker preset: {spk!r}")
+        rec = speakers[spk]
+        return rec["gpt_cond_latent"], rec["speaker_embedding"]
+
+    def synthesize_stream(
+        self,
+        text: str,
+        *,
+        language: str,
+        speaker_id: str | None = None,
+        speaker_wav: Path | None = None,
+        speed: float | None = None,
+        chunk_size: int = 20,
+    ) -> Iterator[tuple[Any, int]]:
+        """
+        Yield (float32 mono samples, sample_rate) chunks as XTTS generates them.
+        """
+        if not text.strip():
+            raise ValueError("Cannot synthesize empty text.")
+        import numpy as np  # type: ignore
+
+        model = self._xtts_model()
+        if model is None:
+            raise RuntimeError("XTTS streaming API unavailable")
+        gpt_latent, spk_emb = self.conditioning_latents(
+            speaker_wav=speaker_wav, speaker_id=speaker_id
+        )
+        sr = int(getattr(getattr(model.config, "audio", None), "output_sample_rate", 24000))
+        for chunk in model.inference_stream(
+            text,
+            language,
+            gpt_latent,
+            spk_emb,
+            stream_chunk_size=int(chunk_size),
+            speed=float(speed or 1.0),
+            enable_text_splitting=True,
+        ):
+            if hasattr(chunk, "detach"):
+                chunk = chunk.detach().cpu().numpy()
+            yield np.asarray(chunk, dtype=np.float32).reshape(-1), sr
+
 
 def _cosine_sim(a, b) -> float:
     import numpy as np  # type: ignore
@@ -10,6 +10,7 @@ from typing import Any
 from dubbing_pipeline.cache.store import cache_get, cache_put, make_key
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.checkpoint import read_ckpt, stage_is_done, write_ckpt
+from dubbing_pipeline.ops.spans import span
 from dubbing_pipeline.stages.tts_engine import CoquiXTTS, choose_similar_voice
 from dubbing_pipeline.utils.circuit import Circuit
 from dubbing_pipeline.utils.ffmpeg_safe import run_ffmpeg
@@ -170,6 +171,124 @@ def render_aligned_track(
         wf.writeframes(bytes(buf))
 
 
+def load_voice_bank_map() -> dict[str, str]:
+    """
+    Optional per-speaker preset mapping (voice bank map):
+      {"SPEAKER_01": "alice", "SPEAKER_02": "bob"}
+    """
+    settings = get_settings()
+    try:
+        voice_map_path = settings.voice_bank_map_path or settings.voice_map_path
+        if voice_map_path:
+            vm = read_json(Path(voice_map_path), default={})
+            if isinstance(vm, dict):
+                return {
+                    str(k): str(v) for k, v in vm.items() if str(k).strip() and str(v).strip()
+                }
+    except Exception:
+        pass
+    return {}
+
+
+def load_voice_map_items(
+    voice_map_json_path: Path | None,
+) -> tuple[dict[str, Path], dict[str, str], dict[str, str], set[str]]:
+    """
+    Optional rich voice map (per-job mapping) for per-speaker overrides.
+    Format: {"items":[{"character_id": "...", "speaker_strategy": "preset|zero-shot",
+             "tts_speaker": "...", "tts_speaker_wav": "..."}]}
+
+    Returns (wav overrides, preset overrides, voice modes, keep-original speaker ids).
+    """
+    per_speaker_wav_override: dict[str, Path] = {}
+    per_speaker_preset_override: dict[str, str] = {}
+    per_speaker_voice_mode: dict[str, str] = {}
+    per_speaker_keep_original: set[str] = set()
+    try:
+        vmj = str(voice_map_json_path) if voice_map_json_path else ""
+        if vmj:
+            data = read_json(Path(vmj), default={})
+            if isinstance(data, dict) and isinstance(data.get("items"), list):
+                for it in data.get("items", []):
+                    if not isinstance(it, dict):
+                        continue
+                    cid = str(it.get("character_id") or "").strip()
+                    strat = (
+                        str(it.get("speaker_strategy") or it.get("strategy") or "").strip().lower()
+                    )
+                    if not cid:
+                        continue
+                    if strat in {"original", "keep-original", "keep_original", "keep"}:
+                        per_speaker_keep_original.add(cid)
+                        per_speaker_voice_mode[cid] = "original"
+                        continue
+                    if strat in {"preset"}:
+                        per_speaker_voice_mode[cid] = "preset"
+                    if strat in {"zero-shot", "zeroshot", "clone"}:
+                        per_speaker_voice_mode[cid] = "clone"
+                    if strat in {"zero-shot", "zeroshot", "clone"}:
+                        wp = str(it.get("tts_speaker_wav") or "").strip()
+                        if wp:
+                            p = Path(wp)
+                            if p.exists():
+                                per_speaker_wav_override[cid] = p
+                    if strat in {"preset"}:
+                        spk = str(it.get("tts_speaker") or "").strip()
+                        if spk:
+                            per_speaker_preset_override[cid] = spk
+    except Exception:
+        per_speaker_wav_override = {}
+        per_speaker_preset_override = {}
+        per_speaker_voice_mode = {}
+        per_speaker_keep_original = set()
+    return (
+        per_speaker_wav_override,
+        per_speaker_preset_override,
+        per_speaker_voice_mode,
+        per_speaker_keep_original,
+    )
+
+
+def load_pronunciations(
+    pronunciation_dict: list[dict] | None,
+    pronunciation_overrides: dict[int, list[dict]] | None,
+) -> tuple[list[Any], dict[int, list[Any]]]:
+    """
+    Normalize the pronunciation dictionary (global) and per-segment overrides.
+    """
+    pron_global: list[Any] = []
+    pron_overrides: dict[int, list[Any]] = {}
+    try:
+        from dubbing_pipeline.text.pronunciation import normalize_pronunciations
+
+        if isinstance(pronunciation_dict, list):
+            pron_global = normalize_pronunciations(pronunciation_dict)
+        if isinstance(pronunciation_overrides, dict):
+            for k, v in pronunciation_overrides.items():
+                try:
+                    sid = int(k)
+                except Exception:
+                    continue
+                entries: list[dict[str, Any]] = []
+                if isinstance(v, list):
+                    entries = [x for x in v if isinstance(x, dict)]
+                elif isinstance(v, dict):
+                    if isinstance(v.get("entries"), list):
+                        entries = [x for x in v.get("entries") if isinstance(x, dict)]
+                    else:
+                        entries = [
+                            {"term": str(t), "ipa_or_phoneme": v[t]}
+                            for t in v.keys()
+                            if str(t).strip()
+                        ]
+                if entries:
+                    pron_overrides[int(sid)] = normalize_pronunciations(entries)
+    except Exception:
+        pron_global = []
+        pron_overrides = {}
+    return pron_global, pron_overrides
+
+
 def run(
     *,
     out_dir: Path,
@@ -299,61 +418,13 @@ def run(
     out_dir.mkdir(parents=True, exist_ok=True)
     ckpt_path = out_dir / ".checkpoint.json"
 
-    # Optional per-speaker preset mapping (voice bank map):
-    #   {"SPEAKER_01": "alice", "SPEAKER_02": "bob"}
-    voice_map: dict[str, str] = {}
-    try:
-        voice_map_path = settings.voice_bank_map_path or settings.voice_map_path
-        if voice_map_path:
-            vm = read_json(Path(voice_map_path), default={})
-            if isinstance(vm, dict):
-                voice_map = {
-                    str(k): str(v) for k, v in vm.items() if str(k).strip() and str(v).strip()
-                }
-    except Exception:
-        voice_map = {}
-
-    # Optional rich voice map (per-job mapping) for per-speaker overrides.
-    # Format: {"items":[{"character_id": "...", "speaker_strategy": "preset|zero-shot", "tts_speaker": "...", "tts_speaker_wav": "..."}]}
-    per_speaker_wav_override: dict[str, Path] = {}
-    per_speaker_preset_override: dict[str, str] = {}
-    per_speaker_voice_mode: dict[str, str] = {}
-    per_speaker_keep_original: set[str] = set()
-    try:
-        vmj = str(eff_voice_map_json_path) if eff_voice_map_json_path else ""
-        if vmj:
-            data = read_json(Path(vmj), default={})
-            if isinstance(data, dict) and isinstance(data.get("items"), list):
-                for it in data.get("items", []):
-                    if not isinstance(it, dict):
-                        continue
-                    cid = str(it.get("character_id") or "").strip()
-                    strat = str(it.get("speaker_strategy") or it.get("strategy") or "").strip().lower()
-                    if not cid:
-                        continue
-                    if strat in {"original", "keep-original", "keep_original", "keep"}:
-                        per_speaker_keep_original.add(cid)
-                        per_speaker_voice_mode[cid] = "original"
-                        continue
-                    if strat in {"preset"}:
-                        per_speaker_voice_mode[cid] = "preset"
-                    if strat in {"zero-shot", "zeroshot", "clone"}:
-                        per_speaker_voice_mode[cid] = "clone"
-                    if strat in {"zero-shot", "zeroshot", "clone"}:
-                        wp = str(it.get("tts_speaker_wav") or "").strip()
-                        if wp:
-                            p = Path(wp)
-                            if p.exists():
-                                per_speaker_wav_override[cid] = p
-                    if strat in {"preset"}:
-                        spk = str(it.get("tts_speaker") or "").strip()
-                        if spk:
-                            per_speaker_preset_override[cid] = spk
-    except Exception:
-        per_speaker_wav_override = {}
-        per_speaker_preset_override = {}
-        per_speaker_voice_mode = {}
-        per_speaker_keep_original = set()
+    voice_map = load_voice_bank_map()
+    (
+        per_speaker_wav_override,
+        per_speaker_preset_override,
+        per_speaker_voice_mode,
+        per_speaker_keep_original,
+    ) = load_voice_map_items(eff_voice_map_json_path)
 
     # Optional per-speaker voice profile refs (track-clone).
     voice_profile_ref_map: dict[str, Path] = {}
@@ -416,8 +487,10 @@ def run(
             if review_state_path is not None
             else (out_dir / "review" / "state.json")
         )
-        if rsp.exists():
-            st = read_json(rsp, default={})
+        from dubbing_pipeline.review.state import has_review_state, load_state
+
+        if has_review_state(rsp.parent.parent):
+            st = load_state(rsp.parent.parent)
             segs = st.get("segments", []) if isinstance(st, dict) else []
             if isinstance(segs, list):
                 for s in segs:
@@ -481,36 +554,7 @@ def run(
     voice_db_embeddings_dir = (settings.voice_db_path.parent / "embeddings").resolve()
 
     # Pronunciation dictionary (global + per-segment overrides).
-    pron_global: list[Any] = []
-    pron_overrides: dict[int, list[Any]] = {}
-    try:
-        from dubbing_pipeline.text.pronunciation import normalize_pronunciations
-
-        if isinstance(pronunciation_dict, list):
-            pron_global = normalize_pronunciations(pronunciation_dict)
-        if isinstance(pronunciation_overrides, dict):
-            for k, v in pronunciation_overrides.items():
-                try:
-                    sid = int(k)
-                except Exception:
-                    continue
-                entries: list[dict[str, Any]] = []
-                if isinstance(v, list):
-                    entries = [x for x in v if isinstance(x, dict)]
-                elif isinstance(v, dict):
-                    if isinstance(v.get("entries"), list):
-                        entries = [x for x in v.get("entries") if isinstance(x, dict)]
-                    else:
-                        entries = [
-                            {"term": str(t), "ipa_or_phoneme": v[t]}
-                            for t in v.keys()
-                            if str(t).strip()
-                        ]
-                if entries:
-                    pron_overrides[int(sid)] = normalize_pronunciations(entries)
-    except Exception:
-        pron_global = []
-        pron_overrides = {}
+    pron_global, pron_overrides = load_pronunciations(pronunciation_dict, pronunciation_overrides)
 
     def _rep(speaker_id: str) -> dict[str, Any]:
         sid = str(speaker_id or "default")
@@ -1012,18 +1056,19 @@ def run(
             except Exception:
                 pass
 
-        def _retry_wrap(fn_name: str, fn):
+        def _retry_wrap(fn_name: str, fn, segment: int = i):
             def _on_retry(n, delay, ex):
                 logger.warning("tts_retry", method=fn_name, attempt=n, delay_s=delay, error=str(ex))
 
-            return retry_call(
-                fn,
-                retries=int(settings.retry_max),
-                base=float(settings.retry_base_sec),
-                cap=float(settings.retry_cap_sec),
-                jitter=True,
-                on_retry=_on_retry,
-            )
+            with span(f"tts.{fn_name}", kind="tts_line", segment=segment):
+                return retry_call(
+                    fn,
+                    retries=int(settings.retry_max),
+                    base=float(settings.retry_base_sec),
+                    cap=float(settings.retry_cap_sec),
+                    jitter=True,
+                    on_retry=_on_retry,
+                )
 
         # If breaker is open, skip XTTS and go straight to fallbacks.
         if (
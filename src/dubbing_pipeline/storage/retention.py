@@ -97,6 +97,14 @@ def _collect_references(job_dir: Path) -> set[Path]:
                 _walk(data)
         except Exception:
             continue
+    # Row-level review state (review/state.db) references the current segment audio.
+    try:
+        from dubbing_pipeline.review.state import has_review_state, load_state
+
+        if has_review_state(job_dir):
+            _walk(load_state(job_dir))
+    except Exception:
+        pass
     return refs
 
 
@@ -157,6 +165,7 @@ def _important_intermediates(job_dir: Path) -> list[Path]:
     out.extend(list((job_dir / "expressive").glob("**/*")))
     out.extend(list((job_dir / "manifests").glob("*.json")))
     out.extend(list((job_dir / "review").glob("state.json")))
+    out.extend(list((job_dir / "review").glob("state.db*")))
     # per-job human log (kept even in minimal mode)
     out.extend([job_dir / "job.log"])
     return [p for p in out if p.exists()]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
 from dubbing_pipeline.utils.ffmpeg_safe import extract_audio_mono_16k, ffprobe_duration_seconds
+from dubbing_pipeline.utils.vad import iter_speech_segments
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,6 +21,47 @@ class Chunk:
         return d
 
 
+class _SpeechTimeline:
+    """
+    Lazily pulls finalized VAD segments so only the audio up to the current cut is scanned.
+    """
+
+    def __init__(self, segments: Iterator[tuple[float, float]]) -> None:
+        self._it = segments
+        self._done = False
+        self.segments: list[tuple[float, float]] = []
+
+    def _upto(self, t: float) -> None:
+        while not self._done and (not self.segments or self.segments[-1][0] <= t):
+            nxt = next(self._it, None)
+            if nxt is None:
+                self._done = True
+            else:
+                self.segments.append(nxt)
+
+    def snap(self, end: float, *, lo: float) -> float:
+        """
+        Move a cut at `end` back into the nearest silence within [lo, end] (gap centre when the
+        gap fits). Keeps `end` when it is already silent or no gap is in range.
+        """
+        self._upto(end)
+        if not any(s < end < e for s, e in self.segments):
+            return end
+        best = None
+        prev_e = 0.0
+        for s, e in self.segments:
+            if s >= end:
+                break
+            g0, g1 = prev_e, s
+            prev_e = e
+            a, b = max(g0, lo), min(g1, end)
+            if b <= a:
+                continue
+            c = min(max((g0 + g1) / 2.0, a), b)
+            best = c if best is None else max(best, c)
+        return end if best is None else float(best)
+
+
 def split_audio_to_chunks(
     *,
     source_wav: Path,
@@ -26,10 +69,15 @@ def split_audio_to_chunks(
     chunk_seconds: float = 10.0,
     overlap_seconds: float = 1.0,
     prefix: str = "chunk_",
+    speech_aware: bool = False,
+    boundary_search_s: float = 3.0,
 ) -> list[Chunk]:
     """
     Splits `source_wav` (any ffmpeg-readable audio) into mono 16k WAV chunks.
 
+    With `speech_aware`, chunk ends move back (up to `boundary_search_s`) into the nearest
+    silence so a cut does not land mid-utterance; needs `source_wav` to be a mono 16k WAV.
+
     Writes to:
       out_dir/<prefix><idx:03d>.wav
     """
@@ -44,12 +92,17 @@ def split_audio_to_chunks(
     cs = max(2.0, float(chunk_seconds))
     ov = max(0.0, min(float(overlap_seconds), cs * 0.9))
 
+    timeline = _SpeechTimeline(iter_speech_segments(source_wav)) if speech_aware else None
+    search = max(0.0, min(float(boundary_search_s), cs * 0.5 - ov))
+
     chunks: list[Chunk] = []
     start = 0.0
     idx = 0
     while start < total - 1e-3:
         idx += 1
         end = min(total, start + cs)
+        if timeline is not None and end < total and search > 0:
+            end = timeline.snap(end, lo=end - search)
         wav_out = out_dir / f"{prefix}{idx:03d}.wav"
         extract_audio_mono_16k(
             src=source_wav,
@@ -9,8 +9,12 @@ from typing import Any
 
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.stages.audio_extractor import extract as extract_audio
-from dubbing_pipeline.stages.transcription import transcribe
-from dubbing_pipeline.stages.translation import TranslationConfig, translate_segments
+from dubbing_pipeline.stages.transcription import transcribe, whisper_translate_sidecar
+from dubbing_pipeline.stages.translation import (
+    TranslationConfig,
+    translate_segments,
+    wants_whisper_translate,
+)
 from dubbing_pipeline.stages.tts import _write_silence_wav
 from dubbing_pipeline.streaming.chunker import Chunk, split_audio_to_chunks
 from dubbing_pipeline.streaming.context import StreamContextBuffer
@@ -272,6 +276,7 @@ def run_streaming(
         out_dir=chunks_dir,
         chunk_seconds=float(chunk_seconds),
         overlap_seconds=float(overlap_seconds),
+        speech_aware=bool(getattr(s, "stream_speech_boundaries", False)),
     )
     if not chunks:
         raise RuntimeError("stream: no chunks produced (audio duration is zero?)")
@@ -303,7 +308,9 @@ def run_streaming(
                 # Minimal artifacts; skip ASR/MT/TTS and create silence audio over video segment.
                 _write_silence_wav(dubbed_wav, duration_s=max(0.05, ch.end_s - ch.start_s))
             else:
-                # 3a) ASR
+                # 3a) ASR (+ Whisper translate on the same model handle when MT would use it)
+                hint = ctx.build_translation_hint()
+                run_mt = str(tgt_lang).lower() != "en" or str(mt_engine).lower() != "whisper"
                 transcribe(
                     audio_path=ch.wav_path,
                     srt_out=src_srt,
@@ -313,6 +320,9 @@ def run_streaming(
                     src_lang=src_lang,
                     tgt_lang=tgt_lang,
                     word_timestamps=(str(align_mode).lower() == "word"),
+                    also_translate=run_mt
+                    and wants_whisper_translate(str(mt_engine), src_lang, tgt_lang),
+                    translate_hint=hint or None,
                 )
                 meta = read_json(src_srt.with_suffix(".json"), default={})
                 cues = meta.get("segments_detail", []) if isinstance(meta, dict) else []
@@ -360,10 +370,11 @@ def run_streaming(
                     whisper_model=asr_model,
                     audio_path=str(ch.wav_path),
                     device=device,
-                    context_hint=ctx.build_translation_hint(),
+                    context_hint=hint,
+                    whisper_translate_path=str(whisper_translate_sidecar(src_srt)),
                 )
                 translated = segs_for_mt
-                if str(tgt_lang).lower() != "en" or str(mt_engine).lower() != "whisper":
+                if run_mt:
                     with suppress(Exception):
                         translated = translate_segments(
                             segs_for_mt, src_lang=src_lang, tgt_lang=tgt_lang, cfg=cfg
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import hashlib
 import subprocess
-from contextlib import suppress
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from pathlib import Path
 
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.ops.spans import span
 from dubbing_pipeline.utils.io import atomic_write_text, ensure_dir
 
 _FORBIDDEN_FLAGS = {
@@ -61,6 +65,42 @@ def run_ffmpeg(
     capture: bool = False,
 ) -> subprocess.CompletedProcess[str] | None:
     _validate_args(argv)
+    tool = Path(str(argv[0] if argv else "ffmpeg")).name
+    with span(tool, kind="ffmpeg", retries=int(retries)), _counted(tool):
+        return _run_ffmpeg_attempts(argv, timeout_s=timeout_s, retries=retries, capture=capture)
+
+
+@contextmanager
+def _counted(tool: str) -> Iterator[None]:
+    """
+    ffmpeg_calls_total{tool,result} and the in-flight gauge (ops.metrics, imported lazily).
+    """
+    try:
+        from dubbing_pipeline.ops.metrics import ffmpeg_call, ffmpeg_inflight
+    except Exception:
+        yield
+        return
+    result = "failed"
+    ffmpeg_inflight.inc()
+    try:
+        yield
+        result = "ok"
+    except FFmpegError as ex:
+        if isinstance(ex.__cause__, subprocess.TimeoutExpired):
+            result = "timeout"
+        raise
+    finally:
+        ffmpeg_inflight.dec()
+        ffmpeg_call(tool, result).inc()
+
+
+def _run_ffmpeg_attempts(
+    argv: list[str],
+    *,
+    timeout_s: int | None,
+    retries: int,
+    capture: bool,
+) -> subprocess.CompletedProcess[str] | None:
     last_ex: Exception | None = None
     for attempt in range(int(retries) + 1):
         try:
@@ -118,6 +158,71 @@ def run_ffmpeg(
     raise FFmpegError(f"ffmpeg failed (argv={argv})")
 
 
+def pipe_rawvideo(
+    argv: list[str], *, frame_bytes: int, timeout_s: int | None = None
+) -> Iterator[bytes]:
+    """
+    Run ffmpeg with `-f rawvideo ... pipe:1` and yield fixed-size frame buffers as they are
+    decoded (no temp files). A trailing partial frame is dropped.
+    Pass `-v error` in argv: stderr is buffered in a pipe until ffmpeg exits.
+    timeout_s bounds each wait for a frame (time the caller spends between frames does not
+    count): a stalled ffmpeg is killed and FFmpegError raised.
+    """
+    _validate_args(argv)
+    if int(frame_bytes) <= 0:
+        raise FFmpegError("frame_bytes must be > 0")
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except Exception as ex:
+        raise FFmpegError(f"ffmpeg spawn failed: {ex} (argv={argv})") from ex
+    assert proc.stdout is not None
+    finished = False
+    # Monotonic start of the read in progress (None between reads), checked by a watchdog.
+    reading_since: list[float | None] = [time.monotonic()]
+    stalled = threading.Event()
+    done = threading.Event()
+
+    def _watchdog() -> None:
+        limit = float(timeout_s or 0)
+        while not done.wait(min(1.0, limit / 4.0)):
+            t0 = reading_since[0]
+            if t0 is not None and time.monotonic() - t0 > limit:
+                stalled.set()
+                with suppress(Exception):
+                    proc.kill()
+                return
+
+    if timeout_s:
+        threading.Thread(target=_watchdog, name="ffmpeg-pipe-watchdog", daemon=True).start()
+    try:
+        while True:
+            reading_since[0] = time.monotonic()
+            buf = proc.stdout.read(int(frame_bytes))
+            reading_since[0] = None
+            if len(buf) < int(frame_bytes):
+                break
+            yield buf
+        finished = True
+    finally:
+        done.set()
+        if not finished:
+            with suppress(Exception):
+                proc.kill()
+        with suppress(Exception):
+            proc.stdout.close()
+        stderr = ""
+        with suppress(Exception):
+            stderr = proc.stderr.read().decode("utf-8", errors="replace") if proc.stderr else ""
+            proc.stderr.close()
+        rc = proc.wait(timeout=timeout_s)
+        with suppress(Exception):
+            _write_ffmpeg_logs(argv, stderr=stderr)
+    if stalled.is_set():
+        raise FFmpegError(f"ffmpeg produced no frame for {timeout_s}s (argv={argv})")
+    if rc != 0:
+        raise FFmpegError(f"ffmpeg failed (exit={rc})\nargv={argv}\nstderr_tail={_tail(stderr)}")
+
+
 def ffprobe_duration_seconds(path: Path, *, timeout_s: int = 20) -> float:
     s = get_settings()
     argv = [
@@ -131,17 +236,18 @@ def ffprobe_duration_seconds(path: Path, *, timeout_s: int = 20) -> float:
         str(path),
     ]
     _validate_args(argv)
-    try:
-        out = (
-            subprocess.check_output(argv, stderr=subprocess.DEVNULL, timeout=timeout_s)
-            .decode("utf-8", errors="replace")
-            .strip()
-        )
-        return float(out)
-    except subprocess.TimeoutExpired as ex:
-        raise FFmpegError("ffprobe timed out") from ex
-    except Exception as ex:
-        raise FFmpegError(f"ffprobe failed: {ex}") from ex
+    with _counted(Path(argv[0]).name):
+        try:
+            out = (
+                subprocess.check_output(argv, stderr=subprocess.DEVNULL, timeout=timeout_s)
+                .decode("utf-8", errors="replace")
+                .strip()
+            )
+            return float(out)
+        except subprocess.TimeoutExpired as ex:
+            raise FFmpegError("ffprobe timed out") from ex
+        except Exception as ex:
+            raise FFmpegError(f"ffprobe failed: {ex}") from ex
 
 
 def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
@@ -153,6 +259,7 @@ def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
       - duration_s: float
       - width: int (0 if unknown)
       - height: int (0 if unknown)
+      - video_codec: str ("" if unknown)
     """
     import json
 
@@ -168,14 +275,15 @@ def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
         str(path),
     ]
     _validate_args(argv)
-    try:
-        out = subprocess.check_output(argv, stderr=subprocess.DEVNULL, timeout=timeout_s).decode(
-            "utf-8", errors="replace"
-        )
-    except subprocess.TimeoutExpired as ex:
-        raise FFmpegError("ffprobe timed out") from ex
-    except Exception as ex:
-        raise FFmpegError(f"ffprobe failed: {ex}") from ex
+    with _counted(Path(argv[0]).name):
+        try:
+            out = subprocess.check_output(
+                argv, stderr=subprocess.DEVNULL, timeout=timeout_s
+            ).decode("utf-8", errors="replace")
+        except subprocess.TimeoutExpired as ex:
+            raise FFmpegError("ffprobe timed out") from ex
+        except Exception as ex:
+            raise FFmpegError(f"ffprobe failed: {ex}") from ex
 
     try:
         data = json.loads(out) if out else {}
@@ -188,6 +296,7 @@ def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
     duration_s = 0.0
     width = 0
     height = 0
+    video_codec = ""
 
     try:
         if isinstance(fmt, dict):
@@ -209,6 +318,7 @@ def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
             except Exception:
                 width = 0
                 height = 0
+            video_codec = str(st.get("codec_name") or "").strip()
             break
 
     return {
@@ -216,9 +326,90 @@ def ffprobe_media_info(path: Path, *, timeout_s: int = 20) -> dict:
         "duration_s": float(duration_s),
         "width": int(width),
         "height": int(height),
+        "video_codec": video_codec,
     }
 
 
+def ffprobe_keyframes(path: Path, *, timeout_s: int = 120) -> list[float]:
+    """
+    Sorted presentation times (seconds) of the first video stream's keyframes.
+
+    Reads packet flags only (no decoding), so it is cheap even for full episodes.
+    """
+    s = get_settings()
+    argv = [
+        str(s.ffprobe_bin),
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags",
+        "-of",
+        "csv=p=0",
+        str(path),
+    ]
+    _validate_args(argv)
+    with _counted(Path(argv[0]).name):
+        try:
+            out = subprocess.check_output(
+                argv, stderr=subprocess.DEVNULL, timeout=timeout_s
+            ).decode("utf-8", errors="replace")
+        except subprocess.TimeoutExpired as ex:
+            raise FFmpegError("ffprobe timed out") from ex
+        except Exception as ex:
+            raise FFmpegError(f"ffprobe failed: {ex}") from ex
+
+    times: set[float] = set()
+    for line in out.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) < 2 or "K" not in parts[1]:
+            continue
+        with suppress(ValueError):
+            times.add(float(parts[0]))
+    return sorted(times)
+
+
+def ffprobe_video_stream(path: Path, *, timeout_s: int = 20) -> dict[str, str]:
+    """
+    Codec parameters of the first video stream that must agree for `-c copy` concat:
+    codec_name, profile, level, pix_fmt, width, height, time_base (as ffprobe prints them;
+    {} when there is no video stream).
+    """
+    import json
+
+    s = get_settings()
+    argv = [
+        str(s.ffprobe_bin),
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name,profile,level,pix_fmt,width,height,time_base",
+        "-of",
+        "json",
+        str(path),
+    ]
+    _validate_args(argv)
+    with _counted(Path(argv[0]).name):
+        try:
+            out = subprocess.check_output(
+                argv, stderr=subprocess.DEVNULL, timeout=timeout_s
+            ).decode("utf-8", errors="replace")
+        except subprocess.TimeoutExpired as ex:
+            raise FFmpegError("ffprobe timed out") from ex
+        except Exception as ex:
+            raise FFmpegError(f"ffprobe failed: {ex}") from ex
+    try:
+        streams = (json.loads(out) if out else {}).get("streams") or []
+    except Exception as ex:
+        raise FFmpegError(f"ffprobe returned invalid JSON: {ex}") from ex
+    if not streams or not isinstance(streams[0], dict):
+        return {}
+    return {str(k): str(v) for k, v in streams[0].items()}
+
+
 def extract_audio_mono_16k(
     *,
     src: Path,
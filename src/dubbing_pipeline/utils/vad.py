@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import math
+import struct
 import wave
+from collections.abc import Iterable, Iterator
 from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from dubbing_pipeline.utils.log import logger
 
+# Samples per feed() when scanning a file (~16 s at 16 kHz).
+_BLOCK_SAMPLES = 1 << 18
+
 
 @dataclass(frozen=True, slots=True)
 class VADConfig:
@@ -19,18 +24,197 @@ class VADConfig:
     min_silence_ms: int = 250
 
 
-def _rms_int16(frame: bytes) -> float:
-    # frame is little-endian int16 PCM
-    if not frame:
-        return 0.0
-    n = len(frame) // 2
-    if n <= 0:
-        return 0.0
-    s = 0.0
-    for i in range(0, len(frame), 2):
-        v = int.from_bytes(frame[i : i + 2], "little", signed=True)
-        s += float(v * v)
-    return math.sqrt(s / n) / 32768.0
+def pcm16_view(path: Path) -> tuple[Any, int] | tuple[None, int]:
+    """
+    Memory-map the PCM data chunk of a mono int16 WAV. Returns (int16 array, sr).
+    """
+    import numpy as np  # type: ignore
+
+    try:
+        with wave.open(str(path), "rb") as wf:
+            sr = int(wf.getframerate())
+            ch = int(wf.getnchannels())
+            sw = int(wf.getsampwidth())
+            nframes = int(wf.getnframes())
+        if ch != 1 or sw != 2:
+            return None, sr
+        with Path(path).open("rb") as f:
+            hdr = f.read(12)
+            if hdr[:4] != b"RIFF" or hdr[8:12] != b"WAVE":
+                return None, sr
+            while True:
+                ch_hdr = f.read(8)
+                if len(ch_hdr) != 8:
+                    return None, sr
+                cid, size = ch_hdr[:4], struct.unpack("<I", ch_hdr[4:])[0]
+                if cid == b"data":
+                    offset = f.tell()
+                    break
+                f.seek(size + (size & 1), 1)
+        n = min(nframes, max(0, (Path(path).stat().st_size - offset) // 2))
+        if n <= 0:
+            return np.zeros(0, dtype="<i2"), sr
+        return np.memmap(str(path), dtype="<i2", mode="r", offset=offset, shape=(n,)), sr
+    except Exception:
+        return None, 0
+
+
+def _webrtc(cfg: VADConfig) -> Any:
+    try:
+        import webrtcvad  # type: ignore
+
+        return webrtcvad.Vad(int(cfg.aggressiveness))
+    except Exception:
+        return None
+
+
+class StreamingVAD:
+    """
+    Incremental VAD: feed int16 PCM blocks, get finalized speech segments back.
+
+    Energy is gated for a whole block at once; webrtcvad (when installed) only sees frames above
+    the gate. Segments are returned as soon as no later audio can extend or merge them, so
+    callers can act on speech boundaries while the rest of the file is still being read.
+    `feed()` + `flush()` over a whole file yields exactly `detect_speech_segments()`.
+    """
+
+    def __init__(self, cfg: VADConfig = VADConfig(), *, sample_rate: int | None = None) -> None:
+        self.cfg = cfg
+        self.sample_rate = int(sample_rate or cfg.sample_rate)
+        self.frame_len = max(1, int(self.sample_rate * (cfg.frame_ms / 1000.0)))
+        self._frame_s = cfg.frame_ms / 1000.0
+        # Non-speech frames that close a segment / largest gap still merged afterwards.
+        self._split_frames = max(1, -(-int(cfg.min_silence_ms) // max(1, int(cfg.frame_ms))))
+        self._vad = _webrtc(cfg)
+        self._carry = b""
+        self._frames = 0
+        self._open: list[int] | None = None  # [start_frame, end_frame) of the current segment
+        self._pending: tuple[int, int] | None = None
+        self.frames_checked = 0  # frames handed to webrtcvad
+
+    @property
+    def position_s(self) -> float:
+        return self._frames * self._frame_s
+
+    def _speech_flags(self, x: Any, *, partial: bool = False) -> Any:
+        import numpy as np  # type: ignore
+
+        xf = x.astype(np.float64)
+        rms = np.sqrt(np.mean(xf * xf, axis=1)) / 32768.0
+        speech = rms >= float(self.cfg.energy_gate)
+        if self._vad is not None and not partial:
+            idx = np.flatnonzero(speech)
+            self.frames_checked += int(idx.size)
+            for i in idx:
+                with suppress(Exception):
+                    speech[i] = bool(self._vad.is_speech(x[i].tobytes(), self.sample_rate))
+        return speech
+
+    def _close(self, start: int, end: int, out: list[tuple[float, float]]) -> None:
+        if (end - start) * self.cfg.frame_ms < int(self.cfg.min_speech_ms):
+            return
+        if self._pending is not None:
+            if (start - self._pending[1]) * self.cfg.frame_ms <= int(self.cfg.min_silence_ms):
+                self._pending = (self._pending[0], end)
+                return
+            out.append(self._seconds(self._pending))
+        self._pending = (start, end)
+
+    def _seconds(self, seg: tuple[int, int]) -> tuple[float, float]:
+        return (seg[0] * self._frame_s, seg[1] * self._frame_s)
+
+    def _advance(self, speech: Any, out: list[tuple[float, float]]) -> None:
+        import numpy as np  # type: ignore
+
+        base = self._frames
+        self._frames += int(speech.shape[0])
+        idx = np.flatnonzero(speech) + base
+        k = self._split_frames
+        if idx.size:
+            brk = np.flatnonzero(np.diff(idx) > k)
+            starts = idx[np.concatenate(([0], brk + 1))].tolist()
+            ends = (idx[np.concatenate((brk, [idx.size - 1]))] + 1).tolist()
+            if self._open is not None:
+                if starts[0] - self._open[1] >= k:
+                    self._close(self._open[0], self._open[1], out)
+                else:
+                    starts[0] = self._open[0]
+            for s, e in zip(starts[:-1], ends[:-1], strict=True):
+                self._close(s, e, out)
+            self._open = [starts[-1], ends[-1]]
+        if self._open is not None and self._frames - self._open[1] >= k:
+            self._close(self._open[0], self._open[1], out)
+            self._open = None
+        # Nothing later can merge into the pending segment once the gap exceeds min_silence.
+        if self._pending is not None:
+            nxt = self._open[0] if self._open is not None else self._frames
+            if (nxt - self._pending[1]) * self.cfg.frame_ms > int(self.cfg.min_silence_ms):
+                out.append(self._seconds(self._pending))
+                self._pending = None
+
+    def feed(self, pcm: bytes | Any) -> list[tuple[float, float]]:
+        """
+        Consume little-endian int16 PCM (bytes or an int16 array); return finalized segments.
+        """
+        import numpy as np  # type: ignore
+
+        if not isinstance(pcm, bytes | bytearray | memoryview):
+            pcm = np.ascontiguousarray(pcm, dtype="<i2").tobytes()
+        buf = self._carry + bytes(pcm) if self._carry else pcm
+        step = 2 * self.frame_len
+        n = len(buf) // step
+        self._carry = bytes(buf[n * step :])
+        out: list[tuple[float, float]] = []
+        if n:
+            x = np.frombuffer(buf, dtype="<i2", count=n * self.frame_len).reshape(n, -1)
+            self._advance(self._speech_flags(x), out)
+        return out
+
+    def flush(self) -> list[tuple[float, float]]:
+        """
+        End of stream: a trailing partial frame is judged on energy alone.
+        """
+        import numpy as np  # type: ignore
+
+        out: list[tuple[float, float]] = []
+        if len(self._carry) >= 2:
+            x = np.frombuffer(self._carry, dtype="<i2", count=len(self._carry) // 2)
+            self._advance(self._speech_flags(x.reshape(1, -1), partial=True), out)
+        self._carry = b""
+        if self._open is not None:
+            self._close(self._open[0], self._open[1], out)
+            self._open = None
+        if self._pending is not None:
+            out.append(self._seconds(self._pending))
+            self._pending = None
+        return out
+
+    def run(self, blocks: Iterable[bytes | Any]) -> Iterator[tuple[float, float]]:
+        """
+        Generator over PCM blocks yielding speech segments as they finalize.
+        """
+        for b in blocks:
+            yield from self.feed(b)
+        yield from self.flush()
+
+
+def iter_speech_segments(
+    wav_path: str | Path, cfg: VADConfig = VADConfig()
+) -> Iterator[tuple[float, float]]:
+    """
+    Stream speech segments of a mono int16 WAV, memory-mapping it in large blocks.
+    """
+    path = Path(wav_path)
+    if not path.exists():
+        return
+    x, sr = pcm16_view(path)
+    if x is None:
+        logger.warning("VAD expects 16kHz mono int16; unreadable wav=%s", str(path))
+        return
+    if sr != cfg.sample_rate:
+        logger.warning("VAD expects 16kHz mono int16; got sr=%s ch=1 sw=2", sr)
+    vad = StreamingVAD(cfg, sample_rate=sr)
+    yield from vad.run(x[i : i + _BLOCK_SAMPLES] for i in range(0, x.shape[0], _BLOCK_SAMPLES))
 
 
 def detect_speech_segments(
@@ -42,67 +226,4 @@ def detect_speech_segments(
       - fallback to pure energy gate if not available
     Assumes 16kHz mono PCM WAV (pipeline extracts this).
     """
-    path = Path(wav_path)
-    if not path.exists():
-        return []
-
-    try:
-        import webrtcvad  # type: ignore
-
-        vad = webrtcvad.Vad(int(cfg.aggressiveness))
-        use_webrtc = True
-    except Exception:
-        vad = None
-        use_webrtc = False
-
-    with wave.open(str(path), "rb") as wf:
-        sr = wf.getframerate()
-        ch = wf.getnchannels()
-        sw = wf.getsampwidth()
-        if sr != cfg.sample_rate or ch != 1 or sw != 2:
-            logger.warning("VAD expects 16kHz mono int16; got sr=%s ch=%s sw=%s", sr, ch, sw)
-
-        frames: list[tuple[float, float, bool]] = []
-        t = 0.0
-        while True:
-            buf = wf.readframes(int(sr * (cfg.frame_ms / 1000.0)))
-            if not buf:
-                break
-            rms = _rms_int16(buf)
-            speech = rms >= cfg.energy_gate
-            if use_webrtc and speech:
-                with suppress(Exception):
-                    speech = bool(vad.is_speech(buf, sr))
-            frames.append((t, t + cfg.frame_ms / 1000.0, speech))
-            t += cfg.frame_ms / 1000.0
-
-    # Merge frames into segments with min silence
-    segs: list[tuple[float, float]] = []
-    cur_start = None
-    last_speech_end = None
-    for start, end, speech in frames:
-        if speech:
-            if cur_start is None:
-                cur_start = start
-            last_speech_end = end
-        else:
-            if cur_start is not None and last_speech_end is not None:
-                silence_ms = (end - last_speech_end) * 1000.0
-                if silence_ms >= cfg.min_silence_ms:
-                    segs.append((cur_start, last_speech_end))
-                    cur_start = None
-                    last_speech_end = None
-
-    if cur_start is not None and last_speech_end is not None:
-        segs.append((cur_start, last_speech_end))
-
-    # Filter short segments and merge small gaps
-    out: list[tuple[float, float]] = []
-    for s, e in segs:
-        if (e - s) * 1000.0 < cfg.min_speech_ms:
-            continue
-        if out and s - out[-1][1] <= cfg.min_silence_ms / 1000.0:
-            out[-1] = (out[-1][0], e)
-        else:
-            out.append((s, e))
-    return out
+    return list(iter_speech_segments(wav_path, cfg))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import heapq
 import json
 import math
+import os
 import time
 import wave
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,7 +15,7 @@ from typing import Any
 from dubbing_pipeline.utils.io import atomic_copy, atomic_write_text, write_json
 from dubbing_pipeline.utils.ffmpeg_safe import extract_audio_mono_16k
 from dubbing_pipeline.utils.log import logger
-from dubbing_pipeline.utils.vad import VADConfig, detect_speech_segments
+from dubbing_pipeline.utils.vad import VADConfig, detect_speech_segments, pcm16_view
 
 
 @dataclass(frozen=True, slots=True)
@@ -51,17 +54,6 @@ class ExtractRefsConfig:
     target_rms_dbfs: float = -20.0
 
 
-def _read_wav_pcm16(path: Path) -> tuple[int, bytes]:
-    with wave.open(str(path), "rb") as wf:
-        sr = int(wf.getframerate())
-        ch = int(wf.getnchannels())
-        sw = int(wf.getsampwidth())
-        if ch != 1 or sw != 2:
-            raise ValueError(f"expected mono int16 wav; got ch={ch} sw={sw} ({path})")
-        frames = wf.readframes(wf.getnframes())
-        return sr, frames
-
-
 def _wav_duration_s(path: Path) -> float:
     try:
         with wave.open(str(path), "rb") as wf:
@@ -72,31 +64,74 @@ def _wav_duration_s(path: Path) -> float:
         return 0.0
 
 
-def _frames_s(frames: bytes, sr: int) -> float:
-    if sr <= 0:
-        return 0.0
-    return float(len(frames) // 2) / float(sr)
-
+def _rms_norm_int16(x: Any) -> float:
+    # normalized RMS in [0, 1] of an int16 sample array
+    import numpy as np  # type: ignore
 
-def _rms_norm_int16(buf: bytes) -> float:
-    # normalized RMS in [0, 1]
-    if not buf:
+    if len(x) == 0:
         return 0.0
-    n = max(1, len(buf) // 2)
-    s = 0.0
-    for i in range(0, len(buf), 2):
-        v = int.from_bytes(buf[i : i + 2], "little", signed=True)
-        s += float(v * v)
-    return math.sqrt(s / n) / 32768.0
+    xf = np.asarray(x, dtype=np.float64)
+    return math.sqrt(float(np.dot(xf, xf)) / float(len(xf))) / 32768.0
 
 
-def _percentile(vals: list[float], p: float) -> float:
-    if not vals:
+def _percentile(vals: Any, p: float) -> float:
+    # Nearest-rank on the sorted values (index rounded like the original list version).
+    import numpy as np  # type: ignore
+
+    if len(vals) == 0:
         return 0.0
     p = max(0.0, min(1.0, float(p)))
-    xs = sorted(vals)
-    i = int(round(p * (len(xs) - 1)))
-    return float(xs[max(0, min(len(xs) - 1, i))])
+    i = max(0, min(len(vals) - 1, int(round(p * (len(vals) - 1)))))
+    return float(np.partition(np.asarray(vals), i)[i])
+
+
+@dataclass(slots=True)
+class _Waveform:
+    """
+    16 kHz mono int16 audio (memory-mapped) plus its VAD speech spans in samples.
+    Candidates are scored as spans of this array; nothing is sliced to disk.
+    """
+
+    path: Path
+    x: Any
+    sr: int
+    speech_starts: Any
+    speech_ends: Any
+
+    @classmethod
+    def load(cls, path: Path, vad: VADConfig) -> _Waveform | None:
+        import numpy as np  # type: ignore
+
+        x, sr = pcm16_view(Path(path))
+        if x is None or sr != int(vad.sample_rate):
+            return None
+        spans = detect_speech_segments(path, vad)
+        starts = np.array([int(float(s) * sr) for s, _e in spans], dtype=np.int64)
+        ends = np.array([int(float(e) * sr) for _s, e in spans], dtype=np.int64)
+        n = int(x.shape[0])
+        return cls(Path(path), x, int(sr), np.clip(starts, 0, n), np.clip(ends, 0, n))
+
+    @property
+    def n(self) -> int:
+        return int(self.x.shape[0])
+
+    def span(self, start_s: float, end_s: float) -> tuple[int, int]:
+        i0 = max(0, min(self.n, int(round(float(start_s) * self.sr))))
+        i1 = max(i0, min(self.n, int(round(float(end_s) * self.sr))))
+        return i0, i1
+
+    def speech_parts(self, i0: int, i1: int) -> list[tuple[int, int]]:
+        import numpy as np  # type: ignore
+
+        lo = int(np.searchsorted(self.speech_ends, i0, side="right"))
+        hi = int(np.searchsorted(self.speech_starts, i1, side="left"))
+        out = []
+        for k in range(lo, hi):
+            a = max(i0, int(self.speech_starts[k]))
+            b = min(i1, int(self.speech_ends[k]))
+            if b > a:
+                out.append((a, b))
+        return out
 
 
 @dataclass(frozen=True, slots=True)
@@ -129,7 +164,22 @@ class CandidateScore:
         }
 
 
-def _analyze_candidate(wav_path: Path, *, start_s: float, end_s: float, speaker_id: str, cfg: VoiceRefConfig) -> CandidateScore | None:
+def _score_span(
+    w: _Waveform,
+    i0: int,
+    i1: int,
+    *,
+    start_s: float,
+    end_s: float,
+    speaker_id: str,
+    cfg: VoiceRefConfig,
+) -> CandidateScore | None:
+    """
+    Score samples [i0, i1) of a shared waveform: speech ratio from the VAD spans, per-frame
+    RMS percentiles and clipped frames, all computed on array views.
+    """
+    import numpy as np  # type: ignore
+
     dur = max(0.0, float(end_s) - float(start_s))
     if dur <= 0.0:
         return None
@@ -138,58 +188,35 @@ def _analyze_candidate(wav_path: Path, *, start_s: float, end_s: float, speaker_
     if dur > float(cfg.max_candidate_s):
         # Too long tends to include noise/music; prefer smaller utterances.
         return None
-
-    # Basic format sanity
-    try:
-        sr, frames = _read_wav_pcm16(wav_path)
-    except Exception:
-        return None
-    if sr != int(cfg.vad.sample_rate):
+    total = int(i1) - int(i0)
+    if total <= 0:
         return None
 
-    # Trim to VAD speech-only frames (best-effort).
-    speech = detect_speech_segments(wav_path, cfg.vad)
-    speech_frames = bytearray()
-    total_frames = len(frames) // 2
-    for s0, e0 in speech:
-        i0 = max(0, min(total_frames, int(float(s0) * sr)))
-        i1 = max(0, min(total_frames, int(float(e0) * sr)))
-        if i1 <= i0:
-            continue
-        speech_frames += frames[i0 * 2 : i1 * 2]
-
-    total_s = _frames_s(frames, sr)
-    speech_s = _frames_s(bytes(speech_frames), sr)
-    if total_s <= 1e-6:
-        return None
-    speech_ratio = float(speech_s / total_s)
+    parts = w.speech_parts(i0, i1)
+    speech_n = sum(b - a for a, b in parts)
+    total_s = float(total) / float(w.sr)
+    speech_ratio = float(speech_n) / float(total)
     if speech_ratio < float(cfg.min_speech_ratio):
         return None
 
-    # Per-frame RMS distribution (for noise/loudness proxy)
-    frame_ms = int(cfg.vad.frame_ms)
-    frame_n = max(1, int(sr * (frame_ms / 1000.0)))
-    rms_vals: list[float] = []
-    clip_cnt = 0
-    frame_cnt = 0
-    for off in range(0, len(frames), frame_n * 2):
-        buf = frames[off : off + frame_n * 2]
-        if not buf:
-            continue
-        frame_cnt += 1
-        r = _rms_norm_int16(buf)
-        rms_vals.append(r)
-        # crude clip detection: any sample near full scale
-        with suppress(Exception):
-            for j in range(0, len(buf), 2):
-                v = int.from_bytes(buf[j : j + 2], "little", signed=True)
-                if abs(v) >= 32700:
-                    clip_cnt += 1
-                    break
-    if not rms_vals:
-        return None
-
-    rms = max(1e-8, float(_rms_norm_int16(bytes(speech_frames)) or _rms_norm_int16(frames)))
+    # Per-frame RMS distribution (for noise/loudness proxy); the last frame may be partial.
+    seg = np.asarray(w.x[i0:i1], dtype=np.float64)
+    frame_n = max(1, int(w.sr * (int(cfg.vad.frame_ms) / 1000.0)))
+    nf = total // frame_n
+    sq = seg * seg
+    ms = list(sq[: nf * frame_n].reshape(nf, frame_n).mean(axis=1)) if nf else []
+    hot = np.abs(seg) >= 32700
+    clip_cnt = int(hot[: nf * frame_n].reshape(nf, frame_n).any(axis=1).sum()) if nf else 0
+    if nf * frame_n < total:
+        ms.append(float(sq[nf * frame_n :].mean()))
+        clip_cnt += int(bool(hot[nf * frame_n :].any()))
+    rms_vals = np.sqrt(np.asarray(ms, dtype=np.float64)) / 32768.0
+    frame_cnt = int(rms_vals.shape[0])
+
+    speech_sq = sum(float(sq[a - i0 : b - i0].sum()) for a, b in parts)
+    speech_rms = math.sqrt(speech_sq / speech_n) / 32768.0 if speech_n else 0.0
+    all_rms = math.sqrt(float(sq.sum()) / float(total)) / 32768.0
+    rms = max(1e-8, float(speech_rms or all_rms))
     rms_dbfs = 20.0 * math.log10(rms)
 
     p20 = _percentile(rms_vals, 0.20)
@@ -211,7 +238,7 @@ def _analyze_candidate(wav_path: Path, *, start_s: float, end_s: float, speaker_
     )
 
     return CandidateScore(
-        path=wav_path,
+        path=w.path,
         start_s=float(start_s),
         end_s=float(end_s),
         speaker_id=str(speaker_id),
@@ -225,6 +252,18 @@ def _analyze_candidate(wav_path: Path, *, start_s: float, end_s: float, speaker_
     )
 
 
+def _analyze_candidate(
+    wav_path: Path, *, start_s: float, end_s: float, speaker_id: str, cfg: VoiceRefConfig
+) -> CandidateScore | None:
+    """
+    Score a candidate that lives in its own WAV file (whole file = the candidate).
+    """
+    w = _Waveform.load(wav_path, cfg.vad)
+    if w is None:
+        return None
+    return _score_span(w, 0, w.n, start_s=start_s, end_s=end_s, speaker_id=speaker_id, cfg=cfg)
+
+
 def _exclude_overlaps(segments: list[dict[str, Any]], *, eps_s: float) -> set[int]:
     """
     Returns indices of segments to drop due to overlap with another speaker.
@@ -261,75 +300,35 @@ def _exclude_overlaps(segments: list[dict[str, Any]], *, eps_s: float) -> set[in
     return drop
 
 
-def _concat_wavs(paths: list[Path], *, out_path: Path, cfg: VoiceRefConfig) -> float:
+def _ref_pcm(parts: list[Any], *, sr: int, silence_pad_ms: int, target_rms_dbfs: float) -> Any:
     """
-    Concatenate input wavs (16k mono int16) with a small silence pad between.
-    Returns duration_s.
+    Concatenate int16 sample arrays with a small silence pad between, then RMS-normalize
+    (gain clamped to +/-18 dB, hard-clipped to int16).
     """
-    sr = int(cfg.vad.sample_rate)
-    pad_frames = max(0, int(float(cfg.silence_pad_ms) / 1000.0 * sr))
-    pad = b"\x00\x00" * pad_frames
-
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    frames_all = bytearray()
-    for p in paths:
-        try:
-            sr2, frames = _read_wav_pcm16(p)
-            if sr2 != sr:
-                continue
-            frames_all += frames
-            frames_all += pad
-        except Exception:
-            continue
-
-    # Trim trailing pad
-    if pad and len(frames_all) >= len(pad):
-        frames_all = frames_all[: -len(pad)]
-
-    with wave.open(str(out_path), "wb") as wf:
+    import numpy as np  # type: ignore
+
+    pad = np.zeros(max(0, int(float(silence_pad_ms) / 1000.0 * sr)), dtype=np.int16)
+    chunks: list[Any] = []
+    for x in parts:
+        if chunks and pad.size:
+            chunks.append(pad)
+        chunks.append(np.asarray(x, dtype=np.int16))
+    pcm = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+    if pcm.size == 0:
+        return pcm
+    rms = max(1e-8, float(_rms_norm_int16(pcm)))
+    gain_db = max(-18.0, min(18.0, float(target_rms_dbfs) - 20.0 * math.log10(rms)))
+    gain = 10.0 ** (gain_db / 20.0)
+    return np.clip(np.rint(pcm.astype(np.float64) * gain), -32768, 32767).astype("<i2")
+
+
+def _write_pcm16(path: Path, pcm: Any, *, sr: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
-        wf.setframerate(sr)
-        wf.writeframes(bytes(frames_all))
-
-    return _frames_s(bytes(frames_all), sr)
-
-
-def _normalize_wav_rms(path: Path, *, target_rms_dbfs: float) -> None:
-    """
-    Simple RMS normalization with hard clipping prevention (no external deps).
-    """
-    try:
-        with wave.open(str(path), "rb") as wf:
-            sr = int(wf.getframerate())
-            ch = int(wf.getnchannels())
-            sw = int(wf.getsampwidth())
-            if ch != 1 or sw != 2:
-                return
-            frames = bytearray(wf.readframes(wf.getnframes()))
-        if not frames:
-            return
-        rms = max(1e-8, float(_rms_norm_int16(bytes(frames))))
-        cur_db = 20.0 * math.log10(rms)
-        gain_db = float(target_rms_dbfs) - float(cur_db)
-        # clamp extreme gains
-        gain_db = max(-18.0, min(18.0, gain_db))
-        gain = 10.0 ** (gain_db / 20.0)
-        # apply gain with clipping prevention
-        for i in range(0, len(frames), 2):
-            v = int.from_bytes(frames[i : i + 2], "little", signed=True)
-            vv = int(round(float(v) * float(gain)))
-            vv = max(-32768, min(32767, vv))
-            frames[i : i + 2] = int(vv).to_bytes(2, "little", signed=True)
-        tmp = Path(str(path) + ".norm.tmp")
-        with wave.open(str(tmp), "wb") as wf2:
-            wf2.setnchannels(1)
-            wf2.setsampwidth(2)
-            wf2.setframerate(sr)
-            wf2.writeframes(bytes(frames))
-        tmp.replace(path)
-    except Exception:
-        return
+        wf.setframerate(int(sr))
+        wf.writeframes(pcm.astype("<i2").tobytes())
 
 
 def _write_voice_store_index(voice_store_dir: Path, mapping: dict[str, Any], *, cfg: VoiceRefConfig) -> Path:
@@ -480,6 +479,183 @@ def extract_speaker_refs_legacy(
     return out
 
 
+def _shared_waveform(
+    dialogue_wav: Path, tmp_dir: Path, vad: VADConfig, *, max_end_s: float
+) -> _Waveform | None:
+    """
+    The job's dialogue audio as one 16 kHz mono waveform (decoded once if it is in another
+    format). None when it is unusable or does not cover the timeline (e.g. a segment clip).
+    """
+    if not dialogue_wav.is_file():
+        return None
+    w = _Waveform.load(dialogue_wav, vad)
+    if w is None:
+        dec = (tmp_dir / "_dialogue_16k.wav").resolve()
+        with suppress(Exception):
+            extract_audio_mono_16k(src=dialogue_wav, dst=dec, timeout_s=600)
+            w = _Waveform.load(dec, vad)
+    if w is None or float(w.n) / float(w.sr) + 0.5 < float(max_end_s):
+        return None
+    return w
+
+
+def _candidate_source(
+    shared: _Waveform | None,
+    *,
+    idx: int,
+    st: float,
+    en: float,
+    wav_path: str,
+    speaker_id: str,
+    dialogue_wav: Path,
+    tmp_dir: Path,
+    vad: VADConfig,
+    suffix: str = "",
+) -> tuple[_Waveform, int, int] | str:
+    """
+    (waveform, i0, i1) for one candidate, or a rejection reason.
+    Without a shared waveform, falls back to the candidate's own clip (sliced if missing).
+    """
+    if shared is not None:
+        i0, i1 = shared.span(st, en)
+        return shared, i0, i1
+    p: Path | None = None
+    if wav_path:
+        with suppress(Exception):
+            cand = Path(wav_path).resolve()
+            if cand.exists() and cand.is_file():
+                p = cand
+    if p is None:
+        p = (tmp_dir / f"{speaker_id}_{idx:04d}{suffix}.wav").resolve()
+        try:
+            extract_audio_mono_16k(
+                src=dialogue_wav, dst=p, start_s=float(st), end_s=float(en), timeout_s=120
+            )
+        except Exception as ex:
+            return f"slice_failed:{ex}"
+    if _wav_duration_s(p) > max(3.0, (en - st) * 3.0):
+        return "bad_candidate_duration"
+    w = _Waveform.load(p, vad)
+    if w is None:
+        return "score_rejected"
+    return w, 0, w.n
+
+
+def _keep_limit(config: ExtractRefsConfig) -> int | None:
+    """
+    How many top candidates per speaker can matter: selection stops once the speech-weighted
+    duration reaches the target, and every scored candidate adds at least
+    min_seg_seconds * min_speech_ratio (10% slack for clip rounding).
+    """
+    per = 0.9 * float(config.min_seg_seconds) * float(config.min_speech_ratio)
+    if per <= 0.0:
+        return None
+    return int(math.ceil(float(config.target_seconds) / per)) + 1
+
+
+def _select_speaker(
+    speaker_id: str,
+    segs: list[tuple[int, float, float, str]],
+    *,
+    shared: _Waveform | None,
+    dialogue_wav: Path,
+    tmp_dir: Path,
+    cfg: VoiceRefConfig,
+    config: ExtractRefsConfig,
+) -> dict[str, Any]:
+    """
+    Score one speaker's candidates, keeping only a bounded top-k heap, and pick the refs.
+    """
+    rejected: list[dict[str, Any]] = []
+    limit = _keep_limit(config)
+    heap: list[tuple[float, int, CandidateScore, _Waveform, int, int]] = []
+    for seq, (idx, st, en, wp0) in enumerate(segs):
+        dur = max(0.0, float(en) - float(st))
+        if dur < float(config.min_seg_seconds):
+            rejected.append({"start": st, "end": en, "reason": "too_short"})
+            continue
+        if config.max_seg_seconds is not None and dur > float(config.max_seg_seconds):
+            rejected.append({"start": st, "end": en, "reason": "too_long"})
+            continue
+        src = _candidate_source(
+            shared,
+            idx=idx,
+            st=st,
+            en=en,
+            wav_path=wp0,
+            speaker_id=speaker_id,
+            dialogue_wav=dialogue_wav,
+            tmp_dir=tmp_dir,
+            vad=cfg.vad,
+        )
+        if isinstance(src, str):
+            rejected.append({"start": st, "end": en, "reason": src})
+            continue
+        w, i0, i1 = src
+        sc = _score_span(w, i0, i1, start_s=st, end_s=en, speaker_id=speaker_id, cfg=cfg)
+        if sc is None:
+            rejected.append({"start": st, "end": en, "reason": "score_rejected"})
+            continue
+        # Ties keep timeline order: the later candidate is the smaller heap entry.
+        entry = (float(sc.score), -seq, sc, w, i0, i1)
+        if limit is None or len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    chosen: list[tuple[CandidateScore, _Waveform, int, int]] = []
+    acc = 0.0
+    for _score, _neg, c, w, i0, i1 in sorted(heap, key=lambda e: (-e[0], -e[1])):
+        if acc >= float(config.target_seconds):
+            break
+        chosen.append((c, w, i0, i1))
+        acc += float(c.duration_s) * float(max(0.0, min(1.0, c.speech_ratio)))
+
+    warnings: list[str] = []
+    if not chosen:
+        warnings.append("no_good_candidates")
+        # fallback: pick longest non-overlap segment (even if low speech ratio)
+        best = None
+        best_d = 0.0
+        for idx, st, en, wp0 in segs:
+            d = max(0.0, float(en) - float(st))
+            if d > best_d:
+                best_d = d
+                best = (idx, st, en, wp0)
+        if best is not None:
+            idx, st, en, wp0 = best
+            src = _candidate_source(
+                shared,
+                idx=idx,
+                st=st,
+                en=en,
+                wav_path=wp0,
+                speaker_id=speaker_id,
+                dialogue_wav=dialogue_wav,
+                tmp_dir=tmp_dir,
+                vad=cfg.vad,
+                suffix=".fallback",
+            )
+            if not isinstance(src, str):
+                w, i0, i1 = src
+                relaxed = VoiceRefConfig(
+                    target_s=cfg.target_s,
+                    overlap_eps_s=cfg.overlap_eps_s,
+                    min_candidate_s=0.0,
+                    max_candidate_s=cfg.max_candidate_s,
+                    min_speech_ratio=0.0,
+                    silence_pad_ms=cfg.silence_pad_ms,
+                    vad=cfg.vad,
+                    index_name=cfg.index_name,
+                )
+                sc2 = _score_span(
+                    w, i0, i1, start_s=st, end_s=en, speaker_id=speaker_id, cfg=relaxed
+                )
+                if sc2 is not None:
+                    chosen = [(sc2, w, i0, i1)]
+    return {"chosen": chosen, "rejected": rejected, "warnings": warnings}
+
+
 def extract_speaker_refs(
     diarization_timeline: list[dict[str, Any]],
     dialogue_wav: Path,
@@ -491,7 +667,9 @@ def extract_speaker_refs(
 
     Inputs:
     - diarization_timeline: list of dicts with at least {start,end,speaker_id}. Optional wav_path.
-    - dialogue_wav: source audio; used only when timeline entries don't provide wav_path.
+    - dialogue_wav: source audio. When it decodes and covers the whole timeline, every candidate
+      is scored and cut from it and per-entry wav_path is ignored; otherwise each candidate
+      reads its own wav_path (sliced from dialogue_wav when that is missing).
     - out_dir: directory to write speaker refs + manifest.json
     - config: ExtractRefsConfig
 
@@ -562,100 +740,36 @@ def extract_speaker_refs(
     tmp_dir = out_dir / "_segments"
     tmp_dir.mkdir(parents=True, exist_ok=True)
 
-    for speaker_id, segs in sorted(by_spk.items(), key=lambda x: x[0]):
-        rejected: list[dict[str, Any]] = []
-        cand_scores: list[CandidateScore] = []
-        for idx, st, en, wp0 in segs:
-            dur = max(0.0, float(en) - float(st))
-            if dur < float(config.min_seg_seconds):
-                rejected.append({"start": st, "end": en, "reason": "too_short"})
-                continue
-            if config.max_seg_seconds is not None and dur > float(config.max_seg_seconds):
-                rejected.append({"start": st, "end": en, "reason": "too_long"})
-                continue
-
-            wav_path: Path | None = None
-            if wp0:
-                with suppress(Exception):
-                    p = Path(wp0).resolve()
-                    if p.exists() and p.is_file():
-                        wav_path = p
-            if wav_path is None:
-                wav_path = (tmp_dir / f"{speaker_id}_{idx:04d}.wav").resolve()
-                try:
-                    extract_audio_mono_16k(
-                        src=dialogue_wav, dst=wav_path, start_s=float(st), end_s=float(en), timeout_s=120
-                    )
-                except Exception as ex:
-                    rejected.append({"start": st, "end": en, "reason": f"slice_failed:{ex}"})
-                    continue
-
-            got = _wav_duration_s(wav_path)
-            if got > max(3.0, dur * 3.0):
-                rejected.append({"start": st, "end": en, "reason": "bad_candidate_duration"})
-                continue
-
-            sc = _analyze_candidate(wav_path, start_s=st, end_s=en, speaker_id=speaker_id, cfg=cfg)
-            if sc is None:
-                rejected.append({"start": st, "end": en, "reason": "score_rejected"})
-                continue
-            cand_scores.append(sc)
-
-        cand_scores.sort(key=lambda x: x.score, reverse=True)
-
-        chosen: list[CandidateScore] = []
-        acc = 0.0
-        for c in cand_scores:
-            if acc >= float(config.target_seconds):
-                break
-            chosen.append(c)
-            acc += float(c.duration_s) * float(max(0.0, min(1.0, c.speech_ratio)))
-
-        warnings: list[str] = []
-        if not chosen:
-            warnings.append("no_good_candidates")
-            # fallback: pick longest non-overlap segment (even if low speech ratio)
-            best = None
-            best_d = 0.0
-            for idx, st, en, wp0 in segs:
-                d = max(0.0, float(en) - float(st))
-                if d > best_d:
-                    best_d = d
-                    best = (idx, st, en, wp0)
-            if best is not None:
-                idx, st, en, wp0 = best
-                wav_path: Path | None = None
-                if wp0:
-                    with suppress(Exception):
-                        p = Path(wp0).resolve()
-                        if p.exists():
-                            wav_path = p
-                if wav_path is None:
-                    wav_path = (tmp_dir / f"{speaker_id}_{idx:04d}.fallback.wav").resolve()
-                    with suppress(Exception):
-                        extract_audio_mono_16k(
-                            src=dialogue_wav, dst=wav_path, start_s=float(st), end_s=float(en), timeout_s=120
-                        )
-                if wav_path is not None and wav_path.exists():
-                    sc2 = _analyze_candidate(
-                        wav_path,
-                        start_s=st,
-                        end_s=en,
-                        speaker_id=speaker_id,
-                        cfg=VoiceRefConfig(
-                            target_s=cfg.target_s,
-                            overlap_eps_s=cfg.overlap_eps_s,
-                            min_candidate_s=0.0,
-                            max_candidate_s=cfg.max_candidate_s,
-                            min_speech_ratio=0.0,
-                            silence_pad_ms=cfg.silence_pad_ms,
-                            vad=cfg.vad,
-                            index_name=cfg.index_name,
-                        ),
-                    )
-                    if sc2 is not None:
-                        chosen = [sc2]
+    # Decode/VAD the dialogue audio once; every candidate is scored as a span of it.
+    max_end = max((float(s["end"]) for s in norm), default=0.0)
+    shared = _shared_waveform(dialogue_wav, tmp_dir, cfg.vad, max_end_s=max_end)
+    if shared is None and by_spk:
+        logger.info("voice_ref_per_file_candidates", dialogue_wav=str(dialogue_wav))
+
+    def _run(item: tuple[str, list[tuple[int, float, float, str]]]) -> dict[str, Any]:
+        speaker_id, segs = item
+        return _select_speaker(
+            speaker_id,
+            segs,
+            shared=shared,
+            dialogue_wav=dialogue_wav,
+            tmp_dir=tmp_dir,
+            cfg=cfg,
+            config=config,
+        )
 
+    speakers = sorted(by_spk.items(), key=lambda x: x[0])
+    workers = max(1, min(len(speakers), int(os.cpu_count() or 1), 8))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            picks = list(ex.map(_run, speakers))
+    else:
+        picks = [_run(it) for it in speakers]
+
+    for (speaker_id, _segs), sel in zip(speakers, picks, strict=True):
+        chosen = sel["chosen"]
+        rejected = sel["rejected"]
+        warnings = sel["warnings"]
         # Logging: rejected + selected
         for rj in rejected:
             logger.info(
@@ -670,22 +784,31 @@ def extract_speaker_refs(
             speaker_id=str(speaker_id),
             selected=[
                 {"start_s": float(c.start_s), "end_s": float(c.end_s), "score": float(c.score)}
-                for c in chosen
+                for c, _w, _i0, _i1 in chosen
             ],
         )
 
-        ref_out = (out_dir / f"{speaker_id}_ref.wav").resolve()
-        tmp_ref = (out_dir / f".{speaker_id}.ref.tmp.{int(time.time()*1000)}.wav").resolve()
-        dur_out = _concat_wavs([c.path for c in chosen], out_path=tmp_ref, cfg=cfg)
+        sr = int(cfg.vad.sample_rate)
+        pcm = _ref_pcm(
+            [w.x[i0:i1] for _c, w, i0, i1 in chosen],
+            sr=sr,
+            silence_pad_ms=int(cfg.silence_pad_ms),
+            target_rms_dbfs=float(config.target_rms_dbfs),
+        )
+        dur_out = float(pcm.shape[0]) / float(sr)
         if dur_out + 1e-6 < float(config.target_seconds):
             warnings.append(f"insufficient_audio:{dur_out:.2f}s")
+        ref_out = (out_dir / f"{speaker_id}_ref.wav").resolve()
+        tmp_ref = (out_dir / f".{speaker_id}.ref.tmp.{int(time.time()*1000)}.wav").resolve()
+        _write_pcm16(tmp_ref, pcm, sr=sr)
         tmp_ref.replace(ref_out)
-        _normalize_wav_rms(ref_out, target_rms_dbfs=float(config.target_rms_dbfs))
 
         out["items"][speaker_id] = {
             "ref_path": str(ref_out),
             "duration_sec": float(dur_out),
-            "segments_used": [{"start_s": float(c.start_s), "end_s": float(c.end_s)} for c in chosen],
+            "segments_used": [
+                {"start_s": float(c.start_s), "end_s": float(c.end_s)} for c, *_ in chosen
+            ],
             "segments_used_count": int(len(chosen)),
             "warnings": warnings,
             "rejected": rejected,
@@ -700,4 +823,3 @@ def extract_speaker_refs(
     with suppress(Exception):
         write_json(out_dir / "manifest.json", out, indent=2)
     return out
-
@@ -14,6 +14,7 @@ from fastapi.responses import StreamingResponse
 
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.models import Job, now_utc
+from dubbing_pipeline.ops.metrics import media_bytes, media_response
 from dubbing_pipeline.runtime.scheduler import Scheduler
 from dubbing_pipeline.utils.ffmpeg_safe import ffprobe_media_info
 from dubbing_pipeline.utils.net import get_client_ip
@@ -327,20 +328,24 @@ def _file_range_response(
                 if not chunk:
                     break
                 remaining -= len(chunk)
+                media_bytes.inc(len(chunk))
                 yield chunk
 
     if not rng:
         headers = {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+        media_response("200").inc()
         return StreamingResponse(_iter_range(0, max(0, size - 1)), media_type=media_type, headers=headers)
 
     m = re.match(r"bytes=(\d*)-(\d*)", rng)
     if not m:
         headers = {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+        media_response("200").inc()
         return StreamingResponse(_iter_range(0, max(0, size - 1)), media_type=media_type, headers=headers)
 
     start_s, end_s = m.group(1), m.group(2)
     if not start_s and not end_s:
         headers = {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+        media_response("200").inc()
         return StreamingResponse(_iter_range(0, max(0, size - 1)), media_type=media_type, headers=headers)
 
     if start_s:
@@ -351,6 +356,7 @@ def _file_range_response(
         suffix = int(end_s or 0)
         if suffix <= 0:
             headers = {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+            media_response("200").inc()
             return StreamingResponse(
                 _iter_range(0, max(0, size - 1)), media_type=media_type, headers=headers
             )
@@ -358,6 +364,7 @@ def _file_range_response(
         end = size - 1
 
     if start >= size:
+        media_response("416").inc()
         return Response(
             status_code=416,
             headers={"Content-Range": f"bytes */{size}"},
@@ -370,6 +377,7 @@ def _file_range_response(
         "Accept-Ranges": "bytes",
         "Content-Length": str(end - start + 1),
     }
+    media_response("206").inc()
     return StreamingResponse(
         _iter_range(start, end),
         status_code=206,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import ipaddress
+import json
 from contextlib import suppress
 
 from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
@@ -13,6 +14,8 @@ from dubbing_pipeline.api.models import AuthStore
 from dubbing_pipeline.api.security import decode_token
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.models import JobState
+from dubbing_pipeline.ops.metrics import sse_job as sse_job_gauge
+from dubbing_pipeline.ops.metrics import sse_jobs as sse_jobs_gauge
 from dubbing_pipeline.runtime import lifecycle
 from dubbing_pipeline.security import policy
 from dubbing_pipeline.security.policy_deps import secure_router
@@ -24,6 +27,39 @@ router = secure_router()
 ws_router = APIRouter()
 
 
+def job_events_tick(store, ident: Identity, last: dict[str, str]) -> list[dict[str, str]]:
+    """
+    One poll of /api/jobs/events: events for jobs visible to `ident` that changed since `last`
+    (updated in place). Also timed by benchmarks/cases.py (sse_fanout).
+    """
+    out: list[dict[str, str]] = []
+    for j in store.list(limit=200):
+        try:
+            require_job_access(store=store, ident=ident, job=j)
+        except HTTPException as ex:
+            if ex.status_code == 403:
+                continue
+            raise
+        key = f"{j.state.value}:{j.updated_at}:{j.progress:.4f}:{j.message}"
+        if last.get(j.id) == key:
+            continue
+        last[j.id] = key
+        payload = {
+            "id": j.id,
+            "state": j.state.value,
+            "progress": float(j.progress),
+            "message": j.message,
+            "updated_at": j.updated_at,
+            "created_at": j.created_at,
+            "video_path": j.video_path,
+            "mode": j.mode,
+            "src_lang": j.src_lang,
+            "tgt_lang": j.tgt_lang,
+        }
+        out.append({"event": "job", "data": json.dumps(payload)})
+    return out
+
+
 @router.get("/api/jobs/events")
 async def jobs_events(
     request: Request,
@@ -33,42 +69,20 @@ async def jobs_events(
 
     async def gen():
         last: dict[str, str] = {}
+        sse_jobs_gauge.inc()
         try:
             while True:
                 if lifecycle.is_draining():
                     return
                 if await request.is_disconnected():
                     return
-                jobs = store.list(limit=200)
-                for j in jobs:
-                    try:
-                        require_job_access(store=store, ident=ident, job=j)
-                    except HTTPException as ex:
-                        if ex.status_code == 403:
-                            continue
-                        raise
-                    key = f"{j.state.value}:{j.updated_at}:{j.progress:.4f}:{j.message}"
-                    if last.get(j.id) == key:
-                        continue
-                    last[j.id] = key
-                    payload = {
-                        "id": j.id,
-                        "state": j.state.value,
-                        "progress": float(j.progress),
-                        "message": j.message,
-                        "updated_at": j.updated_at,
-                        "created_at": j.created_at,
-                        "video_path": j.video_path,
-                        "mode": j.mode,
-                        "src_lang": j.src_lang,
-                        "tgt_lang": j.tgt_lang,
-                    }
-                    yield {"event": "job", "data": json.dumps(payload)}
+                for ev in job_events_tick(store, ident, last):
+                    yield ev
                 await asyncio.sleep(0.75)
         except asyncio.CancelledError:
             return
-
-    import json
+        finally:
+            sse_jobs_gauge.dec()
 
     return EventSourceResponse(gen())
 
@@ -220,6 +234,7 @@ async def sse_job(request: Request, id: str, ident: Identity = Depends(require_s
 
     async def gen():
         last_updated = None
+        sse_job_gauge.inc()
         try:
             while True:
                 if lifecycle.is_draining():
@@ -252,6 +267,8 @@ async def sse_job(request: Request, id: str, ident: Identity = Depends(require_s
                 await asyncio.sleep(0.5)
         except asyncio.CancelledError:
             return
+        finally:
+            sse_job_gauge.dec()
 
     import json
 
@@ -6,12 +6,14 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import Depends, HTTPException, Request
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sse_starlette.sse import EventSourceResponse  # type: ignore
 
 from dubbing_pipeline.api.access import require_job_access
 from dubbing_pipeline.api.deps import Identity, require_scope
 from dubbing_pipeline.jobs.models import JobState
+from dubbing_pipeline.ops.metrics import sse_logs
+from dubbing_pipeline.ops.spans import TRACE_FILENAME, load_job_trace
 from dubbing_pipeline.security.policy_deps import secure_router
 from dubbing_pipeline.runtime import lifecycle
 from dubbing_pipeline.web.routes.jobs_common import _get_store, _job_base_dir, _parse_iso_ts
@@ -172,9 +174,33 @@ async def get_job_timeline(
         "last_log_line": last_log,
         "log_tail_url": f"/api/jobs/{id}/logs/tail?n=200",
         "log_stream_url": f"/api/jobs/{id}/logs/stream",
+        "trace_url": (
+            f"/api/jobs/{id}/trace" if (base_dir / "logs" / TRACE_FILENAME).exists() else ""
+        ),
     }
 
 
+@router.get("/api/jobs/{id}/trace")
+async def get_job_trace(
+    request: Request,
+    id: str,
+    download: int = 1,
+    ident: Identity = Depends(require_scope("read:job")),
+) -> JSONResponse:
+    """
+    Per-job span timeline in Chrome trace format (open in chrome://tracing or Perfetto).
+    """
+    store = _get_store(request)
+    job = require_job_access(store=store, ident=ident, job_id=id)
+    data = await asyncio.to_thread(load_job_trace, _job_base_dir(job))
+    if data is None:
+        raise HTTPException(status_code=404, detail="No trace for job")
+    resp = JSONResponse(data)
+    if download:
+        resp.headers["content-disposition"] = f'attachment; filename="{Path(id).name}.trace.json"'
+    return resp
+
+
 @router.get("/api/jobs/{id}/logs/tail")
 async def tail_logs(
     request: Request, id: str, n: int = 200, ident: Identity = Depends(require_scope("read:job"))
@@ -213,6 +239,7 @@ async def stream_logs(
                 yield {"event": "message", "data": f"<div>{ln}</div>"}
         if once:
             return
+        sse_logs.inc()
         try:
             while True:
                 if lifecycle.is_draining():
@@ -231,5 +258,7 @@ async def stream_logs(
                 await asyncio.sleep(0.5)
         except asyncio.CancelledError:
             return
+        finally:
+            sse_logs.dec()
 
     return EventSourceResponse(gen())
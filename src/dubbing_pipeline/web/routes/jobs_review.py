@@ -141,6 +141,27 @@ async def get_job_review_segments(
     return await routes_segments.get_job_review_segments(request, id, ident)
 
 
+@router.post("/api/jobs/{id}/review/segments/batch")
+async def post_job_review_batch_edit(
+    request: Request, id: str, ident: Identity = Depends(require_scope("edit:job"))
+) -> dict[str, Any]:
+    return await routes_segments.post_job_review_batch_edit(request, id, ident)
+
+
+@router.get("/api/jobs/{id}/review/journal")
+async def get_job_review_journal(
+    request: Request, id: str, ident: Identity = Depends(require_scope("read:job"))
+) -> dict[str, Any]:
+    return await routes_segments.get_job_review_journal(request, id, ident)
+
+
+@router.post("/api/jobs/{id}/review/undo")
+async def post_job_review_undo(
+    request: Request, id: str, ident: Identity = Depends(require_scope("edit:job"))
+) -> dict[str, Any]:
+    return await routes_segments.post_job_review_undo(request, id, ident)
+
+
 @router.post("/api/jobs/{id}/review/segments/{segment_id}/helper")
 async def post_job_review_helper(
     request: Request,
@@ -171,6 +192,16 @@ async def post_job_review_regen(
     return await routes_rerun.post_job_review_regen(request, id, segment_id, ident)
 
 
+@router.post("/api/jobs/{id}/review/segments/{segment_id}/regen/stream")
+async def post_job_review_regen_stream(
+    request: Request,
+    id: str,
+    segment_id: int,
+    ident: Identity = Depends(require_scope("edit:job")),
+) -> Response:
+    return await routes_rerun.post_job_review_regen_stream(request, id, segment_id, ident)
+
+
 @router.post("/api/jobs/{id}/review/segments/{segment_id}/lock")
 async def post_job_review_lock(
     request: Request,
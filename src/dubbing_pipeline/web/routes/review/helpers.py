@@ -7,6 +7,8 @@ from typing import Any
 
 from fastapi import HTTPException
 
+from dubbing_pipeline.utils.log import logger
+
 
 def _parse_srt(path: Path) -> list[dict[str, Any]]:
     if not path.exists():
@@ -35,10 +37,6 @@ def _parse_srt(path: Path) -> list[dict[str, Any]]:
     return out
 
 
-def _review_state_path(base_dir: Path) -> Path:
-    return (base_dir / "review" / "state.json").resolve()
-
-
 def _review_audio_path(base_dir: Path, segment_id: int) -> Path | None:
     try:
         from dubbing_pipeline.review.state import load_state
@@ -85,16 +83,15 @@ def _hash_text(text: str) -> str:
 
 
 def _ensure_review_state(base_dir: Path, job_video_path: str | None) -> dict[str, Any]:
-    rsp = _review_state_path(base_dir)
-    if not rsp.exists():
+    from dubbing_pipeline.review.state import has_review_state, load_state
+
+    if not has_review_state(base_dir):
         try:
             from dubbing_pipeline.review.ops import init_review
 
             init_review(base_dir, video_path=Path(job_video_path) if job_video_path else None)
         except Exception as ex:
             raise HTTPException(status_code=400, detail=f"review init failed: {ex}") from ex
-    from dubbing_pipeline.review.state import load_state
-
     return load_state(base_dir)
 
 
@@ -201,3 +198,17 @@ def _rewrite_helper_reduce_slang(text: str) -> str:
     for pat, rep in slang:
         t = re.sub(pat, rep, t)
     return t.strip()
+
+
+def _rescore_qa(base_dir: Path, segment_ids: list[int]) -> None:
+    """
+    Refresh QA reports for just the touched segments, if the job has been scored (best-effort).
+    """
+    if not segment_ids or not (Path(base_dir) / "qa" / "segment_scores.jsonl").exists():
+        return
+    try:
+        from dubbing_pipeline.qa.scoring import rescore
+
+        rescore(base_dir, segment_ids)
+    except Exception as ex:
+        logger.warning("qa_rescore_failed", job_dir=str(base_dir), error=str(ex))
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import suppress
 from typing import Any
 
 from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from dubbing_pipeline.api.access import require_job_access
 from dubbing_pipeline.api.deps import Identity
@@ -18,6 +22,8 @@ from dubbing_pipeline.web.routes.jobs_common import (
     _load_transcript_store,
 )
 
+from .helpers import _rescore_qa
+
 
 async def post_job_segments_rerun(
     request: Request, id: str, ident: Identity
@@ -134,6 +140,23 @@ async def synthesize_from_approved(
     return {"ok": True}
 
 
+def _job_pronunciations(store, job) -> tuple[list[dict], dict[int, Any]]:
+    """Pronunciation dictionary + per-segment QA overrides for a job (best-effort)."""
+    entries: list[dict] = []
+    overrides: dict[int, Any] = {}
+    with suppress(Exception):
+        entries = store.list_pronunciations(lang=str(job.tgt_lang or "").strip().lower())
+    with suppress(Exception):
+        for rec in store.list_qa_reviews(job_id=str(job.id)):
+            if not isinstance(rec, dict) or not rec.get("pronunciation_overrides"):
+                continue
+            with suppress(Exception):
+                sid = int(rec.get("segment_id") or 0)
+                if sid > 0:
+                    overrides[sid] = rec["pronunciation_overrides"]
+    return entries, overrides
+
+
 async def post_job_review_regen(
     request: Request,
     id: str,
@@ -151,8 +174,16 @@ async def post_job_review_regen(
     base_dir = _job_base_dir(job)
     from dubbing_pipeline.review.ops import regen_segment
 
+    pron, pron_overrides = _job_pronunciations(store, job)
     try:
-        p = regen_segment(base_dir, int(segment_id))
+        p = await asyncio.to_thread(
+            regen_segment,
+            base_dir,
+            int(segment_id),
+            pronunciations=pron,
+            pronunciation_overrides=pron_overrides,
+        )
+        await asyncio.to_thread(_rescore_qa, base_dir, [int(segment_id)])
         audit_event(
             "review.regen",
             request=request,
@@ -162,3 +193,59 @@ async def post_job_review_regen(
         return {"ok": True, "audio_path": str(p)}
     except Exception as ex:
         raise HTTPException(status_code=400, detail=str(ex)) from ex
+
+
+async def post_job_review_regen_stream(
+    request: Request,
+    id: str,
+    segment_id: int,
+    ident: Identity,
+) -> StreamingResponse:
+    """
+    Regenerate a segment and stream the WAV while it is synthesized (warm XTTS session).
+    """
+    store = _get_store(request)
+    _enforce_rate_limit(
+        request,
+        key=f"review:regen:user:{ident.user.id}",
+        limit=60,
+        per_seconds=60,
+    )
+    job = require_job_access(store=store, ident=ident, job_id=id)
+    base_dir = _job_base_dir(job)
+    from dubbing_pipeline.review.ops import regen_segment_stream
+
+    pron, pron_overrides = _job_pronunciations(store, job)
+    try:
+        chunks = regen_segment_stream(
+            base_dir,
+            int(segment_id),
+            pronunciations=pron,
+            pronunciation_overrides=pron_overrides,
+        )
+    except Exception as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    audit_event(
+        "review.regen",
+        request=request,
+        user_id=ident.user.id,
+        meta={"job_id": id, "segment_id": int(segment_id), "stream": True},
+    )
+    finished: list[bool] = []
+
+    def _body():
+        yield from chunks
+        finished.append(True)
+
+    def _rescore() -> None:
+        if finished:
+            _rescore_qa(base_dir, [int(segment_id)])
+
+    # Sync generator and background task: Starlette runs both in its threadpool, so neither
+    # synthesis nor the QA rescore blocks the loop, and the rescore never delays the last chunk.
+    return StreamingResponse(
+        _body(),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-store"},
+        background=BackgroundTask(_rescore),
+    )
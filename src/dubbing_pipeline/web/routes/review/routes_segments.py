@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import suppress
-from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException, Request
@@ -22,7 +22,7 @@ from dubbing_pipeline.web.routes.jobs_common import (
 from .helpers import (
     _ensure_review_state,
     _hash_text,
-    _review_state_path,
+    _rescore_qa,
     _rewrite_helper_formal,
     _rewrite_helper_reduce_slang,
     _segments_from_state,
@@ -93,7 +93,8 @@ async def patch_job_segment(
         with suppress(Exception):
             from dubbing_pipeline.review.ops import edit_segment
 
-            edit_segment(base_dir, int(segment_id), text=new_text)
+            edit_segment(base_dir, int(segment_id), text=new_text, actor=str(ident.user.id))
+        await asyncio.to_thread(_rescore_qa, base_dir, [int(segment_id)])
 
     try:
         store.upsert_qa_review(
@@ -231,18 +232,7 @@ async def get_job_review_segments(
     store = _get_store(request)
     job = require_job_access(store=store, ident=ident, job_id=id)
     base_dir = _job_base_dir(job)
-    rsp = _review_state_path(base_dir)
-    if not rsp.exists():
-        try:
-            from dubbing_pipeline.review.ops import init_review
-
-            init_review(base_dir, video_path=Path(job.video_path) if job.video_path else None)
-        except Exception as ex:
-            raise HTTPException(status_code=400, detail=f"review init failed: {ex}") from ex
-
-    from dubbing_pipeline.review.state import load_state
-
-    return load_state(base_dir)
+    return _ensure_review_state(base_dir, job.video_path)
 
 
 async def post_job_review_helper(
@@ -362,7 +352,8 @@ async def post_job_review_edit(
     from dubbing_pipeline.review.ops import edit_segment
 
     try:
-        edit_segment(base_dir, int(segment_id), text=text)
+        edit_segment(base_dir, int(segment_id), text=text, actor=str(ident.user.id))
+        await asyncio.to_thread(_rescore_qa, base_dir, [int(segment_id)])
         audit_event(
             "review.edit",
             request=request,
@@ -392,7 +383,8 @@ async def post_job_review_lock(
     from dubbing_pipeline.review.ops import lock_segment
 
     try:
-        lock_segment(base_dir, int(segment_id))
+        lock_segment(base_dir, int(segment_id), actor=str(ident.user.id))
+        await asyncio.to_thread(_rescore_qa, base_dir, [int(segment_id)])
         audit_event(
             "review.lock",
             request=request,
@@ -422,7 +414,8 @@ async def post_job_review_unlock(
     from dubbing_pipeline.review.ops import unlock_segment
 
     try:
-        unlock_segment(base_dir, int(segment_id))
+        unlock_segment(base_dir, int(segment_id), actor=str(ident.user.id))
+        await asyncio.to_thread(_rescore_qa, base_dir, [int(segment_id)])
         audit_event(
             "review.unlock",
             request=request,
@@ -432,3 +425,114 @@ async def post_job_review_unlock(
         return {"ok": True}
     except Exception as ex:
         raise HTTPException(status_code=400, detail=str(ex)) from ex
+
+
+async def post_job_review_batch_edit(
+    request: Request,
+    id: str,
+    ident: Identity,
+) -> dict[str, Any]:
+    """
+    Edit several segments in one write.
+
+    Body JSON: {"edits": [{"segment_id": 3, "text": "..."}, ...]} (all-or-nothing).
+    """
+    store = _get_store(request)
+    _enforce_rate_limit(
+        request,
+        key=f"review:edit:user:{ident.user.id}",
+        limit=120,
+        per_seconds=60,
+    )
+    job = require_job_access(store=store, ident=ident, job_id=id)
+    base_dir = _job_base_dir(job)
+    body = await request.json()
+    edits = body.get("edits") if isinstance(body, dict) else None
+    if not isinstance(edits, list) or not edits or len(edits) > 2000:
+        raise HTTPException(status_code=400, detail="edits must be a non-empty list (max 2000)")
+    by_id: dict[int, str] = {}
+    try:
+        for e in edits:
+            by_id[int(e["segment_id"])] = str(e.get("text") or "")
+    except Exception as ex:
+        raise HTTPException(status_code=400, detail="Invalid edit entry") from ex
+    from dubbing_pipeline.review.ops import edit_segments
+    from dubbing_pipeline.review.state import state_revision
+
+    try:
+        done = edit_segments(base_dir, by_id, actor=str(ident.user.id))
+    except Exception as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    await asyncio.to_thread(_rescore_qa, base_dir, done)
+    audit_event(
+        "review.edit.batch",
+        request=request,
+        user_id=ident.user.id,
+        meta={"job_id": id, "segments": len(done)},
+    )
+    return {"ok": True, "segment_ids": done, "revision": state_revision(base_dir)}
+
+
+async def get_job_review_journal(
+    request: Request,
+    id: str,
+    ident: Identity,
+) -> dict[str, Any]:
+    """
+    Review edit journal after `since` (sequence number) for client sync.
+    """
+    store = _get_store(request)
+    job = require_job_access(store=store, ident=ident, job_id=id)
+    base_dir = _job_base_dir(job)
+    try:
+        since = max(0, int(request.query_params.get("since") or 0))
+        limit = max(1, min(2000, int(request.query_params.get("limit") or 500)))
+    except Exception as ex:
+        raise HTTPException(status_code=400, detail="Invalid since/limit") from ex
+    from dubbing_pipeline.review.state import review_journal, state_revision
+
+    items = review_journal(base_dir, since=since, limit=limit)
+    return {
+        "items": items,
+        "next": int(items[-1]["seq"]) if items else since,
+        "revision": state_revision(base_dir),
+    }
+
+
+async def post_job_review_undo(
+    request: Request,
+    id: str,
+    ident: Identity,
+) -> dict[str, Any]:
+    store = _get_store(request)
+    _enforce_rate_limit(
+        request,
+        key=f"review:edit:user:{ident.user.id}",
+        limit=120,
+        per_seconds=60,
+    )
+    job = require_job_access(store=store, ident=ident, job_id=id)
+    base_dir = _job_base_dir(job)
+    body: Any = {}
+    if "application/json" in (request.headers.get("content-type") or "").lower():
+        with suppress(Exception):
+            body = await request.json()
+    sid = body.get("segment_id") if isinstance(body, dict) else None
+    from dubbing_pipeline.review.state import undo_edit
+
+    try:
+        ent = undo_edit(
+            base_dir, segment_id=int(sid) if sid is not None else None, actor=str(ident.user.id)
+        )
+    except Exception as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    if ent is None:
+        raise HTTPException(status_code=404, detail="Nothing to undo")
+    await asyncio.to_thread(_rescore_qa, base_dir, [int(ent["segment_id"])])
+    audit_event(
+        "review.undo",
+        request=request,
+        user_id=ident.user.id,
+        meta={"job_id": id, "segment_id": int(ent["segment_id"]), "seq": int(ent["seq"])},
+    )
+    return {"ok": True, "undone": ent}
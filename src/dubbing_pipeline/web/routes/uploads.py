@@ -13,6 +13,7 @@ from dubbing_pipeline.api.deps import Identity, require_scope
 from dubbing_pipeline.api.middleware import audit_event
 from dubbing_pipeline.config import get_settings
 from dubbing_pipeline.jobs.limits import get_limits
+from dubbing_pipeline.ops.metrics import upload_bytes, upload_chunk_dedup, upload_chunk_stored
 from dubbing_pipeline.security import policy
 from dubbing_pipeline.security.policy_deps import secure_router
 from dubbing_pipeline.security.crypto import CryptoConfigError, encrypt_file, encryption_enabled_for
@@ -428,6 +429,7 @@ async def uploads_chunk(
             and int(prev.get("offset") or 0) == int(offset)
         ):
             # already accepted
+            upload_chunk_dedup.inc()
             return {
                 "ok": True,
                 "received_bytes": int(rec2.get("received_bytes") or 0),
@@ -440,6 +442,8 @@ async def uploads_chunk(
             f.seek(int(offset))
             f.write(body)
 
+        upload_chunk_stored.inc()
+        upload_bytes.inc(len(body))
         received[str(idx)] = {"offset": int(offset), "size": int(len(body)), "sha256": sha}
         received_bytes = sum(int(v.get("size") or 0) for v in received.values() if isinstance(v, dict))
         store.update_upload(
@@ -3,13 +3,20 @@ from __future__ import annotations
 import uvicorn
 
 from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.utils.log import logger
 
 
 def main() -> None:
     s = get_settings()
+    workers = max(1, int(getattr(s, "web_workers", 1) or 1))
+    if workers > 1 and bool(getattr(s, "web_run_jobs", True)):
+        # Each uvicorn worker would run its own job executor against the same store.
+        logger.warning("web_workers_ignored", web_workers=workers, hint="set WEB_RUN_JOBS=0")
+        workers = 1
     uvicorn.run(
         "dubbing_pipeline.server:app",
         host=str(s.host),
         port=int(s.port),
         reload=False,
+        workers=workers,
     )
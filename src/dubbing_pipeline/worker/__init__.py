@@ -0,0 +1,7 @@
+"""
+Standalone job workers (`dubbing-worker`).
+
+Run any number of these next to a `dubbing-web` started with WEB_RUN_JOBS=0. Workers consume
+from the queue backend (Redis, or the SQLite fallback with claims in workers.db), report
+progress through the shared job store and publish capabilities via heartbeats.
+"""
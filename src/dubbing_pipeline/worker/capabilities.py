@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import os
+import platform
+from typing import Any
+
+from dubbing_pipeline.runtime.capacity import read_gpus, read_meminfo
+from dubbing_pipeline.runtime.device_allocator import _cuda_available
+from dubbing_pipeline.runtime.model_manager import ModelManager
+
+
+def collect_capabilities(*, concurrency: int) -> dict[str, Any]:
+    """
+    What this worker can run right now; published with every heartbeat.
+    """
+    gpus = read_gpus()
+    cuda = bool(gpus) or _cuda_available()
+    return {
+        "device": "cuda" if cuda else "cpu",
+        "cuda": cuda,
+        "gpus": gpus,
+        "cpu_count": int(os.cpu_count() or 1),
+        "concurrency": int(concurrency),
+        "models_resident": ModelManager.instance().state(),
+        "python": platform.python_version(),
+        **read_meminfo(),
+    }
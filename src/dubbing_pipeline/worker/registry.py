@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from dubbing_pipeline.config import get_settings
+
+WORKERS_DB_NAME = "workers.db"
+
+
+def default_registry_path() -> Path:
+    s = get_settings()
+    out_root = Path(s.output_dir).resolve()
+    state_root = Path(getattr(s, "state_dir", None) or (out_root / "_state")).resolve()
+    return state_root / WORKERS_DB_NAME
+
+
+class WorkerRegistry:
+    """
+    Worker heartbeats + job claims (SQLite, next to jobs.db).
+
+    - Every `dubbing-worker` upserts its row (capabilities, running jobs) each heartbeat.
+    - A job may only run on the worker that holds its claim; claims held by a worker whose
+      heartbeat is older than `stale_after_s` are considered abandoned and can be taken over.
+
+    With the fallback (non-Redis) queue this is the cross-process lock; with Redis it mirrors
+    the jobs each worker holds a RedisQueue lock for (listings, reaping, startup recovery).
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS workers (
+                  worker_id TEXT PRIMARY KEY,
+                  host TEXT NOT NULL,
+                  pid INTEGER NOT NULL,
+                  state TEXT NOT NULL,
+                  started_at REAL NOT NULL,
+                  heartbeat_at REAL NOT NULL,
+                  capabilities_json TEXT NOT NULL
+                );
+                """
+            )
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS claims (
+                  job_id TEXT PRIMARY KEY,
+                  worker_id TEXT NOT NULL,
+                  claimed_at REAL NOT NULL
+                );
+                """
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_claims_worker ON claims(worker_id);")
+
+    def _conn(self) -> sqlite3.Connection:
+        # Autocommit; claim() opens its own IMMEDIATE transaction.
+        con = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+        con.row_factory = sqlite3.Row
+        with suppress(Exception):
+            con.execute("PRAGMA journal_mode=WAL;")
+        return con
+
+    def heartbeat(
+        self,
+        worker_id: str,
+        *,
+        host: str,
+        pid: int,
+        capabilities: dict[str, Any],
+        state: str = "running",
+    ) -> None:
+        now = time.time()
+        with self._conn() as con:
+            con.execute(
+                """
+                INSERT INTO workers(worker_id, host, pid, state, started_at, heartbeat_at,
+                                    capabilities_json)
+                VALUES(?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET
+                  host=excluded.host, pid=excluded.pid, state=excluded.state,
+                  heartbeat_at=excluded.heartbeat_at,
+                  capabilities_json=excluded.capabilities_json;
+                """,
+                (
+                    str(worker_id),
+                    str(host),
+                    int(pid),
+                    str(state),
+                    now,
+                    now,
+                    json.dumps(capabilities, sort_keys=True, default=str),
+                ),
+            )
+
+    def mark_stopped(self, worker_id: str) -> list[str]:
+        """
+        Mark the worker stopped and drop its claims. Returns the job ids it still held.
+        """
+        with self._conn() as con:
+            con.execute(
+                "UPDATE workers SET state='stopped', heartbeat_at=? WHERE worker_id=?;",
+                (time.time(), str(worker_id)),
+            )
+            rows = con.execute(
+                "SELECT job_id FROM claims WHERE worker_id=?;", (str(worker_id),)
+            ).fetchall()
+            con.execute("DELETE FROM claims WHERE worker_id=?;", (str(worker_id),))
+        return [str(r["job_id"]) for r in rows]
+
+    def workers(self, *, stale_after_s: float) -> list[dict[str, Any]]:
+        now = time.time()
+        with self._conn() as con:
+            rows = con.execute("SELECT * FROM workers ORDER BY worker_id;").fetchall()
+            claims = con.execute("SELECT job_id, worker_id FROM claims;").fetchall()
+        running: dict[str, list[str]] = {}
+        for c in claims:
+            running.setdefault(str(c["worker_id"]), []).append(str(c["job_id"]))
+        out: list[dict[str, Any]] = []
+        for r in rows:
+            try:
+                caps = json.loads(str(r["capabilities_json"] or "{}"))
+            except Exception:
+                caps = {}
+            age = max(0.0, now - float(r["heartbeat_at"]))
+            out.append(
+                {
+                    "worker_id": str(r["worker_id"]),
+                    "host": str(r["host"]),
+                    "pid": int(r["pid"]),
+                    "state": str(r["state"]),
+                    "started_at": float(r["started_at"]),
+                    "heartbeat_age_s": age,
+                    "alive": str(r["state"]) != "stopped" and age <= float(stale_after_s),
+                    "capabilities": caps,
+                    "running": sorted(running.get(str(r["worker_id"]), [])),
+                }
+            )
+        return out
+
+    def _alive_ids(self, con: sqlite3.Connection, *, stale_after_s: float) -> set[str]:
+        cutoff = time.time() - float(stale_after_s)
+        rows = con.execute(
+            "SELECT worker_id FROM workers WHERE state!='stopped' AND heartbeat_at>=?;",
+            (cutoff,),
+        ).fetchall()
+        return {str(r["worker_id"]) for r in rows}
+
+    def claim(
+        self, job_id: str, worker_id: str, *, stale_after_s: float, force: bool = False
+    ) -> bool:
+        """
+        Atomically claim `job_id` for `worker_id`. Re-claiming your own job is a no-op success.
+        `force` takes the claim regardless of the holder (the caller holds the real lock).
+        """
+        con = self._conn()
+        try:
+            con.execute("BEGIN IMMEDIATE;")
+            row = con.execute(
+                "SELECT worker_id FROM claims WHERE job_id=?;", (str(job_id),)
+            ).fetchone()
+            if (
+                not force
+                and row is not None
+                and str(row["worker_id"]) != str(worker_id)
+                and str(row["worker_id"]) in self._alive_ids(con, stale_after_s=stale_after_s)
+            ):
+                con.execute("ROLLBACK;")
+                return False
+            con.execute(
+                """
+                INSERT INTO claims(job_id, worker_id, claimed_at) VALUES(?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                  worker_id=excluded.worker_id, claimed_at=excluded.claimed_at;
+                """,
+                (str(job_id), str(worker_id), time.time()),
+            )
+            con.execute("COMMIT;")
+            return True
+        except Exception:
+            with suppress(Exception):
+                con.execute("ROLLBACK;")
+            raise
+        finally:
+            con.close()
+
+    def release(self, job_id: str, worker_id: str) -> None:
+        with self._conn() as con:
+            con.execute(
+                "DELETE FROM claims WHERE job_id=? AND worker_id=?;",
+                (str(job_id), str(worker_id)),
+            )
+
+    def is_claimed_elsewhere(self, job_id: str, worker_id: str, *, stale_after_s: float) -> bool:
+        with self._conn() as con:
+            row = con.execute(
+                "SELECT worker_id FROM claims WHERE job_id=?;", (str(job_id),)
+            ).fetchone()
+            if row is None or str(row["worker_id"]) == str(worker_id):
+                return False
+            return str(row["worker_id"]) in self._alive_ids(con, stale_after_s=stale_after_s)
+
+    def reap_stale(self, *, stale_after_s: float) -> list[tuple[str, str]]:
+        """
+        Drop claims held by dead workers. Returns [(job_id, worker_id)] so callers can requeue.
+        """
+        con = self._conn()
+        try:
+            con.execute("BEGIN IMMEDIATE;")
+            alive = self._alive_ids(con, stale_after_s=stale_after_s)
+            rows = con.execute("SELECT job_id, worker_id FROM claims;").fetchall()
+            dead = [(str(r["job_id"]), str(r["worker_id"])) for r in rows]
+            dead = [(j, w) for j, w in dead if w not in alive]
+            for j, w in dead:
+                con.execute("DELETE FROM claims WHERE job_id=? AND worker_id=?;", (j, w))
+            con.execute("COMMIT;")
+            return dead
+        except Exception:
+            with suppress(Exception):
+                con.execute("ROLLBACK;")
+            raise
+        finally:
+            con.close()
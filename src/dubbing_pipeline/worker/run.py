@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+from contextlib import suppress
+
+from dubbing_pipeline.utils.log import logger
+from dubbing_pipeline.worker.runtime import WorkerRuntime
+
+
+async def _serve(rt: WorkerRuntime) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, stop.set)
+    await rt.start()
+    try:
+        await stop.wait()
+    finally:
+        logger.info("worker_shutdown_requested", worker_id=rt.worker_id)
+        await rt.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Dubbing job worker (no web server)")
+    ap.add_argument("--id", dest="worker_id", default=None, help="worker id (default WORKER_ID)")
+    ap.add_argument(
+        "--concurrency", type=int, default=None, help="parallel jobs (default WORKER_CONCURRENCY)"
+    )
+    args = ap.parse_args(argv)
+    asyncio.run(_serve(WorkerRuntime(worker_id=args.worker_id, concurrency=args.concurrency)))
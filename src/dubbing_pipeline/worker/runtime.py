@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from pathlib import Path
+from types import SimpleNamespace
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs.models import Job, JobState, now_utc
+from dubbing_pipeline.jobs.queue import JobQueue
+from dubbing_pipeline.queue.queue_backend import build_queue_backend
+from dubbing_pipeline.runtime import lifecycle
+from dubbing_pipeline.runtime.scheduler import Scheduler
+from dubbing_pipeline.store_backend import build_store
+from dubbing_pipeline.utils.log import logger
+from dubbing_pipeline.worker.capabilities import collect_capabilities
+from dubbing_pipeline.worker.registry import WORKERS_DB_NAME, WorkerRegistry
+
+
+def _jobs_db_path() -> tuple[Path, Path]:
+    s = get_settings()
+    out_root = Path(s.output_dir).resolve()
+    state_root = Path(getattr(s, "state_dir", None) or (out_root / "_state")).resolve()
+    return out_root, state_root / str(getattr(s, "jobs_db_name", "jobs.db") or "jobs.db")
+
+
+class WorkerRuntime:
+    """
+    One `dubbing-worker` process: JobQueue + Scheduler + queue backend, no HTTP.
+
+    Job state/progress go to the shared job store exactly as they do from the web process.
+    Capabilities and claimed jobs are published to workers.db on every heartbeat; claims of
+    workers that stop heartbeating are reaped and their jobs requeued by whichever worker
+    notices first.
+    """
+
+    def __init__(self, *, worker_id: str | None = None, concurrency: int | None = None) -> None:
+        s = get_settings()
+        self.worker_id = str(
+            worker_id or getattr(s, "worker_id", "") or f"{socket.gethostname()}:{os.getpid()}"
+        )
+        self.concurrency = max(
+            1,
+            int(concurrency or getattr(s, "worker_concurrency", 0) or s.jobs_concurrency or 1),
+        )
+        self.heartbeat_s = max(0.5, float(getattr(s, "worker_heartbeat_sec", 5.0) or 5.0))
+        self.stale_after_s = max(
+            self.heartbeat_s * 2.0, float(getattr(s, "worker_stale_sec", 30.0) or 30.0)
+        )
+        self.state = SimpleNamespace()
+        self.registry: WorkerRegistry | None = None
+        self._hb_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        out_root, jobs_db = _jobs_db_path()
+        store = build_store(jobs_db)
+        q = JobQueue(store, concurrency=self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        def _enqueue_threadsafe(job: Job) -> None:
+            coro = q.enqueue(job)
+            try:
+                fut = asyncio.run_coroutine_threadsafe(coro, loop)
+            except Exception:
+                with suppress(Exception):
+                    coro.close()
+                raise
+            fut.result(timeout=5.0)
+
+        sched = Scheduler(store=store, enqueue_cb=_enqueue_threadsafe)
+        Scheduler.install(sched)
+        sched.start()
+
+        self.registry = WorkerRegistry(jobs_db.parent / WORKERS_DB_NAME)
+        qb = build_queue_backend(
+            scheduler=sched,
+            get_store_cb=lambda: store,
+            enqueue_job_id_cb=lambda job_id: q.enqueue_id(job_id),
+            registry=self.registry,
+            worker_id=self.worker_id,
+        )
+        q.queue_backend = qb
+
+        st = self.state
+        st.job_store = store
+        st.job_queue = q
+        st.scheduler = sched
+        st.queue_backend = qb
+        st.output_root = out_root
+        st.run_jobs = True
+        st.maintenance = False
+
+        # Announce before JobQueue startup recovery so peers' claims are judged correctly.
+        await self._heartbeat()
+        await self._requeue_stale()
+        await lifecycle.start_all(st)
+        self._hb_task = asyncio.create_task(self._heartbeat_loop(), name="worker.heartbeat")
+        logger.info(
+            "worker_started",
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+            queue_mode=qb.status().mode,
+        )
+
+    async def stop(self) -> None:
+        if self._hb_task is not None:
+            self._hb_task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await self._hb_task
+            self._hb_task = None
+        with suppress(Exception):
+            await self._heartbeat(state="draining")
+        await lifecycle.stop_all(self.state)
+        if self.registry is not None:
+            held: list[str] = []
+            with suppress(Exception):
+                held = self.registry.mark_stopped(self.worker_id)
+            # Jobs interrupted by the drain deadline go back to the queue for other workers.
+            await self._requeue(held, reason=f"worker {self.worker_id} stopped")
+        logger.info("worker_stopped", worker_id=self.worker_id)
+
+    async def _heartbeat(self, *, state: str = "running") -> None:
+        if self.registry is None:
+            return
+        if lifecycle.is_draining() and state == "running":
+            state = "draining"
+        caps = await asyncio.to_thread(collect_capabilities, concurrency=self.concurrency)
+        self.registry.heartbeat(
+            self.worker_id,
+            host=socket.gethostname(),
+            pid=os.getpid(),
+            capabilities=caps,
+            state=state,
+        )
+
+    async def _requeue_stale(self) -> None:
+        if self.registry is None:
+            return
+        for job_id, dead in self.registry.reap_stale(stale_after_s=self.stale_after_s):
+            await self._requeue([job_id], reason=f"worker {dead} lost")
+
+    async def _requeue(self, job_ids: list[str], *, reason: str) -> None:
+        store = getattr(self.state, "job_store", None)
+        qb = getattr(self.state, "queue_backend", None)
+        if store is None:
+            return
+        for job_id in job_ids:
+            j = store.get(job_id)
+            if j is None or j.state != JobState.RUNNING:
+                continue
+            store.update(job_id, state=JobState.QUEUED, message=f"Requeued ({reason})")
+            store.append_log(job_id, f"[{now_utc()}] requeued: {reason}")
+            logger.warning("worker_job_requeued", job_id=job_id, reason=reason)
+            if qb is not None:
+                with suppress(Exception):
+                    await qb.submit_job(
+                        job_id=job_id,
+                        user_id=str(getattr(j, "owner_id", "") or ""),
+                        mode=str(j.mode),
+                        device=str(j.device),
+                    )
+
+    async def _heartbeat_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.heartbeat_s)
+                try:
+                    await self._heartbeat()
+                    await self._requeue_stale()
+                except Exception as ex:
+                    logger.warning("worker_heartbeat_failed", error=str(ex))
+        except asyncio.CancelledError:
+            logger.info("task stopped", task="worker.heartbeat")
+            return
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs import artifacts
+from dubbing_pipeline.jobs.models import Job, JobState
+from dubbing_pipeline.jobs.store import JobStore
+from dubbing_pipeline.server import app
+
+
+def _runtime(tmp_path: Path) -> str:
+    root = tmp_path.resolve()
+    for d in ("Input", "Output", "logs"):
+        (root / d).mkdir(parents=True, exist_ok=True)
+    vp = root / "Input" / "Show.mp4"
+    vp.write_bytes(b"\x00" * 1024)
+    os.environ["APP_ROOT"] = str(root)
+    os.environ["INPUT_DIR"] = str(root / "Input")
+    os.environ["DUBBING_OUTPUT_DIR"] = str(root / "Output")
+    os.environ["DUBBING_LOG_DIR"] = str(root / "logs")
+    os.environ["ADMIN_USERNAME"] = "admin"
+    os.environ["ADMIN_PASSWORD"] = "adminpass"
+    os.environ["COOKIE_SECURE"] = "0"
+    os.environ["ENABLE_AUDIO_PREVIEW"] = "1"
+    get_settings.cache_clear()
+    return str(vp)
+
+
+def _job(video_path: str, out_dir: Path) -> Job:
+    now = "2026-01-01T00:00:00+00:00"
+    return Job(
+        id="j_idx_1",
+        owner_id="u1",
+        video_path=video_path,
+        duration_s=1.0,
+        mode="low",
+        device="cpu",
+        src_lang="ja",
+        tgt_lang="en",
+        created_at=now,
+        updated_at=now,
+        state=JobState.DONE,
+        progress=1.0,
+        message="Done",
+        output_mkv="",
+        output_srt="",
+        work_dir=str(out_dir),
+        log_path=str(out_dir / "job.log"),
+    )
+
+
+def test_store_revision_only_moves_on_change(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db")
+    base = tmp_path / "Output" / "Show"
+    (base / "qa").mkdir(parents=True)
+    (base / "Show.dub.mkv").write_bytes(b"mkv")
+    (base / "qa" / "summary.json").write_text("{}", encoding="utf-8")
+    assert store.list_job_artifacts("j1") == (None, [])
+
+    rows = artifacts.index_job_artifacts(store, "j1", base)
+    assert sorted(r["kind"] for r in rows) == ["mkv", "qa_summary"]
+    meta, listed = store.list_job_artifacts("j1")
+    assert meta["revision"] == 1 and meta["indexed_at"] is not None
+    assert {r["kind"]: r["media"]["content_type"] for r in listed}["mkv"] == "video/x-matroska"
+
+    artifacts.index_job_artifacts(store, "j1", base)
+    assert store.list_job_artifacts("j1")[0]["revision"] == 1
+    # Unknown files are ignored; a changed file bumps the revision.
+    assert artifacts.register_artifacts(store, "j1", base, [base / "notes.txt"]) == 1
+    (base / "Show.dub.mkv").write_bytes(b"mkv, longer")
+    assert artifacts.register_artifacts(store, "j1", base, [base / "Show.dub.mkv"]) == 2
+
+    (base / "qa" / "summary.json").unlink()
+    artifacts.index_job_artifacts(store, "j1", base)
+    meta, listed = store.list_job_artifacts("j1")
+    assert meta["revision"] == 3 and [r["kind"] for r in listed] == ["mkv"]
+    store.delete_job_artifacts("j1")
+    assert store.list_job_artifacts("j1") == (None, [])
+
+
+def test_files_endpoint_serves_the_index_with_etags(tmp_path: Path, monkeypatch) -> None:
+    video_path = _runtime(tmp_path)
+    out_dir = tmp_path / "Output" / "Show"
+    (out_dir / "hls" / "v0").mkdir(parents=True)
+    (out_dir / "preview").mkdir()
+    (out_dir / "Show.dub.mp4").write_bytes(b"fake")
+    (out_dir / "hls" / "v0" / "master.m3u8").write_text("#EXTM3U\n", encoding="utf-8")
+    (out_dir / "preview" / "audio_preview.m4a").write_bytes(b"\x00" * 16)
+
+    with TestClient(app) as c:
+        r = c.post("/api/auth/login", json={"username": "admin", "password": "adminpass"})
+        tok = r.json()
+        headers = {"Authorization": f"Bearer {tok['access_token']}"}
+        store = c.app.state.job_store
+        store.put(_job(video_path, out_dir))
+
+        # First request indexes the (never indexed) job from disk.
+        r1 = c.get("/api/jobs/j_idx_1/files", headers=headers)
+        assert r1.status_code == 200
+        data = r1.json()
+        assert data["mp4"]["url"] == "/files/Show/Show.dub.mp4"
+        assert data["hls_manifest"]["url"] == "/files/Show/hls/v0/master.m3u8"
+        assert [f["kind"] for f in data["files"]] == ["hls_manifest", "mp4"]
+        etag = r1.headers["etag"]
+        assert c.get("/api/jobs/j_idx_1/outputs", headers=headers).json() == data
+
+        # Later polls never touch the job tree.
+        def _no_scan(*a, **k):
+            raise AssertionError("filesystem scan")
+
+        monkeypatch.setattr(artifacts, "scan_job_artifacts", _no_scan)
+        r2 = c.get("/api/jobs/j_idx_1/files", headers={**headers, "If-None-Match": etag})
+        assert r2.status_code == 304
+
+        (out_dir / "Show.dub.mkv").write_bytes(b"mkv")
+        artifacts.register_artifacts(store, "j_idx_1", out_dir, [out_dir / "Show.dub.mkv"])
+        r3 = c.get("/api/jobs/j_idx_1/files", headers={**headers, "If-None-Match": etag})
+        assert r3.status_code == 200 and r3.headers["etag"] != etag
+        assert r3.json()["mkv"]["url"] == "/files/Show/Show.dub.mkv"
+
+        # A file removed behind the index's back is pruned and the validator moves.
+        (out_dir / "Show.dub.mkv").unlink()
+        inm = {**headers, "If-None-Match": r3.headers["etag"]}
+        r4 = c.get("/api/jobs/j_idx_1/files", headers=inm)
+        assert r4.status_code == 200 and r4.headers["etag"] != r3.headers["etag"]
+        assert r4.json()["mkv"] is None
+        assert [r["kind"] for r in store.list_job_artifacts("j_idx_1")[1]] == [
+            "audio_preview",
+            "hls_manifest",
+            "mp4",
+        ]
+
+        p1 = c.get("/api/jobs/j_idx_1/preview/audio", headers=headers)
+        assert p1.status_code == 200 and p1.headers["content-type"].startswith("audio/mp4")
+        p2 = c.get(
+            "/api/jobs/j_idx_1/preview/audio",
+            headers={**headers, "If-None-Match": p1.headers["etag"]},
+        )
+        assert p2.status_code == 304
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import sys
+import types
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dubbing_pipeline.runtime.model_manager import ModelManager
+from dubbing_pipeline.utils.vad import pcm16_view
+
+SR = 16000
+
+
+class _BurstModel:
+    """
+    Deterministic stand-in for Whisper: one segment per loud burst, relative to the input.
+    """
+
+    def transcribe(self, audio, **kw):
+        if isinstance(audio, str):
+            x, _sr = pcm16_view(Path(audio))
+            audio = np.asarray(x, dtype=np.float32) / 32768.0
+        frames = np.abs(audio[: audio.size // 160 * 160]).reshape(-1, 160).mean(axis=1) > 0.01
+        segs, start = [], None
+        for i, loud in enumerate([*frames.tolist(), False]):
+            if loud and start is None:
+                start = i
+            elif not loud and start is not None:
+                d = (i - start) / 100.0
+                segs.append({"start": start / 100.0, "end": i / 100.0, "text": f" {d:.2f}s"})
+                start = None
+        return {"language": kw.get("language") or "ja", "segments": segs}
+
+
+def _speechy_wav(path: Path, seconds: float = 70.0) -> Path:
+    rng = np.random.default_rng(5)
+    t = np.arange(int(seconds * SR)) / SR
+    x = 0.0002 * rng.standard_normal(t.size)
+    pos = 0.5
+    while pos < seconds - 2.0:
+        dur = float(rng.uniform(1.0, 4.0))
+        m = (t >= pos) & (t < pos + dur)
+        x[m] += 0.3 * np.sin(2 * np.pi * 200 * t[m])
+        pos += dur + float(rng.uniform(0.5, 1.2))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes((x * 32767).astype("<i2").tobytes())
+    return path
+
+
+@pytest.fixture
+def burst_whisper(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("DUBBING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("RETRY_MAX", "0")
+    monkeypatch.setenv("ASR_SHARD_MIN_S", "10")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    monkeypatch.setitem(sys.modules, "whisper", types.ModuleType("whisper"))
+    monkeypatch.setattr("dubbing_pipeline.utils.vad._webrtc", lambda cfg: None)
+    mm = ModelManager()
+    monkeypatch.setattr(mm, "_load_whisper", lambda name, device: _BurstModel())
+    monkeypatch.setattr(ModelManager, "_singleton", mm)
+    # Forked workers inherit the fake model (spawned ones would import the real one).
+    monkeypatch.setattr("dubbing_pipeline.stages.asr_shards._MP_CONTEXT", "fork")
+    yield
+    get_settings.cache_clear()
+
+
+def test_shards_are_cut_in_silence(tmp_path: Path, burst_whisper) -> None:
+    from dubbing_pipeline.stages.asr_shards import plan_shards
+    from dubbing_pipeline.utils.vad import detect_speech_segments
+
+    wav = _speechy_wav(tmp_path / "a.wav")
+    shards = plan_shards(wav, workers=2, min_shard_s=10.0, context_s=5.0)
+    speech = detect_speech_segments(wav)
+    assert len(shards) >= 3
+    assert shards[0].start_s == 0.0 and shards[-1].end_s == pytest.approx(70.0)
+    assert all(a.end_s == b.start_s for a, b in zip(shards, shards[1:], strict=False))
+    assert all(sh.start_s - sh.audio_start_s == pytest.approx(5.0) for sh in shards[1:])
+    for sh in shards[:-1]:
+        assert not any(s0 < sh.end_s < e0 for s0, e0 in speech)
+    assert plan_shards(wav, workers=2, min_shard_s=60.0) == plan_shards(wav, workers=1)[:1]
+
+
+def test_sharded_output_matches_single_process(tmp_path: Path, burst_whisper) -> None:
+    from dubbing_pipeline.stages.transcription import transcribe
+
+    wav = _speechy_wav(tmp_path / "a.wav")
+    one = transcribe(wav, tmp_path / "one.srt", "cpu", "small", "transcribe", "auto")
+    many = transcribe(
+        wav, tmp_path / "many.srt", "cpu", "small", "transcribe", "auto", shard_workers=2
+    )
+    m1 = json.loads(one.with_suffix(".json").read_text(encoding="utf-8"))
+    m2 = json.loads(many.with_suffix(".json").read_text(encoding="utf-8"))
+    assert "sharding" not in m1
+    report = m2["sharding"]
+    assert report["workers"] == 2 and len(report["shards"]) >= 3
+    # Copies decoded in the context pre-roll were dropped while stitching.
+    assert sum(r["dropped_overlap"] for r in report["shards"]) > 0
+    assert all(r["wall_s"] >= 0.0 and r["pid"] for r in report["shards"])
+
+    assert m2["detected_language"] == m1["detected_language"] == "ja"
+    assert m2["segments"] == m1["segments"]
+    assert [d["text"] for d in m2["segments_detail"]] == [d["text"] for d in m1["segments_detail"]]
+    for a, b in zip(m1["segments_detail"], m2["segments_detail"], strict=True):
+        assert b["start"] == pytest.approx(a["start"], abs=1e-3)
+        assert b["end"] == pytest.approx(a["end"], abs=1e-3)
+    assert many.read_text(encoding="utf-8").count(" --> ") == m1["segments"]
+
+
+def _stuck_shard(job: dict) -> dict:
+    import os
+    import time
+
+    Path(job["audio_path"]).with_name(f"worker-{os.getpid()}").touch()
+    time.sleep(600)
+    return {}
+
+
+def _shards_phase(wav: str) -> None:
+    from dubbing_pipeline.stages.asr_shards import Shard, transcribe_shards
+
+    shards = [
+        Shard(idx=i, start_s=5.0 * i, end_s=5.0 * i + 5, audio_start_s=5.0 * i) for i in range(2)
+    ]
+    transcribe_shards(
+        Path(wav),
+        shards,
+        workers=2,
+        model_name="small",
+        device="cpu",
+        task="transcribe",
+        language="ja",
+        want_words=False,
+        combined=False,
+        translate_hint=None,
+    )
+
+
+def _alive(pid: int) -> bool:
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except OSError:
+        return False
+    return state not in {"Z", "X"}
+
+
+def test_killed_watchdog_phase_takes_its_shard_workers_along(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import time
+
+    from dubbing_pipeline.jobs.watchdog import PhaseTimeout, run_with_timeout
+
+    if not Path("/proc/self/stat").exists():
+        pytest.skip("needs /proc")
+    monkeypatch.setattr("dubbing_pipeline.stages.asr_shards._MP_CONTEXT", "fork")
+    monkeypatch.setattr("dubbing_pipeline.stages.asr_shards._decode_shard", _stuck_shard)
+    wav = tmp_path / "a.wav"
+    with pytest.raises(PhaseTimeout):
+        run_with_timeout("asr", timeout_s=3, fn=_shards_phase, args=(str(wav),), daemon=False)
+    pids = [int(p.name.split("-")[1]) for p in tmp_path.glob("worker-*")]
+    assert len(pids) == 2
+    deadline = time.monotonic() + 10.0
+    while any(_alive(pid) for pid in pids) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(_alive(pid) for pid in pids)
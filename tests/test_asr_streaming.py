@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import sys
+import types
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dubbing_pipeline.runtime.model_manager import ModelManager
+
+SR = 16000
+
+
+class _Crash(BaseException):
+    pass
+
+
+class _FakeWhisperModel:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self.crash_at: int | None = None
+
+    def transcribe(self, audio, **kw):
+        if self.crash_at is not None and len(self.calls) == self.crash_at:
+            raise _Crash()
+        self.calls.append({"n": len(audio), **kw})
+        return {
+            "language": kw.get("language") or "ja",
+            "segments": [{"start": 0.25, "end": 0.75, "text": f" line {len(self.calls)}"}],
+        }
+
+
+def _speechy_wav(path: Path, seconds: float = 70.0) -> Path:
+    rng = np.random.default_rng(2)
+    t = np.arange(int(seconds * SR)) / SR
+    x = 0.0002 * rng.standard_normal(t.size)
+    pos = 0.5
+    while pos < seconds - 2.0:
+        dur = float(rng.uniform(1.0, 4.0))
+        m = (t >= pos) & (t < pos + dur)
+        x[m] += 0.3 * np.sin(2 * np.pi * 200 * t[m])
+        pos += dur + float(rng.uniform(0.5, 1.2))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes((x * 32767).astype("<i2").tobytes())
+    return path
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("DUBBING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("RETRY_MAX", "0")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    monkeypatch.setitem(sys.modules, "whisper", types.ModuleType("whisper"))
+    monkeypatch.setattr("dubbing_pipeline.utils.vad._webrtc", lambda cfg: None)
+    model = _FakeWhisperModel()
+    mm = ModelManager()
+    monkeypatch.setattr(mm, "_load_whisper", lambda name, device: model)
+    monkeypatch.setattr(ModelManager, "_singleton", mm)
+    yield model
+    get_settings.cache_clear()
+
+
+def test_windows_are_contiguous_and_cut_in_silence(tmp_path: Path, fake_whisper) -> None:
+    from dubbing_pipeline.stages.transcription import asr_windows
+    from dubbing_pipeline.utils.vad import detect_speech_segments
+
+    wav = _speechy_wav(tmp_path / "a.wav")
+    wins = list(asr_windows(wav, window_s=15.0))
+    speech = detect_speech_segments(wav)
+    assert wins[0][0] == 0.0 and wins[-1][1] == pytest.approx(70.0)
+    assert all(a[1] == b[0] for a, b in zip(wins, wins[1:], strict=False))
+    assert len(wins) >= 4
+    for _s, e in wins[:-1]:
+        assert not any(s0 < e < e0 for s0, e0 in speech)
+
+
+def test_streaming_journal_publishes_and_resumes(tmp_path: Path, fake_whisper) -> None:
+    from dubbing_pipeline.stages.transcription import (
+        asr_journal_path,
+        asr_windows,
+        follow_asr_journal,
+        transcribe,
+    )
+
+    model = fake_whisper
+    wav = _speechy_wav(tmp_path / "a.wav")
+    wins = list(asr_windows(wav, window_s=15.0))
+    srt = tmp_path / "a.srt"
+    published: list[list[dict]] = []
+    kw = {"streaming": True, "window_s": 15.0, "on_segments": published.append}
+
+    model.crash_at = 2
+    with pytest.raises(_Crash):
+        transcribe(wav, srt, "cpu", "small", "transcribe", "auto", **kw)
+    # Two windows survived the crash: journaled, in the partial SRT, already published.
+    assert len(published) == 2 and published[1][0]["start"] == pytest.approx(wins[1][0] + 0.25)
+    assert srt.read_text(encoding="utf-8").count(" --> ") == 2
+    assert not srt.with_suffix(".json").exists()
+
+    model.crash_at = None
+    transcribe(wav, srt, "cpu", "small", "transcribe", "auto", **kw)
+    assert len(model.calls) == len(wins) and len(published) == len(wins)
+    # The first window's detected language is pinned for the rest.
+    assert model.calls[0]["language"] is None
+    assert {c["language"] for c in model.calls[1:]} == {"ja"}
+    assert [c["n"] for c in model.calls] == [int(e * SR) - int(s * SR) for s, e in wins]
+
+    meta = json.loads(srt.with_suffix(".json").read_text(encoding="utf-8"))
+    assert meta["streaming"]["windows"] == len(wins)
+    starts = [d["start"] for d in meta["segments_detail"]]
+    assert starts == pytest.approx([s + 0.25 for s, _e in wins])
+    cues = srt.read_text(encoding="utf-8").strip().split("\n\n")
+    assert len(cues) == len(wins) and cues[-1].startswith(f"{len(wins)}\n")
+
+    recs = list(follow_asr_journal(asr_journal_path(srt), poll_s=0.01))
+    assert [r["type"] for r in recs] == ["header"] + ["window"] * len(wins) + ["done"]
+
+    # A different window size is a different journal: start over.
+    model.calls.clear()
+    srt.with_suffix(".json").unlink()
+    transcribe(wav, srt, "cpu", "small", "transcribe", "auto", streaming=True, window_s=25.0)
+    assert len(model.calls) == len(list(asr_windows(wav, window_s=25.0))) < len(wins)
+
+
+def test_fallback_model_restarts_the_journal(
+    tmp_path: Path, fake_whisper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from dubbing_pipeline.stages.transcription import (
+        asr_journal_path,
+        asr_windows,
+        follow_asr_journal,
+        transcribe,
+    )
+
+    class _Broken(_FakeWhisperModel):
+        def transcribe(self, audio, **kw):
+            if len(self.calls) == 2:
+                raise RuntimeError("oom")
+            return super().transcribe(audio, **kw)
+
+    broken = _Broken()
+    mm = ModelManager.instance()
+    monkeypatch.setattr(
+        mm, "_load_whisper", lambda name, device: broken if name == "large-v3" else fake_whisper
+    )
+    wav = _speechy_wav(tmp_path / "a.wav")
+    wins = list(asr_windows(wav, window_s=15.0))
+    srt = tmp_path / "a.srt"
+    transcribe(wav, srt, "cpu", "large-v3", "transcribe", "auto", streaming=True, window_s=15.0)
+
+    # Two large-v3 windows were journaled before the failure; medium redoes every window.
+    assert len(broken.calls) == 2 and len(fake_whisper.calls) == len(wins)
+    recs = list(follow_asr_journal(asr_journal_path(srt), poll_s=0.01))
+    assert recs[0]["key"]["model"] == "medium" and recs[0]["key"]["device"] == "cpu"
+    assert [r["type"] for r in recs] == ["header"] + ["window"] * len(wins) + ["done"]
+    assert srt.read_text(encoding="utf-8").count(" --> ") == len(wins)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from dubbing_pipeline import batch_pool
+from dubbing_pipeline.batch_pool import BatchInput, run_batch_pool
+
+
+def _fake_run_input(args: list[str]) -> str | None:
+    """
+    Stand-in for one pipeline run: logs (pid, input) and fails/crashes on request.
+    """
+    name = Path(args[0]).name
+    log = Path(os.environ["BATCH_TEST_LOG"])
+    with log.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"pid": os.getpid(), "input": name, "args": args[1:]}) + "\n")
+    time.sleep(0.05)
+    if name.startswith("boom"):
+        return "RuntimeError: boom"
+    if name.startswith("crash"):
+        os._exit(3)
+    return None
+
+
+@click.command("probe")
+@click.option("--tag", required=True)
+@click.option("--log", "log_path", required=True)
+def _probe(tag: str, log_path: str) -> None:
+    """
+    What one input sees of the worker's state; then it leaves env, settings and context dirty.
+    """
+    from dubbing_pipeline.config import get_settings
+    from dubbing_pipeline.utils.log import request_id_var
+
+    row = {
+        "tag": tag,
+        "leak": os.environ.get("BATCH_PROBE_LEAK"),
+        "mt_engine": str(get_settings().mt_engine),
+        "request_id": request_id_var.get(),
+    }
+    with Path(log_path).open("a", encoding="utf-8") as f:
+        f.write(json.dumps(row) + "\n")
+    os.environ["BATCH_PROBE_LEAK"] = tag
+    os.environ["MT_ENGINE"] = "nllb"
+    get_settings.cache_clear()
+    assert get_settings().mt_engine == "nllb"
+    request_id_var.set(f"req-{tag}")
+
+
+def _two_real_inputs(log_path: str) -> None:
+    # Runs in a spawned interpreter, like a batch worker: the real _run_input and cli.main.
+    from dubbing_pipeline.cli import cli
+    from dubbing_pipeline.utils.log import request_id_var
+
+    cli.add_command(_probe)
+    request_id_var.set("worker")
+    for tag in ("a", "b"):
+        error = batch_pool._run_input(["probe", "--tag", tag, "--log", log_path])
+        assert error is None, error
+
+
+@pytest.fixture
+def fake_runs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    log = tmp_path / "runs.jsonl"
+    monkeypatch.setenv("BATCH_TEST_LOG", str(log))
+    # Forked workers inherit the patched runner (spawned ones would run the real CLI).
+    monkeypatch.setattr(batch_pool, "_MP_CONTEXT", "fork")
+    monkeypatch.setattr(batch_pool, "_run_input", _fake_run_input)
+    return log
+
+
+def _inputs(*names: str) -> list[BatchInput]:
+    return [BatchInput(idx=i, path=Path(n), args=[n]) for i, n in enumerate(names, 1)]
+
+
+def _runs(log: Path) -> list[dict]:
+    return [json.loads(x) for x in log.read_text(encoding="utf-8").splitlines()]
+
+
+def test_workers_are_reused_and_replaced_after_failures(fake_runs: Path) -> None:
+    names = ("boom.mp4", "crash.mp4", "a.mp4", "b.mp4", "c.mp4", "d.mp4", "e.mp4")
+    report = run_batch_pool(_inputs(*names), workers=2)
+
+    by_idx = {r["idx"]: r for r in report["inputs"]}
+    assert [by_idx[i]["status"] for i in range(1, 8)] == ["failed"] * 2 + ["ok"] * 5
+    assert by_idx[1]["error"] == "RuntimeError: boom"
+    assert by_idx[2]["error"] == "worker crashed (exit=3)"
+    assert (report["ok"], report["failed"], report["skipped"]) == (5, 2, 0)
+    # A failed input ends its worker; a replacement is started while inputs remain.
+    runs = _runs(fake_runs)
+    assert sorted(r["input"] for r in runs) == sorted(names)
+    assert 3 <= report["worker_starts"] == len({r["pid"] for r in runs}) <= 4
+    assert any(r["worker_input"] > 1 for r in report["inputs"] if r["status"] == "ok")
+
+
+def test_fail_fast_and_worker_recycling(fake_runs: Path) -> None:
+    report = run_batch_pool(_inputs("boom.mp4", "a.mp4", "b.mp4"), workers=1, fail_fast=True)
+    assert [r["status"] for r in report["inputs"]] == ["failed", "skipped", "skipped"]
+    assert report["worker_starts"] == 1
+
+    fake_runs.unlink()
+    report = run_batch_pool(_inputs("a.mp4", "b.mp4", "c.mp4"), workers=1, max_inputs_per_worker=1)
+    assert report["ok"] == 3 and report["worker_starts"] == 3
+    assert len({r["pid"] for r in _runs(fake_runs)}) == 3
+
+
+def test_cli_batch_jobs_uses_pool_and_writes_report(
+    fake_runs: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from dubbing_pipeline.cli import cli
+    from dubbing_pipeline.config import get_settings
+
+    out = tmp_path / "Output"
+    monkeypatch.setenv("DUBBING_OUTPUT_DIR", str(out))
+    get_settings.cache_clear()
+    src = tmp_path / "season"
+    src.mkdir()
+    for n in ("ep01.mp4", "ep02.mp4", "ep03.mkv", "notes.txt"):
+        (src / n).write_bytes(b"\0")
+    try:
+        res = CliRunner().invoke(
+            cli, ["run", "--batch", str(src), "--jobs", "2", "--mode", "low", "--no-resume"]
+        )
+    finally:
+        get_settings.cache_clear()
+    assert res.exit_code == 0, res.output
+
+    runs = _runs(fake_runs)
+    assert sorted(r["input"] for r in runs) == ["ep01.mp4", "ep02.mp4", "ep03.mkv"]
+    assert all(r["args"][r["args"].index("--mode") + 1] == "low" for r in runs)
+    reports = list((out / "_batch").glob("batch_*.json"))
+    assert len(reports) == 1
+    report = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert report["ok"] == 3 and report["workers"] == 2 and report["spec"] == str(src)
+
+
+def test_real_run_input_isolates_consecutive_inputs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MT_ENGINE", raising=False)
+    monkeypatch.delenv("BATCH_PROBE_LEAK", raising=False)
+    log = tmp_path / "probe.jsonl"
+    p = mp.get_context("spawn").Process(target=_two_real_inputs, args=(str(log),))
+    p.start()
+    p.join(60)
+    assert p.exitcode == 0
+
+    rows = _runs(log)
+    assert [r["tag"] for r in rows] == ["a", "b"]
+    # The second input sees none of the first one's env, cached settings or context.
+    for r in rows:
+        assert r["leak"] is None
+        assert r["mt_engine"] == "auto"
+        assert r["request_id"] is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.run import compare, main, run_cases  # noqa: E402
+
+
+def test_quick_run_produces_results() -> None:
+    res = run_cases(
+        ["vad", "render_aligned_track", "subtitle_format", "sse_fanout"],
+        scale=0.05,
+        repeat=1,
+        warmup=0,
+    )
+    assert set(res["cases"]) == {"vad", "render_aligned_track", "subtitle_format", "sse_fanout"}
+    for row in res["cases"].values():
+        assert row["median_s"] > 0 and row["throughput"] > 0
+    assert res["errors"] == {}
+
+
+def test_compare_flags_regressions_over_threshold() -> None:
+    base = {"params": {"scale": 1.0}, "cases": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+    cur = {"params": {"scale": 1.0}, "cases": {"a": {"median_s": 1.2}, "b": {"median_s": 1.5}}}
+    regs = compare(cur, base, threshold=0.25)
+    assert [r["case"] for r in regs] == ["b"]
+    # Different input scale => not comparable.
+    assert compare({**cur, "params": {"scale": 0.1}}, base) == []
+
+
+def test_cli_baseline_roundtrip(tmp_path: Path) -> None:
+    out = tmp_path / "latest.json"
+    baseline = tmp_path / "baseline.json"
+    args = ["--only", "subtitle_format", "--quick", "--out", str(out), "--baseline", str(baseline)]
+    assert main([*args, "--update-baseline"]) == 0
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    assert "subtitle_format" in data["cases"]
+    # Generous threshold: same node, same inputs => no regression.
+    assert main([*args, "--threshold", "100"]) == 0
+
+
+def test_failing_case_is_an_error_not_a_skip(tmp_path: Path, monkeypatch) -> None:
+    from benchmarks import cases
+
+    def _broken(ctx):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(cases.CASES, "broken", cases.BenchCase("broken", "ops", _broken))
+    res = run_cases(["broken"], scale=0.05, repeat=1, warmup=0)
+    assert res["errors"] == {"broken": "RuntimeError: boom"} and res["skipped"] == {}
+    baseline = tmp_path / "baseline.json"
+    args = ["--only", "broken", "--out", str(tmp_path / "o.json"), "--baseline", str(baseline)]
+    assert main([*args, "--update-baseline"]) == 1
+    assert not baseline.exists()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from dubbing_pipeline.ops.importtime import (
+    STARTUP_BUDGETS,
+    check_budget,
+    import_chain,
+    measure_imports,
+    parse_importtime,
+)
+
+_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       300 |        420 |   json.decoder
+import time:        80 |        500 | json
+"""
+
+
+def test_parse_importtime_and_chain() -> None:
+    recs = parse_importtime(_SAMPLE)
+    assert [(r.name, r.depth) for r in recs] == [("_json", 2), ("json.decoder", 1), ("json", 0)]
+    assert recs[-1].cumulative_us == 500
+    assert import_chain(recs, "_json") == ["_json", "json.decoder", "json"]
+
+
+@pytest.mark.parametrize("budget", STARTUP_BUDGETS, ids=lambda b: b.module)
+def test_entry_points_stay_light(budget) -> None:
+    try:
+        records = measure_imports(budget.module)
+    except RuntimeError as ex:
+        if budget.module == "dubbing_pipeline.server":
+            pytest.skip(f"server does not import in this environment: {ex}")
+        raise
+    # Wall-clock budgets are noisy on shared CI runners; forbidden imports are not.
+    problems = [p for p in check_budget(budget, records) if " imports " in p]
+    assert problems == []
+    slack = budget.__class__(budget.module, budget.max_ms * 4, ())
+    assert check_budget(slack, records) == []
+
+
+def test_cli_resolves_lazy_commands() -> None:
+    from click.testing import CliRunner
+
+    from dubbing_pipeline.cli import cli
+
+    res = CliRunner().invoke(cli, ["doctor", "--help"])
+    assert res.exit_code == 0, res.output
+    assert "Usage:" in res.output
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.plugins.lipsync import wav2lip_plugin as w2l
+from dubbing_pipeline.plugins.lipsync.base import LipSyncRequest
+
+# Stands in for Wav2Lip's infer.py: records its wall-clock window, fails once on request,
+# then "lip-syncs" by copying the face clip.
+_STUB = """
+import argparse, json, os, shutil, sys, time
+p = argparse.ArgumentParser()
+for a in ("--checkpoint_path", "--face", "--audio", "--outfile", "--device"):
+    p.add_argument(a)
+p.add_argument("--box", nargs=4)
+a = p.parse_args()
+t0 = time.time()
+time.sleep(0.4)
+seg = os.path.basename(os.path.dirname(a.face))
+flag = os.path.join(os.path.dirname(__file__), "fail_" + seg)
+rec = {"seg": seg, "t0": t0, "t1": time.time(), "box": a.box}
+with open(os.path.join(os.path.dirname(__file__), "calls.jsonl"), "a") as f:
+    f.write(json.dumps(rec) + "\\n")
+if os.path.exists(flag):
+    os.remove(flag)
+    sys.exit(3)
+shutil.copyfile(a.face, a.outfile)
+"""
+
+
+def test_plan_pieces_copies_between_keyframes() -> None:
+    kf = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    pieces = w2l._plan_pieces([(3.1, 5.0), (8.9, 9.5)], duration_s=12.0, keyframes=kf)
+    assert pieces == [
+        (0.0, 2.0, "copy"),
+        (2.0, 3.1, "encode"),
+        (3.1, 5.0, "lipsync"),
+        (5.0, 6.0, "encode"),
+        (6.0, 8.0, "copy"),
+        # 8.0 -> 8.9 is longer than the edge threshold, so it stays a re-encoded piece.
+        (8.0, 8.9, "encode"),
+        (8.9, 9.5, "lipsync"),
+        (9.5, 10.0, "encode"),
+        (10.0, 12.0, "copy"),
+    ]
+    # Short edges fold into the neighbouring lip-sync range; no keyframes => re-encode the gap.
+    assert w2l._plan_pieces([(2.1, 3.9)], duration_s=6.0, keyframes=[0.0, 2.0, 4.0]) == [
+        (0.0, 2.0, "copy"),
+        (2.0, 4.0, "lipsync"),
+        (4.0, 6.0, "copy"),
+    ]
+    assert w2l._plan_pieces([(1.0, 2.0)], duration_s=3.0, keyframes=[]) == [
+        (0.0, 1.0, "encode"),
+        (1.0, 2.0, "lipsync"),
+        (2.0, 3.0, "encode"),
+    ]
+
+
+def test_ranges_run_in_parallel_with_cached_face_boxes(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "wav2lip"
+    repo.mkdir()
+    (repo / "inference.py").write_text(_STUB, encoding="utf-8")
+    ckpt = repo / "wav2lip.pth"
+    ckpt.write_bytes(b"x")
+    src = tmp_path / "in.mp4"
+    src.write_bytes(b"source-video")
+    audio = tmp_path / "dub.wav"
+    audio.write_bytes(b"dub-audio")
+
+    monkeypatch.setenv("LIPSYNC_WORKERS", "3")
+    monkeypatch.setenv("LIPSYNC_RANGE_RETRIES", "1")
+    monkeypatch.setenv("LIPSYNC_PASSTHROUGH_COPY", "1")
+    get_settings.cache_clear()
+
+    cuts: list[tuple[str, float, float]] = []
+    detected: list[tuple[float, float]] = []
+    concat: list[list[Path]] = []
+
+    def _slice(self, *, src_video, start_s, end_s, out_mp4):
+        cuts.append(("encode", float(start_s), float(end_s)))
+        copied.discard(out_mp4.parent.name)
+        shutil.copyfile(src_video, out_mp4)
+        return out_mp4
+
+    def _cut_copy(self, *, src_video, start_s, end_s, out_mp4):
+        cuts.append(("copy", float(start_s), float(end_s)))
+        copied.add(out_mp4.parent.name)
+        shutil.copyfile(src_video, out_mp4)
+        return out_mp4
+
+    def _mux(self, *, video_mp4, audio_wav, out_mp4, timeout_s):
+        shutil.copyfile(video_mp4, out_mp4)
+        return out_mp4
+
+    def _concat(self, *, mp4s, out_mp4, timeout_s):
+        concat.append(list(mp4s))
+        out_mp4.write_bytes(b"".join(p.read_bytes() for p in mp4s))
+        return out_mp4
+
+    def _box(*, video, start_s, end_s, width, height, **_kw):
+        detected.append((float(start_s), float(end_s)))
+        return (10, 20, 110, 140)
+
+    monkeypatch.setattr(w2l.Wav2LipPlugin, "_slice_video_segment", _slice)
+    monkeypatch.setattr(w2l.Wav2LipPlugin, "_cut_copy", _cut_copy)
+    monkeypatch.setattr(w2l.Wav2LipPlugin, "_mux_video_audio", _mux)
+    monkeypatch.setattr(w2l.Wav2LipPlugin, "_concat_mp4s", _concat)
+    monkeypatch.setattr(w2l, "detect_face_box", _box)
+    monkeypatch.setattr(w2l, "pick_device", lambda prefer="auto": "cpu")
+    monkeypatch.setattr(w2l.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(w2l, "ffprobe_duration_seconds", lambda p: 20.0)
+    monkeypatch.setattr(
+        w2l, "ffprobe_media_info", lambda p: {"video_codec": "h264", "width": 640, "height": 360}
+    )
+    monkeypatch.setattr(w2l, "ffprobe_keyframes", lambda p: [float(k) for k in range(0, 20, 2)])
+    # Copied pieces probe like the source; `copy_tb` simulates a timebase mismatch.
+    copied: set[str] = set()
+    copy_tb = {"tb": "1/12288"}
+    base = {"codec_name": "h264", "profile": "Constrained Baseline", "level": "30"}
+    base.update({"pix_fmt": "yuv420p", "width": "640", "height": "360"})
+
+    def _probe(p):
+        tb = copy_tb["tb"] if Path(p).parent.name in copied else "1/12288"
+        return {**base, "time_base": tb}
+
+    monkeypatch.setattr(w2l, "ffprobe_video_stream", _probe)
+    monkeypatch.setattr(
+        w2l, "extract_audio_mono_16k", lambda *, src, dst, **_kw: shutil.copyfile(src, dst)
+    )
+
+    ranges = [(2.0, 4.0), (6.0, 8.0), (10.0, 12.0)]
+    out_dir = tmp_path / "job"
+    req = LipSyncRequest(
+        input_video=src,
+        dubbed_audio_wav=audio,
+        output_video=out_dir / "final_lipsynced.mp4",
+        work_dir=out_dir / "tmp" / "lipsync",
+        scene_limited=True,
+        ranges=ranges,
+    )
+    plugin = w2l.Wav2LipPlugin(wav2lip_dir=repo, checkpoint_path=ckpt)
+    try:
+        (repo / "fail_seg_003").write_text("1")  # range 6-8 fails once, then succeeds
+        assert plugin.run(req) == req.output_video
+
+        calls = [json.loads(x) for x in (repo / "calls.jsonl").read_text().splitlines()]
+        assert sorted(c["seg"] for c in calls) == ["seg_001", "seg_003", "seg_003", "seg_005"]
+        firsts = sorted(calls, key=lambda c: c["t0"])[:3]
+        # The three ranges' first attempts overlap in time.
+        assert max(c["t0"] for c in firsts) < min(c["t1"] for c in firsts)
+        assert all(c["box"] == ["10", "20", "110", "140"] for c in calls)
+        # One detection per range, even though seg_003 ran twice.
+        assert sorted(detected) == ranges
+        # Gaps are keyframe-aligned, so every pass-through piece is a stream copy.
+        assert all(kind == "copy" for kind, a, b in cuts if (a, b) not in ranges)
+        assert [p.parent.name for p in concat[0]] == [f"seg_{i:03d}" for i in range(7)]
+        log = (out_dir / "analysis" / "lipsync_ranges.jsonl").read_text().splitlines()
+        assert [json.loads(x)["status"] for x in log] == ["ok"] * 7
+
+        # A re-run reuses the persisted face boxes.
+        assert plugin.run(req) == req.output_video
+        assert sorted(detected) == ranges
+
+        # Copied pieces that would not concat cleanly with the re-encoded ones are re-encoded.
+        copy_tb["tb"] = "1/15360"
+        cuts.clear()
+        assert plugin.run(req) == req.output_video
+        gaps = [(0.0, 2.0), (4.0, 6.0), (8.0, 10.0), (12.0, 20.0)]
+        assert sorted((a, b) for kind, a, b in cuts if kind == "encode") == sorted(gaps + ranges)
+        assert sorted((a, b) for kind, a, b in cuts if kind == "copy") == gaps
+    finally:
+        get_settings.cache_clear()
+
+
+@pytest.mark.parametrize("device,expect", [("cpu", 3), ("cuda", 1)])
+def test_range_workers_respect_device(monkeypatch, device: str, expect: int) -> None:
+    monkeypatch.setenv("LIPSYNC_WORKERS", "3")
+    monkeypatch.setenv("LIPSYNC_GPU_WORKERS", "1")
+    get_settings.cache_clear()
+    monkeypatch.setattr(w2l, "pick_device", lambda prefer="auto": prefer)
+    monkeypatch.setattr(w2l.os, "cpu_count", lambda: 8)
+    try:
+        assert w2l._range_workers(device, 5) == expect
+        assert w2l._range_workers(device, 0) == 1
+    finally:
+        get_settings.cache_clear()
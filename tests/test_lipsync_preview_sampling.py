@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+import time
+
+import pytest
+
+from dubbing_pipeline.plugins.lipsync.preview import (
+    _adaptive_face_samples,
+    _recommend_ranges_from_samples,
+)
+from dubbing_pipeline.utils.ffmpeg_safe import FFmpegError, pipe_rawvideo
+
+
+def test_adaptive_sampling_matches_dense_detection_with_fewer_frames() -> None:
+    n = 240
+    truth = [30 <= i < 95 or 150 <= i < 171 or i == 239 for i in range(n)]
+    fetched: list[int] = []
+
+    def _fetch(start: int, step: int, count: int) -> list[int]:
+        idx = [i for i in range(start, n, step)][:count]
+        fetched.extend(idx)
+        return idx
+
+    def _detect(frames: list[int]) -> list[int | None]:
+        return [1 if truth[i] else 0 for i in frames]
+
+    samples, detected = _adaptive_face_samples(n=n, stride=4, fetch=_fetch, detect=_detect)
+    assert [s.face_found for s in samples] == truth
+    assert [int(s.t_s) for s in samples] == list(range(n))
+    assert detected == len(set(fetched)) and detected < n // 2
+    # Transitions are detected, not inferred.
+    assert samples[30].method == "opencv_haar" and samples[95].method == "opencv_haar"
+    assert samples[61].method == "inferred"
+
+    dense, _ = _adaptive_face_samples(n=n, stride=1, fetch=_fetch, detect=_detect)
+    kw = dict(
+        duration_s=120.0,
+        effective_sample_every_s=0.5,
+        min_face_ratio=0.6,
+        min_range_s=2.0,
+        merge_gap_s=0.6,
+    )
+    assert _recommend_ranges_from_samples(samples=samples, **kw) == (
+        _recommend_ranges_from_samples(samples=dense, **kw)
+    )
+
+
+def test_pipe_rawvideo_yields_whole_frames() -> None:
+    argv = [sys.executable, "-c", "import sys; sys.stdout.buffer.write(bytes(range(7)) * 3)"]
+    frames = list(pipe_rawvideo(argv, frame_bytes=6))
+    assert frames == [bytes(range(6)), bytes([6, 0, 1, 2, 3, 4]), bytes([5, 6, 0, 1, 2, 3])]
+
+
+def test_pipe_rawvideo_kills_a_stalled_decoder() -> None:
+    code = "import sys, time; sys.stdout.buffer.write(b'ab'); sys.stdout.flush(); time.sleep(60)"
+    t0 = time.monotonic()
+    with pytest.raises(FFmpegError, match="no frame"):
+        list(pipe_rawvideo([sys.executable, "-c", code], frame_bytes=2, timeout_s=1))
+    assert time.monotonic() - t0 < 10
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.ops import metrics as m
+
+
+def _value(name: str, **labels: str) -> float:
+    return float(m.REGISTRY.get_sample_value(name, labels) or 0.0)
+
+
+def test_label_cache_resolves_each_child_once() -> None:
+    cache = m.LabelCache(m.queue_events)
+    a = cache("local", "submitted")
+    assert cache("local", "submitted") is a
+    assert cache("redis", "submitted") is not a
+    before = _value("dubbing_pipeline_queue_events_total", backend="local", event="submitted")
+    a.inc(2)
+    after = _value("dubbing_pipeline_queue_events_total", backend="local", event="submitted")
+    assert after - before == 2
+
+
+def test_subsystems_record_events(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from dubbing_pipeline.cache.store import cache_get
+    from dubbing_pipeline.config import get_settings
+    from dubbing_pipeline.runtime.model_manager import ModelManager
+    from dubbing_pipeline.utils.ffmpeg_safe import FFmpegError, run_ffmpeg
+
+    calls = "dubbing_pipeline_ffmpeg_calls_total"
+    ok0 = _value(calls, tool="true", result="ok")
+    failed0 = _value(calls, tool="false", result="failed")
+    run_ffmpeg(["true"])
+    with pytest.raises(FFmpegError):
+        run_ffmpeg(["false"])
+    assert _value(calls, tool="true", result="ok") == ok0 + 1
+    assert _value(calls, tool="false", result="failed") == failed0 + 1
+    assert _value("dubbing_pipeline_ffmpeg_inflight") == 0
+
+    monkeypatch.setenv("MODEL_CACHE_MAX", "1")
+    monkeypatch.setenv("DUBBING_CACHE_DIR", str(tmp_path / "cache"))
+    get_settings.cache_clear()
+    try:
+        mm = ModelManager()
+        monkeypatch.setattr(mm, "_load_whisper", lambda name, device: object())
+        reqs = "dubbing_pipeline_model_requests_total"
+        loads0 = _value(reqs, kind="whisper", result="load")
+        hits0 = _value(reqs, kind="whisper", result="hit")
+        resident0 = _value("dubbing_pipeline_models_resident", kind="whisper")
+        with mm.acquire_whisper("small", "cpu"), mm.acquire_whisper("small", "cpu"):
+            assert _value("dubbing_pipeline_models_resident", kind="whisper") == resident0 + 1
+        # Cache holds one model: loading another evicts the idle one.
+        with mm.acquire_whisper("medium", "cpu"):
+            pass
+        assert _value(reqs, kind="whisper", result="load") == loads0 + 2
+        assert _value(reqs, kind="whisper", result="hit") == hits0 + 1
+        assert _value("dubbing_pipeline_models_resident", kind="whisper") == resident0 + 1
+
+        misses0 = _value("dubbing_pipeline_cache_requests_total", cache="tts", result="miss")
+        assert cache_get("tts:0123") is None
+        misses = _value("dubbing_pipeline_cache_requests_total", cache="tts", result="miss")
+        assert misses == misses0 + 1
+    finally:
+        get_settings.cache_clear()
+
+
+def test_render_is_coalesced_within_max_age() -> None:
+    first = m.render_latest(max_age_s=0)
+    assert b"dubbing_pipeline_sched_queue_depth" in first
+    assert b"dubbing_pipeline_ffmpeg_calls_total" in first
+    m.upload_bytes.inc(7)
+    # Within the window every scrape gets the same bytes; a fresh render sees the increment.
+    assert m.render_latest(max_age_s=60) is first
+    assert m.render_latest(max_age_s=0) != first
+
+
+_CHILD = """
+import sys
+from dubbing_pipeline.ops import metrics as m
+m.queue_event("local", "submitted").inc(int(sys.argv[1]))
+m.sched_active_jobs.inc()
+print(__import__("os").getpid())
+"""
+
+_SCRAPE = """
+import sys
+from dubbing_pipeline.ops import metrics as m
+m.mark_process_dead(int(sys.argv[1]))
+sys.stdout.write(m.render_latest().decode())
+"""
+
+
+def test_multiprocess_mode_aggregates_all_processes(tmp_path: Path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def _py(code: str, *args: str) -> str:
+        proc = subprocess.run(
+            [sys.executable, "-c", code, *args],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=120,
+            check=True,
+        )
+        return proc.stdout
+
+    first = _py(_CHILD, "2").strip()
+    _py(_CHILD, "3")
+    body = _py(_SCRAPE, first)
+    lines = set(body.splitlines())
+    assert 'dubbing_pipeline_queue_events_total{backend="local",event="submitted"} 5.0' in lines
+    # Counters survive their process; live gauges of a process marked dead are dropped.
+    assert "dubbing_pipeline_sched_active_jobs 1.0" in lines
+    assert not list(tmp_path.glob(f"gauge_livesum_{first}.db"))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.audio import music_detect as md
+
+
+def _wav(path: Path, *, seconds: float, music: list[tuple[float, float]], sr: int = 16000) -> Path:
+    rng = np.random.default_rng(7)
+    t = np.arange(int(seconds * sr)) / sr
+    x = 0.02 * np.sin(2 * np.pi * 150 * t)  # quiet hum: not music for the heuristic
+    for a, b in music:
+        m = (t >= a) & (t < b)
+        x[m] += 0.3 * rng.standard_normal(int(m.sum())) + 0.2 * np.sin(2 * np.pi * 440 * t[m])
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(np.clip(x * 32767, -32768, 32767).astype("<i2").tobytes())
+    return path
+
+
+def _naive_window(x: np.ndarray, sr: int) -> tuple[float, float, float, float]:
+    v = x.astype(np.float64) / 32768.0
+    mag = np.abs(np.fft.rfft(v * np.hanning(v.size))) + 1e-9
+    freqs = np.fft.rfftfreq(v.size, 1.0 / sr)
+    cdf = np.cumsum(mag)
+    roll = freqs[min(int(np.searchsorted(cdf, 0.85 * cdf[-1])), freqs.size - 1)]
+    return (
+        float(np.sqrt(np.mean(v * v))),
+        float((freqs * mag).sum() / mag.sum()),
+        float(np.exp(np.mean(np.log(mag))) / np.mean(mag)),
+        float(roll),
+    )
+
+
+def test_batched_features_match_per_window_reference(tmp_path: Path) -> None:
+    p = _wav(tmp_path / "a.wav", seconds=7.3, music=[(2.0, 5.0)])
+    md._FEATURE_CACHE.clear()
+    feats = md.compute_music_features(p, window_s=1.0, hop_s=0.5)
+    assert feats is not None and len(feats) == 15  # last window (7.0-7.3) is truncated
+    with wave.open(str(p), "rb") as wf:
+        x = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    for k in range(len(feats)):
+        i0, i1 = int(feats.start[k] * 16000), int(feats.end[k] * 16000)
+        got = (feats.rms[k], feats.centroid[k], feats.flat[k], feats.roll[k])
+        assert np.allclose(got, _naive_window(x[i0:i1], 16000), rtol=1e-9)
+
+    regs = md.analyze_audio_for_music_regions(p, threshold=0.7)
+    assert len(regs) == 1 and 1.0 <= regs[0].start <= 2.0 and 5.0 <= regs[0].end <= 6.0
+
+
+def test_coverage_prefix_sums_match_linear_scan() -> None:
+    iv = [(0.3, 1.2), (1.0, 2.5), (4.0, 4.01), (7.0, 9.0), (3.0, 3.0)]
+    starts = np.arange(0.0, 10.0, 0.5)
+    ends = np.minimum(10.0, starts + 1.0)
+    expected = []
+    for a, b in zip(starts, ends, strict=True):
+        tot = sum(max(0.0, min(b, e) - max(a, s)) for s, e in iv)
+        expected.append(max(0.0, min(1.0, tot / (b - a))))
+    assert np.allclose(md._coverage_ratios(iv, starts, ends), expected)
+
+
+def test_op_ed_reuses_feature_matrix_and_runs_fast(tmp_path: Path, monkeypatch) -> None:
+    minutes = 4
+    p = _wav(
+        tmp_path / "ep.wav",
+        seconds=60.0 * minutes,
+        music=[(5.0, 80.0), (60.0 * minutes - 70.0, 60.0 * minutes - 2.0)],
+    )
+    md._FEATURE_CACHE.clear()
+    t0 = time.perf_counter()
+    regs = md.analyze_audio_for_music_regions(p, threshold=0.7)
+    assert time.perf_counter() - t0 < 0.5 * minutes
+
+    def _no_rescan(*_a, **_kw):
+        raise AssertionError("detect_op_ed re-read the audio")
+
+    monkeypatch.setattr(md, "_pcm16_view", _no_rescan)
+    monkeypatch.setattr(md, "_wav_duration_s", _no_rescan)
+    oped = md.detect_op_ed(p, music_regions=regs, seconds=90, threshold=0.7)
+    assert oped["op"] is not None and oped["op"].start < 10.0
+    assert oped["ed"] is not None and oped["ed"].end > 60.0 * minutes - 10.0
+    # Regions can also come straight from the cached features.
+    assert md.detect_op_ed(p, seconds=90, threshold=0.7) == oped
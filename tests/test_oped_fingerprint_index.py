@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.audio import oped_index as oi
+from dubbing_pipeline.audio.music_detect import Region, should_suppress_segment
+from dubbing_pipeline.jobs.store import JobStore
+
+SR = 16000
+_NOTES = [220, 247, 262, 294, 330, 349, 392, 440, 494, 523, 587, 659]
+
+
+def _song(seconds: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    x = np.zeros(int(seconds * SR))
+    tt = np.arange(SR // 4) / SR
+    for i, f in enumerate(rng.choice(_NOTES, size=int(seconds * 4))):
+        a = i * (SR // 4)
+        n = min(tt.size, x.size - a)
+        note = 0.3 * np.sin(2 * np.pi * f * tt) * np.exp(-3 * tt)
+        note += 0.15 * np.sin(2 * np.pi * 2 * f * tt) * np.exp(-4 * tt)
+        x[a : a + n] += note[:n]
+    return x + 0.02 * rng.standard_normal(x.size)
+
+
+def _talk(seconds: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voiced = rng.random(t.size) > 0.3
+    return 0.2 * np.sin(2 * np.pi * np.cumsum(f0) / SR) * voiced + 0.03 * rng.standard_normal(
+        t.size
+    )
+
+
+def _wav(path: Path, *parts: np.ndarray) -> Path:
+    x = np.concatenate(parts)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(np.clip(x * 32767, -32768, 32767).astype("<i2").tobytes())
+    return path
+
+
+def test_opening_learned_in_one_episode_is_recognized_in_the_next(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db")
+    op = _song(45.0, seed=1)
+    ep1 = _wav(tmp_path / "ep1.wav", _talk(10.0, 2), op, _talk(30.0, 3))
+    ep2 = _wav(tmp_path / "ep2.wav", _talk(23.37, 4), op, _talk(40.0, 5))
+
+    idx1 = oi.SeriesOpEdIndex.for_episode(store=store, series_slug="show", wav=ep1)
+    assert idx1 is not None and idx1.matches == []
+    detected = Region(start=10.0, end=55.0, kind="op", confidence=0.8, reason="heuristic")
+    cached = [Region(start=12.0, end=50.0, kind="singing", confidence=0.6, reason="heuristic")]
+    learned = idx1.learn({"op": detected, "ed": None}, cached, job_id="job1")
+    assert len(learned) == 1
+    rows = store.list_series_fingerprints("show", params=oi.PARAMS)
+    assert [r["kind"] for r in rows] == ["op"] and rows[0]["source_job_id"] == "job1"
+    # Entries are scoped to their series.
+    assert oi.SeriesOpEdIndex.for_episode(store=store, series_slug="other", wav=ep1) is not None
+    assert store.list_series_fingerprints("other") == []
+
+    idx2 = oi.SeriesOpEdIndex.for_episode(store=store, series_slug="show", wav=ep2)
+    assert idx2 is not None and len(idx2.matches) == 1
+    m = idx2.matches[0]
+    assert m.kind == "op" and m.source_job_id == "job1" and m.score > 0.3
+    assert abs(m.start_s - 23.37) < 0.1 and abs(m.end_s - (23.37 + 45.0)) < 0.5
+
+    regs = idx2.music_regions([Region(30.0, 40.0, "music", 0.7, "heuristic")])
+    assert [r.kind for r in regs] == ["op", "singing"]
+    assert abs(regs[1].start - (23.37 + 2.0)) < 0.1
+    assert should_suppress_segment(30.0, 31.5, regs)
+    assert not should_suppress_segment(5.0, 8.0, regs)
+    assert not should_suppress_segment(75.0, 80.0, regs)
+    oped = idx2.op_ed({"op": None, "ed": None})
+    assert oped["op"] is not None and oped["op"].reason.startswith("fingerprint_match")
+    assert idx2.learn(oped, regs, job_id="job2") == []
+    assert store.list_series_fingerprints("show")[0]["hits"] == 1
+
+
+def test_different_song_does_not_match(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db")
+    ep1 = _wav(tmp_path / "ep1.wav", _talk(5.0, 2), _song(40.0, seed=1), _talk(20.0, 3))
+    ep2 = _wav(tmp_path / "ep2.wav", _talk(8.0, 4), _song(40.0, seed=9), _talk(20.0, 5))
+    idx1 = oi.SeriesOpEdIndex.for_episode(store=store, series_slug="show", wav=ep1)
+    assert idx1 is not None
+    assert idx1.learn({"op": Region(5.0, 45.0, "op", 0.8, "heuristic"), "ed": None}, [])
+    idx2 = oi.SeriesOpEdIndex.for_episode(store=store, series_slug="show", wav=ep2)
+    assert idx2 is not None and idx2.matches == []
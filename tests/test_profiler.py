@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs.watchdog import run_with_timeout
+from dubbing_pipeline.ops import profiler
+from dubbing_pipeline.ops.spans import (
+    SpanRecorder,
+    install_recorder,
+    reset_recorder,
+    span,
+    thread_context,
+)
+
+
+def _busy(n: int) -> int:
+    t_end = time.monotonic() + 0.4
+    x = 0
+    while time.monotonic() < t_end:
+        x += sum(range(n))
+    return x
+
+
+def _env(monkeypatch, tmp_path: Path, **extra: str) -> None:
+    monkeypatch.setenv("DUBBING_STATE_DIR", str(tmp_path / "_state"))
+    monkeypatch.setenv("PROFILING_ENABLED", "1")
+    monkeypatch.setenv("PROFILING_HZ", "200")
+    for k, v in extra.items():
+        monkeypatch.setenv(k, v)
+    get_settings.cache_clear()
+
+
+def test_arm_state_roundtrip(monkeypatch, tmp_path: Path) -> None:
+    _env(monkeypatch, tmp_path)
+    try:
+        ctl = profiler.arm_job("j1")
+        assert profiler.is_armed("j1", ctl) and not profiler.is_armed("j2", ctl)
+        ctl = profiler.arm_window(60)
+        assert profiler.is_armed("j2", ctl)
+        ctl = profiler.disarm()
+        assert not profiler.is_armed("j1", ctl) and not profiler.is_armed("j2", ctl)
+        # Expired job arms are dropped.
+        ctl = profiler.arm_job("j3", seconds=60)
+        assert not profiler.is_armed("j3", ctl, now=time.time() + 120)
+    finally:
+        get_settings.cache_clear()
+
+
+def test_armed_job_samples_parent_and_watchdog_child(monkeypatch, tmp_path: Path) -> None:
+    _env(monkeypatch, tmp_path)
+    logs = tmp_path / "job" / "logs"
+    rec = SpanRecorder("jp")
+    tok = install_recorder(rec)
+    try:
+        profiler.arm_job("jp")
+        profiler.register_job("jp", logs)
+        assert profiler.active_jobs() == ["jp"]
+        with span("tts", kind="stage"):
+            _busy(200)
+        with span("transcribe", kind="stage"):
+            run_with_timeout("transcribe", timeout_s=30, fn=_busy, args=(200,))
+    finally:
+        profiler.unregister_job("jp")
+        reset_recorder(tok)
+        get_settings.cache_clear()
+
+    collapsed = (logs / profiler.COLLAPSED_FILENAME).read_text(encoding="utf-8")
+    lines = collapsed.splitlines()
+    assert any(ln.startswith("stage:tts;") and "_busy" in ln for ln in lines)
+    # Child samples are merged back and labelled with the watchdog phase stage.
+    assert any(ln.startswith("stage:transcribe;") and "_busy" in ln for ln in lines)
+    ss = json.loads((logs / profiler.SPEEDSCOPE_FILENAME).read_text(encoding="utf-8"))
+    prof = ss["profiles"][0]
+    assert prof["type"] == "sampled" and len(prof["samples"]) == len(prof["weights"])
+    assert profiler.active_jobs() == []
+    # The job finished, so its open-ended arm request is gone.
+    assert "jp" not in profiler.read_control()["jobs"]
+
+
+def test_loop_thread_samples_follow_the_running_task() -> None:
+    seen: dict[str, tuple[str, str] | None] = {}
+
+    async def _job(job_id: str, stage: str) -> None:
+        tok = install_recorder(SpanRecorder(job_id))
+        try:
+            with span(stage, kind="stage"):
+                await asyncio.sleep(0.01)  # both jobs now have a span open on this thread
+                seen[job_id] = thread_context(threading.get_ident())
+                await asyncio.sleep(0.01)
+        finally:
+            reset_recorder(tok)
+
+    async def _main() -> None:
+        await asyncio.gather(_job("ja", "asr"), _job("jb", "tts"))
+        seen["idle"] = thread_context(threading.get_ident())
+
+    asyncio.run(_main())
+    assert seen == {"ja": ("ja", "asr"), "jb": ("jb", "tts"), "idle": None}
+
+
+def test_unarmed_or_disabled_job_is_not_sampled(monkeypatch, tmp_path: Path) -> None:
+    _env(monkeypatch, tmp_path, PROFILING_ENABLED="0")
+    logs = tmp_path / "job" / "logs"
+    try:
+        profiler.register_job("jx", logs)
+        assert profiler.active_jobs() == []
+        profiler.unregister_job("jx")
+    finally:
+        get_settings.cache_clear()
+    assert not (logs / profiler.COLLAPSED_FILENAME).exists()
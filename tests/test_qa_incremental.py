@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.qa import scoring_impl as qa
+
+
+def _clip(path: Path, seconds: float, amp: float, *, channels: int = 1) -> str:
+    x = (amp * 32767 * np.sin(np.arange(int(16000 * seconds)) / 7.0)).astype("<i2")
+    if channels > 1:
+        x = np.repeat(x, channels)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(x.tobytes())
+    return str(path)
+
+
+def _job(tmp_path: Path, n: int = 30) -> Path:
+    job = tmp_path / "job"
+    (job / "analysis").mkdir(parents=True)
+    (job / "clips").mkdir()
+    segs, clips = [], []
+    for i in range(1, n + 1):
+        t = 2.0 * (i - 1)
+        segs.append(
+            {"start": t, "end": t + 1.5, "text": "word " * (1 + i % 7), "speaker": f"S{i % 2}"}
+        )
+        clips.append(_clip(job / "clips" / f"{i}.wav", 1.2 + 0.05 * (i % 5), 0.5))
+    (job / "translated.json").write_text(json.dumps({"segments": segs}), encoding="utf-8")
+    (job / "analysis" / "tts_manifest.json").write_text(
+        json.dumps({"clips": clips, "lines": [{} for _ in clips]}), encoding="utf-8"
+    )
+    (job / "analysis" / "music_regions.json").write_text(
+        json.dumps({"regions": [{"start": 20.0, "end": 24.0, "kind": "music"}]}), encoding="utf-8"
+    )
+    return job
+
+
+def _summary(s: dict) -> dict:
+    return {k: v for k, v in s.items() if k not in ("wall_time_s", "rescored")}
+
+
+def test_unchanged_segments_reuse_cached_results(tmp_path: Path, monkeypatch) -> None:
+    job = _job(tmp_path)
+    measured: list[str] = []
+    orig = qa._clip_stats
+    monkeypatch.setattr(qa, "_clip_stats", lambda p: measured.append(Path(p).name) or orig(p))
+
+    first = qa.score_job(job)
+    assert first["rescored"] == 30 and len(measured) == 30
+    rows = (job / "qa" / "segment_scores.jsonl").read_text(encoding="utf-8")
+
+    measured.clear()
+    again = qa.score_job(job)
+    assert again["rescored"] == 0 and measured == []
+    assert _summary(again) == _summary(first)
+    assert (job / "qa" / "segment_scores.jsonl").read_text(encoding="utf-8") == rows
+
+    # Regenerated clip: too long and clipping. Only that segment is re-measured and re-checked.
+    _clip(job / "clips" / "7.wav", 2.4, 1.0)
+    after = qa.rescore(job, [7])
+    assert measured == ["7.wav"] and after["rescored"] == 1
+    assert _summary(after) == _summary(qa.score_job(job, write_outputs=False, use_cache=False))
+    seg7 = json.loads((job / "qa" / "segment_scores.jsonl").read_text().splitlines()[6])
+    assert {"alignment_drift", "segment_overlap", "audio_clipping"} <= {
+        i["check_id"] for i in seg7["issues"]
+    }
+
+    # A job-wide input change (music regions) re-checks everything but reuses clip stats.
+    measured.clear()
+    (job / "analysis" / "music_regions.json").write_text('{"regions": []}', encoding="utf-8")
+    full = qa.rescore(job, [3])
+    assert full["rescored"] == 30 and measured == []
+    assert _summary(full) == _summary(qa.score_job(job, write_outputs=False, use_cache=False))
+
+
+def test_outputs_written_by_someone_else_invalidate_the_cache(tmp_path: Path) -> None:
+    job = _job(tmp_path, n=5)
+    qa.score_job(job)
+    (job / "qa" / "segment_scores.jsonl").write_text("", encoding="utf-8")
+    assert qa.score_job(job)["rescored"] == 5
+    assert len((job / "qa" / "segment_scores.jsonl").read_text().splitlines()) == 5
+
+
+def test_clip_stats_match_a_decoded_read(tmp_path: Path) -> None:
+    mono = Path(_clip(tmp_path / "m.wav", 0.5, 0.25))
+    stereo = Path(_clip(tmp_path / "s.wav", 0.5, 0.25, channels=2))
+    x = (0.25 * 32767 * np.sin(np.arange(8000) / 7.0)).astype("<i2")
+    want_peak = float(np.abs(x.astype(np.int32)).max()) / 32768.0
+    assert qa._clip_stats(mono) == (0.5, want_peak)
+    assert qa._clip_stats(stereo) == (0.5, want_peak)
+    hot = tmp_path / "hot.wav"
+    with wave.open(str(hot), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(np.array([0, -32768, 5], dtype="<i2").tobytes())
+    assert qa._clip_stats(hot)[1] == 1.0
+
+
+def test_parsed_input_caches_are_bounded(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(qa, "_JSON_CACHE_MAX", 3)
+    monkeypatch.setattr(qa, "_JSON_CACHE", type(qa._JSON_CACHE)())
+    paths = []
+    for i in range(5):
+        p = tmp_path / f"{i}.json"
+        p.write_text(json.dumps({"i": i}), encoding="utf-8")
+        paths.append(str(p))
+        assert qa._read_json_cached(p, {}) == {"i": i}
+    # Re-reading the oldest survivor makes it most recent; the cap evicts the least recent.
+    qa._read_json_cached(Path(paths[2]), {})
+    qa._read_json_cached(tmp_path / "0.json", {})
+    assert list(qa._JSON_CACHE) == [paths[4], paths[2], paths[0]]
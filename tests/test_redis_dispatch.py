@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from dataclasses import replace
+
+import pytest
+
+from dubbing_pipeline.queue.redis_queue_impl import RedisQueue
+from tests._helpers.redis import redis_available
+
+
+def _fake_available() -> bool:
+    try:
+        import fakeredis  # type: ignore  # noqa: F401
+        import lupa  # type: ignore  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+pytestmark = pytest.mark.skipif(
+    not (redis_available() or _fake_available()),
+    reason="needs REDIS_URL or fakeredis+lupa",
+)
+
+
+def _client():
+    if redis_available():
+        import redis.asyncio as aioredis  # type: ignore
+
+        return aioredis.Redis.from_url(os.environ.get("REDIS_URL", ""), decode_responses=True)
+    import fakeredis  # type: ignore
+
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+async def _queue(enqueued: list[str]) -> RedisQueue:
+    rq = RedisQueue(redis_url="redis://test", enqueue_job_id_cb=enqueued.append)
+    rq._client = _client()  # noqa: SLF001
+    rq._cfg = replace(rq._cfg, prefix=f"t{uuid.uuid4().hex[:8]}", block_s=0.2)  # noqa: SLF001
+    await rq._prepare_scripts()  # noqa: SLF001
+    return rq
+
+
+async def _cleanup(rq: RedisQueue) -> None:
+    r = rq._client  # noqa: SLF001
+    await rq.stop()
+    keys = [k async for k in r.scan_iter(match=f"{rq._cfg.prefix}:*")]  # noqa: SLF001
+    if keys:
+        await r.delete(*keys)
+    await r.aclose()
+
+
+def test_dispatch_claims_by_priority_and_defers_over_cap(monkeypatch) -> None:
+    monkeypatch.setenv("MAX_CONCURRENT_JOBS_PER_USER", "1")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+
+    async def _run() -> None:
+        rq = await _queue([])
+        r = rq._client  # noqa: SLF001
+        try:
+            for jid, pr in (("lo", 50), ("hi", 200)):
+                await rq.submit_job(
+                    job_id=jid, user_id="u1", mode="medium", device="cpu", priority=pr
+                )
+            assert await r.llen(rq._wake_key()) == 2  # noqa: SLF001
+
+            assert await rq._dispatch_one() == ("hi", "u1", 1)  # noqa: SLF001
+            assert await r.get(rq._lock_key("hi"))  # noqa: SLF001
+            assert await r.smembers(rq._user_running_set_key("u1")) == {"hi"}  # noqa: SLF001
+            assert await r.smembers(rq._user_queued_set_key("u1")) == {"lo"}  # noqa: SLF001
+
+            # u1 is at its cap: "lo" is moved to delayed (not dropped) and nothing is claimed.
+            assert await rq._dispatch_one() is None  # noqa: SLF001
+            assert await r.zscore(rq._delayed_key(), "lo") is not None  # noqa: SLF001
+            assert await r.zcard(rq._pending_key()) == 0  # noqa: SLF001
+
+            # Fast path: no extra policy/lock round trips for script-claimed jobs.
+            assert await rq.before_job_run(job_id="hi", user_id="u1")
+            await rq.after_job_run(job_id="hi", user_id="u1", final_state="DONE", ok=True)
+            assert not await r.exists(rq._lock_key("hi"))  # noqa: SLF001
+
+            # Once due, the delayed job is promoted and claimed in the same call.
+            await r.zadd(rq._delayed_key(), {"lo": 0.0})  # noqa: SLF001
+            assert await rq._dispatch_one() == ("lo", "u1", 1)  # noqa: SLF001
+        finally:
+            await _cleanup(rq)
+
+    asyncio.run(_run())
+    get_settings.cache_clear()
+
+
+def test_dispatch_skips_canceled_and_dead_letters_exhausted_jobs() -> None:
+    async def _run() -> None:
+        rq = await _queue([])
+        r = rq._client  # noqa: SLF001
+        try:
+            await rq.submit_job(job_id="c", user_id="", mode="medium", device="cpu", priority=300)
+            await rq.cancel_job(job_id="c")
+            await rq.submit_job(job_id="c", user_id="", mode="medium", device="cpu", priority=300)
+            await rq.submit_job(job_id="x", user_id="", mode="medium", device="cpu", priority=200)
+            await r.hset(rq._job_meta_key("x"), "attempts", rq._cfg.max_attempts)  # noqa: SLF001
+            await rq.submit_job(job_id="ok", user_id="", mode="medium", device="cpu", priority=100)
+
+            assert await rq._dispatch_one() == ("ok", "", 1)  # noqa: SLF001
+            dlq = await r.lrange(rq._dlq_key(), 0, -1)  # noqa: SLF001
+            assert [d.split("|")[0] for d in dlq] == ["x"]
+            assert await r.zcard(rq._pending_key()) == 0  # noqa: SLF001
+        finally:
+            await _cleanup(rq)
+
+    asyncio.run(_run())
+
+
+def test_idle_consumer_wakes_on_submit() -> None:
+    async def _run() -> None:
+        enqueued: list[str] = []
+        rq = await _queue(enqueued)
+        rq._consume = True  # noqa: SLF001
+        try:
+            task = asyncio.create_task(rq._consume_loop())  # noqa: SLF001
+            await asyncio.sleep(0.05)
+            await rq.submit_job(job_id="w1", user_id="", mode="medium", device="cpu")
+            for _ in range(100):
+                if enqueued:
+                    break
+                await asyncio.sleep(0.01)
+            assert enqueued == ["w1"]
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        finally:
+            await _cleanup(rq)
+
+    asyncio.run(_run())
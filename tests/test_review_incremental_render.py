@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import random
+import struct
+import wave
+from pathlib import Path
+
+from dubbing_pipeline.review.render import render_map_path, render_review_audio
+from dubbing_pipeline.review.state import render_audio_only
+
+
+def _tone(path: Path, *, seconds: float, seed: int) -> Path:
+    rng = random.Random(seed)
+    n = int(seconds * 16000)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(struct.pack(f"<{n}h", *(rng.randint(-9000, 9000) for _ in range(n))))
+    return path
+
+
+def _state(job_dir: Path) -> dict:
+    audio = job_dir / "review" / "audio"
+    segs = []
+    # Overlapping clips (1 runs into 2) exercise overwrite order; 3 has no audio (silence clip).
+    for sid, (start, end, dur) in enumerate(
+        [(0.0, 1.0, 1.2), (1.1, 2.0, 0.9), (2.5, 3.0, 0.5), (3.2, 4.0, 0.8)], start=1
+    ):
+        p = audio / "3_missing.wav"
+        if sid != 3:
+            p = _tone(audio / f"{sid}_v1.wav", seconds=dur, seed=sid)
+        segs.append({"segment_id": sid, "start": start, "end": end, "audio_path_current": str(p)})
+    return {"version": 1, "segments": segs}
+
+
+def _same_audio(a: Path, b: Path) -> bool:
+    with wave.open(str(a), "rb") as wa, wave.open(str(b), "rb") as wb:
+        return wa.getparams() == wb.getparams() and wa.readframes(-1) == wb.readframes(-1)
+
+
+def test_incremental_render_matches_full_render(tmp_path: Path) -> None:
+    job_dir = tmp_path / "job"
+    st = _state(job_dir)
+    out = job_dir / "review" / "review_render.wav"
+    ref = tmp_path / "full.wav"
+
+    assert render_review_audio(job_dir, st, out)["mode"] == "full"
+    assert render_map_path(job_dir).exists()
+    assert render_review_audio(job_dir, st, out)["mode"] == "unchanged"
+
+    # Regenerate segment 1 with a shorter clip: its old tail under segment 2 must be restored.
+    st["segments"][0]["audio_path_current"] = str(
+        _tone(job_dir / "review" / "audio" / "1_v2.wav", seconds=0.6, seed=11)
+    )
+    # And segment 4 in place (same path, new content).
+    _tone(job_dir / "review" / "audio" / "4_v1.wav", seconds=0.7, seed=44)
+    os.utime(job_dir / "review" / "audio" / "4_v1.wav", ns=(1, 1))
+
+    info = render_review_audio(job_dir, st, out)
+    assert info["mode"] == "patched" and info["windows"] == 2
+    assert info["patched_s"] < 2.5
+    render_audio_only(job_dir, st, ref)
+    assert _same_audio(out, ref)
+
+    # Timing edits change the layout => full render.
+    st["segments"][1]["start"] = 1.3
+    assert render_review_audio(job_dir, st, out)["mode"] == "full"
+    render_audio_only(job_dir, st, ref)
+    assert _same_audio(out, ref)
+
+    # A WAV modified behind our back is not patched.
+    st["segments"][2]["audio_path_current"] = str(
+        _tone(job_dir / "review" / "audio" / "3_v1.wav", seconds=0.4, seed=3)
+    )
+    out.write_bytes(out.read_bytes())
+    os.utime(out, ns=(2, 2))
+    assert render_review_audio(job_dir, st, out)["mode"] == "full"
+    render_audio_only(job_dir, st, ref)
+    assert _same_audio(out, ref)
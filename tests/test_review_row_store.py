@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.review import store as rs
+from dubbing_pipeline.review.ops import edit_segment, edit_segments, lock_segment
+from dubbing_pipeline.review.state import (
+    load_state,
+    review_journal,
+    save_state,
+    state_revision,
+    undo_edit,
+)
+
+
+def _job(tmp_path: Path, n: int = 1500) -> Path:
+    job_dir = tmp_path / "job"
+    (job_dir / "review").mkdir(parents=True)
+    segs = [
+        {
+            "segment_id": i,
+            "start": float(i),
+            "end": i + 0.8,
+            "chosen_text": f"line {i}",
+            "status": "pending",
+            "audio_path_current": "",
+        }
+        for i in range(1, n + 1)
+    ]
+    (job_dir / "review" / "state.json").write_text(
+        json.dumps({"version": 1, "job": {"video_path": ""}, "segments": segs}), encoding="utf-8"
+    )
+    return job_dir
+
+
+def test_edits_touch_single_rows_and_reuse_the_parsed_state(tmp_path: Path, monkeypatch) -> None:
+    job_dir = _job(tmp_path)
+    legacy = (job_dir / "review" / "state.json").read_bytes()
+    rs.drop_cache()
+    st = load_state(job_dir)
+    assert len(st["segments"]) == 1500 and (job_dir / "review" / "state.db").exists()
+    rev0 = state_revision(job_dir)
+
+    reads: list[int] = []
+    orig = rs.ReviewStateDB._read
+    monkeypatch.setattr(
+        rs.ReviewStateDB, "_read", lambda self, con: reads.append(1) or orig(self, con)
+    )
+    # Callers may mutate what they load without affecting the cache.
+    st["segments"][0]["chosen_text"] = "scribble"
+    edit_segment(job_dir, 7, text="seven", actor="u1")
+    st = load_state(job_dir)
+    assert reads == []
+    assert st["segments"][0]["chosen_text"] == "line 1"
+    assert st["segments"][6]["chosen_text"] == "seven" and st["segments"][6]["status"] == (
+        "regenerated"
+    )
+    assert state_revision(job_dir) == rev0 + 1
+    ent = review_journal(job_dir)[-1]
+    assert (ent["segment_id"], ent["op"], ent["actor"]) == (7, "edit", "u1")
+    assert ent["before"]["chosen_text"] == "line 7" and ent["after"]["chosen_text"] == "seven"
+    # The legacy file is left alone; the row store is authoritative.
+    assert (job_dir / "review" / "state.json").read_bytes() == legacy
+
+    # A whole-state save only rewrites the rows that differ.
+    st["segments"][9]["notes"] = "check"
+    save_state(job_dir, st)
+    entries = review_journal(job_dir, since=ent["seq"])
+    assert [(e["segment_id"], e["op"]) for e in entries] == [(10, "update")]
+
+    # Another process sees the new revision and re-reads.
+    con = sqlite3.connect(str(job_dir / "review" / "state.db"))
+    con.execute("PRAGMA user_version = 999;")
+    con.close()
+    load_state(job_dir)
+    assert reads == [1]
+
+
+def test_batch_edit_is_atomic_and_undoable(tmp_path: Path) -> None:
+    job_dir = _job(tmp_path, n=5)
+    clip = job_dir / "review" / "audio" / "3_v1.wav"
+    clip.parent.mkdir(parents=True)
+    clip.write_bytes(b"RIFF")
+    rs.drop_cache()
+    st = load_state(job_dir)
+    st["segments"][2]["audio_path_current"] = str(clip)
+    save_state(job_dir, st)
+    lock_segment(job_dir, 3)
+
+    with pytest.raises(RuntimeError, match="locked"):
+        edit_segments(job_dir, {1: "one", 3: "three"})
+    with pytest.raises(KeyError):
+        edit_segments(job_dir, {1: "one", 42: "nope"})
+    assert [s["chosen_text"] for s in load_state(job_dir)["segments"]][:3] == [
+        "line 1",
+        "line 2",
+        "line 3",
+    ]
+
+    assert edit_segments(job_dir, {2: "two", 1: "one"}, actor="u2") == [1, 2]
+    edit_segment(job_dir, 1, text="uno")
+    assert [s["chosen_text"] for s in load_state(job_dir)["segments"]][:2] == ["uno", "two"]
+
+    assert undo_edit(job_dir, segment_id=1)["op"] == "edit"
+    assert load_state(job_dir)["segments"][0]["chosen_text"] == "one"
+    undo_edit(job_dir)  # newest remaining edit: segment 1 -> "line 1" (batch entry)
+    undo_edit(job_dir)  # then segment 2
+    texts = [s["chosen_text"] for s in load_state(job_dir)["segments"]]
+    assert texts[:2] == ["line 1", "line 2"]
+    assert [e["op"] for e in review_journal(job_dir)][-3:] == [
+        f"undo:{e['seq']}" for e in review_journal(job_dir) if e["op"] == "edit"
+    ][::-1]
+
+
+def test_external_state_json_rewrite_is_reimported(tmp_path: Path) -> None:
+    job_dir = _job(tmp_path, n=3)
+    rs.drop_cache()
+    edit_segment(job_dir, 2, text="edited")
+    st = load_state(job_dir)
+    st["segments"][0]["chosen_text"] = "from a script"
+    p = job_dir / "review" / "state.json"
+    p.write_text(json.dumps(st), encoding="utf-8")
+    texts = [s["chosen_text"] for s in load_state(job_dir)["segments"]]
+    assert texts == ["from a script", "edited", "line 3"]
+    assert review_journal(job_dir)[-1]["op"] == "import"
+
+
+def test_state_cache_is_bounded_and_dropped_with_the_job(tmp_path: Path, monkeypatch) -> None:
+    rs.drop_cache()
+    monkeypatch.setattr(rs, "_CACHE_MAX", 2)
+    dirs = []
+    for name in ("a", "b", "c"):
+        job_dir = _job(tmp_path / name, n=2)
+        job_dir.joinpath("review", "state.json").write_text(
+            json.dumps(
+                {"version": 1, "job": {}, "segments": [{"segment_id": 1, "extra": {"k": [1]}}]}
+            ),
+            encoding="utf-8",
+        )
+        load_state(job_dir)
+        dirs.append(job_dir)
+    assert len(rs._CACHE) == 2
+    assert rs.ReviewStateDB(dirs[0]).key not in rs._CACHE
+
+    # Nested values in a loaded segment are the caller's own.
+    st = load_state(dirs[2])
+    st["segments"][0]["extra"]["k"].append(2)
+    assert load_state(dirs[2])["segments"][0]["extra"] == {"k": [1]}
+
+    rs.drop_cache(dirs[2])
+    key = rs.ReviewStateDB(dirs[1]).key
+    assert rs.ReviewStateDB(dirs[2]).key not in rs._CACHE and key in rs._CACHE
+    rs.drop_cache()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.review.ops import regen_segment, regen_segment_stream
+from dubbing_pipeline.review.state import load_state
+from dubbing_pipeline.review.synth import drop_sessions, get_session
+
+
+class _Engine:
+    """Stands in for CoquiXTTS: 16 kHz clips for synthesize, 24 kHz chunks for streaming."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.refs: list[object] = []
+
+    def can_stream(self) -> bool:
+        return True
+
+    def synthesize(
+        self, text, *, language, speaker_id=None, speaker_wav=None, speed=None, out_path=None
+    ):
+        self.calls.append(text)
+        self.refs.append(speaker_wav)
+        time.sleep(0.1)
+        with wave.open(str(out_path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x10\x00" * 8000)
+        return out_path
+
+    def synthesize_stream(self, text, *, language, speaker_id=None, speaker_wav=None, speed=None):
+        self.calls.append(text)
+        for _ in range(3):
+            yield np.full(2400, 0.25, dtype=np.float32), 24000
+
+
+def _job(tmp_path: Path, *, params: dict | None = None) -> Path:
+    job_dir = tmp_path / "job"
+    (job_dir / "review").mkdir(parents=True)
+    segs = [
+        {"segment_id": 1, "start": 0.0, "end": 0.5, "chosen_text": "hello", "status": "pending"},
+        {"segment_id": 2, "start": 1.0, "end": 1.5, "chosen_text": "", "status": "pending"},
+    ]
+    job = {"pipeline_params": dict(params)} if params else {}
+    (job_dir / "review" / "state.json").write_text(
+        json.dumps({"version": 1, "job": job, "segments": segs}), encoding="utf-8"
+    )
+    return job_dir
+
+
+def _fake_stage_run(seen: list[dict]):
+    def _run(*, out_dir, **kw):
+        seen.append(kw)
+        clips = Path(out_dir) / "tts_clips"
+        clips.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(clips / "0001.wav"), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\x10\x00" * 800)
+
+    return _run
+
+
+def test_identical_requests_share_one_synthesis(tmp_path: Path) -> None:
+    drop_sessions()
+    job_dir = _job(tmp_path)
+    eng = _Engine()
+    sess = get_session(job_dir, engine=eng)
+    seg = load_state(job_dir)["segments"][0]
+
+    outs: list[Path] = []
+    ts = [threading.Thread(target=lambda: outs.append(sess.synthesize(seg))) for _ in range(3)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join(5)
+    assert len(outs) == 3 and len(set(outs)) == 1
+    assert eng.calls == ["hello"]
+    # Served from the recent-results cache; empty text is silence without touching the engine.
+    sess.synthesize(seg)
+    sess.synthesize(load_state(job_dir)["segments"][1])
+    assert eng.calls == ["hello"]
+    assert get_session(job_dir) is sess
+    drop_sessions()
+
+
+def test_regen_uses_warm_session_and_streams(tmp_path: Path) -> None:
+    drop_sessions()
+    job_dir = _job(tmp_path)
+    eng = _Engine()
+    get_session(job_dir, engine=eng)
+
+    p1 = regen_segment(job_dir, 1)
+    assert p1.name == "1_v1.wav"
+    seg = load_state(job_dir)["segments"][0]
+    assert seg["audio_path_current"] == str(p1) and seg["status"] == "regenerated"
+
+    st = load_state(job_dir)
+    st["segments"][0]["chosen_text"] = "hello there"
+    (job_dir / "review" / "state.json").write_text(json.dumps(st), encoding="utf-8")
+    chunks = list(regen_segment_stream(job_dir, 1))
+    assert chunks[0][:4] == b"RIFF" and chunks[0][36:40] == b"data"
+    # 3 x 2400 samples @ 24 kHz => 3 x 1600 @ 16 kHz, streamed before the clip is committed.
+    assert [len(c) for c in chunks[1:]] == [3200, 3200, 3200]
+    assert eng.calls == ["hello", "hello there"]
+    seg = load_state(job_dir)["segments"][0]
+    assert Path(seg["audio_path_current"]).name == "1_v2.wav"
+    with wave.open(seg["audio_path_current"], "rb") as wf:
+        assert wf.getframerate() == 16000 and wf.getnframes() > 0
+    drop_sessions()
+
+
+def test_unread_stream_does_not_hold_the_engine(tmp_path: Path) -> None:
+    drop_sessions()
+    job_dir = _job(tmp_path)
+    eng = _Engine()
+    sess = get_session(job_dir, engine=eng)
+    seg = dict(load_state(job_dir)["segments"][0])
+    stream = sess.stream(seg)
+    next(stream)
+    # The client stalls after the first chunk; other lines still synthesize.
+    other = {**seg, "chosen_text": "meanwhile"}
+    done: list[Path] = []
+    t = threading.Thread(target=lambda: done.append(sess.synthesize(other)))
+    t.start()
+    t.join(5)
+    assert done and eng.calls == ["hello", "meanwhile"]
+    assert len(list(stream)) == 2
+    drop_sessions()
+
+
+def test_cold_stream_fallback_keeps_pronunciations(tmp_path: Path, monkeypatch) -> None:
+    from dubbing_pipeline.config import get_settings
+    from dubbing_pipeline.stages import tts as tts_stage
+
+    seen: list[dict] = []
+    monkeypatch.setenv("REVIEW_SYNTH_WARM", "0")
+    monkeypatch.setattr(tts_stage, "run", _fake_stage_run(seen))
+    get_settings.cache_clear()
+    try:
+        job_dir = _job(tmp_path)
+        lexicon = [{"term": "hello", "replacement": "heh-lo"}]
+        list(
+            regen_segment_stream(
+                job_dir, 1, pronunciations=lexicon, pronunciation_overrides={"1": lexicon}
+            )
+        )
+    finally:
+        get_settings.cache_clear()
+    assert seen[0]["pronunciation_dict"] == lexicon
+    # The one-line clip is position 1 whatever the segment id.
+    assert seen[0]["pronunciation_overrides"] == {1: lexicon}
+
+
+def test_voice_memory_jobs_regen_through_the_stage(tmp_path: Path, monkeypatch) -> None:
+    from dubbing_pipeline.stages import tts as tts_stage
+
+    drop_sessions()
+    seen: list[dict] = []
+    monkeypatch.setattr(tts_stage, "run", _fake_stage_run(seen))
+    # Voice memory picks delivery/voice per character inside the stage; the warm path must not
+    # synthesize with a voice the stage would not have chosen.
+    job_dir = _job(tmp_path, params={"voice_memory": True})
+    eng = _Engine()
+    get_session(job_dir, engine=eng)
+    p = regen_segment(job_dir, 1)
+    assert p.name == "1_v1.wav"
+    assert eng.calls == [] and seen and seen[0]["voice_memory"] is True
+    drop_sessions()
+
+
+def test_warm_path_reuses_refs_the_stage_resolved(tmp_path: Path) -> None:
+    drop_sessions()
+    job_dir = _job(tmp_path)
+    st = load_state(job_dir)
+    st["segments"][0]["speaker"] = "SPK1"
+    (job_dir / "review" / "state.json").write_text(json.dumps(st), encoding="utf-8")
+    # A series character ref the stage resolved from job runtime data the session cannot see.
+    cref = tmp_path / "voice_store" / "series" / "hero" / "ref.wav"
+    cref.parent.mkdir(parents=True)
+    cref.write_bytes(b"RIFF")
+    (job_dir / "tts_manifest.json").write_text(
+        json.dumps({"speaker_report": {"SPK1": {"refs_used": [str(cref)]}}}), encoding="utf-8"
+    )
+    eng = _Engine()
+    sess = get_session(job_dir, engine=eng)
+    sess.synthesize(load_state(job_dir)["segments"][0])
+    assert eng.refs == [cref]
+    drop_sessions()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from dubbing_pipeline.jobs.models import Job, JobState
+from dubbing_pipeline.jobs.store import JobStore
+from dubbing_pipeline.runtime import lifecycle
+from dubbing_pipeline.runtime.capacity import CostModel, PhaseMeter, ResourceCost
+from dubbing_pipeline.runtime.scheduler import JobRecord, Scheduler
+
+
+def _mk_job(jid: str, *, duration_s: float) -> Job:
+    now = "2026-01-01T00:00:00+00:00"
+    return Job(
+        id=jid,
+        owner_id="u1",
+        video_path=f"/in/{jid}.mp4",
+        duration_s=duration_s,
+        mode="medium",
+        device="cpu",
+        src_lang="ja",
+        tgt_lang="en",
+        created_at=now,
+        updated_at=now,
+        state=JobState.QUEUED,
+        progress=0.0,
+        message="Queued",
+        output_mkv="",
+        output_srt="",
+        work_dir="",
+        log_path="",
+    )
+
+
+def test_cost_model_learns_and_persists(tmp_path) -> None:
+    path = tmp_path / "sched_costs.json"
+    cm = CostModel(path)
+    prior = cm.estimate("transcribe", mode="medium", model="medium", device="cpu")
+    assert prior.cpu > 0 and prior.ram_mb > 0 and prior.vram_mb == 0
+    assert cm.estimate("transcribe", mode="medium", device="cuda").vram_mb > 0
+
+    cm.observe(
+        "transcribe",
+        mode="medium",
+        model="medium",
+        wall_s=10.0,
+        cpu_s=20.0,
+        ram_mb=900.0,
+        media_s=100.0,
+    )
+    est = cm.estimate("transcribe", mode="medium", model="medium")
+    assert est == ResourceCost(cpu=2.0, ram_mb=900.0, vram_mb=0.0)
+    # Model-agnostic entry is updated too (used when the model is unknown).
+    assert cm.estimate("transcribe", mode="medium").cpu == pytest.approx(2.0)
+    assert cm.rate("transcribe", mode="medium") == pytest.approx(0.1)
+
+    # RAM is a decaying max: a smaller observation barely lowers it, a larger one sticks.
+    cm.observe("transcribe", mode="medium", model="medium", wall_s=1, cpu_s=1, ram_mb=100)
+    assert cm.estimate("transcribe", mode="medium", model="medium").ram_mb > 800
+    cm.observe("transcribe", mode="medium", model="medium", wall_s=1, cpu_s=1, ram_mb=2000)
+    assert cm.estimate("transcribe", mode="medium", model="medium").ram_mb == 2000
+
+    cm.save()
+    again = CostModel(path)
+    assert again.estimate("transcribe", mode="medium", model="medium").ram_mb == 2000
+
+
+def _hold_ram(mb: int) -> int:
+    buf = bytearray(mb * 1024 * 1024)
+    buf[::4096] = b"x" * len(buf[::4096])
+    return len(buf)
+
+
+def test_phases_in_watchdog_children_are_measured_there() -> None:
+    from dubbing_pipeline.jobs.watchdog import run_with_timeout
+
+    # Every phase runs in a fresh child: each one reports its own peak, not a lifetime max.
+    for _ in range(2):
+        meter = PhaseMeter()
+        run_with_timeout("t", timeout_s=60, fn=_hold_ram, args=(200,))
+        assert meter.finish()["ram_mb"] >= 150
+
+    # Unmeasured RAM/VRAM (0) never replaces the prior.
+    cm = CostModel(None)
+    prior = cm.estimate("tts", mode="medium", device="cuda")
+    cm.observe("tts", mode="medium", device="cuda", wall_s=1.0, cpu_s=1.0, ram_mb=0.0)
+    est = cm.estimate("tts", mode="medium", device="cuda")
+    assert (est.ram_mb, est.vram_mb) == (prior.ram_mb, prior.vram_mb)
+    assert est.cpu == pytest.approx(1.0)
+
+
+def test_phases_are_admitted_by_budget(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SCHED_RESOURCE_AWARE", "1")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    cm = CostModel(None)
+    cm.observe("transcribe", mode="medium", wall_s=1.0, cpu_s=3.0, ram_mb=1000.0)
+    cm.observe("mux", mode="medium", wall_s=1.0, cpu_s=1.0, ram_mb=100.0)
+    sched = Scheduler(
+        store=JobStore(tmp_path / "jobs.db"),
+        enqueue_cb=lambda _j: None,
+        costs=cm,
+        budget=ResourceCost(cpu=4.0, ram_mb=4000.0),
+    )
+
+    order: list[str] = []
+    release = threading.Event()
+
+    def _hold(phase: str, tag: str) -> None:
+        with sched.phase(phase):
+            order.append(f"{tag}:in")
+            release.wait(5)
+            order.append(f"{tag}:out")
+
+    t1 = threading.Thread(target=_hold, args=("transcribe", "a"))
+    t1.start()
+    while "a:in" not in order:
+        time.sleep(0.01)
+    # 3 of 4 cores used: a second transcribe must wait, a 1-core mux still fits.
+    t2 = threading.Thread(target=_hold, args=("transcribe", "b"))
+    t3 = threading.Thread(target=_hold, args=("mux", "c"))
+    t2.start()
+    t3.start()
+    while "c:in" not in order:
+        time.sleep(0.01)
+    assert "b:in" not in order
+    assert sched.state()["budget"]["in_use"]["cpu"] == pytest.approx(4.0)
+    release.set()
+    for t in (t1, t2, t3):
+        t.join(5)
+    assert order.index("b:in") > order.index("a:out")
+    assert sched.state()["budget"]["in_use"]["cpu"] == 0
+    get_settings.cache_clear()
+
+
+def test_dispatch_prefers_shorter_jobs_within_priority(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lifecycle.end_draining()
+    monkeypatch.setenv("BACKPRESSURE_Q_MAX", "-1")
+    monkeypatch.setenv("MAX_CONCURRENCY_GLOBAL", "1")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    store = JobStore(tmp_path / "jobs.db")
+    enq: list[str] = []
+    sched = Scheduler(
+        store=store,
+        enqueue_cb=lambda j: enq.append(j.id),
+        costs=CostModel(None),
+        budget=ResourceCost(cpu=4.0, ram_mb=8000.0),
+    )
+    for jid, dur in (("film", 5400.0), ("clip", 90.0), ("urgent_film", 5400.0)):
+        store.put(_mk_job(jid, duration_s=dur))
+    sched.submit(JobRecord(job_id="film", mode="medium", device_pref="cpu", created_at=1.0))
+    sched.submit(JobRecord(job_id="clip", mode="medium", device_pref="cpu", created_at=2.0))
+    sched.submit(
+        JobRecord(
+            job_id="urgent_film", mode="medium", device_pref="cpu", created_at=3.0, priority=10
+        )
+    )
+    assert sched.snapshot_queue()[0]["expected_s"] > 0
+
+    sched.start()
+    try:
+        for expected in (["urgent_film"], ["urgent_film", "clip"]):
+            deadline = time.monotonic() + 5
+            while len(enq) < len(expected) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert enq == expected
+            sched.on_job_done(expected[-1])
+    finally:
+        sched.stop()
+        get_settings.cache_clear()
+
+
+def test_phase_caps_hold_under_resource_aware_admission(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SCHED_RESOURCE_AWARE", "1")
+    monkeypatch.setenv("MAX_CONCURRENCY_TRANSCRIBE", "1")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    cm = CostModel(None)
+    cm.observe("transcribe", mode="medium", wall_s=1.0, cpu_s=0.1, ram_mb=10.0)
+    sched = Scheduler(
+        store=JobStore(tmp_path / "jobs.db"),
+        enqueue_cb=lambda _j: None,
+        costs=cm,
+        budget=ResourceCost(cpu=64.0, ram_mb=64000.0),
+    )
+    observed: list[str] = []
+    monkeypatch.setattr(cm, "observe", lambda name, **_kw: observed.append(name))
+
+    order: list[str] = []
+    release = threading.Event()
+
+    def _hold(tag: str) -> None:
+        with sched.phase("transcribe"):
+            order.append(f"{tag}:in")
+            release.wait(5)
+            order.append(f"{tag}:out")
+
+    t1 = threading.Thread(target=_hold, args=("a",))
+    t1.start()
+    while "a:in" not in order:
+        time.sleep(0.01)
+    # The budget has room for many, but MAX_CONCURRENCY_TRANSCRIBE=1 still applies.
+    t2 = threading.Thread(target=_hold, args=("b",))
+    t2.start()
+    time.sleep(0.3)
+    assert "b:in" not in order
+    release.set()
+    for t in (t1, t2):
+        t.join(5)
+    assert order.index("b:in") > order.index("a:out")
+    # Neither overlapped another phase, so both were measured.
+    assert observed == ["transcribe", "transcribe"]
+
+    # Overlapping in-process phases without child measurements are not recorded.
+    observed.clear()
+    release.clear()
+    t3 = threading.Thread(target=_hold, args=("c",))
+    t3.start()
+    while "c:in" not in order:
+        time.sleep(0.01)
+    with sched.phase("mux"):
+        pass
+    release.set()
+    t3.join(5)
+    assert observed == []
+    get_settings.cache_clear()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import sys
+import types
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dubbing_pipeline.runtime.model_manager import ModelManager
+
+SR = 16000
+
+
+class _FakeWhisperModel:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def transcribe(self, audio, **kw):
+        self.calls += 1
+        peak = float(np.abs(audio).max()) if len(audio) else 0.0
+        return {
+            "language": kw.get("language") or "ja",
+            "segments": [{"start": 0.5, "end": 1.5, "text": f" n={len(audio)} p={peak:.3f}"}],
+        }
+
+
+def _write_wav(path: Path, x: np.ndarray) -> Path:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes((x * 32767).astype("<i2").tobytes())
+    return path
+
+
+def _speech(seconds: float = 70.0) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    t = np.arange(int(seconds * SR)) / SR
+    x = 0.0002 * rng.standard_normal(t.size)
+    pos = 0.5
+    while pos < seconds - 2.0:
+        dur = float(rng.uniform(1.0, 4.0))
+        m = (t >= pos) & (t < pos + dur)
+        x[m] += float(rng.uniform(0.1, 0.4)) * np.sin(2 * np.pi * 200 * t[m])
+        pos += dur + float(rng.uniform(0.5, 1.2))
+    return x
+
+
+@pytest.fixture
+def env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("DUBBING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("RETRY_MAX", "0")
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    monkeypatch.setitem(sys.modules, "whisper", types.ModuleType("whisper"))
+    monkeypatch.setattr("dubbing_pipeline.utils.vad._webrtc", lambda cfg: None)
+    model = _FakeWhisperModel()
+    mm = ModelManager()
+    monkeypatch.setattr(mm, "_load_whisper", lambda name, device: model)
+    monkeypatch.setattr(ModelManager, "_singleton", mm)
+    yield model
+    get_settings.cache_clear()
+
+
+def _run(wav: Path, srt: Path, **kw) -> dict:
+    from dubbing_pipeline.stages.transcription import transcribe
+
+    transcribe(wav, srt, "cpu", "small", "transcribe", "auto", streaming=True, window_s=15.0, **kw)
+    return json.loads(srt.with_suffix(".json").read_text(encoding="utf-8"))
+
+
+def test_asr_windows_are_reused_across_jobs(tmp_path: Path, env) -> None:
+    from dubbing_pipeline.stages.transcription import asr_windows
+
+    model = env
+    x = _speech()
+    a = _write_wav(tmp_path / "a.wav", x)
+    n_win = len(list(asr_windows(a, window_s=15.0)))
+
+    first = _run(a, tmp_path / "j1" / "a.srt")
+    assert model.calls == n_win
+    assert first["segment_cache"] == {
+        "hits": 0,
+        "misses": n_win,
+        "lookups": n_win,
+        "hit_ratio": 0.0,
+    }
+
+    # Same PCM in another container/job: every window is a hit, output is identical.
+    b = _write_wav(tmp_path / "b.wav", x)
+    second = _run(b, tmp_path / "j2" / "b.srt")
+    assert model.calls == n_win and second["segment_cache"]["hit_ratio"] == 1.0
+    assert second["segments_detail"] == first["segments_detail"]
+    srt1 = (tmp_path / "j1" / "a.srt").read_text(encoding="utf-8")
+    assert (tmp_path / "j2" / "b.srt").read_text(encoding="utf-8") == srt1
+
+    # Louder final seconds: only the last window is decoded again.
+    y = x.copy()
+    y[-5 * SR :] *= 1.5
+    c = _write_wav(tmp_path / "c.wav", y)
+    third = _run(c, tmp_path / "j3" / "c.srt")
+    assert third["segment_cache"]["misses"] == 1 and model.calls == n_win + 1
+
+    # Privacy-mode jobs neither read nor fill the shared cache.
+    fourth = _run(a, tmp_path / "j4" / "a.srt", use_segment_cache=False)
+    assert "segment_cache" not in fourth and model.calls == 2 * n_win + 1
+
+
+def test_mt_lines_are_cached_per_engine_and_input(tmp_path: Path, env, monkeypatch) -> None:
+    from dubbing_pipeline.cache.segments import read_cache_stats
+    from dubbing_pipeline.stages import translation as tr
+
+    calls: list[str] = []
+
+    def _fake_marian(text: str, src_lang: str, tgt_lang: str) -> str:
+        calls.append(text)
+        return f"EN({text})"
+
+    monkeypatch.setattr(tr, "_translate_marian", _fake_marian)
+    gloss = tmp_path / "glossary.tsv"
+    gloss.write_text("Taro\tTaro-kun\n", encoding="utf-8")
+    lines = ["Hello Taro", "Good morning", "Hello Taro", "Bye"]
+    segs = [{"start": float(i), "end": i + 0.9, "text": t} for i, t in enumerate(lines)]
+    stats = tmp_path / "mt.json"
+    cfg = tr.TranslationConfig(
+        mt_engine="marian", glossary_path=str(gloss), cache_stats_path=str(stats)
+    )
+    first = tr.translate_segments(segs, "ja", "en", cfg)
+    # Repeats and the marian base/fallback pair are translated once per call.
+    assert calls == ["Hello Taro-kun", "Good morning", "Bye"]
+    assert read_cache_stats(stats) == {"hits": 0, "misses": 3, "lookups": 3, "hit_ratio": 0.0}
+
+    again = tr.translate_segments(segs, "ja", "en", cfg)
+    assert len(calls) == 3 and again == first
+    assert read_cache_stats(stats)["hit_ratio"] == 1.0
+
+    # A glossary edit only re-translates the lines whose MT input changed.
+    gloss.write_text("Taro\tTaro-san\n", encoding="utf-8")
+    third = tr.translate_segments(segs, "ja", "en", cfg)
+    assert calls[3:] == ["Hello Taro-san"] and third[1] == first[1]
+    assert read_cache_stats(stats) == {"hits": 2, "misses": 1, "lookups": 3, "hit_ratio": 0.6667}
+
+
+def test_store_is_pruned_by_ttl_then_lru(env, monkeypatch) -> None:
+    import sqlite3
+    import time
+
+    from dubbing_pipeline.cache.segments import prune_segment_cache, segment_cache
+    from dubbing_pipeline.config import get_settings
+
+    sc = segment_cache()
+    assert sc is not None
+    for i in range(6):
+        sc.put("mt", f"k{i}", {"text": str(i)})
+    sc.put("mt", "k0", {"text": "0!"})  # an update is not a new row
+    sc.put("asr", "w0", {"segments": []})
+    assert sc.counts() == {"mt": 6, "asr": 1}
+
+    day = 86400.0
+    con = sqlite3.connect(str(sc.path))
+    stale = time.time() - 200 * day
+    con.execute("UPDATE segment_cache SET created_at = ? WHERE key = ?", (stale, "k5"))
+    for i in range(5):
+        old = time.time() - 10 * day + i
+        con.execute("UPDATE segment_cache SET created_at = ? WHERE key = ?", (old, f"k{i}"))
+    con.commit()
+    con.close()
+    assert sc.get("mt", "k0") == {"text": "0!"}  # the hit makes k0 recently used
+
+    monkeypatch.setenv("SEGMENT_CACHE_MAX_ENTRIES", "4")
+    monkeypatch.setenv("SEGMENT_CACHE_TTL_DAYS", "90")
+    get_settings.cache_clear()
+    # k5 is past the TTL; then the two least recently used rows (k1, k2) go.
+    assert prune_segment_cache() == 3
+    assert sc.counts() == {"mt": 3, "asr": 1}
+    assert [sc.get("mt", k) is not None for k in ("k0", "k1", "k2", "k3", "k4")] == [
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
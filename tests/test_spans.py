@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from dubbing_pipeline.jobs.stage_graph import StageGraph, StageNode, run_stage_graph
+from dubbing_pipeline.jobs.watchdog import run_with_timeout
+from dubbing_pipeline.ops import metrics
+from dubbing_pipeline.ops.spans import (
+    SpanRecorder,
+    install_recorder,
+    load_job_trace,
+    reset_recorder,
+    span,
+    start_span,
+)
+
+
+def _child_work(x: int) -> int:
+    with span("child.step", kind="ffmpeg"):
+        return x * 2
+
+
+def test_nested_spans_inherit_stage_and_write_chrome_trace(tmp_path: Path) -> None:
+    rec = SpanRecorder("job1", mode="low", device="cpu")
+    tok = install_recorder(rec)
+    try:
+        st = start_span("tts", kind="stage")
+        with span("tts.line", kind="tts_line", segment=3):
+            pass
+        st.finish()
+        with span("after", kind="step"):
+            pass
+    finally:
+        reset_recorder(tok)
+
+    evs = {e["name"]: e for e in rec.events()}
+    assert evs["tts.line"]["stage"] == "tts"
+    assert evs["tts.line"]["mode"] == "low" and evs["tts.line"]["device"] == "cpu"
+    assert evs["tts.line"]["attrs"] == {"segment": 3}
+    # Stage label is reset once the stage span finishes.
+    assert evs["after"]["stage"] == ""
+
+    out = rec.write(tmp_path / "logs" / "trace.json")
+    data = json.loads(out.read_text(encoding="utf-8"))
+    xs = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in xs} == {"tts", "tts.line", "after"}
+    assert any(e["ph"] == "M" for e in data["traceEvents"])
+    assert load_job_trace(tmp_path)["otherData"]["job_id"] == "job1"
+
+
+def test_observe_span_updates_histogram() -> None:
+    def _count() -> float:
+        for m in metrics.span_seconds.collect():
+            for s in m.samples:
+                if (
+                    s.name.endswith("_count")
+                    and s.labels.get("kind") == "ffmpeg"
+                    and s.labels.get("stage") == "mux_test"
+                ):
+                    return float(s.value)
+        return 0.0
+
+    before = _count()
+    with span("ffmpeg", kind="ffmpeg", stage="mux_test"):
+        pass
+    assert _count() == before + 1
+
+
+def test_spans_follow_stage_graph_threads_and_watchdog_children() -> None:
+    rec = SpanRecorder("job2")
+    tok = install_recorder(rec)
+    try:
+        g = StageGraph()
+        g.add(StageNode(name="export_a", fn=lambda: None, kind="export"))
+        g.add(StageNode(name="export_b", fn=lambda: None, kind="export"))
+        run_stage_graph(g, job_id="job2", max_workers=2)
+        with span("transcribe", kind="stage"):
+            assert run_with_timeout("transcribe", timeout_s=30, fn=_child_work, args=(4,)) == 8
+    finally:
+        reset_recorder(tok)
+
+    evs = rec.events()
+    names = {e["name"] for e in evs}
+    assert {"export_a", "export_b", "transcribe", "child.step"} <= names
+    child = next(e for e in evs if e["name"] == "child.step")
+    assert child["stage"] == "transcribe"
+    assert any(e["kind"] == "phase" for e in evs)
+
+
+def test_concurrent_spans_do_not_claim_process_wide_io() -> None:
+    import contextvars
+    import threading
+
+    rec = SpanRecorder("job3")
+    tok = install_recorder(rec)
+    try:
+        with span("solo", kind="step"):
+            pass
+        started, release = threading.Event(), threading.Event()
+
+        def _other() -> None:
+            with span("other", kind="step"):
+                started.set()
+                release.wait(5)
+
+        with span("overlapped", kind="step"):
+            t = threading.Thread(target=contextvars.copy_context().run, args=(_other,))
+            t.start()
+            started.wait(5)
+            release.set()
+            t.join()
+    finally:
+        reset_recorder(tok)
+
+    evs = {e["name"]: e for e in rec.events()}
+    assert evs["solo"]["shared"] is False
+    assert evs["solo"]["child_cpu_s"] is not None and evs["solo"]["read_bytes"] is not None
+    assert evs["solo"]["rss_bytes"] > 0
+    for name in ("overlapped", "other"):
+        assert evs[name]["shared"] is True
+        assert evs[name]["child_cpu_s"] is None
+        assert evs[name]["read_bytes"] is None and evs[name]["write_bytes"] is None
+        assert evs[name]["rss_delta_bytes"] is None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sse_starlette.sse import AppStatus
+
+from dubbing_pipeline.config import get_settings
+from dubbing_pipeline.jobs.models import Job, JobState
+from dubbing_pipeline.ops import metrics
+from dubbing_pipeline.server import app
+
+
+def test_job_event_stream_sends_state_and_closes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # sse_starlette keeps one exit event bound to the loop of the first stream it served.
+    monkeypatch.setattr(AppStatus, "should_exit_event", None)
+    for d in ("Input", "Output", "logs"):
+        (tmp_path / d).mkdir()
+    video = tmp_path / "Input" / "Test.mp4"
+    video.write_bytes(b"\x00" * 1024)
+    os.environ["APP_ROOT"] = str(tmp_path)
+    os.environ["INPUT_DIR"] = str(tmp_path / "Input")
+    os.environ["DUBBING_OUTPUT_DIR"] = str(tmp_path / "Output")
+    os.environ["DUBBING_LOG_DIR"] = str(tmp_path / "logs")
+    os.environ["ADMIN_USERNAME"] = "admin"
+    os.environ["ADMIN_PASSWORD"] = "adminpass"
+    os.environ["COOKIE_SECURE"] = "0"
+    get_settings.cache_clear()
+
+    with TestClient(app) as c:
+        r = c.post("/api/auth/login", json={"username": "admin", "password": "adminpass"})
+        assert r.status_code == 200
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        now = "2026-01-01T00:00:00+00:00"
+        c.app.state.job_store.put(
+            Job(
+                id="j_sse_1",
+                owner_id="u1",
+                video_path=str(video),
+                duration_s=10.0,
+                mode="low",
+                device="cpu",
+                src_lang="ja",
+                tgt_lang="en",
+                created_at=now,
+                updated_at=now,
+                state=JobState.DONE,
+                progress=1.0,
+                message="Done",
+                output_mkv="",
+                output_srt="",
+                work_dir=str(tmp_path / "Output" / "Test"),
+                log_path=str(tmp_path / "Output" / "Test" / "job.log"),
+            )
+        )
+        before = metrics.REGISTRY.get_sample_value(
+            "dubbing_pipeline_sse_subscribers", {"stream": "job"}
+        )
+        r = c.get("/events/jobs/j_sse_1", headers=headers)
+        assert r.status_code == 200
+        data = [ln[len("data:") :].strip() for ln in r.text.splitlines() if ln.startswith("data:")]
+        assert data and json.loads(data[0])["state"] == "DONE"
+        after = metrics.REGISTRY.get_sample_value(
+            "dubbing_pipeline_sse_subscribers", {"stream": "job"}
+        )
+        assert after == before
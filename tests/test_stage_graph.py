@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.jobs.stage_graph import (
+    StageGraph,
+    StageGraphError,
+    StageNode,
+    run_stage_graph,
+    write_stage_timeline,
+)
+from dubbing_pipeline.utils.io import read_json
+
+
+def test_independent_stages_run_concurrently(tmp_path: Path) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    order: list[str] = []
+
+    def _parallel(name: str):
+        def _fn():
+            # Both nodes must be in flight at the same time to pass the barrier.
+            barrier.wait()
+            order.append(name)
+            return name
+
+        return _fn
+
+    g = StageGraph()
+    g.add(StageNode(name="a", fn=_parallel("a")))
+    g.add(StageNode(name="b", fn=_parallel("b")))
+    g.add(StageNode(name="c", fn=lambda: order.append("c"), deps=("a", "b")))
+
+    res = run_stage_graph(g, job_id="j1", max_workers=2)
+    assert res.results["a"] == "a" and res.results["b"] == "b"
+    assert order[-1] == "c"
+    assert {e["stage"] for e in res.timeline} == {"a", "b", "c"}
+
+
+def test_optional_failure_skips_dependents_required_failure_raises() -> None:
+    def _boom():
+        raise RuntimeError("boom")
+
+    g = StageGraph()
+    g.add(StageNode(name="a", fn=_boom))
+    g.add(StageNode(name="b", fn=lambda: 1, deps=("a",)))
+    g.add(StageNode(name="c", fn=lambda: 2))
+    res = run_stage_graph(g, job_id="j1", max_workers=1)
+    assert "boom" in res.errors["a"]
+    assert res.errors["b"].startswith("dependency_failed")
+    assert res.ok("c")
+
+    g2 = StageGraph()
+    g2.add(StageNode(name="a", fn=_boom, required=True))
+    with pytest.raises(RuntimeError, match="boom"):
+        run_stage_graph(g2, job_id="j1")
+
+
+def test_cycle_and_unknown_dep_rejected() -> None:
+    g = StageGraph()
+    g.add(StageNode(name="a", fn=lambda: None, deps=("b",)))
+    g.add(StageNode(name="b", fn=lambda: None, deps=("a",)))
+    with pytest.raises(StageGraphError):
+        g.order()
+    g2 = StageGraph()
+    g2.add(StageNode(name="a", fn=lambda: None, deps=("missing",)))
+    with pytest.raises(StageGraphError):
+        g2.order()
+
+
+def test_checkpoint_reuse_respects_inputs(tmp_path: Path) -> None:
+    ckpt = tmp_path / ".checkpoint.json"
+    src = tmp_path / "in.wav"
+    src.write_bytes(b"v1")
+    out = tmp_path / "out.bin"
+    calls: list[int] = []
+
+    def _make():
+        calls.append(1)
+        out.write_bytes(src.read_bytes() + b"-out")
+
+    def _graph() -> StageGraph:
+        g = StageGraph()
+        g.add(
+            StageNode(
+                name="export",
+                fn=_make,
+                inputs=(src,),
+                outputs={"out": out},
+                ckpt_stage="export_x",
+            )
+        )
+        return g
+
+    run_stage_graph(_graph(), job_id="j1", ckpt_path=ckpt)
+    res = run_stage_graph(_graph(), job_id="j1", ckpt_path=ckpt)
+    assert len(calls) == 1
+    assert res.timeline[0]["outcome"] == "checkpoint"
+
+    # Upstream artifact changes => checkpoint is stale.
+    time.sleep(0.01)
+    src.write_bytes(b"v2-longer")
+    run_stage_graph(_graph(), job_id="j1", ckpt_path=ckpt)
+    assert len(calls) == 2
+
+    tl = write_stage_timeline(
+        tmp_path / "logs" / "stage_timeline.json",
+        job_id="j1",
+        group="export",
+        timeline=res.timeline,
+    )
+    data = read_json(tl, default={})
+    assert data["groups"]["export"]["stages"][0]["stage"] == "export"
+
+
+def _silence(path: Path, seconds: float = 2.0) -> None:
+    import wave
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x00\x00" * int(seconds * 16000))
+
+
+@pytest.mark.parametrize("workers", [2, 1])
+def test_transcribe_runs_alongside_diarize(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    import asyncio
+
+    from dubbing_pipeline.config import get_settings
+    from dubbing_pipeline.jobs import queue_impl as qi
+    from dubbing_pipeline.jobs.models import Job, JobState
+    from dubbing_pipeline.jobs.store import JobStore
+
+    # The job writes drift reports relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    out, inp = tmp_path / "Output", tmp_path / "Input"
+    inp.mkdir()
+    (inp / "Test.mp4").write_bytes(b"\x00" * 1024)
+    for k, v in {
+        "APP_ROOT": tmp_path,
+        "INPUT_DIR": inp,
+        "DUBBING_OUTPUT_DIR": out,
+        "DUBBING_LOG_DIR": out / "logs",
+        "STAGE_GRAPH_WORKERS": workers,
+        "MT_ENGINE": "whisper",
+        "WATCHDOG_WHISPER_S": 600,
+        "WATCHDOG_TRANSLATE_S": 120,
+    }.items():
+        monkeypatch.setenv(k, str(v))
+    get_settings.cache_clear()
+    marks = tmp_path / "marks.txt"
+
+    def _mark(stage: str, t0: float) -> None:
+        with marks.open("a", encoding="utf-8") as f:
+            f.write(f"{stage} {t0} {time.time()}\n")
+
+    def _extract(*, video, out_dir, wav_out=None, **_kw):
+        p = Path(wav_out or (Path(out_dir) / "audio.wav"))
+        _silence(p)
+        return p
+
+    def _diarize(_wav, **_kw):
+        t0 = time.time()
+        time.sleep(1.0)
+        _mark("diarize", t0)
+        return []
+
+    def _transcribe(*, srt_out, **_kw):
+        t0 = time.time()
+        time.sleep(1.0)
+        Path(srt_out).write_text("1\n00:00:00,000 --> 00:00:01,000\nhi\n\n", encoding="utf-8")
+        Path(srt_out).with_suffix(".json").write_text("{}", encoding="utf-8")
+        _mark("transcribe", t0)
+        return srt_out
+
+    monkeypatch.setattr(qi.audio_extractor, "extract", _extract)
+    monkeypatch.setattr(qi, "diarize_v2", _diarize)
+    monkeypatch.setattr(qi, "transcribe", _transcribe)
+    budgets: dict[str, int] = {}
+    real_run = qi.run_with_timeout
+
+    def _run(name, *, timeout_s, **kw):
+        budgets.setdefault(name, int(timeout_s))
+        return real_run(name, timeout_s=timeout_s, **kw)
+
+    monkeypatch.setattr(qi, "run_with_timeout", _run)
+    try:
+        store = JobStore(out / "_state" / "jobs.db")
+        now = "2026-01-01T00:00:00+00:00"
+        store.put(
+            Job(
+                id="j_fanout",
+                owner_id="u1",
+                video_path=str(inp / "Test.mp4"),
+                duration_s=2.0,
+                mode="low",
+                device="cpu",
+                src_lang="ja",
+                tgt_lang="en",
+                created_at=now,
+                updated_at=now,
+                state=JobState.QUEUED,
+                progress=0.0,
+                message="Queued",
+                output_mkv="",
+                output_srt="",
+                work_dir="",
+                log_path="",
+                runtime={},
+            )
+        )
+        # Later stages are not faked; only the diarize/transcribe timing matters here.
+        asyncio.run(qi.JobQueue(store, concurrency=1, app_root=tmp_path)._run_job("j_fanout"))
+    finally:
+        get_settings.cache_clear()
+
+    rows = [ln.split() for ln in marks.read_text(encoding="utf-8").splitlines()]
+    spans = {r[0]: (float(r[1]), float(r[2])) for r in rows}
+    assert sorted(spans) == ["diarize", "transcribe"] and len(rows) == 2
+    (d0, d1), (t0, t1) = spans["diarize"], spans["transcribe"]
+    overlap = min(d1, t1) - max(d0, t0)
+    assert overlap > 0.5 if workers > 1 else overlap <= 0
+    # ja -> en with Whisper MT: the transcribe phase also runs the translate pass.
+    assert budgets["transcribe"] == 600 + 120
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import math
+import sys
+import types
+import wave
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.streaming import chunker
+from dubbing_pipeline.utils import vad as vad_mod
+from dubbing_pipeline.utils.vad import StreamingVAD, VADConfig, detect_speech_segments
+
+SR = 16000
+
+
+class _FakeVad:
+    """Stands in for webrtcvad: speech when the frame is mostly voiced (tonal) energy."""
+
+    calls = 0
+
+    def __init__(self, mode: int) -> None:
+        self.mode = mode
+
+    def is_speech(self, buf: bytes, sr: int) -> bool:
+        _FakeVad.calls += 1
+        x = np.frombuffer(buf, dtype="<i2").astype(np.float64)
+        if x.size * 1000 // sr not in (10, 20, 30):
+            raise ValueError("bad frame length")
+        return bool(np.abs(np.diff(np.sign(x))).sum() / 2 < 0.2 * x.size)
+
+
+def _reference(path: Path, cfg: VADConfig, vad) -> list[tuple[float, float]]:
+    # The frame-by-frame implementation this module replaced.
+    with wave.open(str(path), "rb") as wf:
+        sr = wf.getframerate()
+        frames = []
+        t = 0.0
+        while True:
+            buf = wf.readframes(int(sr * (cfg.frame_ms / 1000.0)))
+            if not buf:
+                break
+            n = len(buf) // 2
+            rms = math.sqrt(sum(v * v for v in np.frombuffer(buf, "<i2").tolist()) / n) / 32768.0
+            speech = rms >= cfg.energy_gate
+            if vad is not None and speech:
+                with suppress(Exception):
+                    speech = bool(vad.is_speech(buf, sr))
+            frames.append((t, t + cfg.frame_ms / 1000.0, speech))
+            t += cfg.frame_ms / 1000.0
+    segs, cur, last = [], None, None
+    for start, end, speech in frames:
+        if speech:
+            cur = start if cur is None else cur
+            last = end
+        elif cur is not None and (end - last) * 1000.0 >= cfg.min_silence_ms:
+            segs.append((cur, last))
+            cur = last = None
+    if cur is not None:
+        segs.append((cur, last))
+    out: list[tuple[float, float]] = []
+    for s, e in segs:
+        if (e - s) * 1000.0 < cfg.min_speech_ms:
+            continue
+        if out and s - out[-1][1] <= cfg.min_silence_ms / 1000.0:
+            out[-1] = (out[-1][0], e)
+        else:
+            out.append((s, e))
+    return out
+
+
+def _wav(path: Path, seconds: float, seed: int) -> Path:
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SR) + 123  # trailing partial frame
+    t = np.arange(n) / SR
+    x = 0.0002 * rng.standard_normal(n)
+    pos = 0.2
+    while pos < seconds - 0.5:
+        dur = float(rng.uniform(0.1, 2.5))
+        m = (t >= pos) & (t < pos + dur)
+        if rng.random() < 0.75:
+            x[m] += 0.2 * np.sin(2 * np.pi * 180 * t[m])  # voiced
+        else:
+            x[m] += 0.1 * rng.standard_normal(int(m.sum()))  # loud noise
+        pos += dur + float(rng.choice([0.05, 0.15, 0.24, 0.25, 0.26, 0.4, 1.2]))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(np.clip(x * 32767, -32768, 32767).astype("<i2").tobytes())
+    return path
+
+
+def _assert_same(got, want) -> None:
+    assert len(got) == len(want)
+    assert np.allclose(np.asarray(got).reshape(-1), np.asarray(want).reshape(-1), atol=1e-6)
+
+
+def test_matches_reference_and_gates_webrtc_calls(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "webrtcvad", types.SimpleNamespace(Vad=_FakeVad))
+    p = _wav(tmp_path / "a.wav", 40.0, seed=3)
+    for cfg in (VADConfig(), VADConfig(frame_ms=10, min_silence_ms=250, min_speech_ms=200)):
+        want = _reference(p, cfg, _FakeVad(2))
+        _FakeVad.calls = 0
+        got = detect_speech_segments(p, cfg)
+        _assert_same(got, want)
+        assert len(want) > 5
+        # Only frames above the energy gate reach webrtcvad.
+        assert 0 < _FakeVad.calls < 0.9 * (40_000 // cfg.frame_ms)
+
+    monkeypatch.delitem(sys.modules, "webrtcvad")
+    monkeypatch.setattr(vad_mod, "_webrtc", lambda cfg: None)
+    _assert_same(detect_speech_segments(p), _reference(p, VADConfig(), None))
+
+
+def test_incremental_feed_finalizes_segments_early(tmp_path: Path) -> None:
+    p = _wav(tmp_path / "b.wav", 30.0, seed=5)
+    whole = detect_speech_segments(p)
+    with wave.open(str(p), "rb") as wf:
+        pcm = wf.readframes(wf.getnframes())
+    rng = np.random.default_rng(0)
+    v = StreamingVAD()
+    got: list[tuple[float, float]] = []
+    i = 0
+    while i < len(pcm):
+        step = int(rng.integers(1, 9000))
+        for seg in v.feed(pcm[i : i + step]):
+            # A finalized segment can no longer change: it ends before the audio fed so far.
+            assert seg[1] <= v.position_s
+            got.append(seg)
+        i += step
+    early = len(got)
+    got.extend(v.flush())
+    _assert_same(got, whole)
+    assert early >= len(whole) - 1
+
+
+def test_chunker_moves_cuts_into_silence(tmp_path: Path, monkeypatch) -> None:
+    p = _wav(tmp_path / "c.wav", 60.0, seed=11)
+    speech = detect_speech_segments(p)
+
+    def _extract(*, src, dst, start_s, end_s, timeout_s):
+        Path(dst).write_bytes(b"")
+
+    monkeypatch.setattr(chunker, "extract_audio_mono_16k", _extract)
+    monkeypatch.setattr(chunker, "ffprobe_duration_seconds", lambda p, timeout_s=60: 60.0)
+    fixed = chunker.split_audio_to_chunks(source_wav=p, out_dir=tmp_path / "f", chunk_seconds=10)
+    aware = chunker.split_audio_to_chunks(
+        source_wav=p, out_dir=tmp_path / "a", chunk_seconds=10, speech_aware=True
+    )
+
+    def _mid_speech(t: float) -> bool:
+        return any(s < t < e for s, e in speech)
+
+    assert any(_mid_speech(c.end_s) for c in fixed[:-1])
+    moved = 0
+    for c in aware[:-1]:
+        nominal = c.start_s + 10.0
+        assert nominal - 3.0 <= c.end_s <= nominal
+        if c.end_s < nominal:
+            moved += 1
+            assert not _mid_speech(c.end_s)
+    assert moved > 0
+    assert aware[-1].end_s == 60.0
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from dubbing_pipeline.voice_refs import extract_refs as er
+
+SR = 16000
+
+
+def _wav(path: Path, x: np.ndarray) -> Path:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(x.astype("<i2").tobytes())
+    return path
+
+
+def _episode(tmp_path: Path, n_lines: int = 60, n_spk: int = 3) -> tuple[Path, list[dict]]:
+    rng = np.random.default_rng(7)
+    segs, t = [], 0.5
+    for i in range(n_lines):
+        d = float(rng.uniform(1.0, 9.0))
+        segs.append((t, t + d, f"SPK_{i % n_spk:02d}"))
+        t += d + float(rng.uniform(0.3, 1.5))
+    tt = np.arange(int((t + 1) * SR)) / SR
+    x = 30 * rng.standard_normal(tt.size)
+    for st, en, spk in segs:
+        m = (tt >= st) & (tt < en)
+        f0 = 120 + 15 * int(spk[-2:])
+        env = np.sin(2 * np.pi * 3 * tt[m]) > -0.3
+        x[m] += float(rng.uniform(0.05, 0.9)) * 32767 * np.sin(2 * np.pi * f0 * tt[m]) * env
+    x = np.clip(x, -32768, 32767).astype(np.int16)
+    dialogue = _wav(tmp_path / "dialogue.wav", x)
+    (tmp_path / "segs").mkdir()
+    timeline = []
+    for i, (st, en, spk) in enumerate(segs):
+        clip = _wav(tmp_path / "segs" / f"{i:04d}.wav", x[round(st * SR) : round(en * SR)])
+        timeline.append({"start": st, "end": en, "speaker_id": spk, "wav_path": str(clip)})
+    return dialogue, timeline
+
+
+def test_shared_waveform_matches_per_clip_scoring(tmp_path: Path, monkeypatch) -> None:
+    dialogue, timeline = _episode(tmp_path)
+    cfg = er.ExtractRefsConfig(target_seconds=12.0)
+    loads: list[str] = []
+    orig = er._Waveform.load.__func__
+    monkeypatch.setattr(
+        er._Waveform,
+        "load",
+        classmethod(lambda cls, p, vad: loads.append(Path(p).name) or orig(cls, p, vad)),
+    )
+
+    shared = er.extract_speaker_refs(timeline, dialogue, tmp_path / "shared", cfg)
+    assert loads == ["dialogue.wav"]
+
+    # A clip that does not cover the timeline forces the per-clip path (legacy callers).
+    loads.clear()
+    first_clip = Path(timeline[0]["wav_path"])
+    per_clip = er.extract_speaker_refs(timeline, first_clip, tmp_path / "pc", cfg)
+    assert len(loads) > 20
+
+    assert sorted(shared["items"]) == ["SPK_00", "SPK_01", "SPK_02"]
+    for sid, rec in shared["items"].items():
+        other = per_clip["items"][sid]
+        assert rec["segments_used"] == other["segments_used"]
+        assert [r["reason"] for r in rec["rejected"]] == [r["reason"] for r in other["rejected"]]
+        a = Path(rec["ref_path"]).read_bytes()
+        assert a == Path(other["ref_path"]).read_bytes()
+        assert not rec["warnings"]
+        x = np.frombuffer(a[44:], dtype="<i2").astype(np.float64)
+        rms_db = 20.0 * math.log10(math.sqrt(float(np.mean(x * x))) / 32768.0)
+        assert abs(rms_db - cfg.target_rms_dbfs) < 0.5
+
+
+def test_top_k_heap_keeps_the_same_picks_as_a_full_sort(tmp_path: Path, monkeypatch) -> None:
+    dialogue, timeline = _episode(tmp_path, n_lines=90, n_spk=2)
+    cfg = er.ExtractRefsConfig(target_seconds=8.0)
+    assert er._keep_limit(cfg) == 9
+    bounded = er.extract_speaker_refs(timeline, dialogue, tmp_path / "a", cfg)
+    monkeypatch.setattr(er, "_keep_limit", lambda config: None)
+    full = er.extract_speaker_refs(timeline, dialogue, tmp_path / "b", cfg)
+    for sid in ("SPK_00", "SPK_01"):
+        assert bounded["items"][sid]["segments_used"] == full["items"][sid]["segments_used"]
+        assert len(bounded["items"][sid]["segments_used"]) >= 2
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.runtime.model_manager import ModelManager
+
+
+class _FakeWhisperModel:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def transcribe(self, audio, **kw):
+        self.calls.append({"audio": audio, **kw})
+        if kw.get("task") == "translate":
+            return {"language": kw.get("language"), "segments": [_seg("We have to go.")]}
+        return {"language": "ja", "segments": [_seg("行かなきゃ")]}
+
+
+def _seg(text: str) -> dict:
+    return {"start": 0.0, "end": 1.5, "text": text, "avg_logprob": -0.2}
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("DUBBING_CACHE_DIR", str(tmp_path / "cache"))
+    from dubbing_pipeline.config import get_settings
+
+    get_settings.cache_clear()
+    mod = types.ModuleType("whisper")
+    mod.load_audio = lambda path: f"pcm:{Path(path).name}"  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "whisper", mod)
+
+    model = _FakeWhisperModel()
+    loads: list[tuple[str, str]] = []
+    mm = ModelManager()
+
+    def _load(model_name: str, device: str):
+        loads.append((model_name, device))
+        return model
+
+    monkeypatch.setattr(mm, "_load_whisper", _load)
+    monkeypatch.setattr(ModelManager, "_singleton", mm)
+    yield model, loads
+    get_settings.cache_clear()
+
+
+def test_combined_pass_feeds_translation_without_second_run(fake_whisper, tmp_path: Path) -> None:
+    from dubbing_pipeline.stages.transcription import transcribe, whisper_translate_sidecar
+    from dubbing_pipeline.stages.translation import TranslationConfig, translate_segments
+
+    model, loads = fake_whisper
+    wav = tmp_path / "a.wav"
+    wav.write_bytes(b"")
+    srt = tmp_path / "a.srt"
+    transcribe(wav, srt, "cpu", "small", "transcribe", "auto", also_translate=True)
+
+    # One load, one decode; translate reuses the detected language instead of re-detecting.
+    assert loads == [("small", "cpu")]
+    assert [c["task"] for c in model.calls] == ["transcribe", "translate"]
+    assert {c["audio"] for c in model.calls} == {"pcm:a.wav"}
+    assert model.calls[1]["language"] == "ja"
+    side = json.loads(whisper_translate_sidecar(srt).read_text(encoding="utf-8"))
+    assert side["segments"][0]["text"] == "We have to go."
+
+    cfg = TranslationConfig(
+        mt_engine="whisper",
+        whisper_model="small",
+        audio_path=str(wav),
+        whisper_translate_path=str(whisper_translate_sidecar(srt)),
+    )
+    out = translate_segments(
+        [{"start": 0.0, "end": 1.5, "speaker": "S1", "text": "行かなきゃ"}],
+        src_lang="auto",
+        tgt_lang="en",
+        cfg=cfg,
+    )
+    assert out[0]["text"] == "We have to go."
+    assert len(model.calls) == 2
+
+    # Sidecar from a different model is ignored => a real translate pass on the shared handle.
+    cfg2 = TranslationConfig(
+        mt_engine="whisper",
+        whisper_model="medium",
+        audio_path=str(wav),
+        whisper_translate_path=str(whisper_translate_sidecar(srt)),
+    )
+    translate_segments([{"start": 0.0, "end": 1.5, "text": "x"}], "auto", "en", cfg2)
+    assert model.calls[-1]["task"] == "translate"
+    assert loads == [("small", "cpu"), ("medium", "cpu")]
+
+    # A sidecar decoded from other audio (re-extracted/replaced file) is not reused.
+    n = len(model.calls)
+    wav.write_bytes(b"\x00" * 32)
+    translate_segments([{"start": 0.0, "end": 1.5, "text": "x"}], "auto", "en", cfg)
+    assert len(model.calls) == n + 1 and model.calls[-1]["task"] == "translate"
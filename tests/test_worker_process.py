@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from dubbing_pipeline.jobs.models import Job, JobState
+from dubbing_pipeline.jobs.queue import JobQueue
+from dubbing_pipeline.jobs.store import JobStore
+from dubbing_pipeline.queue.fallback_local_queue import FallbackLocalQueue
+from dubbing_pipeline.worker.registry import WorkerRegistry
+from dubbing_pipeline.worker.runtime import WorkerRuntime
+
+
+def _job(job_id: str, state: JobState) -> Job:
+    now = "2026-01-01T00:00:00+00:00"
+    return Job(
+        id=job_id,
+        owner_id="u1",
+        video_path=f"/in/{job_id}.mp4",
+        duration_s=60.0,
+        mode="medium",
+        device="cpu",
+        src_lang="ja",
+        tgt_lang="en",
+        created_at=now,
+        updated_at=now,
+        state=state,
+        progress=0.5,
+        message="",
+        output_mkv="",
+        output_srt="",
+        work_dir="",
+        log_path="",
+    )
+
+
+def _beat(reg: WorkerRegistry, worker_id: str) -> None:
+    reg.heartbeat(worker_id, host="h", pid=1, capabilities={"device": "cpu"})
+
+
+def test_registry_claims_are_exclusive_until_worker_goes_stale(tmp_path: Path) -> None:
+    reg = WorkerRegistry(tmp_path / "workers.db")
+    _beat(reg, "w1")
+    _beat(reg, "w2")
+    assert reg.claim("j1", "w1", stale_after_s=30)
+    assert reg.claim("j1", "w1", stale_after_s=30)  # idempotent for the holder
+    assert not reg.claim("j1", "w2", stale_after_s=30)
+    assert reg.is_claimed_elsewhere("j1", "w2", stale_after_s=30)
+    assert not reg.is_claimed_elsewhere("j1", "w1", stale_after_s=30)
+
+    ws = {w["worker_id"]: w for w in reg.workers(stale_after_s=30)}
+    assert ws["w1"]["running"] == ["j1"] and ws["w1"]["alive"]
+    assert ws["w1"]["capabilities"]["device"] == "cpu"
+
+    # w1 stops heartbeating => its claim can be taken over / reaped.
+    time.sleep(0.05)
+    _beat(reg, "w2")
+    assert reg.reap_stale(stale_after_s=0.03) == [("j1", "w1")]
+    assert reg.claim("j1", "w2", stale_after_s=0.03)
+    assert reg.mark_stopped("w2") == ["j1"]
+    assert not reg.is_claimed_elsewhere("j1", "w1", stale_after_s=30)
+
+
+def test_fallback_queue_worker_pool_and_submit_only_modes(tmp_path: Path) -> None:
+    class _Sched:
+        def __init__(self) -> None:
+            self.submitted: list[str] = []
+
+        def submit(self, rec) -> None:
+            self.submitted.append(rec.job_id)
+
+    reg = WorkerRegistry(tmp_path / "workers.db")
+    _beat(reg, "w1")
+    _beat(reg, "w2")
+    sched = _Sched()
+
+    web = FallbackLocalQueue(get_store_cb=lambda: None, scheduler=sched, consume=False)
+    asyncio.run(web.submit_job(job_id="j1", user_id="u1", mode="medium", device="cpu"))
+    assert sched.submitted == []  # left QUEUED in the store for workers
+
+    w1 = FallbackLocalQueue(
+        get_store_cb=lambda: None, scheduler=sched, registry=reg, worker_id="w1"
+    )
+    w2 = FallbackLocalQueue(
+        get_store_cb=lambda: None, scheduler=sched, registry=reg, worker_id="w2"
+    )
+    assert asyncio.run(w1.before_job_run(job_id="j1", user_id=None))
+    assert not asyncio.run(w2.before_job_run(job_id="j1", user_id=None))
+    assert w2.is_claimed_elsewhere("j1")
+    asyncio.run(w1.after_job_run(job_id="j1", user_id=None, final_state="DONE", ok=True))
+    assert asyncio.run(w2.before_job_run(job_id="j1", user_id=None))
+
+
+def test_startup_recovery_skips_jobs_held_by_live_workers(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db")
+    store.put(_job("held", JobState.RUNNING))
+    store.put(_job("orphan", JobState.RUNNING))
+
+    class _Backend:
+        def __init__(self) -> None:
+            self.submitted: list[str] = []
+
+        async def is_claimed_elsewhere(self, job_id: str) -> bool:
+            return job_id == "held"
+
+        async def submit_job(self, *, job_id: str, **_kw) -> None:
+            self.submitted.append(job_id)
+
+    async def _run() -> list[str]:
+        qb = _Backend()
+        q = JobQueue(store, concurrency=1, app_root=tmp_path, queue_backend=qb)
+        await q.start()
+        await q.stop()
+        return qb.submitted
+
+    assert asyncio.run(_run()) == ["orphan"]
+    assert store.get("held").state == JobState.RUNNING
+    assert store.get("orphan").state == JobState.QUEUED
+
+
+def test_worker_requeues_running_jobs_of_dead_workers(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db")
+    store.put(_job("j1", JobState.RUNNING))
+    reg = WorkerRegistry(tmp_path / "workers.db")
+    _beat(reg, "dead")
+    assert reg.claim("j1", "dead", stale_after_s=30)
+
+    rt = WorkerRuntime(worker_id="w1", concurrency=1)
+    rt.registry = reg
+    rt.state.job_store = store
+    rt.stale_after_s = 0.03
+    time.sleep(0.05)
+    asyncio.run(rt._requeue_stale())  # noqa: SLF001
+
+    j = store.get("j1")
+    assert j.state == JobState.QUEUED
+    assert "worker dead lost" in j.message
+
+
+def test_redis_recovery_leaves_jobs_locked_by_live_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from dubbing_pipeline.config import get_settings
+    from dubbing_pipeline.queue.manager import AutoQueueBackend
+
+    monkeypatch.setenv("REDIS_URL", "redis://test")
+    monkeypatch.setenv("REDIS_QUEUE_PREFIX", f"t{uuid.uuid4().hex[:8]}")
+    get_settings.cache_clear()
+    store = JobStore(tmp_path / "jobs.db")
+    store.put(_job("held", JobState.RUNNING))
+    store.put(_job("orphan", JobState.RUNNING))
+    reg = WorkerRegistry(tmp_path / "workers.db")
+    _beat(reg, "w1")
+    _beat(reg, "w2")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    def _backend(worker_id: str, registry: WorkerRegistry | None) -> AutoQueueBackend:
+        qb = AutoQueueBackend(
+            scheduler=None,
+            get_store_cb=lambda: store,
+            enqueue_job_id_cb=lambda job_id: None,
+            registry=registry,
+            worker_id=worker_id,
+        )
+        qb._redis._client = client
+        qb._redis._healthy = True
+        return qb
+
+    async def _run() -> tuple[list[str], list[str]]:
+        w1 = _backend("w1", reg)
+        await w1._redis._prepare_scripts()
+        await w1.submit_job(job_id="held", user_id="u1", mode="medium", device="cpu")
+        assert await w1.before_job_run(job_id="held", user_id="u1")
+        assert reg.workers(stale_after_s=30)[0]["running"] == ["held"]
+        pending = w1._redis._pending_key()
+        await client.zrem(pending, "held")
+
+        recovered: list[list[str]] = []
+        # A second worker (shared workers.db) and a web process without a registry.
+        for qb in (_backend("w2", reg), _backend("", None)):
+            q = JobQueue(store, concurrency=1, app_root=tmp_path, queue_backend=qb)
+            await q.start()
+            await q.stop()
+            recovered.append(sorted(await client.zrange(pending, 0, -1)))
+            await client.zrem(pending, "orphan")
+            store.update("orphan", state=JobState.RUNNING)
+        await w1.after_job_run(job_id="held", user_id="u1", final_state="DONE", ok=True)
+        return recovered[0], recovered[1]
+
+    try:
+        assert asyncio.run(_run()) == (["orphan"], ["orphan"])
+    finally:
+        get_settings.cache_clear()
+    assert store.get("held").state == JobState.RUNNING
+    assert reg.workers(stale_after_s=30)[0]["running"] == []